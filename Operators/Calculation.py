@@ -0,0 +1,117 @@
+"""
+Calculation Value Objects
+Compact request and result objects that flow from payload parsing through the
+operation handler to JSON serialization.
+
+A CalculationResult holds the numeric result and the parsed parameters; the
+'operation' description (e.g. "2.0 × sin(30.0°)") is only formatted when something
+reads it, typically the JSON encoder. Results are read-only mappings with the keys
+of the API response, so callers index them exactly like the dictionaries they
+replace.
+"""
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
+
+if TYPE_CHECKING:
+    from Operators.OperatorRegistry import OperationSpec
+
+RESULT_KEYS = ('success', 'result', 'operation')
+
+
+class CalculationRequest:
+    """
+    A decoded calculation: the operation and its parameters in handler order.
+
+    Attributes:
+        spec: Registered operation
+        args: Parsed parameters, as returned by OperationSpec.parse
+    """
+
+    __slots__ = ('spec', 'args')
+
+    def __init__(self, spec: 'OperationSpec', args: Tuple):
+        self.spec = spec
+        self.args = args
+
+    @property
+    def key(self) -> Tuple:
+        """Normalized identity of the calculation, used by the result cache and coalescing."""
+        args = self.args
+        if 0.0 in args:
+            # -0.0 == 0.0 and both hash alike, but results can differ (-0.0 * 5 is -0.0)
+            args = tuple(repr(arg) if type(arg) is float and arg == 0.0 else arg for arg in args)
+        return (self.spec.name,) + args
+
+    def run(self) -> 'CalculationResult':
+        """Run the operation handler."""
+        return self.spec.run(self.args)
+
+    def __repr__(self) -> str:
+        return f"CalculationRequest({self.spec.name!r}, {self.args!r})"
+
+
+class CalculationResult(Mapping):
+    """
+    Successful calculation result with a lazily built operation description.
+
+    Attributes:
+        result: Value returned by the operation handler
+    """
+
+    __slots__ = ('result', '_spec', '_args', '_operation')
+
+    def __init__(self, result: Any, spec: Optional['OperationSpec'] = None,
+                 args: Tuple = (), operation: Optional[str] = None):
+        """
+        Args:
+            result: Value returned by the operation handler
+            spec: Operation whose describe() formats the description from args
+            args: Parsed parameters
+            operation: Ready-made description, used instead of spec and args
+        """
+        self.result = result
+        self._spec = spec
+        self._args = args
+        self._operation = operation
+
+    @property
+    def success(self) -> bool:
+        return True
+
+    @property
+    def operation(self) -> str:
+        """Human-readable description of the calculation, formatted on first use."""
+        if self._operation is None:
+            self._operation = self._spec.describe(*self._args)
+        return self._operation
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The API response body."""
+        # Called by the JSON encoder once per result, so the property is inlined
+        operation = self._operation
+        if operation is None:
+            operation = self._operation = self._spec.describe(*self._args)
+        return {'success': True, 'result': self.result, 'operation': operation}
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'result':
+            return self.result
+        if key == 'success':
+            return True
+        if key == 'operation':
+            return self.operation
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(RESULT_KEYS)
+
+    def __len__(self) -> int:
+        return len(RESULT_KEYS)
+
+    def __reduce__(self):
+        # Pickled for process-pool workers: operation handlers and describe lambdas
+        # cannot be pickled, so the description is formatted first
+        return CalculationResult, (self.result, None, (), self.operation)
+
+    def __repr__(self) -> str:
+        return f"CalculationResult({self.to_dict()!r})"
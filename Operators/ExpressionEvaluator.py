@@ -0,0 +1,319 @@
+"""
+Expression Evaluation Module
+Tokenizes, parses and compiles whole formulas into compact bytecode evaluated with Operator.
+"""
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple
+
+from Operators.Operator import Operator, CalculatorError
+
+
+# Bytecode opcodes
+PUSH = 0    # push constant
+BINARY = 1  # pop two operands, push func(a, b)
+NEGATE = 2  # negate top of stack
+CALL = 3    # pop argc operands, push func(*args)
+
+Instruction = Tuple[int, Any]
+
+TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<name>[A-Za-z_π][A-Za-z_0-9]*)
+      | (?P<symbol>[-+*/^%(),×÷])
+    )""", re.VERBOSE)
+
+SYMBOL_ALIASES = {"×": "*", "÷": "/", "%": "mod"}
+
+CONSTANTS = {
+    "pi": Operator.get_pi,
+    "π": Operator.get_pi,
+}
+
+
+BINARY_OPERATORS: Dict[str, Callable[[float, float], float]] = {
+    "+": lambda a, b: Operator.perform_basic_operation("+", a, b),
+    "-": lambda a, b: Operator.perform_basic_operation("-", a, b),
+    "*": lambda a, b: Operator.perform_basic_operation("*", a, b),
+    "/": lambda a, b: Operator.perform_basic_operation("/", a, b),
+    "mod": Operator.perform_modulo,
+    "^": Operator.perform_real_power,
+}
+
+# name -> (function, minimum arguments, maximum arguments)
+FUNCTIONS: Dict[str, Tuple[Callable[..., float], int, int]] = {
+    "sin": (lambda angle: Operator.perform_trigonometric_function("sin", angle), 1, 1),
+    "cos": (lambda angle: Operator.perform_trigonometric_function("cos", angle), 1, 1),
+    "tan": (lambda angle: Operator.perform_trigonometric_function("tan", angle), 1, 1),
+    "cot": (lambda angle: Operator.perform_trigonometric_function("cot", angle), 1, 1),
+    "log": (lambda number, base=10: Operator.perform_logarithm(number, base), 1, 2),
+    "power": (Operator.perform_real_power, 2, 2),
+    "mod": (Operator.perform_modulo, 2, 2),
+}
+
+
+def tokenize(expression: str) -> List[Tuple[str, Any, int]]:
+    """
+    Split an expression into tokens.
+
+    Args:
+        expression: Formula text
+
+    Returns:
+        List of (kind, value, position) tuples, terminated by an 'end' token
+
+    Raises:
+        CalculatorError: If an unexpected character is found
+    """
+    tokens = []
+    position = 0
+    length = len(expression)
+
+    while position < length:
+        match = TOKEN_PATTERN.match(expression, position)
+        if match is None:
+            remainder = expression[position:].lstrip()
+            if not remainder:
+                break
+            offset = length - len(remainder)
+            raise CalculatorError(f"Unexpected character '{remainder[0]}' at position {offset}")
+
+        kind = match.lastgroup
+        value = match.group(kind)
+        start = match.start(kind)
+        if kind == "number":
+            tokens.append(("number", float(value), start))
+        elif kind == "name":
+            value = value.lower()
+            tokens.append(("symbol" if value == "mod" else "name", value, start))
+        else:
+            tokens.append(("symbol", SYMBOL_ALIASES.get(value, value), start))
+        position = match.end()
+
+    tokens.append(("end", None, length))
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive-descent parser emitting postfix bytecode.
+
+    Grammar (lowest to highest precedence):
+        expression := term (('+' | '-') term)*
+        term       := unary (('*' | '/' | 'mod') unary)*
+        unary      := '-' unary | '+' unary | power
+        power      := primary ('^' unary)?          # right associative
+        primary    := number | constant | name '(' args ')' | '(' expression ')'
+    """
+
+    def __init__(self, tokens: List[Tuple[str, Any, int]]):
+        self.tokens = tokens
+        self.index = 0
+        self.code: List[Instruction] = []
+
+    def parse(self) -> List[Instruction]:
+        self._expression()
+        kind, value, position = self._peek()
+        if kind != "end":
+            raise CalculatorError(f"Unexpected token '{value}' at position {position}")
+        return self.code
+
+    def _peek(self) -> Tuple[str, Any, int]:
+        return self.tokens[self.index]
+
+    def _advance(self) -> Tuple[str, Any, int]:
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def _accept(self, symbol: str) -> bool:
+        kind, value, _ = self._peek()
+        if kind == "symbol" and value == symbol:
+            self.index += 1
+            return True
+        return False
+
+    def _expect(self, symbol: str) -> None:
+        if not self._accept(symbol):
+            kind, value, position = self._peek()
+            if kind == "end":
+                raise CalculatorError(f"Expected '{symbol}' but expression ended")
+            raise CalculatorError(f"Expected '{symbol}' at position {position}, found '{value}'")
+
+    def _expression(self) -> None:
+        self._term()
+        while True:
+            kind, value, _ = self._peek()
+            if kind == "symbol" and value in ("+", "-"):
+                self.index += 1
+                self._term()
+                self.code.append((BINARY, BINARY_OPERATORS[value]))
+            else:
+                return
+
+    def _term(self) -> None:
+        self._unary()
+        while True:
+            kind, value, _ = self._peek()
+            if kind == "symbol" and value in ("*", "/", "mod"):
+                self.index += 1
+                self._unary()
+                self.code.append((BINARY, BINARY_OPERATORS[value]))
+            else:
+                return
+
+    def _unary(self) -> None:
+        if self._accept("-"):
+            self._unary()
+            self.code.append((NEGATE, None))
+        elif self._accept("+"):
+            self._unary()
+        else:
+            self._power()
+
+    def _power(self) -> None:
+        self._primary()
+        if self._accept("^"):
+            self._unary()
+            self.code.append((BINARY, BINARY_OPERATORS["^"]))
+
+    def _primary(self) -> None:
+        kind, value, position = self._advance()
+
+        if kind == "number":
+            self.code.append((PUSH, value))
+        elif kind == "name":
+            if value in CONSTANTS:
+                self.code.append((PUSH, CONSTANTS[value]()))
+            elif value in FUNCTIONS:
+                self._call(value)
+            else:
+                raise CalculatorError(f"Unknown name '{value}' at position {position}")
+        elif kind == "symbol" and value == "(":
+            self._expression()
+            self._expect(")")
+        elif kind == "symbol" and value == "mod" and self._peek()[1] == "(":
+            self._call("mod")
+        elif kind == "end":
+            raise CalculatorError("Unexpected end of expression")
+        else:
+            raise CalculatorError(f"Unexpected token '{value}' at position {position}")
+
+    def _call(self, name: str) -> None:
+        function, min_args, max_args = FUNCTIONS[name]
+        self._expect("(")
+        argc = 0
+        if not self._accept(")"):
+            while True:
+                self._expression()
+                argc += 1
+                if self._accept(")"):
+                    break
+                self._expect(",")
+
+        if not min_args <= argc <= max_args:
+            expected = str(min_args) if min_args == max_args else f"{min_args}-{max_args}"
+            raise CalculatorError(f"Function {name} expects {expected} argument(s), got {argc}")
+        self.code.append((CALL, (function, argc)))
+
+
+class CompiledExpression:
+    """
+    Compiled expression holding postfix bytecode.
+    Evaluation runs a small stack machine; Python eval is never used.
+    """
+
+    def __init__(self, source: str, code: List[Instruction]):
+        self.source = source
+        self.code = tuple(code)
+
+    def evaluate(self) -> float:
+        """
+        Execute the bytecode.
+
+        Returns:
+            Result of the expression
+
+        Raises:
+            CalculatorError: If any operation fails
+        """
+        stack: List[float] = []
+        push = stack.append
+        pop = stack.pop
+
+        for opcode, argument in self.code:
+            if opcode == PUSH:
+                push(argument)
+            elif opcode == BINARY:
+                right = pop()
+                push(argument(pop(), right))
+            elif opcode == NEGATE:
+                push(-pop())
+            else:
+                function, argc = argument
+                args = stack[-argc:]
+                del stack[-argc:]
+                push(function(*args))
+
+        return stack[0]
+
+
+@lru_cache(maxsize=1024)
+def _compile_cached(expression: str) -> CompiledExpression:
+    """Compile an expression, caching the result by its exact text."""
+    return CompiledExpression(expression, _Parser(tokenize(expression)).parse())
+
+
+class ExpressionEvaluator:
+    """
+    Facade for compiling and evaluating formulas such as '2*sin(30)+log(8,2)^2 mod 3'.
+    Compiled forms are cached by expression text so repeated formulas skip parsing.
+    """
+
+    @staticmethod
+    def compile(expression: str) -> CompiledExpression:
+        """
+        Compile an expression to bytecode.
+
+        Args:
+            expression: Formula text
+
+        Returns:
+            CompiledExpression ready for evaluation
+
+        Raises:
+            CalculatorError: If the expression is empty or malformed
+        """
+        if not isinstance(expression, str) or not expression.strip():
+            raise CalculatorError("Expression is empty")
+        try:
+            return _compile_cached(expression)
+        except RecursionError:
+            raise CalculatorError("Expression is nested too deeply")
+
+    @staticmethod
+    def evaluate(expression: str) -> float:
+        """
+        Compile (or fetch from cache) and evaluate an expression.
+
+        Args:
+            expression: Formula text
+
+        Returns:
+            Result of the expression
+
+        Raises:
+            CalculatorError: If the expression is malformed or evaluation fails
+        """
+        return ExpressionEvaluator.compile(expression).evaluate()
+
+    @staticmethod
+    def cache_info():
+        """Return hit/miss statistics of the compiled expression cache."""
+        return _compile_cached.cache_info()
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Clear the compiled expression cache."""
+        _compile_cached.cache_clear()
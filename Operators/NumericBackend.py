@@ -0,0 +1,260 @@
+"""
+Numeric Backends Module
+Exact and arbitrary-precision alternatives to the float Operator methods.
+
+The 'decimal' backend evaluates every registered built-in operation with
+decimal.Decimal at a configurable precision; the 'fraction' backend evaluates
+basic arithmetic and modulo exactly with fractions.Fraction. Operand values
+are converted from their decimal text (0.1 becomes Decimal('0.1'), not the
+binary float nearest to it), so clients wanting exact input send strings.
+"""
+import decimal
+import operator
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from typing import Any, Callable, Dict, Optional
+
+from Operators.Operator import CalculatorError, special_angle_sin_cos
+
+
+# Extra digits carried through series and logarithms before rounding to the target precision
+GUARD_DIGITS = 5
+
+MAX_PRECISION = 1000
+
+# Operand size limits: converting '1e5000000' to a Fraction alone builds a
+# five-million-digit integer, so operands are checked before conversion
+MAX_OPERAND_DIGITS = 2000
+MAX_OPERAND_EXPONENT = 10000
+_OPERAND_INT_LIMIT = 10 ** MAX_OPERAND_DIGITS
+
+# Messages for decimal signals raised while evaluating an operation
+_DECIMAL_ERRORS = (
+    (decimal.Overflow, "result too large"),
+    (decimal.DivisionImpossible, "operand too large for the precision"),
+    (decimal.DivisionByZero, "division by zero"),
+)
+
+
+def _check_divisor(divisor: Any, message: str) -> None:
+    if divisor == 0:
+        raise CalculatorError(message)
+
+
+def _divide(a: Any, b: Any) -> Any:
+    _check_divisor(b, "Division by zero")
+    return a / b
+
+
+def _modulo(a: Any, b: Any) -> Any:
+    """Remainder with the sign of the divisor, as float % does."""
+    _check_divisor(b, "Modulo by zero")
+    remainder = a % b
+    if remainder and (remainder < 0) != (b < 0):
+        remainder += b
+    return remainder
+
+
+BASIC_OPERATIONS: Dict[str, Callable[[Any, Any], Any]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": _divide,
+    "mod": _modulo,
+}
+
+
+def decimal_pi() -> Decimal:
+    """Compute Pi to the current precision (recipe from the decimal module documentation)."""
+    with localcontext() as context:
+        context.prec += GUARD_DIGITS
+        three = Decimal(3)
+        last, total, term, n, na, d, da = 0, three, three, 1, 0, 0, 24
+        while total != last:
+            last = total
+            n, na = n + na, na + 8
+            d, da = d + da, da + 32
+            term = (term * n) / d
+            total += term
+    return +total
+
+
+def _sin_cos(angle_degrees: Decimal):
+    """(sin, cos) of an angle in degrees at the current precision."""
+    angle = angle_degrees % 360
+    if angle < 0:
+        angle += 360
+    if angle % 15 == 0:
+        return special_angle_sin_cos(int(angle))
+
+    with localcontext() as context:
+        context.prec += GUARD_DIGITS
+        x = angle * decimal_pi() / 180
+        # Taylor series for sin and cos
+        sine, cosine = Decimal(0), Decimal(0)
+        term, n = Decimal(1), 0
+        while True:
+            previous = (sine, cosine)
+            cosine += term
+            term *= x / (n + 1)
+            sine += term
+            term *= -x / (n + 2)
+            n += 2
+            if (sine, cosine) == previous:
+                break
+    return +sine, +cosine
+
+
+def _decimal_trig(name: str) -> Callable[[Optional[Decimal], Decimal], Decimal]:
+    def trig(num1: Optional[Decimal], angle: Decimal) -> Decimal:
+        sine, cosine = _sin_cos(angle)
+        if name == "sin":
+            value = sine
+        elif name == "cos":
+            value = cosine
+        else:
+            numerator, denominator = (sine, cosine) if name == "tan" else (cosine, sine)
+            if denominator == 0:
+                raise CalculatorError(
+                    f"Trigonometric calculation error: {name}({angle}°) is undefined"
+                )
+            value = numerator / denominator
+        return value if num1 is None else num1 * value
+    return trig
+
+
+def _decimal_logarithm(number: Decimal, base: Decimal) -> Decimal:
+    if number <= 0:
+        raise CalculatorError("Logarithm requires positive number")
+    if base <= 0 or base == 1:
+        raise CalculatorError("Logarithm base must be positive and not equal to 1")
+    with localcontext() as context:
+        context.prec += GUARD_DIGITS
+        result = number.ln() / base.ln()
+    return +result
+
+
+def _decimal_power(base: Decimal, exponent: Decimal) -> Decimal:
+    if base == 0 and exponent < 0:
+        raise CalculatorError("Power calculation error: zero cannot be raised to a negative power")
+    try:
+        return base ** exponent
+    except decimal.InvalidOperation:
+        raise CalculatorError("Power calculation error: result is not a real number")
+    except decimal.Overflow:
+        raise CalculatorError("Power calculation error: result too large")
+
+
+DECIMAL_OPERATIONS: Dict[str, Callable[..., Decimal]] = {
+    **BASIC_OPERATIONS,
+    "sin": _decimal_trig("sin"),
+    "cos": _decimal_trig("cos"),
+    "tan": _decimal_trig("tan"),
+    "cot": _decimal_trig("cot"),
+    "log": _decimal_logarithm,
+    "power": _decimal_power,
+    "pi": decimal_pi,
+}
+
+FRACTION_OPERATIONS: Dict[str, Callable[..., Fraction]] = dict(BASIC_OPERATIONS)
+
+
+class NumericBackend:
+    """
+    Number type used to evaluate an operation.
+
+    Attributes:
+        name: Backend name used in requests ('decimal', 'fraction')
+        number_type: Type operands are converted to
+        operations: Operation name to handler taking converted operands
+    """
+
+    def __init__(self, name: str, number_type: type, operations: Dict[str, Callable[..., Any]]):
+        self.name = name
+        self.number_type = number_type
+        self.operations = operations
+
+    def convert(self, value: Any) -> Any:
+        """
+        Convert a request value to the backend's number type.
+
+        Floats are converted from their shortest repr, so 0.1 stays one tenth. Other
+        values are parsed as a Decimal first (cheap even for huge exponents), so their
+        size can be checked before an exact Fraction is built.
+
+        Raises:
+            CalculatorError: If the value is not a finite number, or has more than
+                             MAX_OPERAND_DIGITS digits or an exponent beyond
+                             MAX_OPERAND_EXPONENT
+        """
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise CalculatorError(f"Invalid number: {value!r}")
+        if isinstance(value, int) and abs(value) >= _OPERAND_INT_LIMIT:
+            raise CalculatorError(f"Number too large: at most {MAX_OPERAND_DIGITS} digits")
+        try:
+            text = repr(value) if isinstance(value, float) else str(value).strip()
+            if '/' in text:
+                # Ratios ('1/3') have no exponent; only the digit count needs a bound
+                if sum(map(str.isdigit, text)) > MAX_OPERAND_DIGITS:
+                    raise CalculatorError(f"Number too large: at most {MAX_OPERAND_DIGITS} digits")
+                return self.number_type(text)
+            number = Decimal(text)
+        except (ValueError, ZeroDivisionError, decimal.InvalidOperation):
+            raise CalculatorError(f"Invalid number: {value!r}")
+        if not number.is_finite():
+            raise CalculatorError(f"Invalid number: {value!r}")
+        if len(number.as_tuple().digits) > MAX_OPERAND_DIGITS:
+            raise CalculatorError(f"Number too large: at most {MAX_OPERAND_DIGITS} digits")
+        if number and abs(number.adjusted()) > MAX_OPERAND_EXPONENT:
+            raise CalculatorError(f"Number out of range: exponent beyond ±{MAX_OPERAND_EXPONENT}")
+        return number if self.number_type is Decimal else self.number_type(number)
+
+    def execute(self, operation: str, args: tuple, precision: int) -> Any:
+        """
+        Run an operation on converted operands.
+
+        Args:
+            operation: Operation name
+            args: Converted operands in handler order
+            precision: Significant digits for the decimal backend
+
+        Returns:
+            Result in the backend's number type
+
+        Raises:
+            CalculatorError: If the operation is unsupported or fails
+        """
+        handler = self.operations.get(operation)
+        if handler is None:
+            raise CalculatorError(f"Operation {operation} is not supported by the {self.name} backend")
+        try:
+            with localcontext() as context:
+                context.prec = precision
+                # Unary plus rounds Decimal results to the requested precision; fractions stay exact
+                return +handler(*args) if self.number_type is Decimal else handler(*args)
+        except decimal.DecimalException as e:
+            # The C implementation raises the base signal and lists the specific ones in args
+            signals = e.args[0] if e.args and isinstance(e.args[0], list) else [type(e)]
+            message = next((text for signal, text in _DECIMAL_ERRORS
+                            if any(issubclass(raised, signal) for raised in signals)),
+                           "invalid operation")
+            raise CalculatorError(f"Calculation error: {message}")
+
+
+NUMERIC_BACKENDS: Dict[str, NumericBackend] = {
+    "decimal": NumericBackend("decimal", Decimal, DECIMAL_OPERATIONS),
+    "fraction": NumericBackend("fraction", Fraction, FRACTION_OPERATIONS),
+}
+
+
+def get_backend(name: Any) -> NumericBackend:
+    """
+    Look up a numeric backend.
+
+    Raises:
+        CalculatorError: If no backend has the name
+    """
+    backend = NUMERIC_BACKENDS.get(name) if isinstance(name, str) else None
+    if backend is None:
+        raise CalculatorError(f"Unknown numeric backend: {name}")
+    return backend
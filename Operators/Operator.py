@@ -3,7 +3,9 @@ Calculator Operations Module
 Provides basic, advanced, and trigonometric operations following clean code principles.
 """
 import math
-from typing import Union
+from decimal import Decimal, localcontext
+from operator import add, sub, mul, truediv
+from typing import Any, Dict, Optional, Tuple, Union
 
 
 class CalculatorError(Exception):
@@ -11,6 +13,151 @@ class CalculatorError(Exception):
     pass
 
 
+# Dispatch tables built once at import time rather than on every call
+BASIC_OPERATIONS = {
+    "+": add,
+    "-": sub,
+    "*": mul,
+    "/": truediv
+}
+
+TRIGONOMETRIC_FUNCTIONS = {
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "cot": lambda a: 1 / math.tan(a)
+}
+
+
+def special_angle_sin_cos(angle: int) -> Tuple[Decimal, Decimal]:
+    """
+    Exact (sin, cos) of a multiple of 15° from closed forms, in the current decimal context.
+
+    Args:
+        angle: Angle in degrees, a multiple of 15 in [0, 360)
+
+    Returns:
+        (sine, cosine) as Decimals rounded to the context precision
+    """
+    quadrant, offset = divmod(angle, 90)
+    root2, root6 = Decimal(2).sqrt(), Decimal(6).sqrt()
+    half, root3_half = Decimal(1) / 2, Decimal(3).sqrt() / 2
+    # (sin, cos) for the first quadrant
+    sine, cosine = {
+        0: (Decimal(0), Decimal(1)),
+        15: ((root6 - root2) / 4, (root6 + root2) / 4),
+        30: (half, root3_half),
+        45: (root2 / 2, root2 / 2),
+        60: (root3_half, half),
+        75: ((root6 + root2) / 4, (root6 - root2) / 4),
+    }[offset]
+    # sin(x + 90°) = cos(x), cos(x + 90°) = -sin(x)
+    for _ in range(quadrant):
+        sine, cosine = cosine, -sine
+    return sine, cosine
+
+
+def _special_angle_values() -> Dict[str, Dict[int, Optional[float]]]:
+    """
+    Correctly rounded trigonometric values at every multiple of 15°.
+
+    libm evaluated on math.radians() is off by an ulp or more at these angles
+    (sin 30° = 0.49999999999999994, cot 90° = 6.1e-17). Values are derived from
+    closed forms in 40-digit decimal arithmetic; None marks an undefined value.
+    """
+    values: Dict[str, Dict[int, Optional[float]]] = {name: {} for name in TRIGONOMETRIC_FUNCTIONS}
+    with localcontext() as context:
+        context.prec = 40
+        for angle in range(0, 360, 15):
+            sine, cosine = special_angle_sin_cos(angle)
+            # Adding 0.0 turns -0.0 into 0.0
+            values["sin"][angle] = float(sine) + 0.0
+            values["cos"][angle] = float(cosine) + 0.0
+            values["tan"][angle] = float(sine / cosine) + 0.0 if cosine else None
+            values["cot"][angle] = float(cosine / sine) + 0.0 if sine else None
+    return values
+
+
+SPECIAL_ANGLE_VALUES = _special_angle_values()
+
+# Precomputed values per function keyed by angle in [0, 360), filled by configure_trig_table.
+# Undefined values (tan 90°, cot 0°) are stored as NaN so the lookup stays a single dict get.
+TRIGONOMETRIC_TABLES: Dict[str, Dict[float, float]] = {
+    name: {} for name in TRIGONOMETRIC_FUNCTIONS
+}
+
+
+def _trigonometric(operator: str, angle_degrees: float, value: Optional[float]) -> float:
+    """
+    Slow path for angles the table lookup in Operator did not answer.
+
+    Args:
+        operator: Trigonometric function name
+        angle_degrees: Angle in degrees
+        value: Result of the lookup: None when the angle is not tabulated, NaN when undefined
+    """
+    table = TRIGONOMETRIC_TABLES.get(operator)
+    if table is None:
+        raise CalculatorError(f"Invalid trigonometric operator: {operator}")
+
+    if value is None and not 0 <= angle_degrees < 360:
+        value = table.get(angle_degrees % 360)
+        if value is not None and value == value:
+            return value
+
+    if value is not None:
+        raise CalculatorError(
+            f"Trigonometric calculation error: {operator}({angle_degrees}°) is undefined"
+        )
+
+    try:
+        return TRIGONOMETRIC_FUNCTIONS[operator](math.radians(angle_degrees))
+    except (ValueError, ZeroDivisionError) as e:
+        raise CalculatorError(f"Trigonometric calculation error: {str(e)}")
+
+
+# Logarithms in fixed bases with dedicated libm functions. They skip the second log
+# and division of math.log(number, base), and log2/log10 avoid the quotient's extra
+# rounding, which can put it nearly 2 ulps off the true value.
+FIXED_BASE_LOGARITHMS = {
+    2.0: math.log2,
+    10.0: math.log10,
+    math.e: math.log
+}
+
+# Exact powers for integer operands whose result libm may round wrongly, memoized up
+# to POWER_MEMO_LIMIT pairs. Below 2**53 every integer is a float and pow is exact.
+POWER_MEMO: Dict[Tuple[float, float], float] = {}
+POWER_MEMO_LIMIT = 4096
+EXACT_POWER_LIMIT = 2.0 ** 53
+
+
+def _exact_power(base: float, exponent: float, result: float) -> float:
+    """
+    Slow path for a power of at least 2**53 that the memo in Operator did not answer.
+
+    Args:
+        base: Base
+        exponent: Exponent
+        result: libm result
+
+    Returns:
+        The exact integer result correctly rounded when both operands are integer-valued
+        floats, else result
+    """
+    # Operands may be ints, which have no is_integer() before Python 3.12
+    if not (float(base).is_integer() and float(exponent).is_integer()):
+        return result
+    # Exponentiation by squaring on integers; int -> float conversion rounds correctly
+    try:
+        value = float(int(base) ** int(exponent))
+    except OverflowError:
+        return result
+    if len(POWER_MEMO) < POWER_MEMO_LIMIT:
+        POWER_MEMO[(base, exponent)] = value
+    return value
+
+
 class Operator:
     """
     Calculator operator class providing static methods for various mathematical operations.
@@ -33,21 +180,14 @@ class Operator:
         Raises:
             CalculatorError: If operator is invalid or division by zero
         """
-        operations = {
-            "+": lambda a, b: a + b,
-            "-": lambda a, b: a - b,
-            "*": lambda a, b: a * b,
-            "/": lambda a, b: a / b if b != 0 else None
-        }
-
-        if operator not in operations:
+        operation = BASIC_OPERATIONS.get(operator)
+        if operation is None:
             raise CalculatorError(f"Invalid operator: {operator}")
 
-        result = operations[operator](num1, num2)
-        if result is None:
+        if operator == "/" and num2 == 0:
             raise CalculatorError("Division by zero")
 
-        return result
+        return operation(num1, num2)
 
     @staticmethod
     def perform_trigonometric_operation(operator: str, num1: float, angle_degrees: float) -> float:
@@ -65,23 +205,11 @@ class Operator:
         Raises:
             CalculatorError: If operator is invalid or calculation error occurs
         """
-        angle_radians = math.radians(angle_degrees)
-
-        try:
-            operations = {
-                "sin": lambda a: math.sin(a),
-                "cos": lambda a: math.cos(a),
-                "tan": lambda a: math.tan(a),
-                "cot": lambda a: 1 / math.tan(a)
-            }
-
-            if operator not in operations:
-                raise CalculatorError(f"Invalid trigonometric operator: {operator}")
-
-            return num1 * operations[operator](angle_radians)
-
-        except (ValueError, ZeroDivisionError) as e:
-            raise CalculatorError(f"Trigonometric calculation error: {str(e)}")
+        table = TRIGONOMETRIC_TABLES.get(operator)
+        value = table.get(angle_degrees) if table is not None else None
+        if value is not None and value == value:
+            return num1 * value
+        return num1 * _trigonometric(operator, angle_degrees, value)
 
     @staticmethod
     def perform_trigonometric_function(operator: str, angle_degrees: float) -> float:
@@ -98,23 +226,36 @@ class Operator:
         Raises:
             CalculatorError: If operator is invalid or calculation error occurs
         """
-        angle_radians = math.radians(angle_degrees)
-
-        try:
-            operations = {
-                "sin": lambda a: math.sin(a),
-                "cos": lambda a: math.cos(a),
-                "tan": lambda a: math.tan(a),
-                "cot": lambda a: 1 / math.tan(a)
-            }
+        table = TRIGONOMETRIC_TABLES.get(operator)
+        value = table.get(angle_degrees) if table is not None else None
+        if value is not None and value == value:
+            return value
+        return _trigonometric(operator, angle_degrees, value)
 
-            if operator not in operations:
-                raise CalculatorError(f"Invalid trigonometric operator: {operator}")
+    @staticmethod
+    def configure_trig_table(resolution: int = 1) -> None:
+        """
+        Rebuild the precomputed trigonometric table.
 
-            return operations[operator](angle_radians)
+        Angles on the table grid (after reduction to [0, 360)) are answered by lookup
+        instead of math.radians plus libm. Multiples of 15° always use exact values.
 
-        except (ValueError, ZeroDivisionError) as e:
-            raise CalculatorError(f"Trigonometric calculation error: {str(e)}")
+        Args:
+            resolution: Table entries per degree (1 covers 0-359°, 10 covers tenths);
+                        0 keeps only the exact special angles
+        """
+        for name, function in TRIGONOMETRIC_FUNCTIONS.items():
+            table: Dict[float, float] = {}
+            for step in range(360 * resolution):
+                angle = step / resolution
+                try:
+                    table[angle] = function(math.radians(angle))
+                except ZeroDivisionError:
+                    pass
+            for angle, value in SPECIAL_ANGLE_VALUES[name].items():
+                table[float(angle)] = math.nan if value is None else value
+            TRIGONOMETRIC_TABLES[name].clear()
+            TRIGONOMETRIC_TABLES[name].update(table)
 
     @staticmethod
     def perform_logarithm(number: float, base: float) -> float:
@@ -136,6 +277,9 @@ class Operator:
                 raise CalculatorError("Logarithm requires positive number")
             if base <= 0 or base == 1:
                 raise CalculatorError("Logarithm base must be positive and not equal to 1")
+            function = FIXED_BASE_LOGARITHMS.get(base)
+            if function is not None:
+                return function(number)
             return math.log(number, base)
         except (ValueError, ZeroDivisionError) as e:
             raise CalculatorError(f"Logarithm calculation error: {str(e)}")
@@ -156,9 +300,40 @@ class Operator:
             CalculatorError: If calculation error occurs
         """
         try:
-            return base ** exponent
+            result = base ** exponent
         except (ValueError, OverflowError) as e:
             raise CalculatorError(f"Power calculation error: {str(e)}")
+        try:
+            if result < EXACT_POWER_LIMIT or type(result) is not float:
+                return result
+        except TypeError:
+            # Complex results (negative base, fractional exponent) are not ordered
+            return result
+        value = POWER_MEMO.get((base, exponent))
+        return value if value is not None else _exact_power(base, exponent, result)
+
+    @staticmethod
+    def perform_real_power(base: float, exponent: float) -> float:
+        """
+        Calculate base raised to exponent, rejecting complex results.
+
+        Raises:
+            CalculatorError: If calculation error occurs or the result is complex
+                             (negative base, fractional exponent)
+        """
+        return Operator.require_real(Operator.perform_power(base, exponent))
+
+    @staticmethod
+    def require_real(value: Any) -> Any:
+        """
+        Return an operation result unchanged if it is a real number.
+
+        Raises:
+            CalculatorError: If the result is complex
+        """
+        if isinstance(value, complex):
+            raise CalculatorError("Result is not a real number")
+        return value
 
     @staticmethod
     def perform_modulo(num1: float, num2: float) -> float:
@@ -187,4 +362,7 @@ class Operator:
         Returns:
             Value of Pi
         """
-        return math.pi
\ No newline at end of file
+        return math.pi
+
+
+Operator.configure_trig_table()
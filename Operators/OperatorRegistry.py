@@ -0,0 +1,215 @@
+"""
+Operator Registry Module
+Module-level table mapping operation names to handlers, parameters and descriptions.
+Built-in operations are registered at import time; plugins can register more at runtime.
+"""
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from Operators.Calculation import CalculationResult
+from Operators.Operator import Operator, CalculatorError
+
+
+def _build_extractor(params: Tuple[Tuple[str, Any], ...]) -> Callable[[Mapping[str, Any]], Tuple]:
+    """
+    Build a function converting a request payload into the handler's positional arguments.
+    Common arities get unrolled closures so the hot path avoids per-call loops.
+    """
+    if any(default is None for _, default in params):
+        def extract(data):
+            args = []
+            for name, default in params:
+                value = data.get(name, default)
+                if default is None and (value is None or value == ''):
+                    args.append(None)
+                else:
+                    args.append(float(value))
+            return tuple(args)
+        return extract
+
+    if not params:
+        return lambda data: ()
+
+    if len(params) == 2:
+        (name1, default1), (name2, default2) = params
+        return lambda data: (float(data.get(name1, default1)), float(data.get(name2, default2)))
+
+    return lambda data: tuple([float(data.get(name, default)) for name, default in params])
+
+
+class OperationSpec:
+    """
+    Description of a single calculator operation.
+
+    Attributes:
+        name: Operation name used in requests (e.g. '+', 'sin', 'log')
+        handler: Callable taking the parsed parameters positionally and returning the result
+        params: Tuple of (parameter name, default) pairs; a default of None marks the
+                parameter as optional, passing None to the handler when it is omitted
+        describe: Callable building the 'operation' description from the parsed parameters
+        validator: Optional callable run on the parsed parameters before the handler,
+                   raising CalculatorError to reject them
+    """
+
+    def __init__(self, name: str, handler: Callable[..., float],
+                 params: Tuple[Tuple[str, Any], ...],
+                 describe: Callable[..., str],
+                 validator: Optional[Callable[..., None]] = None):
+        self.name = name
+        self.handler = handler
+        self.params = params
+        self.param_names = tuple(param for param, _ in params)
+        self.arity = len(params)
+        self.describe = describe
+        self.validator = validator
+        self._extract = _build_extractor(params)
+
+    def parse(self, data: Mapping[str, Any]) -> Tuple:
+        """
+        Extract and convert the operation parameters from a request payload.
+
+        Args:
+            data: Request payload
+
+        Returns:
+            Tuple of parameters in handler order
+
+        Raises:
+            ValueError, TypeError: If a parameter cannot be converted to float
+            CalculatorError: If the validator rejects the parameters
+        """
+        args = self._extract(data)
+        if self.validator is not None:
+            self.validator(*args)
+        return args
+
+    def execute(self, data: Mapping[str, Any]) -> CalculationResult:
+        """
+        Parse parameters and run the handler.
+
+        Args:
+            data: Request payload
+
+        Returns:
+            Result mapping with success flag, result and operation description
+        """
+        return self.run(self.parse(data))
+
+    def run(self, args: Tuple) -> CalculationResult:
+        """
+        Run the handler on already parsed parameters.
+
+        Args:
+            args: Parameters as returned by parse
+
+        Returns:
+            Result mapping with success flag, result and operation description; the
+            description is only formatted when it is read
+        """
+        return CalculationResult(self.handler(*args), self, args)
+
+
+OPERATIONS: Dict[str, OperationSpec] = {}
+
+
+def register_operation(name: str, handler: Callable[..., float],
+                       params: Tuple[Tuple[str, Any], ...],
+                       describe: Callable[..., str],
+                       validator: Optional[Callable[..., None]] = None,
+                       replace: bool = False) -> OperationSpec:
+    """
+    Register an operation so the service can dispatch to it.
+
+    Args:
+        name: Operation name used in requests
+        handler: Callable computing the result
+        params: Tuple of (parameter name, default) pairs
+        describe: Callable building the operation description
+        validator: Optional callable validating the parsed parameters
+        replace: Allow replacing an existing registration
+
+    Returns:
+        The registered OperationSpec
+
+    Raises:
+        ValueError: If the name is already registered and replace is False
+    """
+    if name in OPERATIONS and not replace:
+        raise ValueError(f"Operation already registered: {name}")
+
+    spec = OperationSpec(name, handler, params, describe, validator)
+    OPERATIONS[name] = spec
+    return spec
+
+
+def unregister_operation(name: str) -> None:
+    """Remove a registered operation if present."""
+    OPERATIONS.pop(name, None)
+
+
+def get_operation(name: str) -> OperationSpec:
+    """
+    Look up a registered operation.
+
+    Args:
+        name: Operation name
+
+    Returns:
+        The OperationSpec for the name
+
+    Raises:
+        CalculatorError: If no operation is registered under the name
+    """
+    spec = OPERATIONS.get(name) if isinstance(name, str) else None
+    if spec is None:
+        raise CalculatorError(f"Unknown operation: {name}")
+    return spec
+
+
+def _register_builtins() -> None:
+    """Register the built-in calculator operations."""
+    basic = Operator.perform_basic_operation
+    for symbol in ("+", "-", "*", "/"):
+        register_operation(
+            symbol,
+            lambda num1, num2, op=symbol: basic(op, num1, num2),
+            (("num1", 0), ("num2", 0)),
+            lambda num1, num2, op=symbol: f"{num1} {op} {num2}"
+        )
+
+    trig_operation = Operator.perform_trigonometric_operation
+    trig_function = Operator.perform_trigonometric_function
+    for name in ("sin", "cos", "tan", "cot"):
+        register_operation(
+            name,
+            lambda num1, angle, op=name: (
+                trig_function(op, angle) if num1 is None else trig_operation(op, num1, angle)
+            ),
+            (("num1", None), ("angle", 0)),
+            lambda num1, angle, op=name: (
+                f"{op}({angle}°)" if num1 is None else f"{num1} × {op}({angle}°)"
+            )
+        )
+
+    register_operation(
+        "log", Operator.perform_logarithm,
+        (("number", 1), ("base", 10)),
+        lambda number, base: f"log_{base}({number})"
+    )
+    register_operation(
+        "power", Operator.perform_real_power,
+        (("base", 0), ("exponent", 0)),
+        lambda base, exponent: f"{base}^{exponent}"
+    )
+    register_operation(
+        "mod", Operator.perform_modulo,
+        (("num1", 0), ("num2", 1)),
+        lambda num1, num2: f"{num1} mod {num2}"
+    )
+    register_operation(
+        "pi", Operator.get_pi,
+        (),
+        lambda: "π"
+    )
+
+
+_register_builtins()
@@ -0,0 +1,227 @@
+"""
+Vectorized Calculator Operations Module
+Evaluates columns of operands with NumPy ufuncs, falling back to the scalar Operator path.
+"""
+import math
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from Operators.Operator import CalculatorError, FIXED_BASE_LOGARITHMS, SPECIAL_ANGLE_VALUES, Operator
+from Operators.OperatorRegistry import OPERATIONS
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is not installed
+    np = None
+
+
+HAS_NUMPY = np is not None
+
+# Column operations take two operands (a, b), matching the registered parameter order:
+#   basic ops: a <op> b, trig: a * f(b degrees), log: log_b(a), power: a ** b, mod: a % b
+# Operations without a NumPy kernel (including registered plugins) use the scalar path.
+
+
+def _vector_operations() -> Dict[str, Callable[[Any, Any], Any]]:
+    """
+    Build NumPy kernels for each operation.
+
+    Each kernel returns (result, irregular) where irregular marks elements that must be
+    recomputed through the scalar path so error semantics match CalculatorError exactly.
+    """
+    def trig(name, func):
+        # Exact values at multiples of 15°, NaN where undefined so the scalar path raises
+        special = np.array([np.nan if value is None else value
+                            for _, value in sorted(SPECIAL_ANGLE_VALUES[name].items())])
+
+        def kernel(a, b):
+            result = a * func(np.radians(b))
+            on_grid = np.remainder(b, 15) == 0
+            if on_grid.any():
+                index = (np.remainder(b[on_grid], 360) // 15).astype(np.intp)
+                result[on_grid] = a[on_grid] * special[index]
+            return result, None
+        return kernel
+
+    # Same bases as the scalar Operator.perform_logarithm, so both paths round alike
+    fixed_base_logarithms = {base: getattr(np, function.__name__)
+                             for base, function in FIXED_BASE_LOGARITHMS.items()}
+
+    def log(a, b):
+        result = np.log(a) / np.log(b)
+        for base, function in fixed_base_logarithms.items():
+            fixed = b == base
+            if fixed.any():
+                result[fixed] = function(a[fixed])
+        return result, (a <= 0) | (b <= 0) | (b == 1)
+
+    return {
+        "+": lambda a, b: (np.add(a, b), None),
+        "-": lambda a, b: (np.subtract(a, b), None),
+        "*": lambda a, b: (np.multiply(a, b), None),
+        "/": lambda a, b: (np.divide(a, b), b == 0),
+        "sin": trig("sin", np.sin),
+        "cos": trig("cos", np.cos),
+        "tan": trig("tan", np.tan),
+        "cot": trig("cot", lambda radians: 1 / np.tan(radians)),
+        "log": log,
+        "power": lambda a, b: (np.power(a, b), None),
+        "mod": lambda a, b: (np.remainder(a, b), b == 0),
+    }
+
+
+VECTOR_OPERATIONS = _vector_operations() if HAS_NUMPY else {}
+
+
+class VectorResult:
+    """
+    Result of a vectorized evaluation.
+
+    Attributes:
+        values: Result per element (NaN where the element failed)
+        errors: Error message per element, or None where the element succeeded
+    """
+
+    def __init__(self, values: Any, errors: List[Optional[str]]):
+        self.values = values
+        self.errors = errors
+
+    @property
+    def mask(self) -> Any:
+        """Boolean error mask, True where the element failed."""
+        flags = [error is not None for error in self.errors]
+        return np.array(flags, dtype=bool) if HAS_NUMPY else flags
+
+    @property
+    def error_count(self) -> int:
+        """Number of failed elements."""
+        return sum(error is not None for error in self.errors)
+
+    def __len__(self) -> int:
+        return len(self.errors)
+
+
+class VectorizedOperator:
+    """
+    Columnar execution engine for calculator operations.
+    Mirrors the scalar Operator semantics while computing whole columns at once.
+    """
+
+    @staticmethod
+    def evaluate(operators: Union[str, Sequence[str]],
+                 operand1: Sequence[float],
+                 operand2: Sequence[float]) -> VectorResult:
+        """
+        Evaluate a column of operations.
+
+        Args:
+            operators: A single operator for the whole column, or one operator per element
+            operand1: First operand column (number for log, multiplier for trig)
+            operand2: Second operand column (base for log, angle in degrees for trig)
+
+        Returns:
+            VectorResult with per-element values and error messages
+
+        Raises:
+            CalculatorError: If the columns have different lengths
+        """
+        size = len(operand1)
+        if len(operand2) != size:
+            raise CalculatorError("Operand columns must have the same length")
+        if not isinstance(operators, str) and len(operators) != size:
+            raise CalculatorError("Operator column must match operand length")
+
+        if not HAS_NUMPY:
+            return VectorizedOperator.evaluate_scalar(operators, operand1, operand2)
+
+        a = np.asarray(operand1, dtype=float)
+        b = np.asarray(operand2, dtype=float)
+        values = np.empty(size, dtype=float)
+        errors: List[Optional[str]] = [None] * size
+
+        if isinstance(operators, str):
+            VectorizedOperator._evaluate_group(operators, a, b, None, values, errors)
+            return VectorResult(values, errors)
+
+        operator_column = np.asarray(operators, dtype=object)
+        for operator in set(operators):
+            indices = np.flatnonzero(operator_column == operator)
+            VectorizedOperator._evaluate_group(
+                operator, a[indices], b[indices], indices, values, errors
+            )
+
+        return VectorResult(values, errors)
+
+    @staticmethod
+    def evaluate_scalar(operators: Union[str, Sequence[str]],
+                        operand1: Sequence[float],
+                        operand2: Sequence[float]) -> VectorResult:
+        """
+        Evaluate a column of operations one element at a time through Operator.
+
+        Args:
+            operators: A single operator for the whole column, or one operator per element
+            operand1: First operand column
+            operand2: Second operand column
+
+        Returns:
+            VectorResult with values as a list
+        """
+        values: List[float] = []
+        errors: List[Optional[str]] = []
+
+        for index in range(len(operand1)):
+            operator = operators if isinstance(operators, str) else operators[index]
+            value, error = VectorizedOperator._evaluate_one(
+                operator, float(operand1[index]), float(operand2[index])
+            )
+            values.append(value)
+            errors.append(error)
+
+        return VectorResult(values, errors)
+
+    @staticmethod
+    def _evaluate_group(operator: str, a: Any, b: Any, indices: Any,
+                        values: Any, errors: List[Optional[str]]) -> None:
+        """Evaluate one homogeneous operator group and scatter results into the output."""
+        kernel = VECTOR_OPERATIONS.get(operator)
+
+        if kernel is None:
+            for local in range(len(a)):
+                position = local if indices is None else indices[local]
+                values[position], errors[position] = VectorizedOperator._evaluate_one(
+                    operator, float(a[local]), float(b[local])
+                )
+            return
+
+        with np.errstate(all="ignore"):
+            result, irregular = kernel(a, b)
+            result = np.broadcast_to(result, a.shape)
+            invalid = ~np.isfinite(result)
+            irregular = invalid if irregular is None else (irregular | invalid)
+
+        if indices is None:
+            values[:] = result
+        else:
+            values[indices] = result
+
+        # Irregular elements are recomputed through the scalar path for exact error semantics
+        for local in np.flatnonzero(irregular):
+            position = local if indices is None else indices[local]
+            values[position], errors[position] = VectorizedOperator._evaluate_one(
+                operator, float(a[local]), float(b[local])
+            )
+
+    @staticmethod
+    def _evaluate_one(operator: str, a: float, b: float):
+        """Evaluate a single element, returning (value, error message)."""
+        spec = OPERATIONS.get(operator)
+        if spec is None or spec.arity != 2:
+            return math.nan, f"Unknown operation: {operator}"
+
+        try:
+            value = Operator.require_real(spec.handler(a, b))
+        except CalculatorError as e:
+            return math.nan, str(e)
+        except Exception as e:
+            return math.nan, f"Unexpected error: {str(e)}"
+        return value, None
@@ -1,9 +1,12 @@
 """
 Flask Application Factory
 Initializes and configures the Flask application following best practices.
+
+Flask and every optional subsystem are imported inside create_app, so modules such
+as app.calculator_service can be used (by the CLI and process-pool workers) without
+loading the web stack.
 """
-from flask import Flask
-from flask_cors import CORS
+import os
 
 
 def create_app():
@@ -13,15 +16,153 @@ def create_app():
     Returns:
         Flask: Configured Flask application
     """
+    from flask import Flask
+    from flask_cors import CORS
+
     app = Flask(__name__)
 
     # Configuration
     app.config['SECRET_KEY'] = 'your-secret-key-change-in-production'
     app.config['JSON_SORT_KEYS'] = False
+    app.config['MAX_BATCH_SIZE'] = int(os.environ.get('MAX_BATCH_SIZE', 1000))
+    app.config['MAX_EXPRESSION_LENGTH'] = 1000
+    app.config['MAX_STREAM_LINE_LENGTH'] = 4096
+
+    # Cache-Control max-age in seconds of GET /api/calculate results and fingerprinted
+    # static files (0 makes clients revalidate every time); STATIC_FINGERPRINT=0 serves
+    # static files under their plain names only
+    app.config['HTTP_CACHE_MAX_AGE'] = int(os.environ.get('HTTP_CACHE_MAX_AGE', 31536000))
+    app.config['STATIC_FINGERPRINT'] = os.environ.get('STATIC_FINGERPRINT', '1') != '0'
+
+    # Precomputed trig table entries per degree (0 keeps only exact multiples of 15°)
+    app.config['TRIG_TABLE_RESOLUTION'] = int(os.environ.get('TRIG_TABLE_RESOLUTION', 1))
+
+    # Default significant digits for requests using the decimal numeric backend
+    app.config['DECIMAL_PRECISION'] = int(os.environ.get('DECIMAL_PRECISION', 28))
+
+    # JSON backend: 'auto' picks orjson or msgspec when installed, else the stdlib
+    app.config['JSON_CODEC'] = os.environ.get('JSON_CODEC', 'auto')
+
+    # Process pool for large batches (0 workers disables it)
+    app.config['PROCESS_POOL_WORKERS'] = int(os.environ.get('PROCESS_POOL_WORKERS', 0))
+    app.config['PROCESS_POOL_MIN_BATCH'] = int(os.environ.get('PROCESS_POOL_MIN_BATCH', 1000))
+
+    # ASGI mode: thread pool for calculations and bridged Flask routes
+    app.config['ASGI_EXECUTOR_WORKERS'] = int(os.environ.get('ASGI_EXECUTOR_WORKERS', 8))
+
+    # Opt-in result cache (0 disables), TTL in seconds (unset means no expiry)
+    app.config['RESULT_CACHE_SIZE'] = int(os.environ.get('RESULT_CACHE_SIZE', 0))
+    ttl = os.environ.get('RESULT_CACHE_TTL')
+    app.config['RESULT_CACHE_TTL'] = float(ttl) if ttl else None
+    # Share the cache across workers in a memory-mapped file: '1' for the default
+    # /dev/shm file, or a path (unset or '0' keeps one cache per process)
+    shared = os.environ.get('RESULT_CACHE_SHARED', '0')
+    app.config['RESULT_CACHE_SHARED'] = None if shared in ('', '0') else shared
+
+    # Calculation sessions with a server-side accumulator (0 disables), idle timeout in
+    # seconds (0 means never), steps kept per session, and RESULT_CACHE_SHARED-style sharing
+    app.config['SESSION_MAX'] = int(os.environ.get('SESSION_MAX', 10000))
+    app.config['SESSION_IDLE_TIMEOUT'] = float(os.environ.get('SESSION_IDLE_TIMEOUT', 900)) or None
+    app.config['SESSION_MAX_LOG'] = int(os.environ.get('SESSION_MAX_LOG', 10))
+    shared = os.environ.get('SESSION_SHARED', '0')
+    app.config['SESSION_SHARED'] = None if shared in ('', '0') else shared
+
+    # Single-flight coalescing of identical concurrent calculations, expressions and batches
+    app.config['COALESCE_REQUESTS'] = os.environ.get('COALESCE_REQUESTS', '1') != '0'
+
+    # Server-side calculation history in SQLite (unset HISTORY_DB disables it)
+    app.config['HISTORY_DB'] = os.environ.get('HISTORY_DB') or None
+    app.config['HISTORY_MAX_ENTRIES'] = int(os.environ.get('HISTORY_MAX_ENTRIES', 1000))
+    max_age = os.environ.get('HISTORY_MAX_AGE_DAYS')
+    app.config['HISTORY_MAX_AGE'] = float(max_age) * 86400 if max_age else None
+    app.config['HISTORY_FLUSH_INTERVAL'] = 0.5
+
+    # Admission control: token buckets in requests/sec (0 disables), burst defaults to the rate
+    app.config['RATE_LIMIT_PER_CLIENT'] = float(os.environ.get('RATE_LIMIT_PER_CLIENT', 0))
+    app.config['RATE_LIMIT_CLIENT_BURST'] = float(os.environ.get('RATE_LIMIT_CLIENT_BURST', 0))
+    app.config['RATE_LIMIT_GLOBAL'] = float(os.environ.get('RATE_LIMIT_GLOBAL', 0))
+    app.config['RATE_LIMIT_GLOBAL_BURST'] = float(os.environ.get('RATE_LIMIT_GLOBAL_BURST', 0))
+    # Per-client buckets key on the remote address, or the X-Client-ID header with 'client-id'
+    app.config['RATE_LIMIT_KEY'] = os.environ.get('RATE_LIMIT_KEY', 'ip')
+    # Shared bucket store for limits across workers and hosts (unset keeps them per process)
+    app.config['RATE_LIMIT_REDIS_URL'] = os.environ.get('RATE_LIMIT_REDIS_URL') or None
+    # Concurrency limit per process (0 disables) and the queue wait after which requests are shed
+    app.config['MAX_CONCURRENT_REQUESTS'] = int(os.environ.get('MAX_CONCURRENT_REQUESTS', 0))
+    app.config['MAX_QUEUE_WAIT'] = float(os.environ.get('MAX_QUEUE_WAIT_MS', 100)) / 1000
+
+    # Per-request profiles for flame graphs: requests whose X-Profile header equals
+    # PROFILE_TOKEN, and a random PROFILE_SAMPLE_RATE fraction (both unset: no hooks at all)
+    app.config['PROFILE_TOKEN'] = os.environ.get('PROFILE_TOKEN') or None
+    app.config['PROFILE_SAMPLE_RATE'] = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+    app.config['PROFILE_DIR'] = os.environ.get('PROFILE_DIR') or None
+    app.config['PROFILE_MAX_FILES'] = int(os.environ.get('PROFILE_MAX_FILES', 1000))
+
+    # Metrics shared across gunicorn workers through METRICS_DIR (unset means per-process)
+    app.config['METRICS_DIR'] = os.environ.get('METRICS_DIR') or None
+    app.config['METRICS_FLUSH_INTERVAL'] = 1.0
 
     # Enable CORS for all routes
     CORS(app)
 
+    # JSON request/response codec
+    from app import json_codec
+    json_codec.init_app(app)
+
+    # Trigonometric lookup table
+    from Operators.Operator import Operator
+    Operator.configure_trig_table(app.config['TRIG_TABLE_RESOLUTION'])
+
+    # Result cache
+    from app.calculator_service import CalculatorService
+    shared_path = app.config['RESULT_CACHE_SHARED']
+    if shared_path == '1':
+        from app.shared_cache import default_path
+        shared_path = default_path()
+    CalculatorService.configure_cache(app.config['RESULT_CACHE_SIZE'],
+                                      app.config['RESULT_CACHE_TTL'], shared_path)
+    CalculatorService.configure_numeric(app.config['DECIMAL_PRECISION'])
+
+    # Calculation sessions
+    from app.sessions import SESSIONS
+    shared_path = app.config['SESSION_SHARED']
+    if shared_path == '1':
+        from app.shared_cache import default_path
+        shared_path = default_path('sessions')
+    SESSIONS.configure(app.config['SESSION_MAX'], app.config['SESSION_IDLE_TIMEOUT'],
+                       app.config['SESSION_MAX_LOG'], shared_path)
+
+    # Request coalescing
+    from app.single_flight import SINGLE_FLIGHT
+    SINGLE_FLIGHT.configure(app.config['COALESCE_REQUESTS'])
+
+    # Batch process pool, warmed at startup
+    from app.process_pool import BATCH_POOL
+    BATCH_POOL.configure(app.config['PROCESS_POOL_WORKERS'], app.config['PROCESS_POOL_MIN_BATCH'],
+                         settings={'trig_table_resolution': app.config['TRIG_TABLE_RESOLUTION'],
+                                   'decimal_precision': app.config['DECIMAL_PRECISION']})
+    BATCH_POOL.start()
+
+    # Calculation history, written in batches by a background thread
+    from app.history import HISTORY
+    HISTORY.configure(app.config['HISTORY_DB'], app.config['HISTORY_MAX_ENTRIES'],
+                      app.config['HISTORY_MAX_AGE'], app.config['HISTORY_FLUSH_INTERVAL'])
+
+    # Request metrics
+    from app import metrics
+    metrics.init_app(app)
+
+    # Admission control, registered after metrics so rejections are counted as requests
+    from app import admission
+    admission.init_app(app)
+
+    # Request profiling, registered last so it traces only the view and its response
+    from app import profiler
+    profiler.init_app(app)
+
+    # Content-hashed static file names
+    from app import static_assets
+    static_assets.init_app(app)
+
     # Register blueprints
     from app.routes import calculator_bp
     app.register_blueprint(calculator_bp)
@@ -0,0 +1,333 @@
+"""
+Admission Control
+Rejects excess load early instead of letting every client's latency grow.
+
+Three checks run before a request body is read or parsed:
+    queue wait    A front proxy's X-Request-Start header older than max_queue_wait
+                  means the request already waited too long in the listen backlog
+    rate limits   Per-client and global token buckets; an empty bucket is a 429
+    concurrency   At most max_concurrent requests run at once per worker; a request
+                  that cannot get a slot within max_queue_wait is shed with a 503
+
+Bucket state lives in this process by default. A shared backend (any client with
+the Redis eval API) makes the limits hold across workers and hosts; if it fails,
+decisions fall back to the in-process buckets rather than failing requests.
+"""
+import math
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from app.metrics import METRICS
+
+
+# Paths never subject to admission control (health checks must keep answering)
+EXEMPT_PATHS = frozenset({'/api/health', '/metrics'})
+
+# (payload, HTTP status, Retry-After seconds)
+Rejection = Tuple[Dict[str, Any], int, int]
+
+# Atomic token bucket for Redis-compatible backends. Uses the server clock so workers
+# on different hosts agree. KEYS[1] = bucket; ARGV = rate, burst, cost.
+# Returns the seconds to wait as a string: "0" when the tokens were taken.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class MemoryBackend:
+    """In-process token buckets keyed by name."""
+
+    def __init__(self, max_keys: int = 100000):
+        """
+        Args:
+            max_keys: Bucket count above which idle (full) buckets are pruned
+        """
+        self.max_keys = max_keys
+        # key -> [tokens, last update]
+        self._buckets: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        """
+        Take cost tokens from a bucket refilling at rate per second up to burst.
+
+        Returns:
+            0.0 if the tokens were taken, else seconds until enough tokens accumulate
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._prune(now)
+                bucket = self._buckets[key] = [burst, now]
+            tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens >= cost:
+                bucket[0] = tokens - cost
+                return 0.0
+            bucket[0] = tokens
+            return (cost - tokens) / rate
+
+    def _prune(self, now: float) -> None:
+        """Drop buckets idle for a minute; at typical rates they have refilled anyway."""
+        idle = [key for key, (tokens, updated) in self._buckets.items() if now - updated > 60]
+        for key in idle:
+            del self._buckets[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisBackend:
+    """Token buckets in a Redis-compatible store, shared by every worker using it."""
+
+    def __init__(self, client: Any, prefix: str = 'calculator:bucket:'):
+        """
+        Args:
+            client: Object with Redis' eval(script, numkeys, *keys_and_args) method
+            prefix: Key prefix for bucket hashes
+        """
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> 'RedisBackend':
+        """
+        Connect with the optional redis package.
+
+        Raises:
+            ValueError: If the redis package is not installed
+        """
+        try:
+            import redis
+        except ImportError:
+            raise ValueError("RATE_LIMIT_REDIS_URL is set but the redis package is not installed "
+                             "(pip install redis)")
+        return cls(redis.Redis.from_url(url, socket_timeout=0.05, socket_connect_timeout=0.05))
+
+    def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        """Same contract as MemoryBackend.take, evaluated atomically in the store."""
+        wait = self.client.eval(TOKEN_BUCKET_SCRIPT, 1, self.prefix + key, rate, burst, cost)
+        return float(wait.decode() if isinstance(wait, bytes) else wait)
+
+
+class AdmissionController:
+    """
+    Token-bucket rate limits plus a concurrency limiter with bounded queue wait.
+    Every limit is off when its setting is 0.
+    """
+
+    def __init__(self):
+        self.local = MemoryBackend()
+        self.backend: Any = self.local
+        self.backend_errors = 0
+        self.rejected: Dict[str, int] = {}
+        self._slots: Optional[threading.BoundedSemaphore] = None
+        self._waiting = 0
+        self.configure()
+
+    def configure(self, client_rate: float = 0, client_burst: float = 0,
+                  global_rate: float = 0, global_burst: float = 0,
+                  max_concurrent: int = 0, max_queue_wait: float = 0.1,
+                  backend: Any = None) -> None:
+        """
+        Set the limits.
+
+        Args:
+            client_rate: Requests per second per client (0 disables)
+            client_burst: Requests a client may make at once (default: client_rate, at least 1)
+            global_rate: Requests per second across all clients (0 disables)
+            global_burst: Burst for the global bucket (default: global_rate, at least 1)
+            max_concurrent: Requests running at once in this process (0 disables)
+            max_queue_wait: Seconds a request may wait for a slot, or have waited in a
+                            proxy queue per X-Request-Start, before it is shed
+            backend: Shared bucket backend (e.g. RedisBackend); None keeps state in-process
+        """
+        self.client_rate = client_rate
+        self.client_burst = client_burst or max(1.0, client_rate)
+        self.global_rate = global_rate
+        self.global_burst = global_burst or max(1.0, global_rate)
+        self.max_concurrent = max_concurrent
+        self.max_queue_wait = max_queue_wait
+        self.backend = backend if backend is not None else self.local
+        self._slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent > 0 else None
+        self.local.clear()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.client_rate > 0 or self.global_rate > 0 or self.max_concurrent > 0)
+
+    def check(self, path: str, client_key: str, request_start: Optional[str] = None) -> Optional[Rejection]:
+        """
+        Apply the queue-wait and rate-limit checks to a request.
+
+        Args:
+            path: Request path; EXEMPT_PATHS and non-API paths are always admitted
+            client_key: Identity for the per-client bucket (address or client ID)
+            request_start: X-Request-Start header set by a front proxy, if any
+
+        Returns:
+            None to admit, else the rejection to send
+        """
+        if not applies(path):
+            return None
+
+        if request_start and self.max_queue_wait > 0:
+            waited = _queue_wait(request_start)
+            if waited is not None and waited > self.max_queue_wait:
+                return self._reject('queue_wait', 503, 'Server overloaded, retry later', 1.0)
+
+        if self.client_rate > 0:
+            wait = self._take('client:' + client_key, self.client_rate, self.client_burst)
+            if wait:
+                return self._reject('client_rate', 429, 'Rate limit exceeded', wait)
+
+        if self.global_rate > 0:
+            wait = self._take('global', self.global_rate, self.global_burst)
+            if wait:
+                return self._reject('global_rate', 429, 'Server rate limit exceeded', wait)
+        return None
+
+    def acquire(self) -> Optional[Rejection]:
+        """
+        Wait up to max_queue_wait for a concurrency slot.
+
+        Returns:
+            None once a slot is held (release it with release()), else the rejection to send
+        """
+        slots = self._slots
+        if slots is None or slots.acquire(blocking=False):
+            return None
+        self._waiting += 1
+        try:
+            if slots.acquire(timeout=self.max_queue_wait):
+                return None
+        finally:
+            self._waiting -= 1
+        return self._reject('concurrency', 503, 'Server overloaded, retry later', 1.0)
+
+    def release(self) -> None:
+        """Release a slot taken by acquire()."""
+        try:
+            if self._slots is not None:
+                self._slots.release()
+        except ValueError:
+            # The slot was taken before configure() replaced the semaphore
+            pass
+
+    def _take(self, key: str, rate: float, burst: float) -> float:
+        if self.backend is not self.local:
+            try:
+                return self.backend.take(key, rate, burst)
+            except Exception:
+                # A shared store outage must not take the API down with it
+                self.backend_errors += 1
+        return self.local.take(key, rate, burst)
+
+    def _reject(self, reason: str, status: int, message: str, retry_after: float) -> Rejection:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        METRICS.record_rejected(reason)
+        return {'success': False, 'error': message}, status, max(1, math.ceil(retry_after))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the configured limits, current load and rejections by reason."""
+        return {
+            'enabled': self.enabled,
+            'client_rate': self.client_rate,
+            'global_rate': self.global_rate,
+            'max_concurrent': self.max_concurrent,
+            'waiting': self._waiting,
+            'shared_backend': self.backend is not self.local,
+            'backend_errors': self.backend_errors,
+            'rejected': dict(self.rejected)
+        }
+
+
+def applies(path: str) -> bool:
+    """True for API paths subject to admission control."""
+    return path.startswith('/api/') and path not in EXEMPT_PATHS
+
+
+def _queue_wait(header: str) -> Optional[float]:
+    """
+    Seconds since a proxy's X-Request-Start timestamp ('t=<seconds|ms|us>' or a bare number).
+
+    Returns:
+        The wait, or None if the header cannot be parsed
+    """
+    value = header.strip()
+    if value.startswith('t='):
+        value = value[2:]
+    try:
+        stamp = float(value)
+    except ValueError:
+        return None
+    # Proxies send seconds, milliseconds or microseconds since the epoch
+    while stamp > 1e11:
+        stamp /= 1000
+    return time.time() - stamp
+
+
+# Process-wide controller, configured by create_app
+ADMISSION = AdmissionController()
+
+
+def init_app(app) -> None:
+    """
+    Configure ADMISSION from the app config and register the request hooks.
+
+    Args:
+        app: Flask application
+    """
+    from flask import g, jsonify, request
+
+    config = app.config
+    backend = None
+    if config.get('RATE_LIMIT_REDIS_URL'):
+        backend = RedisBackend.from_url(config['RATE_LIMIT_REDIS_URL'])
+    ADMISSION.configure(config['RATE_LIMIT_PER_CLIENT'], config['RATE_LIMIT_CLIENT_BURST'],
+                        config['RATE_LIMIT_GLOBAL'], config['RATE_LIMIT_GLOBAL_BURST'],
+                        config['MAX_CONCURRENT_REQUESTS'], config['MAX_QUEUE_WAIT'], backend)
+    if not ADMISSION.enabled:
+        return
+    by_client_id = config['RATE_LIMIT_KEY'] == 'client-id'
+
+    @app.before_request
+    def admit_request():
+        client_key = (by_client_id and request.headers.get('X-Client-ID')) or request.remote_addr or ''
+        rejection = ADMISSION.check(request.path, client_key, request.headers.get('X-Request-Start'))
+        if rejection is None and applies(request.path):
+            rejection = ADMISSION.acquire()
+            g.admission_slot = rejection is None
+        if rejection is not None:
+            payload, status, retry_after = rejection
+            response = jsonify(payload)
+            response.status_code = status
+            response.headers['Retry-After'] = str(retry_after)
+            return response
+        return None
+
+    @app.teardown_request
+    def release_slot(exception=None):
+        if g.pop('admission_slot', False):
+            ADMISSION.release()
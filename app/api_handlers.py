@@ -0,0 +1,421 @@
+"""
+API Handlers
+Framework-independent request handling shared by the Flask routes and the ASGI app.
+Each handler takes the decoded JSON body and returns a (payload, status code) pair.
+"""
+import re
+from typing import Any, Dict, Mapping, Optional, Tuple
+from urllib.parse import quote, urlencode
+from app.calculator_service import CalculatorService
+from app.history import EXPORT_FORMATS, HISTORY, MAX_PAGE_SIZE, valid_client_id
+from app.process_pool import BATCH_POOL
+from app.sessions import SESSIONS
+from app.single_flight import SINGLE_FLIGHT
+from Operators.Operator import CalculatorError
+from Operators.OperatorRegistry import OPERATIONS
+
+HandlerResult = Tuple[Dict[str, Any], int]
+
+# Session IDs are issued by secrets.token_urlsafe
+SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+HEALTH_PAYLOAD = {
+    'status': 'healthy',
+    'service': 'Calculator API',
+    'version': '1.0.0'
+}
+
+
+def error_payload(message: str) -> Dict[str, Any]:
+    """Build the standard error response body."""
+    return {
+        'success': False,
+        'error': message
+    }
+
+
+def handle_calculate(data: Any, client_id: Optional[str] = None) -> HandlerResult:
+    """
+    Handle a single calculation request.
+
+    Args:
+        data: Decoded JSON body, or None if the body was missing or malformed
+        client_id: X-Client-ID header; successful results are added to its history
+
+    Returns:
+        (response payload, HTTP status code)
+    """
+    try:
+        if not data:
+            return error_payload('No data provided'), 400
+
+        operation = data.get('operation')
+        if not operation:
+            return error_payload('Operation not specified'), 400
+
+        result = CalculatorService.calculate(operation, data, coalesce=True)
+        if client_id is not None and HISTORY.enabled and valid_client_id(client_id):
+            HISTORY.record(client_id, operation, result)
+        return result, 200
+
+    except CalculatorError as e:
+        return error_payload(str(e)), 400
+
+    except ValueError as e:
+        return error_payload(f'Invalid input: {str(e)}'), 400
+
+    except Exception as e:
+        return error_payload(f'Server error: {str(e)}'), 500
+
+
+def validate_calculate_query(args: Mapping[str, Any]) -> Tuple[Any, Optional[HandlerResult]]:
+    """
+    Validate the query parameters of a GET calculation and canonicalize them.
+
+    The canonical query string names the operation, then its parameters in handler
+    order, each written as the repr of its parsed float; omitted optional parameters
+    stay omitted and unknown parameters are dropped. Every spelling of a calculation
+    ('num1=5' or 'num1=5.0', reordered, with extra parameters) has the same canonical URL.
+    GET calculations use float arithmetic, so a numeric backend or precision is rejected
+    rather than redirected to the float result.
+
+    Args:
+        args: Query parameters
+
+    Returns:
+        ((canonical query string, payload for handle_calculate), None) if valid,
+        otherwise (None, error response)
+    """
+    operation = args.get('operation')
+    if not operation:
+        return None, (error_payload('Operation not specified'), 400)
+
+    spec = OPERATIONS.get(operation)
+    if spec is None:
+        return None, (error_payload(f'Unknown operation: {operation}'), 400)
+    if args.get('numeric', 'float') != 'float' or 'precision' in args:
+        return None, (error_payload('Numeric backends and precision are only available '
+                                    'through POST /api/calculate'), 400)
+    try:
+        values = spec.parse(args)
+    except CalculatorError as e:
+        return None, (error_payload(str(e)), 400)
+    except ValueError as e:
+        return None, (error_payload(f'Invalid input: {str(e)}'), 400)
+
+    params = [('operation', operation)]
+    params.extend((name, repr(value)) for name, value in zip(spec.param_names, values)
+                  if value is not None)
+    data = dict(zip(spec.param_names, values), operation=operation)
+    return (urlencode(params, quote_via=quote), data), None
+
+
+def validate_batch(data: Any, max_batch_size: int) -> Tuple[Any, HandlerResult]:
+    """
+    Validate a batch request body.
+
+    Args:
+        data: Decoded JSON body
+        max_batch_size: Maximum number of operations allowed
+
+    Returns:
+        (operations list, None) if valid, otherwise (None, error response)
+    """
+    if not data:
+        return None, (error_payload('No data provided'), 400)
+
+    operations = data.get('operations') if isinstance(data, dict) else None
+    if not isinstance(operations, list):
+        return None, (error_payload('Operations list not specified'), 400)
+
+    if len(operations) > max_batch_size:
+        return None, (error_payload(f'Batch size exceeds limit of {max_batch_size}'), 413)
+
+    return operations, None
+
+
+def handle_batch(data: Any, max_batch_size: int) -> HandlerResult:
+    """
+    Handle a batch calculation request.
+
+    Args:
+        data: Decoded JSON body
+        max_batch_size: Maximum number of operations allowed
+
+    Returns:
+        (response payload, HTTP status code)
+    """
+    try:
+        operations, error = validate_batch(data, max_batch_size)
+        if error is not None:
+            return error
+        return run_batch(operations)
+
+    except Exception as e:
+        return error_payload(f'Server error: {str(e)}'), 500
+
+
+def batch_key(operations: list) -> Optional[tuple]:
+    """
+    Hashable identity of a batch for coalescing, or None if an item is not an object or
+    holds unhashable values (such batches are not coalesced).
+
+    Values are keyed with their type, so 1, 1.0 and True stay distinct, and zero floats
+    by repr, so 0.0 and -0.0 do too.
+    """
+    if not all(type(item) is dict for item in operations):
+        return None
+    key = tuple(
+        tuple((name, type(value), repr(value) if type(value) is float and value == 0.0 else value)
+              for name, value in item.items())
+        for item in operations
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def run_batch(operations: list) -> HandlerResult:
+    """Evaluate a validated batch (coalesced with identical concurrent batches) and build its response."""
+    key = batch_key(operations) if SINGLE_FLIGHT.enabled else None
+    if key is not None:
+        results, _ = SINGLE_FLIGHT.run('batch', key, lambda: BATCH_POOL.calculate_batch(operations))
+    else:
+        results = BATCH_POOL.calculate_batch(operations)
+    return {
+        'success': True,
+        'count': len(results),
+        'results': results
+    }, 200
+
+
+def handle_expression(data: Any, max_length: int, client_id: Optional[str] = None) -> HandlerResult:
+    """
+    Handle an expression evaluation request.
+
+    Args:
+        data: Decoded JSON body
+        max_length: Maximum expression length in characters
+        client_id: X-Client-ID header; successful results are added to its history
+
+    Returns:
+        (response payload, HTTP status code)
+    """
+    try:
+        if not data:
+            return error_payload('No data provided'), 400
+
+        expression = data.get('expression') if isinstance(data, dict) else None
+        if not isinstance(expression, str) or not expression.strip():
+            return error_payload('Expression not specified'), 400
+
+        if len(expression) > max_length:
+            return error_payload(f'Expression exceeds limit of {max_length} characters'), 413
+
+        result = CalculatorService.evaluate_expression(expression, coalesce=True)
+        if client_id is not None and HISTORY.enabled and valid_client_id(client_id):
+            HISTORY.record(client_id, 'expression', result)
+        return result, 200
+
+    except CalculatorError as e:
+        return error_payload(str(e)), 400
+
+    except Exception as e:
+        return error_payload(f'Server error: {str(e)}'), 500
+
+
+def _history_client(client_id: Optional[str]) -> Optional[HandlerResult]:
+    """Return an error response unless history is enabled and the client ID is valid."""
+    if not HISTORY.enabled:
+        return error_payload('History is not enabled'), 404
+    if client_id is None:
+        return error_payload('Client ID not specified (X-Client-ID header)'), 400
+    if not valid_client_id(client_id):
+        return error_payload('Invalid client ID'), 400
+    return None
+
+
+def _optional_float(args: Dict[str, Any], name: str) -> Optional[float]:
+    value = args.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise CalculatorError(f"Invalid {name}: {value}")
+
+
+def handle_history(client_id: Optional[str], args: Dict[str, Any]) -> HandlerResult:
+    """
+    Handle a history page request.
+
+    Args:
+        client_id: X-Client-ID header
+        args: Query parameters: limit, operation, since, until, cursor
+
+    Returns:
+        (response payload, HTTP status code)
+    """
+    error = _history_client(client_id)
+    if error is not None:
+        return error
+    try:
+        limit = args.get('limit', '50')
+        if not str(limit).isdigit():
+            raise CalculatorError(f"Limit must be an integer between 1 and {MAX_PAGE_SIZE}")
+        page = HISTORY.query(
+            client_id, int(limit), args.get('operation') or None,
+            _optional_float(args, 'since'), _optional_float(args, 'until'),
+            args.get('cursor') or None
+        )
+        return {'success': True, **page}, 200
+
+    except CalculatorError as e:
+        return error_payload(str(e)), 400
+
+    except Exception as e:
+        return error_payload(f'Server error: {str(e)}'), 500
+
+
+def handle_history_clear(client_id: Optional[str]) -> HandlerResult:
+    """
+    Handle a request deleting a client's history.
+
+    Returns:
+        (response payload, HTTP status code)
+    """
+    error = _history_client(client_id)
+    if error is not None:
+        return error
+    try:
+        return {'success': True, 'deleted': HISTORY.clear(client_id)}, 200
+
+    except Exception as e:
+        return error_payload(f'Server error: {str(e)}'), 500
+
+
+def validate_history_export(client_id: Optional[str], export_format: str) -> Optional[HandlerResult]:
+    """
+    Validate a history export request before the response starts streaming.
+
+    Returns:
+        None if valid, otherwise an error response
+    """
+    error = _history_client(client_id)
+    if error is not None:
+        return error
+    if export_format not in EXPORT_FORMATS:
+        return error_payload(f"Export format must be one of: {', '.join(EXPORT_FORMATS)}"), 400
+    return None
+
+
+def _session_payload(session_id: str, state: Any, include_log: bool = False) -> Dict[str, Any]:
+    value, steps, created, log = state
+    payload = {'success': True, 'session': session_id, 'value': value, 'steps': steps}
+    if include_log:
+        payload['created'] = created
+        payload['log'] = [{'operation': operation, 'operand': operand, 'result': result}
+                          for operation, operand, result in log]
+    return payload
+
+
+def _session_error(session_id: Any) -> Optional[HandlerResult]:
+    """Return an error response unless sessions are enabled and the session ID is well formed."""
+    if not SESSIONS.enabled:
+        return error_payload('Sessions are not enabled'), 404
+    if not isinstance(session_id, str) or not SESSION_ID_PATTERN.match(session_id):
+        return error_payload('Session not found or expired'), 404
+    return None
+
+
+def handle_session_create(data: Any) -> HandlerResult:
+    """
+    Handle a request starting a calculation session.
+
+    Args:
+        data: Decoded JSON body, optionally {"value": initial accumulator}
+
+    Returns:
+        (response payload, HTTP status code)
+    """
+    if not SESSIONS.enabled:
+        return error_payload('Sessions are not enabled'), 404
+    try:
+        value = data.get('value', 0) if isinstance(data, dict) else 0
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return error_payload('Value must be a number'), 400
+        session_id, state = SESSIONS.create(value)
+        return _session_payload(session_id, state), 201
+
+    except Exception as e:
+        return error_payload(f'Server error: {str(e)}'), 500
+
+
+def handle_session_apply(session_id: str, data: Any, max_steps: int) -> HandlerResult:
+    """
+    Handle a request applying one step, or a list of steps, to a session.
+
+    Args:
+        session_id: Session ID from the URL
+        data: {"operation": str, "operand": number} or {"steps": [such objects]}
+        max_steps: Maximum number of steps in one request
+
+    Returns:
+        (response payload with the new value, HTTP status code)
+    """
+    error = _session_error(session_id)
+    if error is not None:
+        return error
+    try:
+        if not data or not isinstance(data, dict):
+            return error_payload('No data provided'), 400
+
+        steps = data.get('steps', [data] if 'operation' in data else None)
+        if not isinstance(steps, list) or not steps:
+            return error_payload('Operation or steps not specified'), 400
+        if len(steps) > max_steps:
+            return error_payload(f'Steps exceed limit of {max_steps}'), 413
+
+        state = SESSIONS.apply(session_id, steps)
+        if state is None:
+            return error_payload('Session not found or expired'), 404
+        return _session_payload(session_id, state), 200
+
+    except CalculatorError as e:
+        return error_payload(str(e)), 400
+
+    except Exception as e:
+        return error_payload(f'Server error: {str(e)}'), 500
+
+
+def handle_session_get(session_id: str) -> HandlerResult:
+    """
+    Handle a request for a session's value and recent steps.
+
+    Returns:
+        (response payload, HTTP status code)
+    """
+    error = _session_error(session_id)
+    if error is not None:
+        return error
+    state = SESSIONS.get(session_id)
+    if state is None:
+        return error_payload('Session not found or expired'), 404
+    return _session_payload(session_id, state, include_log=True), 200
+
+
+def handle_session_delete(session_id: str) -> HandlerResult:
+    """
+    Handle a request ending a session.
+
+    Returns:
+        (response payload, HTTP status code)
+    """
+    error = _session_error(session_id)
+    if error is not None:
+        return error
+    if not SESSIONS.delete(session_id):
+        return error_payload('Session not found or expired'), 404
+    return {'success': True, 'session': session_id}, 200
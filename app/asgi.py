@@ -0,0 +1,419 @@
+"""
+ASGI Application
+Asyncio serving mode for the calculator API.
+
+The hot JSON endpoints (/api/calculate, /api/calculate/batch, /api/expression,
+/api/health) are served natively, without the Flask request machinery, using the
+same handlers as the Flask routes, so thousands of keep-alive clients can be
+multiplexed by one process. The event loop only reads requests and writes
+responses: calculations run in a thread pool, because a decimal calculation at
+high precision, a long expression or a wait on a coalesced computation would
+otherwise stall every connection. Every other route (web UI, static files,
+streaming, history, metrics, cache stats) is delegated to the Flask app through a
+WSGI bridge running in the same pool.
+"""
+import asyncio
+import queue
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app import create_app
+from app.admission import ADMISSION
+from app.api_handlers import (
+    HEALTH_PAYLOAD, error_payload, handle_calculate, handle_batch, handle_expression
+)
+from app.json_codec import JSON_CODEC
+from app.metrics import METRICS
+from app.profiler import PROFILE_HEADER, PROFILER, RequestProfile
+
+
+class _BodyStream:
+    """
+    Blocking, file-like request body for the WSGI bridge.
+    The event loop feeds chunks into a bounded queue that the WSGI thread reads from,
+    so a slow WSGI consumer applies backpressure to the client upload.
+    """
+
+    def __init__(self, max_chunks: int = 16):
+        self._chunks: "queue.Queue[Optional[bytes]]" = queue.Queue(max_chunks)
+        self._buffer = bytearray()
+        self._finished = False
+        self._closed = False
+
+    def feed(self, chunk: Optional[bytes], block: bool = False) -> None:
+        """
+        Queue a body chunk, or None for end of body.
+
+        Raises:
+            queue.Full: If block is False and the queue is full
+        """
+        while not self._closed:
+            try:
+                self._chunks.put(chunk, block=block, timeout=0.1 if block else None)
+                return
+            except queue.Full:
+                if not block:
+                    raise
+
+    def close(self) -> None:
+        """Discard unread chunks and unblock the feeder once the response is complete."""
+        self._closed = True
+        while True:
+            try:
+                self._chunks.get_nowait()
+            except queue.Empty:
+                return
+
+    def _fill(self) -> bool:
+        """Move one chunk into the buffer; returns False at end of body."""
+        if self._finished:
+            return False
+        chunk = self._chunks.get()
+        if chunk is None:
+            self._finished = True
+            return False
+        self._buffer.extend(chunk)
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            if not self._fill():
+                break
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def readline(self, size: int = -1) -> bytes:
+        while True:
+            newline = self._buffer.find(b'\n')
+            if newline >= 0:
+                end = newline + 1
+                break
+            if 0 <= size <= len(self._buffer) or not self._fill():
+                end = len(self._buffer)
+                break
+        if 0 <= size < end:
+            end = size
+        data = bytes(self._buffer[:end])
+        del self._buffer[:end]
+        return data
+
+    def __iter__(self):
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            yield line
+
+
+class CalculatorASGI:
+    """
+    ASGI application serving the calculator API on an asyncio event loop.
+    """
+
+    def __init__(self, flask_app=None):
+        """
+        Args:
+            flask_app: Flask application providing configuration and fallback routes;
+                       created with create_app() when omitted
+        """
+        self.flask_app = flask_app if flask_app is not None else create_app()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._routes: Dict[Tuple[str, str], Callable] = {
+            ('POST', '/api/calculate'): self._calculate,
+            ('POST', '/api/calculate/batch'): self._batch,
+            ('POST', '/api/expression'): self._expression,
+            ('GET', '/api/health'): self._health,
+        }
+
+    @property
+    def config(self):
+        return self.flask_app.config
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool used for heavy work and the WSGI bridge, created on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.config['ASGI_EXECUTOR_WORKERS'],
+                thread_name_prefix='calculator-asgi'
+            )
+        return self._executor
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        handler = self._routes.get((scope['method'], scope['path']))
+        if handler is None:
+            await self._call_wsgi(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        if ADMISSION.enabled:
+            # Rejected before the body is read; the native handlers share the bounded
+            # thread pool, so only the rate and queue-wait checks apply to them
+            rejection = ADMISSION.check(scope['path'], self._client_key(scope),
+                                        _header(scope, b'x-request-start') or None)
+            if rejection is not None:
+                payload, status, retry_after = rejection
+                await self._send_json(scope, send, payload, status,
+                                      [(b'retry-after', str(retry_after).encode())])
+                METRICS.record_request(scope['path'], status, time.perf_counter() - start)
+                return
+
+        body = await self._read_body(receive)
+        if handler == self._health:
+            encoded, status, profile = self._respond(handler, body, scope)
+        else:
+            loop = asyncio.get_running_loop()
+            encoded, status, profile = await loop.run_in_executor(
+                self.executor, self._respond, handler, body, scope)
+        extra_headers = None
+        if profile is not None:
+            profile_headers = PROFILER.finish(profile, f"{scope['method']} {scope['path']}", status)
+            extra_headers = [(name.lower().encode(), value.encode())
+                             for name, value in profile_headers.items()]
+        await self._send_body(scope, send, encoded, status, extra_headers)
+        METRICS.record_request(scope['path'], status, time.perf_counter() - start)
+
+    async def _lifespan(self, receive: Callable, send: Callable) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # Warm the thread pool before accepting requests
+                self.executor.submit(lambda: None).result()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._executor is not None:
+                    self._executor.shutdown(wait=True)
+                    self._executor = None
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _respond(self, handler: Callable, body: bytes,
+                 scope: Dict[str, Any]) -> Tuple[bytes, int, Optional[RequestProfile]]:
+        """
+        Decode a request body, run a native handler and encode its response, traced
+        when the request is profiled. Runs in the thread pool except for health checks.
+
+        Returns:
+            (encoded response body, HTTP status code, stopped profile or None)
+        """
+        profile = None
+        if PROFILER.enabled:
+            profile = PROFILER.begin(_header(scope, PROFILE_HEADER.lower().encode()) or None)
+        try:
+            payload, status = handler(self._decode_json(scope, body), scope)
+            encoded = _encode_json(payload)
+        except Exception as e:
+            # Same JSON error body as the Flask blueprint's error handler
+            status = 500
+            encoded = _encode_json(error_payload(f'Server error: {str(e)}'))
+        finally:
+            if profile is not None:
+                # Stopped in the tracing thread, before the response is sent
+                profile.stop()
+        return encoded, status, profile
+
+    # Native handlers
+
+    def _calculate(self, data: Any, scope: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        return handle_calculate(data, _header(scope, b'x-client-id') or None)
+
+    def _batch(self, data: Any, scope: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        return handle_batch(data, self.config['MAX_BATCH_SIZE'])
+
+    def _expression(self, data: Any, scope: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        return handle_expression(data, self.config['MAX_EXPRESSION_LENGTH'],
+                                 _header(scope, b'x-client-id') or None)
+
+    def _health(self, data: Any, scope: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        return HEALTH_PAYLOAD, 200
+
+    # Request and response helpers
+
+    def _client_key(self, scope: Dict[str, Any]) -> str:
+        """Per-client rate limit key, matching the Flask hook in app.admission."""
+        if self.config['RATE_LIMIT_KEY'] == 'client-id':
+            client_id = _header(scope, b'x-client-id')
+            if client_id:
+                return client_id
+        client = scope.get('client')
+        return str(client[0]) if client else ''
+
+    @staticmethod
+    async def _read_body(receive: Callable) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                break
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body', False):
+                break
+        return b''.join(chunks)
+
+    @staticmethod
+    def _decode_json(scope: Dict[str, Any], body: bytes) -> Any:
+        """Decode a JSON body the way Flask's get_json(silent=True) does."""
+        content_type = _header(scope, b'content-type').split(';', 1)[0].strip().lower()
+        if content_type != 'application/json' and not (
+                content_type.startswith('application/') and content_type.endswith('+json')):
+            return None
+        try:
+            return JSON_CODEC.loads(body)
+        except ValueError:
+            return None
+
+    async def _send_json(self, scope: Dict[str, Any], send: Callable,
+                         payload: Dict[str, Any], status: int,
+                         extra_headers: Optional[List[Tuple[bytes, bytes]]] = None) -> None:
+        await self._send_body(scope, send, _encode_json(payload), status, extra_headers)
+
+    async def _send_body(self, scope: Dict[str, Any], send: Callable, body: bytes, status: int,
+                         extra_headers: Optional[List[Tuple[bytes, bytes]]] = None) -> None:
+        headers = [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+        ]
+        if extra_headers:
+            headers.extend(extra_headers)
+        origin = _header(scope, b'origin')
+        if origin:
+            headers.append((b'access-control-allow-origin', origin.encode('latin-1')))
+            headers.append((b'vary', b'Origin'))
+        else:
+            headers.append((b'access-control-allow-origin', b'*'))
+
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+    # WSGI bridge
+
+    async def _call_wsgi(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        """Serve a request through the Flask app in the thread pool, streaming both ways."""
+        loop = asyncio.get_running_loop()
+        body = _BodyStream()
+        environ = _build_environ(scope, body)
+
+        async def pump_body():
+            while True:
+                message = await receive()
+                if message['type'] == 'http.disconnect':
+                    break
+                chunk = message.get('body', b'')
+                if chunk:
+                    try:
+                        body.feed(chunk)
+                    except queue.Full:
+                        await loop.run_in_executor(None, body.feed, chunk, True)
+                if not message.get('more_body', False):
+                    break
+            await loop.run_in_executor(None, body.feed, None, True)
+
+        def run_wsgi():
+            started: List[Any] = []
+
+            def start_response(status, headers, exc_info=None):
+                started[:] = [int(status.split(' ', 1)[0]),
+                              [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                               for name, value in headers]]
+
+            def send_sync(message):
+                asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+            result = self.flask_app(environ, start_response)
+            try:
+                sent_start = False
+                for chunk in result:
+                    if not chunk:
+                        continue
+                    if not sent_start:
+                        send_sync({'type': 'http.response.start',
+                                   'status': started[0], 'headers': started[1]})
+                        sent_start = True
+                    send_sync({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+                if not sent_start:
+                    send_sync({'type': 'http.response.start',
+                               'status': started[0], 'headers': started[1]})
+                send_sync({'type': 'http.response.body', 'body': b''})
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+
+        pump = asyncio.ensure_future(pump_body())
+        try:
+            await loop.run_in_executor(self.executor, run_wsgi)
+        finally:
+            body.close()
+            if not pump.done():
+                pump.cancel()
+
+
+def _encode_json(payload: Dict[str, Any]) -> bytes:
+    """Encode a response body the way Flask's jsonify does."""
+    return JSON_CODEC.dumpb(payload) + b'\n'
+
+
+def _header(scope: Dict[str, Any], name: bytes) -> str:
+    """Return the first value of a request header, or an empty string."""
+    for key, value in scope.get('headers', ()):
+        if key.lower() == name:
+            return value.decode('latin-1')
+    return ''
+
+
+def _build_environ(scope: Dict[str, Any], body: _BodyStream) -> Dict[str, Any]:
+    """Translate an ASGI HTTP scope into a WSGI environ."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': str(server[0]),
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': str(client[0]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.input_terminated': True,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', ()):
+        key = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if key == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif key == 'CONTENT_LENGTH':
+            environ['CONTENT_LENGTH'] = value
+        else:
+            key = f'HTTP_{key}'
+            environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+def create_asgi_app(flask_app=None) -> CalculatorASGI:
+    """
+    Create the ASGI application.
+
+    Args:
+        flask_app: Optional Flask application to share configuration and fallback routes with
+
+    Returns:
+        CalculatorASGI: ASGI application
+    """
+    return CalculatorASGI(flask_app)
@@ -2,8 +2,16 @@
 Calculator Service Layer
 Business logic for calculator operations, acts as an interface between routes and operators.
 """
-from typing import Dict, Any
-from Operators.Operator import Operator, CalculatorError
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional
+from Operators.Calculation import CalculationRequest, CalculationResult
+from Operators.Operator import CalculatorError
+from Operators.OperatorRegistry import OPERATIONS
+from Operators.ExpressionEvaluator import ExpressionEvaluator
+from app.json_codec import JSON_CODEC
+from app.result_cache import ResultCache, MISSING
+from app.metrics import METRICS
+from app.single_flight import SINGLE_FLIGHT
 
 
 class CalculatorService:
@@ -12,121 +20,326 @@ class CalculatorService:
     Implements single responsibility principle by separating business logic from routes.
     """
 
+    # Opt-in result cache, enabled through configure_cache
+    _cache: Optional[ResultCache] = None
+
+    # Why a requested shared cache fell back to a per-process one, if it did
+    _cache_fallback: Optional[str] = None
+
+    # Default significant digits for the decimal numeric backend, set through configure_numeric
+    _decimal_precision = 28
+
+    @staticmethod
+    def configure_cache(max_size: int, ttl: Optional[float] = None,
+                        shared_path: Optional[str] = None) -> None:
+        """
+        Enable or disable the result cache.
+
+        Args:
+            max_size: Maximum cached results; 0 disables caching
+            ttl: Seconds a cached result stays valid, or None for no expiry
+            shared_path: Memory-mapped file shared by all worker processes using the
+                         same path; if it cannot be used the cache stays per-process
+        """
+        previous = CalculatorService._cache
+        CalculatorService._cache = None
+        CalculatorService._cache_fallback = None
+        if hasattr(previous, 'close'):
+            previous.close()
+        if max_size <= 0:
+            return
+        if shared_path:
+            try:
+                from app.shared_cache import SharedResultCache
+                CalculatorService._cache = SharedResultCache(shared_path, max_size, ttl)
+                return
+            except (OSError, ValueError) as e:
+                CalculatorService._cache_fallback = str(e)
+        CalculatorService._cache = ResultCache(max_size, ttl)
+
     @staticmethod
-    def calculate(operation: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    def configure_numeric(decimal_precision: int) -> None:
+        """
+        Set the default precision of the decimal numeric backend.
+
+        Args:
+            decimal_precision: Significant digits used when a request gives no precision
+        """
+        CalculatorService._decimal_precision = decimal_precision
+
+    @staticmethod
+    def cache_stats() -> Dict[str, Any]:
+        """
+        Get result cache statistics.
+
+        Returns:
+            Dictionary with cache statistics, or {'enabled': False} if caching is off.
+            'shared' tells whether the cache is shared across processes; 'fallback'
+            gives the reason a requested shared cache could not be used.
+        """
+        cache = CalculatorService._cache
+        if cache is None:
+            return {'enabled': False}
+        stats = {'enabled': True, 'shared': not isinstance(cache, ResultCache), **cache.stats()}
+        if CalculatorService._cache_fallback:
+            stats['fallback'] = CalculatorService._cache_fallback
+        return stats
+
+    @staticmethod
+    def calculate(operation: str, data: Dict[str, Any], coalesce: bool = False) -> Mapping[str, Any]:
         """
         Process calculator operation based on operation type.
 
         Args:
             operation: Type of operation to perform
             data: Dictionary containing operation parameters
+            coalesce: Share the computation with identical concurrent calls (single-flight);
+                      the API handlers enable this, batch items do not
 
         Returns:
-            Dictionary with result or error
+            Result mapping with success flag, result and operation description (a
+            CalculationResult, or a dictionary for the decimal and fraction backends)
 
         Raises:
             CalculatorError: If calculation fails
         """
+        start = perf_counter()
         try:
-            if operation in ['+', '-', '*', '/']:
-                return CalculatorService._handle_basic_operation(operation, data)
-            elif operation in ['sin', 'cos', 'tan', 'cot']:
-                return CalculatorService._handle_trigonometric_operation(operation, data)
-            elif operation == 'log':
-                return CalculatorService._handle_logarithm(data)
-            elif operation == 'power':
-                return CalculatorService._handle_power(data)
-            elif operation == 'mod':
-                return CalculatorService._handle_modulo(data)
-            elif operation == 'pi':
-                return CalculatorService._handle_pi()
-            else:
-                raise CalculatorError(f"Unknown operation: {operation}")
-
+            result = CalculatorService._calculate(operation, data, coalesce)
         except CalculatorError as e:
-            raise e
-        except Exception as e:
-            raise CalculatorError(f"Unexpected error: {str(e)}")
+            METRICS.record_operation(operation, perf_counter() - start, str(e))
+            raise
+        METRICS.record_operation(operation, perf_counter() - start)
+        return result
 
     @staticmethod
-    def _handle_basic_operation(operator: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle basic arithmetic operations."""
-        num1 = float(data.get('num1', 0))
-        num2 = float(data.get('num2', 0))
+    def _calculate(operation: str, data: Dict[str, Any], coalesce: bool = False) -> Mapping[str, Any]:
+        """
+        Decode the payload once, then calculate through the single-flight coalescer
+        and the result cache when they are enabled.
+        """
+        numeric = data.get('numeric')
+        if numeric is not None and numeric != 'float':
+            return CalculatorService._calculate_numeric(operation, data, numeric, coalesce)
 
-        result = Operator.perform_basic_operation(operator, num1, num2)
-        return {
-            'success': True,
-            'result': result,
-            'operation': f"{num1} {operator} {num2}"
-        }
+        request = CalculatorService._decode(operation, data)
+        if coalesce and SINGLE_FLIGHT.enabled:
+            # Results are immutable, so every coalesced caller can share the same one
+            result, _ = SINGLE_FLIGHT.run('calculate', request.key,
+                                          lambda: CalculatorService._calculate_decoded(request))
+            return result
+        return CalculatorService._calculate_decoded(request)
 
     @staticmethod
-    def _handle_trigonometric_operation(operator: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle trigonometric operations."""
-        num1 = data.get('num1')
-        angle = float(data.get('angle', 0))
-
-        # If num1 is provided, multiply result by num1, otherwise just calculate trig function
-        if num1 is not None and num1 != '':
-            num1 = float(num1)
-            result = Operator.perform_trigonometric_operation(operator, num1, angle)
-            operation_desc = f"{num1} × {operator}({angle}°)"
-        else:
-            result = Operator.perform_trigonometric_function(operator, angle)
-            operation_desc = f"{operator}({angle}°)"
+    def _calculate_decoded(request: CalculationRequest) -> CalculationResult:
+        """Run a decoded request through the result cache when it is enabled."""
+        cache = CalculatorService._cache
+        if cache is None:
+            return CalculatorService._run(request)
 
-        return {
-            'success': True,
-            'result': result,
-            'operation': operation_desc
-        }
+        # The decoded parameters are the normalized cache key. Only the value is cached;
+        # the result and its description are rebuilt from the request on a hit.
+        key = request.key
+        cached = cache.get(key)
+        if cached is MISSING:
+            try:
+                result = CalculatorService._run(request)
+            except CalculatorError as e:
+                cache.set(key, (False, str(e)))
+                raise
+            cache.set(key, (True, result.result))
+            return result
+
+        succeeded, value = cached
+        if not succeeded:
+            raise CalculatorError(value)
+        return CalculationResult(value, request.spec, request.args)
 
     @staticmethod
-    def _handle_logarithm(data: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle logarithm operation."""
-        number = float(data.get('number', 1))
-        base = float(data.get('base', 10))
+    def _calculate_numeric(operation: Any, data: Dict[str, Any], numeric: Any,
+                           coalesce: bool = False) -> Dict[str, Any]:
+        """
+        Calculate with an exact or arbitrary-precision numeric backend, bypassing the cache.
+
+        Args:
+            operation: Operation name
+            data: Request payload; 'precision' optionally sets the decimal digits
+            numeric: Backend name ('decimal' or 'fraction')
+            coalesce: Share the computation with identical concurrent calls
+
+        Returns:
+            Dictionary with the result as an exact string, operation description and backend
+
+        Raises:
+            CalculatorError: If the backend, operation, precision or operands are invalid
+        """
+        # Loaded on first use, keeping fractions out of the startup path
+        from Operators.NumericBackend import MAX_PRECISION, get_backend
 
-        result = Operator.perform_logarithm(number, base)
+        backend = get_backend(numeric)
+        spec = OPERATIONS.get(operation) if isinstance(operation, str) else None
+        if spec is None:
+            raise CalculatorError(f"Unknown operation: {operation}")
+
+        precision = data.get('precision', CalculatorService._decimal_precision)
+        if isinstance(precision, bool) or not isinstance(precision, int) or \
+                not 1 <= precision <= MAX_PRECISION:
+            raise CalculatorError(f"Precision must be an integer between 1 and {MAX_PRECISION}")
+
+        args = tuple(
+            None if default is None and data.get(name) in (None, '')
+            else backend.convert(data.get(name, default))
+            for name, default in spec.params
+        )
+        if coalesce and SINGLE_FLIGHT.enabled:
+            # Decimal('1.0') == Decimal('1') but they print differently, so key on the text
+            key = (operation, backend.name, precision) + tuple(map(str, args))
+            result, _ = SINGLE_FLIGHT.run('calculate', key,
+                                          lambda: backend.execute(operation, args, precision))
+        else:
+            result = backend.execute(operation, args, precision)
         return {
             'success': True,
-            'result': result,
-            'operation': f"log_{base}({number})"
+            'result': str(result),
+            'operation': spec.describe(*args),
+            'numeric': backend.name
         }
 
     @staticmethod
-    def _handle_power(data: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle power operation."""
-        base = float(data.get('base', 0))
-        exponent = float(data.get('exponent', 0))
+    def _decode(operation: Any, data: Dict[str, Any]) -> CalculationRequest:
+        """
+        Look up an operation and convert its payload into typed handler arguments.
 
-        result = Operator.perform_power(base, exponent)
-        return {
-            'success': True,
-            'result': result,
-            'operation': f"{base}^{exponent}"
-        }
+        Returns:
+            The decoded request
+
+        Raises:
+            CalculatorError: If the operation is unknown or the parameters are invalid
+        """
+        spec = OPERATIONS.get(operation) if isinstance(operation, str) else None
+        if spec is None:
+            raise CalculatorError(f"Unknown operation: {operation}")
+        try:
+            return CalculationRequest(spec, spec.parse(data))
+        except CalculatorError as e:
+            raise e
+        except Exception as e:
+            raise CalculatorError(f"Unexpected error: {str(e)}")
 
     @staticmethod
-    def _handle_modulo(data: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle modulo operation."""
-        num1 = float(data.get('num1', 0))
-        num2 = float(data.get('num2', 1))
+    def _run(request: CalculationRequest) -> CalculationResult:
+        """Run a decoded request without consulting the cache."""
+        try:
+            return request.run()
 
-        result = Operator.perform_modulo(num1, num2)
-        return {
-            'success': True,
-            'result': result,
-            'operation': f"{num1} mod {num2}"
-        }
+        except CalculatorError as e:
+            raise e
+        except Exception as e:
+            raise CalculatorError(f"Unexpected error: {str(e)}")
 
     @staticmethod
-    def _handle_pi() -> Dict[str, Any]:
-        """Handle pi constant."""
-        result = Operator.get_pi()
-        return {
-            'success': True,
-            'result': result,
-            'operation': 'π'
-        }
+    def calculate_batch(operations: List[Any]) -> List[Mapping[str, Any]]:
+        """
+        Process a list of calculator operations in order.
+
+        Each item uses the same schema as a single /api/calculate request, or is
+        {'expression': str} to evaluate a formula as /api/expression does.
+        Failures are reported per item so one bad operation does not fail the batch.
+
+        Args:
+            operations: List of operation dictionaries
+
+        Returns:
+            List of result or error dictionaries, in input order
+        """
+        return [CalculatorService._calculate_item(item) for item in operations]
+
+    @staticmethod
+    def calculate_stream(lines: Iterable[Optional[bytes]],
+                         encode: Optional[Callable[[Any], str]] = None) -> Iterator[Any]:
+        """
+        Lazily process newline-delimited JSON operations, yielding one result per line.
+
+        Lines are pulled from the input only as results are consumed, so memory stays
+        flat regardless of input size. Blank lines are skipped. After the last line a
+        summary is yielded.
+
+        Args:
+            lines: Iterable of raw NDJSON lines; None marks a line that exceeded the
+                   reader's length limit
+            encode: Optional serializer applied to each yielded item; a result it fails
+                    on is replaced by an error record, so the stream is never cut short
+
+        Yields:
+            Result or error dictionaries in input order, then
+            {'summary': {'count': n, 'succeeded': n, 'errors': n}}; encoded if encode is given
+        """
+        count = 0
+        errors = 0
+        for line in lines:
+            if line is None:
+                result = {'success': False, 'error': 'Line exceeds maximum length'}
+            else:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    item = JSON_CODEC.loads(line)
+                except ValueError:
+                    result = {'success': False, 'error': 'Invalid JSON'}
+                else:
+                    result = CalculatorService._calculate_item(item)
+
+            count += 1
+            if encode is not None:
+                try:
+                    encoded = encode(result)
+                except Exception as e:
+                    result = {'success': False, 'error': f'Server error: {str(e)}'}
+                    encoded = encode(result)
+            if not result['success']:
+                errors += 1
+            yield result if encode is None else encoded
+
+        summary = {'summary': {'count': count, 'succeeded': count - errors, 'errors': errors}}
+        yield summary if encode is None else encode(summary)
+
+    @staticmethod
+    def _calculate_item(item: Any) -> Mapping[str, Any]:
+        """Calculate one batch or stream item, reporting failures as an error dictionary."""
+        if not isinstance(item, dict):
+            return {'success': False, 'error': 'Invalid operation item'}
+
+        operation = item.get('operation')
+        expression = item.get('expression')
+        if not operation and not isinstance(expression, str):
+            return {'success': False, 'error': 'Operation not specified'}
+
+        try:
+            if not operation:
+                return CalculatorService.evaluate_expression(expression)
+            return CalculatorService.calculate(operation, item)
+        except CalculatorError as e:
+            return {'success': False, 'error': str(e)}
+
+    @staticmethod
+    def evaluate_expression(expression: str, coalesce: bool = False) -> CalculationResult:
+        """
+        Evaluate a whole formula such as '2*sin(30)+log(8,2)^2 mod 3'.
+
+        Args:
+            expression: Formula text
+            coalesce: Share the evaluation with identical concurrent calls (single-flight)
+
+        Returns:
+            Result mapping with the result and the evaluated expression as its operation
+
+        Raises:
+            CalculatorError: If the expression is malformed or evaluation fails
+        """
+        if coalesce and SINGLE_FLIGHT.enabled:
+            result, _ = SINGLE_FLIGHT.run('expression', expression.strip(),
+                                          lambda: ExpressionEvaluator.evaluate(expression))
+        else:
+            result = ExpressionEvaluator.evaluate(expression)
+        return CalculationResult(result, operation=expression.strip())
@@ -0,0 +1,299 @@
+"""
+Batch Command Line Interface
+Evaluates operations or expressions from a file or stdin without the web stack.
+
+Input is read and evaluated in chunks, so memory stays flat for inputs of any size:
+
+    jsonl  One /api/calculate or {"expression": ...} object per line
+    csv    Header row naming request fields (operation, num1, num2, angle, number,
+           base, exponent, expression, numeric, precision); empty cells are omitted
+    text   One expression per line
+
+Results are written in input order, one per non-blank record, as JSON lines or CSV.
+With --columnar, a num1,num2,operator CSV file is instead memory-mapped and
+evaluated column-wise by app.file_processor into a result column file.
+
+Usage:
+    python calculatorModel.py [INPUT] [--format F] [--output FILE] [--workers N] [--stats]
+    python calculatorModel.py INPUT --columnar --output FILE [--output-format csv|f64] [--stats]
+"""
+import argparse
+import csv
+import functools
+import itertools
+import os
+import sys
+import time
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.calculator_service import CalculatorService
+from app.json_codec import JSON_CODEC
+
+
+INPUT_FORMATS = ('jsonl', 'csv', 'text')
+OUTPUT_FORMATS = ('jsonl', 'csv')
+CSV_OUTPUT_COLUMNS = ('success', 'result', 'operation', 'error')
+
+# File extension -> input format, used when --format is auto
+_EXTENSION_FORMATS = {'.jsonl': 'jsonl', '.ndjson': 'jsonl', '.json': 'jsonl',
+                      '.csv': 'csv', '.txt': 'text'}
+
+
+def detect_format(path: str, first_line: str) -> str:
+    """
+    Guess the input format from the file extension, or else from the first non-blank line.
+
+    A line starting with '{' is JSON lines; a comma-separated header naming an
+    operation or expression column is CSV; anything else is one expression per line.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in _EXTENSION_FORMATS:
+        return _EXTENSION_FORMATS[extension]
+    stripped = first_line.strip()
+    if stripped.startswith('{'):
+        return 'jsonl'
+    columns = {column.strip().lower() for column in stripped.split(',')}
+    if len(columns) > 1 and columns & {'operation', 'expression'}:
+        return 'csv'
+    return 'text'
+
+
+def read_records(stream: Iterable[str], input_format: str) -> Iterator[Any]:
+    """
+    Lazily split an input stream into records, skipping blank lines.
+
+    Yields:
+        Stripped lines for jsonl and text; for csv, the header row first and then data rows
+    """
+    if input_format == 'csv':
+        for row in csv.reader(stream):
+            if any(cell.strip() for cell in row):
+                yield row
+        return
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def chunked(records: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group records into lists of up to size items."""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def csv_item(header: Sequence[str], row: Sequence[str]) -> Dict[str, Any]:
+    """
+    Build a request item from a CSV row.
+
+    Cells are stripped and empty ones omitted. Numbers stay text, which the service
+    parses, except the precision, which requests carry as an integer; a precision
+    that is not an integer is passed on as text for the service to reject.
+    """
+    item: Dict[str, Any] = {name: value.strip() for name, value in zip(header, row) if value.strip()}
+    precision = item.get('precision')
+    if precision is not None:
+        try:
+            item['precision'] = int(precision)
+        except ValueError:
+            pass
+    return item
+
+
+def evaluate_records(input_format: str, header: Optional[Sequence[str]],
+                     records: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Evaluate one chunk of records; module level so pool workers can run it.
+
+    Args:
+        input_format: One of INPUT_FORMATS
+        header: CSV column names (ignored for other formats)
+        records: Records as produced by read_records
+
+    Returns:
+        Result or error dictionaries, in input order
+    """
+    if input_format == 'jsonl':
+        # calculate_stream ends with a summary, which the CLI computes itself
+        return list(CalculatorService.calculate_stream(records))[:-1]
+    if input_format == 'csv':
+        items = [csv_item(header, row) for row in records]
+    else:
+        items = [{'expression': line} for line in records]
+    return CalculatorService.calculate_batch(items)
+
+
+class ResultWriter:
+    """Writes result dictionaries as JSON lines or CSV rows."""
+
+    def __init__(self, stream: IO[str], output_format: str = 'jsonl'):
+        self.stream = stream
+        self.output_format = output_format
+        self._csv = None
+        if output_format == 'csv':
+            self._csv = csv.writer(stream, lineterminator='\n')
+            self._csv.writerow(CSV_OUTPUT_COLUMNS)
+
+    def write(self, results: List[Dict[str, Any]]) -> None:
+        """Write a chunk of results."""
+        if self._csv is None:
+            self.stream.write(''.join(JSON_CODEC.dumps(result) + '\n' for result in results))
+            return
+        self._csv.writerows(
+            ['true' if result['success'] else 'false', result.get('result', ''),
+             result.get('operation', ''), result.get('error', '')]
+            for result in results
+        )
+
+
+def run(stream: Iterable[str], output: IO[str], input_format: str, output_format: str = 'jsonl',
+        workers: int = 0, chunk_size: int = 1000) -> Dict[str, Any]:
+    """
+    Evaluate every record of an input stream and write the results.
+
+    Args:
+        stream: Input lines, e.g. an open text file
+        output: Text output for the results
+        input_format: One of INPUT_FORMATS
+        output_format: One of OUTPUT_FORMATS
+        workers: Worker processes; 0 evaluates in this process
+        chunk_size: Records evaluated per chunk
+
+    Returns:
+        Statistics: count, succeeded, errors, elapsed_seconds, records_per_sec, workers
+    """
+    from app.process_pool import BatchProcessPool
+
+    start = time.perf_counter()
+    records = read_records(stream, input_format)
+    header = None
+    if input_format == 'csv':
+        header = [column.strip() for column in next(records, [])]
+
+    writer = ResultWriter(output, output_format)
+    pool = BatchProcessPool(workers=workers)
+    count = errors = 0
+    try:
+        evaluate = functools.partial(evaluate_records, input_format, header)
+        for results in pool.map_chunks(evaluate, chunked(records, chunk_size)):
+            writer.write(results)
+            count += len(results)
+            errors += sum(1 for result in results if not result['success'])
+    finally:
+        pool.shutdown()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'count': count,
+        'succeeded': count - errors,
+        'errors': errors,
+        'elapsed_seconds': elapsed,
+        'records_per_sec': count / elapsed if elapsed > 0 else 0.0,
+        'workers': workers
+    }
+
+
+def _peek_first_line(stream: IO[str]) -> Tuple[str, Iterator[str]]:
+    """Read up to the first non-blank line, returning it and an iterable replaying the input."""
+    consumed = []
+    for line in stream:
+        consumed.append(line)
+        if line.strip():
+            break
+    first = consumed[-1] if consumed else ''
+    return first, itertools.chain(consumed, stream)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the batch mode argument parser."""
+    parser = argparse.ArgumentParser(
+        prog='calculatorModel.py',
+        description='Evaluate calculator operations or expressions in bulk. '
+                    'Runs the interactive calculator when given no arguments on a terminal.'
+    )
+    parser.add_argument('input', nargs='?', default='-', help="Input file, or '-' for stdin (default)")
+    parser.add_argument('-f', '--format', choices=('auto',) + INPUT_FORMATS, default='auto',
+                        help='Input format (default: from extension or first line)')
+    parser.add_argument('-o', '--output', default='-', help="Output file, or '-' for stdout (default)")
+    parser.add_argument('--output-format', choices=OUTPUT_FORMATS + ('f64',),
+                        help='jsonl (default) or csv; csv (default) or f64 with --columnar')
+    parser.add_argument('-w', '--workers', type=int, default=0,
+                        help='Worker processes for parallel evaluation (default: 0, in process)')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Records per chunk (default: 1000)')
+    parser.add_argument('--columnar', action='store_true',
+                        help='Evaluate a num1,num2,operator CSV file column-wise with bounded memory')
+    parser.add_argument('--chunk-mb', type=float, default=1.0,
+                        help='Input megabytes per chunk with --columnar (default: 1)')
+    parser.add_argument('--stats', action='store_true', help='Print throughput statistics to stderr')
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Command line entry point.
+
+    Returns:
+        Exit status: 0 when every record succeeded, 1 when any failed
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers < 0 or args.chunk_size < 1:
+        parser.error('--workers must be >= 0 and --chunk-size >= 1')
+    if args.columnar:
+        return _main_columnar(parser, args)
+    if args.output_format == 'f64':
+        parser.error('--output-format f64 requires --columnar')
+
+    source = sys.stdin if args.input == '-' else open(args.input, newline='', encoding='utf-8')
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    try:
+        lines: Iterable[str] = source
+        input_format = args.format
+        if input_format == 'auto':
+            first_line, lines = _peek_first_line(source)
+            input_format = detect_format('' if args.input == '-' else args.input, first_line)
+        stats = run(lines, target, input_format, args.output_format or 'jsonl',
+                    args.workers, args.chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+        else:
+            target.flush()
+
+    if args.stats:
+        print(f"{stats['count']} records ({stats['succeeded']} succeeded, {stats['errors']} errors) "
+              f"in {stats['elapsed_seconds']:.3f} s: {stats['records_per_sec']:.0f} records/sec, "
+              f"{stats['workers']} workers", file=sys.stderr)
+    return 1 if stats['errors'] else 0
+
+
+def _main_columnar(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    """Run the columnar file processor for --columnar."""
+    from app.file_processor import process_file
+    from Operators.Operator import CalculatorError
+
+    if args.input == '-' or args.output == '-':
+        parser.error('--columnar needs input and --output files')
+    if args.chunk_mb <= 0:
+        parser.error('--chunk-mb must be positive')
+    try:
+        stats = process_file(args.input, args.output, args.output_format or 'csv',
+                             int(args.chunk_mb * 1024 * 1024))
+    except (CalculatorError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    if args.stats:
+        rss = stats['peak_rss_mb']
+        print(f"{stats['rows']} rows ({stats['errors']} errors) in {stats['elapsed_seconds']:.3f} s: "
+              f"{stats['rows_per_sec']:.0f} rows/sec, {stats['mb_per_sec']:.1f} MB/sec, "
+              f"peak RSS {'n/a' if rss is None else f'{rss:.1f} MB'}", file=sys.stderr)
+    return 1 if stats['errors'] else 0
@@ -0,0 +1,323 @@
+"""
+Columnar File Processor
+Evaluates large operand CSV files (num1,num2,operator) with bounded memory.
+
+The input is memory-mapped and processed in chunks of roughly chunk_bytes ending
+at a line boundary. Each chunk is split into operand and operator columns, run
+through VectorizedOperator one operator group at a time, and appended to the
+output column file, so memory is bounded by the chunk size, not the file size.
+
+Well-formed chunks (no quotes, blank lines or ragged rows) are parsed by splitting
+the whole chunk at once and converting the operand columns with NumPy; any other
+chunk is parsed row by row with the csv module, reporting bad rows individually.
+Every input row after the header, blank lines included, produces exactly one output
+row, so results line up with input line numbers.
+"""
+import csv
+import math
+import mmap
+import os
+import sys
+import time
+from array import array
+from typing import Any, Dict, IO, Iterator, List, Optional, Sequence, Tuple
+
+from Operators.Operator import CalculatorError
+from Operators.VectorizedOperator import VectorizedOperator, HAS_NUMPY, np
+
+
+# Column order assumed when the file has no header row
+DEFAULT_COLUMNS = ('num1', 'num2', 'operator')
+
+# Header names accepted for the operator column
+OPERATOR_COLUMNS = ('operator', 'operation')
+
+OUTPUT_FORMATS = ('csv', 'f64')
+
+DEFAULT_CHUNK_BYTES = 1024 * 1024
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, or None where unavailable."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024 if os.uname().sysname == 'Darwin' else 1024)
+
+
+def column_positions(header: Sequence[str]) -> Tuple[int, int, int]:
+    """
+    Find the num1, num2 and operator column indexes in a header row.
+
+    Raises:
+        CalculatorError: If a required column is missing
+    """
+    names = [name.strip().lower() for name in header]
+    try:
+        operator = next(names.index(name) for name in OPERATOR_COLUMNS if name in names)
+        return names.index('num1'), names.index('num2'), operator
+    except (StopIteration, ValueError):
+        raise CalculatorError("Header must name num1, num2 and operator columns")
+
+
+def iter_chunks(buffer: Any, start: int, chunk_bytes: int) -> Iterator[bytes]:
+    """
+    Yield consecutive slices of a buffer, each ending at a newline.
+
+    A single line longer than chunk_bytes is yielded whole. The final chunk always
+    ends with a newline, even when the file does not. For an mmap, pages already
+    copied out are released as it goes, so resident memory does not grow with the file.
+    """
+    size = len(buffer)
+    release = isinstance(buffer, mmap.mmap) and hasattr(mmap, 'MADV_DONTNEED')
+    released = 0
+    while start < size:
+        end = min(start + chunk_bytes, size)
+        if end < size:
+            newline = buffer.rfind(b'\n', start, end)
+            end = newline + 1 if newline >= 0 else buffer.find(b'\n', end) + 1 or size
+        chunk = buffer[start:end]
+        start = end
+        if release:
+            boundary = end - end % mmap.PAGESIZE
+            if boundary > released:
+                buffer.madvise(mmap.MADV_DONTNEED, released, boundary - released)
+                released = boundary
+        yield chunk if chunk.endswith(b'\n') else chunk + b'\n'
+
+
+class ParsedChunk:
+    """
+    Operand and operator columns of one chunk.
+
+    Attributes:
+        operators: Operator per row (bytes array with NumPy, else a list of str)
+        operand1: First operand column
+        operand2: Second operand column
+        errors: Row index to error message for rows that could not be parsed
+    """
+
+    def __init__(self, operators: Any, operand1: Any, operand2: Any, errors: Dict[int, str]):
+        self.operators = operators
+        self.operand1 = operand1
+        self.operand2 = operand2
+        self.errors = errors
+
+    def __len__(self) -> int:
+        return len(self.operand1)
+
+
+def parse_chunk(chunk: bytes, positions: Tuple[int, int, int], width: int) -> ParsedChunk:
+    """
+    Split a chunk of complete lines into columns.
+
+    Args:
+        chunk: Lines ending with a newline
+        positions: num1, num2 and operator column indexes
+        width: Number of columns per row
+    """
+    if b'\r' in chunk:
+        chunk = chunk.replace(b'\r', b'')
+    if HAS_NUMPY and b'"' not in chunk and _is_rectangular(chunk, width):
+        fields = chunk.replace(b'\n', b',').split(b',')
+        del fields[-1]
+        try:
+            operand1 = np.array(fields[positions[0]::width]).astype(float)
+            operand2 = np.array(fields[positions[1]::width]).astype(float)
+        except ValueError:
+            pass
+        else:
+            operators = np.char.strip(np.array(fields[positions[2]::width]))
+            return ParsedChunk(operators, operand1, operand2, {})
+    return _parse_rows(chunk, positions, width)
+
+
+def _is_rectangular(chunk: bytes, width: int) -> bool:
+    """True if every line of the chunk has exactly width comma-separated fields."""
+    data = np.frombuffer(chunk, dtype=np.uint8)
+    separators = data[(data == ord(',')) | (data == ord('\n'))]
+    if separators.size % width:
+        return False
+    newlines = separators == ord('\n')
+    return bool(np.array_equal(newlines, np.arange(separators.size) % width == width - 1))
+
+
+def _parse_rows(chunk: bytes, positions: Tuple[int, int, int], width: int) -> ParsedChunk:
+    """Parse a chunk row by row, recording an error for each malformed row."""
+    operators: List[str] = []
+    operand1: List[float] = []
+    operand2: List[float] = []
+    errors: Dict[int, str] = {}
+    # Every line, blank ones included, gets an output row, so output row n is input row n
+    lines = chunk.decode('utf-8', 'replace').split('\n')
+    del lines[-1]
+    for row in csv.reader(lines):
+        index = len(operand1)
+        if not ''.join(row).strip():
+            errors[index] = "Blank line"
+            row = None
+        elif len(row) != width:
+            errors[index] = f"Expected {width} columns, got {len(row)}"
+            row = None
+        else:
+            try:
+                first, second = float(row[positions[0]]), float(row[positions[1]])
+            except ValueError:
+                errors[index] = "Invalid number"
+                row = None
+        if row is None:
+            operators.append('')
+            operand1.append(math.nan)
+            operand2.append(math.nan)
+        else:
+            operators.append(row[positions[2]].strip())
+            operand1.append(first)
+            operand2.append(second)
+
+    if HAS_NUMPY:
+        return ParsedChunk(np.array([op.encode() for op in operators], dtype=bytes),
+                           np.array(operand1), np.array(operand2), errors)
+    return ParsedChunk(operators, operand1, operand2, errors)
+
+
+def evaluate_chunk(parsed: ParsedChunk) -> Tuple[Any, Dict[int, str]]:
+    """
+    Evaluate a parsed chunk one operator group at a time.
+
+    Returns:
+        (values, errors): result per row (NaN where the row failed) and a row index
+        to error message mapping
+    """
+    errors = dict(parsed.errors)
+    if not HAS_NUMPY:
+        valid = [i for i in range(len(parsed)) if i not in errors]
+        result = VectorizedOperator.evaluate(
+            [parsed.operators[i] for i in valid],
+            [parsed.operand1[i] for i in valid], [parsed.operand2[i] for i in valid]
+        )
+        values = [math.nan] * len(parsed)
+        for local, index in enumerate(valid):
+            values[index] = result.values[local]
+            if result.errors[local] is not None:
+                errors[index] = result.errors[local]
+        return values, errors
+
+    values = np.full(len(parsed), np.nan)
+    valid = np.ones(len(parsed), dtype=bool)
+    if errors:
+        valid[list(errors)] = False
+    for operator in np.unique(parsed.operators[valid]):
+        indices = np.flatnonzero((parsed.operators == operator) & valid)
+        name = operator.decode('utf-8', 'replace')
+        result = VectorizedOperator.evaluate(name, parsed.operand1[indices], parsed.operand2[indices])
+        values[indices] = result.values
+        if result.error_count:
+            for local, error in enumerate(result.errors):
+                if error is not None:
+                    errors[int(indices[local])] = error
+    return values, errors
+
+
+class ColumnWriter:
+    """
+    Appends result columns to an output file.
+
+    'csv' writes a result,error header and one line per input row; 'f64' writes raw
+    little-endian float64 values, NaN for failed rows.
+    """
+
+    def __init__(self, stream: IO[bytes], output_format: str = 'csv'):
+        if output_format not in OUTPUT_FORMATS:
+            raise CalculatorError(f"Unknown output format: {output_format}")
+        self.stream = stream
+        self.output_format = output_format
+        if output_format == 'csv':
+            stream.write(b'result,error\n')
+
+    def write(self, values: Any, errors: Dict[int, str]) -> None:
+        """Write the results of one chunk."""
+        if self.output_format == 'f64':
+            if HAS_NUMPY:
+                self.stream.write(np.asarray(values, dtype='<f8').tobytes())
+            else:
+                column = array('d', values)
+                if sys.byteorder == 'big':  # pragma: no cover
+                    column.byteswap()
+                self.stream.write(column.tobytes())
+            return
+
+        lines = [repr(value) + ',' for value in (values.tolist() if HAS_NUMPY else values)]
+        for index, error in errors.items():
+            lines[index] = ',' + _csv_field(error)
+        lines.append('')
+        self.stream.write('\n'.join(lines).encode())
+
+
+def _csv_field(text: str) -> str:
+    if any(character in text for character in ',"\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def process_file(input_path: str, output_path: str, output_format: str = 'csv',
+                 chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Dict[str, Any]:
+    """
+    Evaluate every row of an operand CSV file into an output column file.
+
+    A first row naming num1, num2 and operator (or operation) columns is treated as
+    a header; without one the columns are num1,num2,operator.
+
+    Args:
+        input_path: Input CSV file
+        output_path: Output file, one result per input row
+        output_format: 'csv' (result,error) or 'f64' (raw float64)
+        chunk_bytes: Approximate input bytes processed per chunk
+
+    Returns:
+        Statistics: rows, errors, chunks, bytes, elapsed_seconds, rows_per_sec,
+        mb_per_sec and peak_rss_mb
+
+    Raises:
+        CalculatorError: If the header lacks a required column or the format is unknown
+    """
+    start = time.perf_counter()
+    rows = errors = chunks = 0
+    with open(input_path, 'rb') as source, open(output_path, 'wb') as target:
+        writer = ColumnWriter(target, output_format)
+        size = os.fstat(source.fileno()).st_size
+        if size:
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    buffer.madvise(mmap.MADV_SEQUENTIAL)
+                first_line_end = buffer.find(b'\n')
+                first_line = buffer[:first_line_end if first_line_end >= 0 else size]
+                header = next(csv.reader([first_line.decode('utf-8', 'replace').strip()]), [])
+                names = {name.strip().lower() for name in header}
+                if names & set(DEFAULT_COLUMNS + OPERATOR_COLUMNS):
+                    positions = column_positions(header)
+                    width = len(header)
+                    offset = first_line_end + 1 if first_line_end >= 0 else size
+                else:
+                    positions, width, offset = (0, 1, 2), 3, 0
+
+                for chunk in iter_chunks(buffer, offset, chunk_bytes):
+                    values, chunk_errors = evaluate_chunk(parse_chunk(chunk, positions, width))
+                    writer.write(values, chunk_errors)
+                    rows += len(values)
+                    errors += len(chunk_errors)
+                    chunks += 1
+
+    elapsed = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'errors': errors,
+        'chunks': chunks,
+        'bytes': size,
+        'elapsed_seconds': elapsed,
+        'rows_per_sec': rows / elapsed if elapsed > 0 else 0.0,
+        'mb_per_sec': size / (1024 * 1024) / elapsed if elapsed > 0 else 0.0,
+        'peak_rss_mb': peak_rss_mb()
+    }
@@ -0,0 +1,426 @@
+"""
+Calculation History
+Server-side calculation history per client, stored in SQLite.
+
+Requests only append to an in-memory queue; a background writer thread serializes
+and inserts queued entries in batches, one transaction per batch, and applies the
+retention limits. Logging therefore never waits on the database or takes a lock.
+When the queue is full, entries are dropped and counted instead of blocking the
+request.
+"""
+import atexit
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from app.json_codec import JSON_CODEC
+from Operators.Operator import CalculatorError
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+# Client IDs come from the X-Client-ID header
+CLIENT_ID_PATTERN = re.compile(r'[A-Za-z0-9_.-]{1,64}')
+
+MAX_PAGE_SIZE = 500
+
+EXPORT_FORMATS = ('ndjson', 'csv')
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS history (
+        id INTEGER PRIMARY KEY,
+        client_id TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        operation TEXT NOT NULL,
+        expression TEXT NOT NULL,
+        result NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS history_client_time ON history (client_id, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS history_client_operation_time "
+    "ON history (client_id, operation, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS history_time ON history (created_at)",
+)
+
+# (client_id, created_at, operation, expression, result) as recorded; serialized by the writer
+Entry = Tuple[str, float, str, Any, Any]
+
+
+def valid_client_id(client_id: Any) -> bool:
+    """Check a client ID before it is used as a history key."""
+    return isinstance(client_id, str) and CLIENT_ID_PATTERN.fullmatch(client_id) is not None
+
+
+def _encode_result(result: Any) -> Any:
+    """
+    Store finite numbers natively (the result column has no type affinity) so reading
+    them needs no decoding; strings (exact numeric results), NaN and infinities are
+    stored as JSON text.
+    """
+    if type(result) in (int, float) and result == result and abs(result) != float('inf'):
+        return result
+    return JSON_CODEC.dumps(result)
+
+
+def _decode_result(value: Any) -> Any:
+    """Inverse of _encode_result."""
+    return JSON_CODEC.loads(value) if isinstance(value, str) else value
+
+
+def _row_to_item(row: Tuple) -> Dict[str, Any]:
+    """Convert a (id, created_at, operation, expression, result) row to an API item."""
+    entry_id, created_at, operation, expression, result = row
+    return {
+        'id': entry_id,
+        'timestamp': created_at,
+        'operation': operation,
+        'expression': expression,
+        'result': _decode_result(result)
+    }
+
+
+def _parse_cursor(cursor: str) -> Tuple[float, int]:
+    """Split a '<timestamp>:<id>' page cursor."""
+    created_at, _, entry_id = cursor.rpartition(':')
+    try:
+        return float(created_at), int(entry_id)
+    except ValueError:
+        raise CalculatorError(f"Invalid cursor: {cursor}")
+
+
+class CalculationHistory:
+    """
+    SQLite-backed history store with batched, asynchronous writes.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries_per_client: int = 1000,
+                 max_age: Optional[float] = None, flush_interval: float = 0.5,
+                 batch_size: int = 500, queue_size: int = 10000):
+        """
+        Args:
+            path: SQLite database file, or None to disable history
+            max_entries_per_client: Newest entries kept per client (0 keeps all)
+            max_age: Seconds after which entries are deleted, or None to keep them
+            flush_interval: Longest time an entry waits in the queue before it is written
+            batch_size: Most entries written in one transaction
+            queue_size: Entries buffered before new ones are dropped
+        """
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self.configure(path, max_entries_per_client, max_age, flush_interval, batch_size, queue_size)
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def configure(self, path: Optional[str] = None, max_entries_per_client: int = 1000,
+                  max_age: Optional[float] = None, flush_interval: float = 0.5,
+                  batch_size: int = 500, queue_size: int = 10000) -> None:
+        """Reconfigure the store, writing out anything still queued for the previous database."""
+        self.shutdown()
+        self.path = path
+        self.max_entries_per_client = max_entries_per_client
+        self.max_age = max_age
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        # deque.append is atomic, so recording takes no lock
+        self._pending: Deque[Entry] = deque()
+        self._waiters: List[threading.Event] = []
+        self._wake = threading.Event()
+        self._stopping = False
+        self._local = threading.local()
+        self._last_expiry = 0.0
+        self.written = 0
+        self.dropped = 0
+        if path is not None:
+            self._connection().close()
+            self._local = threading.local()
+
+    def _connection(self) -> 'sqlite3.Connection':
+        """Return the calling thread's connection, creating the schema on first use."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            # Imported on first use so servers without history never load sqlite3
+            import sqlite3
+            connection = sqlite3.connect(self.path, timeout=10)
+            # WAL lets readers run while the writer commits
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            connection.commit()
+            self._local.connection = connection
+        return connection
+
+    # Writing
+
+    def record(self, client_id: str, operation: str, result: Dict[str, Any]) -> None:
+        """
+        Queue a successful calculation; never blocks.
+
+        Args:
+            client_id: Validated client ID
+            operation: Operation name or 'expression'
+            result: Response payload with 'result' and 'operation'
+        """
+        if self.path is None:
+            return
+        if self._writer is None:
+            self._start()
+        pending = self._pending
+        if len(pending) >= self.queue_size:
+            self.dropped += 1
+            return
+        pending.append((client_id, time.time(), operation, result.get('operation'), result.get('result')))
+        if len(pending) == self.batch_size:
+            self._wake.set()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop, name='calculator-history', daemon=True
+                )
+                self._writer.start()
+
+    def _write_loop(self) -> None:
+        """Every flush_interval (or once batch_size entries are pending), write everything pending."""
+        import sqlite3
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            stopping = self._stopping
+            with self._lock:
+                waiters, self._waiters = self._waiters, []
+            # Entries recorded before a flush request are already pending, so draining releases it
+            pending = self._pending
+            while pending:
+                count = min(len(pending), self.batch_size)
+                batch = [pending.popleft() for _ in range(count)]
+                try:
+                    self._write(batch)
+                except Exception:
+                    # Database errors and unencodable results lose this batch, not the writer
+                    self.dropped += len(batch)
+            for waiter in waiters:
+                waiter.set()
+            if stopping:
+                return
+
+    def _write(self, batch: List[Entry]) -> None:
+        """Insert one batch and apply the retention limits in a single transaction."""
+        if not batch:
+            return
+        rows = [(client_id, created_at, operation, str(expression), _encode_result(result))
+                for client_id, created_at, operation, expression, result in batch]
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                'INSERT INTO history (client_id, created_at, operation, expression, result) '
+                'VALUES (?, ?, ?, ?, ?)', rows
+            )
+            if self.max_entries_per_client > 0:
+                for client_id in {entry[0] for entry in batch}:
+                    self._trim_client(connection, client_id)
+            now = time.time()
+            if self.max_age is not None and now - self._last_expiry >= 60:
+                connection.execute('DELETE FROM history WHERE created_at < ?', (now - self.max_age,))
+                self._last_expiry = now
+        self.written += len(batch)
+
+    def _trim_client(self, connection: 'sqlite3.Connection', client_id: str) -> None:
+        """Delete a client's entries beyond the newest max_entries_per_client."""
+        boundary = connection.execute(
+            'SELECT created_at, id FROM history WHERE client_id = ? '
+            'ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET ?',
+            (client_id, self.max_entries_per_client)
+        ).fetchone()
+        if boundary is not None:
+            connection.execute(
+                'DELETE FROM history WHERE client_id = ? AND '
+                '(created_at < ? OR (created_at = ? AND id <= ?))',
+                (client_id, boundary[0], boundary[0], boundary[1])
+            )
+
+    def flush(self, timeout: Optional[float] = 30.0) -> bool:
+        """
+        Block until every entry recorded so far is written.
+
+        Args:
+            timeout: Seconds to wait at most, or None to wait as long as the writer runs
+
+        Returns:
+            True once the entries are written, False on timeout or if the writer has stopped
+        """
+        writer = self._writer
+        if writer is None:
+            return True
+        written = threading.Event()
+        with self._lock:
+            self._waiters.append(written)
+        self._wake.set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not written.wait(0.1):
+            if not writer.is_alive():
+                return False
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+        return True
+
+    def shutdown(self) -> None:
+        """Write out pending entries and stop the writer thread."""
+        writer = getattr(self, '_writer', None)
+        if writer is not None:
+            self._stopping = True
+            self._wake.set()
+            writer.join()
+            self._writer = None
+
+    def _reset_after_fork(self) -> None:
+        """The writer thread and connections do not survive fork; start fresh in the child."""
+        self._writer = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pending = deque()
+        self._waiters = []
+        self._wake = threading.Event()
+
+    # Reading
+
+    def query(self, client_id: str, limit: int = 50, operation: Optional[str] = None,
+              since: Optional[float] = None, until: Optional[float] = None,
+              cursor: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return one page of a client's history, newest first.
+
+        Args:
+            client_id: Validated client ID
+            limit: Entries per page (1 to MAX_PAGE_SIZE)
+            operation: Only entries of this operation
+            since: Only entries at or after this Unix timestamp
+            until: Only entries before this Unix timestamp
+            cursor: next_cursor of the previous page
+
+        Returns:
+            Dictionary with the entries and the cursor of the next page (None on the last page)
+
+        Raises:
+            CalculatorError: If the limit or cursor is invalid
+        """
+        if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= MAX_PAGE_SIZE:
+            raise CalculatorError(f"Limit must be an integer between 1 and {MAX_PAGE_SIZE}")
+
+        conditions, params = ['client_id = ?'], [client_id]
+        if operation is not None:
+            conditions.append('operation = ?')
+            params.append(operation)
+        if since is not None:
+            conditions.append('created_at >= ?')
+            params.append(since)
+        if until is not None:
+            conditions.append('created_at < ?')
+            params.append(until)
+        if cursor is not None:
+            created_at, entry_id = _parse_cursor(cursor)
+            conditions.append('(created_at < ? OR (created_at = ? AND id < ?))')
+            params.extend((created_at, created_at, entry_id))
+
+        # One extra row tells whether another page follows
+        rows = self._connection().execute(
+            'SELECT id, created_at, operation, expression, result FROM history '
+            f'WHERE {" AND ".join(conditions)} ORDER BY created_at DESC, id DESC LIMIT ?',
+            params + [limit + 1]
+        ).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = f'{rows[-1][1]!r}:{rows[-1][0]}'
+        items = [_row_to_item(row) for row in rows]
+        return {'count': len(items), 'items': items, 'next_cursor': next_cursor}
+
+    def export(self, client_id: str, export_format: str = 'ndjson',
+               chunk_size: int = 1000) -> Iterator[str]:
+        """
+        Stream a client's whole history, oldest first.
+
+        Args:
+            client_id: Validated client ID
+            export_format: 'ndjson' (one JSON object per line) or 'csv'
+            chunk_size: Rows fetched from the database at a time
+
+        Yields:
+            Text chunks of the export
+
+        Raises:
+            CalculatorError: If the format is unknown
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise CalculatorError(f"Export format must be one of: {', '.join(EXPORT_FORMATS)}")
+        # A dedicated connection keeps the read snapshot while the response streams
+        import sqlite3
+        connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        return self._export_rows(connection, client_id, export_format, chunk_size)
+
+    @staticmethod
+    def _export_rows(connection: 'sqlite3.Connection', client_id: str, export_format: str,
+                     chunk_size: int) -> Iterator[str]:
+        try:
+            rows = connection.execute(
+                'SELECT id, created_at, operation, expression, result FROM history '
+                'WHERE client_id = ? ORDER BY created_at, id', (client_id,)
+            )
+            if export_format == 'csv':
+                import csv
+                import io
+                buffer = io.StringIO()
+                writer = csv.writer(buffer, lineterminator='\n')
+                writer.writerow(('id', 'timestamp', 'operation', 'expression', 'result'))
+            while True:
+                chunk = rows.fetchmany(chunk_size)
+                if not chunk:
+                    return
+                if export_format == 'csv':
+                    writer.writerows(
+                        (entry_id, repr(created_at), operation, expression, _decode_result(result))
+                        for entry_id, created_at, operation, expression, result in chunk
+                    )
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+                else:
+                    yield ''.join(JSON_CODEC.dumps(_row_to_item(row)) + '\n' for row in chunk)
+        finally:
+            connection.close()
+
+    def clear(self, client_id: str) -> int:
+        """
+        Delete a client's history, including entries still queued.
+
+        Returns:
+            Number of entries deleted
+        """
+        self.flush()
+        connection = self._connection()
+        with connection:
+            return connection.execute('DELETE FROM history WHERE client_id = ?', (client_id,)).rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Writer counters for monitoring."""
+        return {
+            'enabled': self.enabled,
+            'queued': len(self._pending),
+            'written': self.written,
+            'dropped': self.dropped
+        }
+
+
+# Process-wide history store, configured by create_app (disabled until a path is set)
+HISTORY = CalculationHistory()
+
+atexit.register(HISTORY.shutdown)
+os.register_at_fork(after_in_child=HISTORY._reset_after_fork)
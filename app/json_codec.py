@@ -0,0 +1,246 @@
+"""
+JSON Codec
+Pluggable JSON encoding/decoding for request and response bodies.
+
+orjson or msgspec is used when installed, otherwise the stdlib json module.
+Every backend produces byte-for-byte the same output as Flask's default
+provider in compact mode (sorted keys, ASCII-only, Python float repr), and
+accepts exactly the documents the stdlib accepts: whenever a fast backend
+would differ (non-finite floats, huge integers, lone surrogates, ...), the
+payload is handed to the stdlib instead. (msgspec encodes dates and
+dataclasses natively; the API never returns either.)
+
+Backends are imported when selected, so 'auto' never loads msgspec when orjson
+is installed.
+"""
+import codecs
+import dataclasses
+import decimal
+import importlib
+import json
+import re
+import uuid
+from datetime import date
+from typing import Any, Callable, Optional, Tuple, Type
+
+from Operators.Calculation import CalculationResult
+
+
+BACKENDS = ('orjson', 'msgspec', 'json')
+
+
+def _import_backend(name: str) -> Any:
+    """Import a fast backend module, or return None when it is not installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:  # pragma: no cover - depends on the environment
+        return None
+
+
+def __getattr__(name: str) -> Any:
+    # json_codec.orjson / json_codec.msgspec: the backend module, or None when not installed
+    if name in ('orjson', 'msgspec'):
+        return _import_backend(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Outputs that a fast backend formats differently from the stdlib:
+# exponent floats, floats below 1e-4, and 'null' from NaN/Infinity
+_EXPONENT = re.compile(rb'e[-+\d]')
+_FLOAT_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?(?:e[-+]?\d+)?')
+# Integers fast decoders may turn into floats
+_LONG_INTEGER = re.compile(rb'\d{19}')
+
+
+def _default(obj: Any) -> Any:
+    """Serialize calculation results and the extra types Flask's default provider supports."""
+    if type(obj) is CalculationResult:
+        return obj.to_dict()
+    if isinstance(obj, date):
+        from werkzeug.http import http_date
+        return http_date(obj)
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _format_float(match: 're.Match') -> str:
+    token = match.group(0)
+    if token[0] == '"' or ('e' not in token and '.' not in token):
+        return token
+    return repr(float(token))
+
+
+def _escape_non_ascii(error: UnicodeEncodeError) -> Tuple[str, int]:
+    """Encoding error handler writing non-ASCII characters as JSON \\u escapes."""
+    escaped = []
+    for char in error.object[error.start:error.end]:
+        code = ord(char)
+        if code < 0x10000:
+            escaped.append(f'\\u{code:04x}')
+        else:
+            code -= 0x10000
+            escaped.append(f'\\u{0xd800 | (code >> 10):04x}\\u{0xdc00 | (code & 0x3ff):04x}')
+    return ''.join(escaped), error.end
+
+
+codecs.register_error('calculator.json_ascii', _escape_non_ascii)
+
+
+_stdlib_encode = json.JSONEncoder(
+    ensure_ascii=True, sort_keys=True, separators=(',', ':'), default=_default
+).encode
+
+
+class JSONCodec:
+    """
+    JSON encoder/decoder with a selectable backend.
+
+    Attributes:
+        backend: Name of the active backend ('orjson', 'msgspec' or 'json')
+    """
+
+    def __init__(self, backend: str = 'auto'):
+        """
+        Args:
+            backend: 'auto' for the fastest installed backend, or one of BACKENDS
+        """
+        self.configure(backend)
+
+    def configure(self, backend: str = 'auto') -> None:
+        """
+        Select the backend.
+
+        Args:
+            backend: 'auto' for the fastest installed backend, or one of BACKENDS
+
+        Raises:
+            ValueError: If the backend is unknown or not installed
+        """
+        if backend == 'auto':
+            backend = next((name for name in BACKENDS[:-1] if _import_backend(name)), 'json')
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown JSON backend: {backend}")
+        module = _import_backend(backend) if backend != 'json' else None
+        if backend != 'json' and module is None:
+            raise ValueError(f"JSON backend not installed: {backend}")
+
+        self.backend = backend
+        self._encode: Optional[Callable[[Any], bytes]] = None
+        self._decode: Optional[Callable[[bytes], Any]] = None
+        # Exceptions meaning "let the stdlib decide"
+        self._decode_errors: Tuple[Type[BaseException], ...] = (ValueError, TypeError)
+        if backend == 'orjson':
+            option = module.OPT_SORT_KEYS | module.OPT_PASSTHROUGH_DATACLASS | \
+                module.OPT_PASSTHROUGH_DATETIME
+            encode = module.dumps
+            self._encode = lambda obj: encode(obj, default=_default, option=option)
+            self._decode = module.loads
+        elif backend == 'msgspec':
+            self._encode = module.json.Encoder(enc_hook=_default, order='sorted').encode
+            self._decode = module.json.Decoder().decode
+            # msgspec reports some numeric range problems as ValidationError
+            self._decode_errors += (module.MsgspecError,)
+
+    def dumps(self, obj: Any) -> str:
+        """
+        Encode an object as compact JSON text.
+
+        Args:
+            obj: Object to encode
+
+        Returns:
+            JSON text, identical for every backend
+
+        Raises:
+            TypeError: If the object cannot be serialized
+        """
+        if self._encode is not None:
+            try:
+                encoded = self._encode(obj)
+            except (TypeError, ValueError):
+                pass
+            else:
+                # 'null' may be a NaN or Infinity the stdlib writes differently
+                if b'null' not in encoded:
+                    return _normalize(encoded)
+        return _stdlib_encode(obj)
+
+    def dumpb(self, obj: Any) -> bytes:
+        """Encode an object as compact JSON bytes."""
+        return self.dumps(obj).encode('ascii')
+
+    def loads(self, data: Any) -> Any:
+        """
+        Decode a JSON document.
+
+        Args:
+            data: JSON text as str or bytes
+
+        Returns:
+            Decoded object
+
+        Raises:
+            ValueError: If the document is not valid JSON
+        """
+        if self._decode is not None and isinstance(data, bytes) and not _LONG_INTEGER.search(data):
+            try:
+                return self._decode(data)
+            except self._decode_errors:
+                pass
+        return json.loads(data)
+
+
+def _normalize(encoded: bytes) -> str:
+    """Rewrite fast-backend output into the stdlib's float repr and ASCII escaping."""
+    text = encoded.decode('utf-8')
+    if _EXPONENT.search(encoded) or b'0.0000' in encoded:
+        text = _FLOAT_TOKEN.sub(_format_float, text)
+    if not encoded.isascii():
+        escaped = text.encode('ascii', 'backslashreplace')
+        if b'\\' in encoded or b'\\U' in escaped:
+            # Existing escapes or astral characters need the exact JSON error handler
+            text = text.encode('ascii', 'calculator.json_ascii').decode('ascii')
+        else:
+            # The C backslashreplace handler writes \xNN where JSON needs \u00NN
+            text = escaped.replace(b'\\x', b'\\u00').decode('ascii')
+    if b'\x7f' in encoded:
+        text = text.replace('\x7f', '\\u007f')
+    return text
+
+
+# Process-wide codec, configured by create_app
+JSON_CODEC = JSONCodec()
+
+
+def init_app(app) -> None:
+    """
+    Configure JSON_CODEC from app.config['JSON_CODEC'] and install it as the app's JSON provider.
+
+    Args:
+        app: Flask application
+    """
+    from flask.json.provider import DefaultJSONProvider
+
+    class CodecJSONProvider(DefaultJSONProvider):
+        """Flask JSON provider delegating compact encoding and all decoding to JSON_CODEC."""
+
+        # Used by the indented (debug mode) fallback, so it must handle CalculationResult too
+        default = staticmethod(_default)
+
+        def dumps(self, obj: Any, **kwargs: Any) -> str:
+            # jsonify passes only the separators in compact (non-debug) mode
+            if kwargs == {'separators': (',', ':')} and self.sort_keys and self.ensure_ascii:
+                return JSON_CODEC.dumps(obj)
+            return super().dumps(obj, **kwargs)
+
+        def loads(self, s: Any, **kwargs: Any) -> Any:
+            if kwargs:
+                return super().loads(s, **kwargs)
+            return JSON_CODEC.loads(s)
+
+    JSON_CODEC.configure(app.config.get('JSON_CODEC', 'auto'))
+    app.json = CodecJSONProvider(app)
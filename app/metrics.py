@@ -0,0 +1,329 @@
+"""
+Metrics
+Prometheus-style request/operation counters and latency histograms.
+
+Hot-path updates go to per-thread stores, so recording never takes a lock.
+When a metrics directory is configured, each worker process periodically writes
+its snapshot there and /metrics aggregates all worker files, giving correct
+totals across gunicorn workers. Files of workers that are no longer running are
+deleted when metrics are collected, so recycled workers do not accumulate; their
+counts leave the totals, which Prometheus treats as a counter reset.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from Operators.OperatorRegistry import OPERATIONS
+
+
+# Latency buckets in seconds, from microseconds (single operations) to seconds (large batches)
+BUCKETS = (
+    0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5
+)
+
+# name -> (type, help)
+METRIC_INFO = {
+    'calculator_requests_total': ('counter', 'HTTP requests by endpoint and status code.'),
+    'calculator_request_duration_seconds': ('histogram', 'HTTP request latency by endpoint.'),
+    'calculator_operations_total': ('counter', 'Calculator operations by operation type.'),
+    'calculator_operation_errors_total': ('counter', 'Calculator errors by operation and error class.'),
+    'calculator_operation_duration_seconds': ('histogram', 'CalculatorService.calculate latency by operation type.'),
+    'calculator_coalesced_total': ('counter', 'Requests served by an identical in-flight computation, by kind.'),
+    'calculator_rejected_total': ('counter', 'Requests rejected by admission control, by reason.'),
+}
+
+Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def error_class(message: str) -> str:
+    """
+    Reduce a CalculatorError message to a low-cardinality class label.
+
+    'Unknown operation: foo' -> 'unknown_operation', 'Division by zero' -> 'division_by_zero'
+    """
+    head = message.split(':', 1)[0].strip().lower()
+    label = ''.join(char if char.isalnum() else '_' for char in head).strip('_')
+    return label or 'unknown'
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether a process with this ID exists on this host."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, but belongs to another user
+        return True
+    return True
+
+
+class Metrics:
+    """
+    Collection of counters and histograms with lock-free per-thread recording.
+    """
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = 1.0):
+        """
+        Args:
+            directory: Shared directory for cross-process aggregation, or None for in-process only
+            flush_interval: Minimum seconds between snapshot writes to the directory
+        """
+        self._local = threading.local()
+        self._stores: List[Dict[Key, Any]] = []
+        self._stores_lock = threading.Lock()
+        self._last_flush = 0.0
+        self.configure(directory, flush_interval)
+
+    def configure(self, directory: Optional[str] = None, flush_interval: float = 1.0) -> None:
+        """
+        Set the shared directory used for cross-process aggregation.
+
+        Args:
+            directory: Shared directory, or None for in-process only
+            flush_interval: Minimum seconds between snapshot writes
+        """
+        self.directory = directory
+        self.flush_interval = flush_interval
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _store(self) -> Dict[Key, Any]:
+        """Return the calling thread's store, registering it on first use."""
+        store = getattr(self._local, 'store', None)
+        if store is None:
+            store = {}
+            self._local.store = store
+            with self._stores_lock:
+                self._stores.append(store)
+        return store
+
+    def inc(self, name: str, labels: Tuple[Tuple[str, str], ...], amount: int = 1) -> None:
+        """Increment a counter."""
+        store = self._store()
+        key = (name, labels)
+        store[key] = store.get(key, 0) + amount
+
+    def observe(self, name: str, labels: Tuple[Tuple[str, str], ...], seconds: float) -> None:
+        """Record a histogram observation."""
+        store = self._store()
+        key = (name, labels)
+        histogram = store.get(key)
+        if histogram is None:
+            # One slot per bucket plus +Inf, then sum
+            histogram = store[key] = [0] * (len(BUCKETS) + 1) + [0.0]
+        histogram[bisect_left(BUCKETS, seconds)] += 1
+        histogram[-1] += seconds
+
+    def record_operation(self, operation: Any, seconds: float, error: Optional[str] = None) -> None:
+        """
+        Record one CalculatorService.calculate call.
+
+        Args:
+            operation: Operation name from the request
+            seconds: Time spent in calculate
+            error: CalculatorError message if the call failed
+        """
+        label = operation if isinstance(operation, str) and operation in OPERATIONS else 'unknown'
+        labels = (('operation', label),)
+        self.inc('calculator_operations_total', labels)
+        self.observe('calculator_operation_duration_seconds', labels, seconds)
+        if error is not None:
+            self.inc('calculator_operation_errors_total',
+                     (('operation', label), ('error', error_class(error))))
+
+    def record_coalesced(self, kind: str) -> None:
+        """
+        Record a call that waited for an identical in-flight computation.
+
+        Args:
+            kind: 'calculate', 'expression' or 'batch'
+        """
+        self.inc('calculator_coalesced_total', (('kind', kind),))
+
+    def record_rejected(self, reason: str) -> None:
+        """
+        Record a request rejected by admission control.
+
+        Args:
+            reason: 'client_rate', 'global_rate', 'queue_wait' or 'concurrency'
+        """
+        self.inc('calculator_rejected_total', (('reason', reason),))
+
+    def record_request(self, endpoint: str, status: int, seconds: float) -> None:
+        """
+        Record one HTTP request.
+
+        Args:
+            endpoint: URL rule of the matched route
+            status: Response status code
+            seconds: Full request latency
+        """
+        self.inc('calculator_requests_total', (('endpoint', endpoint), ('status', str(status))))
+        self.observe('calculator_request_duration_seconds', (('endpoint', endpoint),), seconds)
+
+        if self.directory and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def merge(self, entries: Iterable[Tuple[Key, Any]]) -> None:
+        """
+        Add values recorded elsewhere, such as a batch pool worker's snapshot items.
+
+        Args:
+            entries: (key, value) pairs as returned by snapshot().items()
+        """
+        _merge(self._store(), entries)
+
+    def snapshot(self) -> Dict[Key, Any]:
+        """
+        Merge all thread stores of this process.
+
+        Returns:
+            Mapping of (name, labels) to counter value or histogram slots
+        """
+        with self._stores_lock:
+            stores = list(self._stores)
+        merged: Dict[Key, Any] = {}
+        for store in stores:
+            _merge(merged, list(store.items()))
+        return merged
+
+    def flush(self) -> None:
+        """Write this process's snapshot to the shared directory."""
+        if not self.directory:
+            return
+        self._last_flush = time.monotonic()
+        entries = [[name, list(labels), value] for (name, labels), value in self.snapshot().items()]
+        path = os.path.join(self.directory, f'worker-{os.getpid()}.json')
+        temp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'w') as handle:
+            json.dump(entries, handle)
+        os.replace(temp_path, path)
+
+    def collect(self) -> Dict[Key, Any]:
+        """
+        Aggregate metrics across all worker processes.
+
+        Returns:
+            Mapping of (name, labels) to aggregated value
+        """
+        if not self.directory:
+            return self.snapshot()
+
+        self.flush()
+        merged: Dict[Key, Any] = {}
+        for filename in os.listdir(self.directory):
+            if not filename.endswith('.json'):
+                continue
+            pid = filename[len('worker-'):-len('.json')]
+            if filename.startswith('worker-') and pid.isdigit() and not _process_alive(int(pid)):
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except OSError:
+                    pass
+                continue
+            try:
+                with open(os.path.join(self.directory, filename)) as handle:
+                    entries = json.load(handle)
+            except (OSError, ValueError):
+                continue
+            _merge(merged, (((name, tuple(tuple(label) for label in labels)), value)
+                            for name, labels, value in entries))
+        return merged
+
+    def render(self) -> str:
+        """
+        Render aggregated metrics in the Prometheus text exposition format.
+
+        Returns:
+            Exposition text
+        """
+        collected = self.collect()
+        lines = []
+        for name, (metric_type, help_text) in METRIC_INFO.items():
+            series = sorted((labels, value) for (key, labels), value in collected.items()
+                            if key == name)
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            for labels, value in series:
+                if metric_type == 'counter':
+                    lines.append(f'{name}{_format_labels(labels)} {value}')
+                else:
+                    lines.extend(_render_histogram(name, labels, value))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """Clear all recorded values in this process."""
+        with self._stores_lock:
+            for store in self._stores:
+                store.clear()
+
+
+def _merge(target: Dict[Key, Any], entries: Iterable[Tuple[Key, Any]]) -> None:
+    """Add counter values and histogram slots from entries into target."""
+    for key, value in entries:
+        if isinstance(value, list):
+            existing = target.get(key)
+            if existing is None:
+                target[key] = list(value)
+            else:
+                for index, slot in enumerate(value):
+                    existing[index] += slot
+        else:
+            target[key] = target.get(key, 0) + value
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]], extra: str = '') -> str:
+    """Format a label set as {name="value",...}."""
+    parts = []
+    for name, value in labels:
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{name}="{escaped}"')
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _render_histogram(name: str, labels: Tuple[Tuple[str, str], ...], slots: List[Any]) -> List[str]:
+    """Render cumulative bucket, sum and count lines for one histogram series."""
+    lines = []
+    cumulative = 0
+    for bound, count in zip(BUCKETS + ('+Inf',), slots[:-1]):
+        cumulative += count
+        bucket_label = f'le="{bound}"'
+        lines.append(f'{name}_bucket{_format_labels(labels, bucket_label)} {cumulative}')
+    lines.append(f'{name}_sum{_format_labels(labels)} {slots[-1]}')
+    lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+    return lines
+
+
+# Process-wide metrics collection, configured by create_app
+METRICS = Metrics()
+
+
+def init_app(app) -> None:
+    """
+    Register request hooks that time every request and record it in METRICS.
+
+    Args:
+        app: Flask application
+    """
+    from flask import g, request
+
+    METRICS.configure(app.config.get('METRICS_DIR'), app.config.get('METRICS_FLUSH_INTERVAL', 1.0))
+
+    @app.before_request
+    def start_request_timer():
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        start = g.get('request_start')
+        if start is not None:
+            endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            METRICS.record_request(endpoint, response.status_code, time.perf_counter() - start)
+        return response
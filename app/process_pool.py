@@ -0,0 +1,207 @@
+"""
+Batch Process Pool
+Offloads large batches to a persistent process pool so CPU-bound work scales across
+cores instead of holding the GIL of a gunicorn worker.
+"""
+import atexit
+import math
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+
+def _calculate_chunk(chunk: List[Any]) -> Tuple[List[Dict[str, Any]], float, list]:
+    """
+    Worker entry point: calculate one chunk and report how long it took, along with the
+    operation metrics it recorded so the parent process can merge them into METRICS.
+    """
+    from app.calculator_service import CalculatorService
+    from app.metrics import METRICS
+
+    # A worker runs one chunk at a time, so its metrics since the reset are this chunk's
+    METRICS.reset()
+    start = time.perf_counter()
+    results = CalculatorService.calculate_batch(chunk)
+    return results, time.perf_counter() - start, list(METRICS.snapshot().items())
+
+
+def _initialize_worker(settings: Dict[str, Any]) -> None:
+    """
+    Apply the app's calculation settings in a new worker.
+
+    Workers started with forkserver or spawn never run create_app, so settings that
+    change results (trig table resolution, decimal precision) are passed explicitly.
+    """
+    if 'trig_table_resolution' in settings:
+        from Operators.Operator import Operator
+        Operator.configure_trig_table(settings['trig_table_resolution'])
+    if 'decimal_precision' in settings:
+        from app.calculator_service import CalculatorService
+        CalculatorService.configure_numeric(settings['decimal_precision'])
+
+
+def _warm_up(_: int) -> bool:
+    """Import the calculator modules in a worker so the first real chunk is fast."""
+    import app.calculator_service  # noqa: F401
+    return True
+
+
+class BatchProcessPool:
+    """
+    Persistent process pool that partitions batches into chunks and reassembles the
+    results in input order. Chunk size adapts to the measured per-item cost so each
+    chunk takes roughly target_chunk_seconds.
+    """
+
+    def __init__(self, workers: int = 0, min_batch_size: int = 2000,
+                 target_chunk_seconds: float = 0.02,
+                 settings: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            workers: Number of worker processes; 0 disables the pool
+            min_batch_size: Batches smaller than this run inline in the calling thread
+            target_chunk_seconds: Desired duration of one chunk in a worker
+            settings: Calculation settings applied in each worker at startup:
+                      'trig_table_resolution' and 'decimal_precision'
+        """
+        self.workers = workers
+        self.min_batch_size = min_batch_size
+        self.target_chunk_seconds = target_chunk_seconds
+        self.settings = dict(settings or {})
+        self._executor: Optional['ProcessPoolExecutor'] = None
+        self._lock = threading.Lock()
+        # Exponentially weighted estimate of seconds per item, refined from completed chunks
+        self._seconds_per_item = 0.00001
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def configure(self, workers: int, min_batch_size: int = 2000,
+                  target_chunk_seconds: float = 0.02,
+                  settings: Optional[Dict[str, Any]] = None) -> None:
+        """Reconfigure the pool, shutting down any running workers."""
+        self.shutdown()
+        self.workers = workers
+        self.min_batch_size = min_batch_size
+        self.target_chunk_seconds = target_chunk_seconds
+        self.settings = dict(settings or {})
+
+    def start(self) -> None:
+        """Start the worker processes and warm them up; a no-op when disabled."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._executor is None:
+                # Imported here so servers with the pool disabled never load multiprocessing
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                # forkserver avoids forking a multi-threaded server process
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context(
+                    'forkserver' if 'forkserver' in methods else 'spawn'
+                )
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=context,
+                                                     initializer=_initialize_worker,
+                                                     initargs=(self.settings,))
+                list(self._executor.map(_warm_up, range(self.workers)))
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def chunk_size(self, total: int) -> int:
+        """
+        Choose a chunk size for a batch.
+
+        Aims for chunks of target_chunk_seconds, but never fewer chunks than workers.
+        """
+        by_cost = int(self.target_chunk_seconds / max(self._seconds_per_item, 1e-9))
+        per_worker = math.ceil(total / max(self.workers, 1))
+        return max(1, min(by_cost, per_worker))
+
+    def calculate_batch(self, operations: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Calculate a batch, in the pool when it is large enough.
+
+        Args:
+            operations: List of operation dictionaries
+
+        Returns:
+            List of result or error dictionaries, in input order
+        """
+        from app.calculator_service import CalculatorService
+        from app.metrics import METRICS
+
+        if not self.enabled or len(operations) < self.min_batch_size:
+            return CalculatorService.calculate_batch(operations)
+
+        self.start()
+        size = self.chunk_size(len(operations))
+        chunks = [operations[i:i + size] for i in range(0, len(operations), size)]
+
+        results: List[Dict[str, Any]] = []
+        busy_seconds = 0.0
+        for chunk_results, elapsed, metrics in self._executor.map(_calculate_chunk, chunks):
+            results.extend(chunk_results)
+            busy_seconds += elapsed
+            METRICS.merge(metrics)
+
+        measured = busy_seconds / len(operations)
+        self._seconds_per_item = 0.8 * self._seconds_per_item + 0.2 * measured
+        return results
+
+    def map_chunks(self, function: Callable[[Any], Any], chunks: Iterable[Any],
+                   max_pending: int = 0) -> Iterator[Any]:
+        """
+        Apply a function to a stream of chunks in the workers, yielding results in order.
+
+        Chunks are pulled from the iterable only as results are consumed, with at most
+        max_pending in flight, so memory stays flat for inputs of any size. Runs inline
+        when the pool is disabled.
+
+        Args:
+            function: Picklable module-level function taking one chunk
+            chunks: Iterable of picklable chunks
+            max_pending: Chunks submitted ahead of the one being yielded (default: 2 per worker)
+
+        Yields:
+            function(chunk) for each chunk, in input order
+        """
+        if not self.enabled:
+            for chunk in chunks:
+                yield function(chunk)
+            return
+
+        self.start()
+        limit = max_pending or 2 * self.workers
+        pending = deque()
+        for chunk in chunks:
+            pending.append(self._executor.submit(function, chunk))
+            if len(pending) >= limit:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool configuration and the current chunk-size estimate."""
+        return {
+            'enabled': self.enabled,
+            'workers': self.workers,
+            'running': self._executor is not None,
+            'min_batch_size': self.min_batch_size,
+            'seconds_per_item': self._seconds_per_item
+        }
+
+
+# Process-wide pool, configured by create_app
+BATCH_POOL = BatchProcessPool()
+atexit.register(BATCH_POOL.shutdown)
@@ -0,0 +1,295 @@
+"""
+Request Profiler
+Opt-in, per-request profiles written as collapsed stacks for flame graphs.
+
+A request is profiled when its X-Profile header matches PROFILE_TOKEN, or at random
+with probability PROFILE_SAMPLE_RATE. The profile is a deterministic trace of the
+request thread (sys.setprofile), so it sees every Python and C call, including
+requests far shorter than a sampling interval. Each profile is written to
+PROFILE_DIR as two files sharing a name:
+
+    <id>.folded  one "root;caller;...;callee nanoseconds" line per stack, with the
+                 self time of that stack; flamegraph.pl, speedscope and inferno
+                 read it directly
+    <id>.json    endpoint, status and the time spent in each phase
+
+Phases are derived from the stacks: json_decode (request body parsing), dispatch
+(CalculatorService), operator (Operators.Operator math, including the libm calls
+it makes), response_encode (JSON serialization of the response) and other. The
+phase timings are also returned in a Server-Timing header, with the profile ID in
+X-Profile-Id.
+
+When neither trigger is configured no request hooks are registered, so the profiler
+costs nothing. Tracing makes a profiled request several times slower and the
+timings include that overhead, so compare phases with each other rather than with
+unprofiled latency.
+"""
+import hmac
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+PROFILE_HEADER = 'X-Profile'
+DEFAULT_DIRECTORY = os.path.join(tempfile.gettempdir(), 'calculator-profiles')
+
+# Frame name prefixes marking each phase. A stack belongs to the phase of its
+# outermost marker, except that operator frames inside dispatch count as operator.
+PHASE_MARKERS = (
+    ('json_decode', ('werkzeug.wrappers.request:Request.get_json', 'flask.wrappers:Request.get_json',
+                     'app.asgi:CalculatorASGI._decode_json', 'app.json_codec:JSONCodec.loads')),
+    ('dispatch', ('app.calculator_service:',)),
+    ('operator', ('Operators.Operator:',)),
+    ('response_encode', ('flask.json:jsonify', 'app.asgi:_encode_json',
+                         'app.json_codec:JSONCodec.dumps', 'app.json_codec:JSONCodec.dumpb')),
+)
+PHASES = tuple(phase for phase, _ in PHASE_MARKERS) + ('other',)
+
+
+def _phase_of(frame_name: str) -> Optional[str]:
+    for phase, prefixes in PHASE_MARKERS:
+        if frame_name.startswith(prefixes):
+            return phase
+    return None
+
+
+def classify(stack: str) -> str:
+    """
+    Phase of a collapsed stack.
+
+    Args:
+        stack: Frame names joined by ';', outermost first
+
+    Returns:
+        One of PHASES
+    """
+    phase = None
+    for frame_name in stack.split(';'):
+        marker = _phase_of(frame_name)
+        if marker is not None and (phase is None or (phase == 'dispatch' and marker == 'operator')):
+            phase = marker
+    return phase or 'other'
+
+
+class RequestProfile:
+    """Trace of one request on the current thread, aggregated into collapsed stacks."""
+
+    def __init__(self, root: str = 'request'):
+        """
+        Args:
+            root: Name of the outermost frame, replaced by the endpoint in finish()
+        """
+        self.root = root
+        self.stacks: Dict[str, int] = {}
+        self.elapsed = 0
+        self._open: List[list] = []
+        self._code_names: Dict[Any, str] = {}
+        self._started = 0
+        self._covered = 0
+        self._active = False
+
+    def start(self) -> 'RequestProfile':
+        """Start tracing calls made by the current thread."""
+        self._active = True
+        self._started = time.perf_counter_ns()
+        sys.setprofile(self._event)
+        return self
+
+    def stop(self) -> None:
+        """Stop tracing; frames still open are closed at this point. Safe to call twice."""
+        if not self._active:
+            return
+        sys.setprofile(None)
+        now = time.perf_counter_ns()
+        self._active = False
+        while self._open:
+            self._close(now)
+        self.elapsed = now - self._started
+        # Time in the frames that were already running when tracing started
+        self.stacks[''] = self.stacks.get('', 0) + max(self.elapsed - self._covered, 0)
+
+    def _name(self, frame: Any, event: str, arg: Any) -> str:
+        if event == 'call':
+            code = frame.f_code
+            name = self._code_names.get(code)
+            if name is None:
+                name = f"{frame.f_globals.get('__name__', '?')}:{code.co_qualname}"
+                self._code_names[code] = name
+            return name
+        module = getattr(arg, '__module__', None) or 'builtins'
+        return f"{module}:{getattr(arg, '__qualname__', type(arg).__name__)}"
+
+    def _event(self, frame: Any, event: str, arg: Any) -> None:
+        if event == 'call' or event == 'c_call':
+            name = self._name(frame, event, arg).replace(';', ',')
+            path = f'{self._open[-1][0]};{name}' if self._open else name
+            self._open.append([path, time.perf_counter_ns(), 0])
+        elif self._open:
+            # return, c_return, c_exception; returns from frames entered before
+            # start() arrive with nothing open and are ignored
+            self._close(time.perf_counter_ns())
+
+    def _close(self, now: int) -> None:
+        path, started, children = self._open.pop()
+        total = now - started
+        self.stacks[path] = self.stacks.get(path, 0) + total - children
+        if self._open:
+            self._open[-1][2] += total
+        else:
+            self._covered += total
+
+    def collapsed(self) -> List[str]:
+        """Collapsed stack lines: 'root;frame;...;frame nanoseconds'."""
+        root = self.root.replace(';', ',')
+        return [f'{root};{path} {ns}' if path else f'{root} {ns}'
+                for path, ns in self.stacks.items() if ns > 0]
+
+    def phases(self) -> Dict[str, float]:
+        """Milliseconds spent in each phase, and the total."""
+        totals = dict.fromkeys(PHASES, 0)
+        for path, ns in self.stacks.items():
+            totals[classify(path)] += ns
+        timings = {phase: ns / 1e6 for phase, ns in totals.items()}
+        timings['total'] = self.elapsed / 1e6
+        return timings
+
+
+class RequestProfiler:
+    """Decides which requests to profile and writes their profiles."""
+
+    def __init__(self):
+        self.token: Optional[str] = None
+        self.sample_rate = 0.0
+        self.directory = DEFAULT_DIRECTORY
+        self.max_files = 1000
+        self.written = 0
+        self._files: deque = deque()
+        self._lock = threading.Lock()
+
+    def configure(self, token: Optional[str] = None, sample_rate: float = 0.0,
+                  directory: Optional[str] = None, max_files: int = 1000) -> None:
+        """
+        Configure the triggers and output.
+
+        Args:
+            token: X-Profile header value that profiles a request (None disables the header)
+            sample_rate: Fraction of requests profiled at random (0 disables sampling)
+            directory: Where profiles are written, created if missing (None: DEFAULT_DIRECTORY)
+            max_files: Profiles this process keeps; older ones are deleted
+        """
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("Profile sample rate must be between 0 and 1")
+        self.token = token or None
+        self.sample_rate = sample_rate
+        self.directory = directory or DEFAULT_DIRECTORY
+        self.max_files = max_files
+        self.written = 0
+        self._files.clear()
+
+    @property
+    def enabled(self) -> bool:
+        return self.token is not None or self.sample_rate > 0
+
+    def begin(self, header: Optional[str], root: str = 'request') -> Optional[RequestProfile]:
+        """
+        Start a profile if this request is selected.
+
+        Args:
+            header: X-Profile header value, if any
+            root: Outermost frame name
+
+        Returns:
+            The running profile, or None
+        """
+        if header and self.token is not None and hmac.compare_digest(header.encode(), self.token.encode()):
+            return RequestProfile(root).start()
+        if self.sample_rate and random.random() < self.sample_rate:
+            return RequestProfile(root).start()
+        return None
+
+    def finish(self, profile: RequestProfile, endpoint: str, status: int) -> Dict[str, str]:
+        """
+        Stop a profile and write it.
+
+        Args:
+            profile: Profile returned by begin()
+            endpoint: Route, used as the root frame
+            status: Response status code
+
+        Returns:
+            Response headers: Server-Timing with the phase timings and X-Profile-Id
+        """
+        profile.stop()
+        profile.root = endpoint
+        phases = profile.phases()
+        with self._lock:
+            self.written += 1
+            profile_id = f'{int(time.time() * 1000)}-{os.getpid()}-{self.written}'
+        stem = os.path.join(self.directory, profile_id)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(f'{stem}.folded', 'w') as folded:
+            folded.write('\n'.join(profile.collapsed()) + '\n')
+        with open(f'{stem}.json', 'w') as summary:
+            json.dump({'id': profile_id, 'endpoint': endpoint, 'status': status,
+                       'time': time.time(), 'phases_ms': phases}, summary)
+        self._retain(stem)
+        return {
+            'Server-Timing': ', '.join(f'{phase};dur={ms:.3f}' for phase, ms in phases.items()),
+            'X-Profile-Id': profile_id
+        }
+
+    def _retain(self, stem: str) -> None:
+        with self._lock:
+            self._files.append(stem)
+            expired = [self._files.popleft() for _ in range(len(self._files) - self.max_files)]
+        for old in expired:
+            for suffix in ('.folded', '.json'):
+                try:
+                    os.remove(old + suffix)
+                except OSError:
+                    pass
+
+
+# Process-wide profiler, configured by init_app
+PROFILER = RequestProfiler()
+
+
+def init_app(app) -> None:
+    """
+    Configure PROFILER from the app config and register the request hooks if enabled.
+
+    Args:
+        app: Flask application
+    """
+    from flask import g, request
+
+    config = app.config
+    PROFILER.configure(config['PROFILE_TOKEN'], config['PROFILE_SAMPLE_RATE'],
+                       config['PROFILE_DIR'], config['PROFILE_MAX_FILES'])
+    if not PROFILER.enabled:
+        return
+
+    @app.before_request
+    def start_profile():
+        g.profile = PROFILER.begin(request.headers.get(PROFILE_HEADER))
+
+    @app.after_request
+    def write_profile(response):
+        profile = g.pop('profile', None)
+        if profile is not None:
+            rule = request.url_rule.rule if request.url_rule is not None else request.path
+            response.headers.update(PROFILER.finish(profile, f'{request.method} {rule}',
+                                                    response.status_code))
+        return response
+
+    @app.teardown_request
+    def discard_profile(exception=None):
+        # Only reached with a profile still running if the response was never built
+        profile = g.pop('profile', None)
+        if profile is not None:
+            profile.stop()
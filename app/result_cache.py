@@ -0,0 +1,151 @@
+"""
+Result Cache
+Bounded, thread-safe LRU cache with optional TTL and hit-rate statistics.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+MISSING = object()
+
+
+class ResultCache:
+    """
+    Size-bounded LRU cache with optional per-entry time-to-live.
+    All operations take a single lock, so one instance can be shared by gunicorn threads.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        """
+        Args:
+            max_size: Maximum number of entries before the least recently used is evicted
+            ttl: Seconds an entry stays valid, or None for no expiry
+        """
+        if max_size <= 0:
+            raise ValueError("Cache size must be positive")
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """
+        Look up a key, refreshing its LRU position.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._entries[key] = (expires_at, value)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def update(self, key: Hashable, function: Callable[[Any], Any]) -> Any:
+        """
+        Atomically replace a value with function(current value).
+
+        Args:
+            key: Cache key
+            function: Called with the live value, or MISSING if there is none; if it
+                      raises, the entry is left unchanged
+
+        Returns:
+            The stored value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            now = time.monotonic()
+            if entry is not None and entry[0] is not None and entry[0] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            value = function(MISSING if entry is None else entry[1])
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+            self._entries[key] = (now + self.ttl if self.ttl is not None else None, value)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return value
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove a key; returns whether it was present."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def values(self) -> List[Any]:
+        """Snapshot of the stored values, including expired ones not yet removed."""
+        with self._lock:
+            return [value for _, value in self._entries.values()]
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with size, limits, hits, misses, evictions, expirations and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -2,12 +2,39 @@
 API Routes
 Defines REST API endpoints for calculator operations.
 """
-from flask import Blueprint, request, jsonify, render_template
+from flask import (
+    Blueprint, Response, request, jsonify, redirect, render_template, current_app,
+    stream_with_context
+)
+from werkzeug.exceptions import HTTPException
+from app.api_handlers import (
+    HEALTH_PAYLOAD, error_payload, handle_calculate, handle_batch, handle_expression, validate_calculate_query,
+    handle_history, handle_history_clear, validate_history_export,
+    handle_session_create, handle_session_apply, handle_session_get, handle_session_delete
+)
 from app.calculator_service import CalculatorService
-from Operators.Operator import CalculatorError
+from app.history import HISTORY
+from app.json_codec import JSON_CODEC
+from app.metrics import METRICS
+from app.sessions import SESSIONS
 
 calculator_bp = Blueprint('calculator', __name__)
 
+# Cache lifetime in seconds of redirects to canonical calculation URLs: short, so a
+# change to the canonical form reaches clients without waiting out a year-long entry
+REDIRECT_MAX_AGE = 3600
+
+
+@calculator_bp.errorhandler(Exception)
+def server_error(e):
+    """
+    Report unexpected failures, including responses that cannot be serialized, as the
+    standard JSON error body instead of an HTML error page.
+    """
+    if isinstance(e, HTTPException):
+        return e
+    return jsonify(error_payload(f'Server error: {str(e)}')), 500
+
 
 @calculator_bp.route('/')
 def index():
@@ -34,43 +61,292 @@ def calculate():
     Returns:
         JSON response with result or error
     """
-    try:
-        # Get JSON data with silent=True to handle malformed JSON
-        data = request.get_json(silent=True)
-
-        if not data:
-            return jsonify({
-                'success': False,
-                'error': 'No data provided'
-            }), 400
-
-        operation = data.get('operation')
-        if not operation:
-            return jsonify({
-                'success': False,
-                'error': 'Operation not specified'
-            }), 400
-
-        result = CalculatorService.calculate(operation, data)
-        return jsonify(result), 200
-
-    except CalculatorError as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 400
-
-    except ValueError as e:
-        return jsonify({
-            'success': False,
-            'error': f'Invalid input: {str(e)}'
-        }), 400
-
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': f'Server error: {str(e)}'
-        }), 500
+    # Get JSON data with silent=True to handle malformed JSON
+    payload, status = handle_calculate(request.get_json(silent=True),
+                                       request.headers.get('X-Client-ID'))
+    return jsonify(payload), status
+
+
+@calculator_bp.route('/api/calculate', methods=['GET'])
+def calculate_query():
+    """
+    Cacheable calculator endpoint taking the /api/calculate parameters in the query
+    string, e.g. /api/calculate?operation=log&number=8&base=2.
+
+    Results are pure functions of the parameters, so each calculation has one
+    canonical URL: other spellings are permanently redirected to it (cached for at most
+    REDIRECT_MAX_AGE), and results are sent with a strong ETag and a long, immutable
+    Cache-Control lifetime. A matching If-None-Match is answered with 304. Results are
+    not added to the history.
+
+    Returns:
+        JSON response with result or error, a redirect to the canonical URL, or 304
+    """
+    canonical, error = validate_calculate_query(request.args)
+    if error is not None:
+        payload, status = error
+        return jsonify(payload), status
+
+    query, data = canonical
+    max_age = current_app.config['HTTP_CACHE_MAX_AGE']
+    redirected = request.query_string.decode('latin-1') != query
+    if redirected:
+        response = redirect(f'{request.script_root}{request.path}?{query}', 301)
+        max_age = min(max_age, REDIRECT_MAX_AGE)
+    else:
+        payload, status = handle_calculate(data)
+        if status != 200:
+            return jsonify(payload), status
+        response = jsonify(payload)
+        response.add_etag()
+    if max_age > 0:
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        # Only the result itself can never change; a redirect depends on the canonical form
+        response.cache_control.immutable = not redirected
+    else:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@calculator_bp.route('/api/calculate/batch', methods=['POST'])
+def calculate_batch():
+    """
+    Batch calculator API endpoint.
+
+    Expects JSON body with:
+    {
+        "operations": [  # List of operation objects, same schema as /api/calculate
+            {"operation": "+", "num1": 1, "num2": 2},
+            {"operation": "sin", "angle": 30}
+        ]
+    }
+
+    Returns:
+        JSON response with per-item results or errors, in request order
+    """
+    payload, status = handle_batch(request.get_json(silent=True),
+                                   current_app.config['MAX_BATCH_SIZE'])
+    return jsonify(payload), status
+
+
+def _read_lines(stream, max_length: int):
+    """
+    Read lines from a binary stream one at a time.
+
+    Lines longer than max_length are drained and reported as None so a single
+    oversized line cannot force the whole body into memory.
+    """
+    while True:
+        line = stream.readline(max_length + 1)
+        if not line:
+            return
+        if len(line) > max_length and not line.endswith(b'\n'):
+            while line and not line.endswith(b'\n'):
+                line = stream.readline(max_length + 1)
+            yield None
+        else:
+            yield line
+
+
+@calculator_bp.route('/api/calculate/stream', methods=['POST'])
+def calculate_stream():
+    """
+    Streaming calculator API endpoint.
+
+    Expects a newline-delimited JSON (NDJSON) body, one operation object per line
+    using the same schema as /api/calculate:
+        {"operation": "+", "num1": 1, "num2": 2}
+        {"operation": "sin", "angle": 30}
+
+    The body is read incrementally and results are streamed back as NDJSON in
+    input order. The next line is only read once the previous result has been
+    written, so a slow client throttles input consumption. The final line is a
+    summary: {"summary": {"count": n, "succeeded": n, "errors": n}}
+
+    Returns:
+        Streaming NDJSON response
+    """
+    lines = _read_lines(request.stream, current_app.config['MAX_STREAM_LINE_LENGTH'])
+
+    def encode(result):
+        return JSON_CODEC.dumps(result) + '\n'
+
+    results = CalculatorService.calculate_stream(lines, encode)
+    return Response(stream_with_context(results), mimetype='application/x-ndjson')
+
+
+@calculator_bp.route('/api/expression', methods=['POST'])
+def evaluate_expression():
+    """
+    Expression evaluation endpoint.
+
+    Expects JSON body with:
+    {
+        "expression": str  # Formula, e.g. "2*sin(30)+log(8,2)^2 mod 3"
+    }
+
+    Supports +, -, *, /, ^, mod (or %), unary minus, parentheses, pi and the
+    functions sin, cos, tan, cot (degrees), log(number, base=10), power, mod.
+
+    Returns:
+        JSON response with result or error
+    """
+    payload, status = handle_expression(request.get_json(silent=True),
+                                        current_app.config['MAX_EXPRESSION_LENGTH'],
+                                        request.headers.get('X-Client-ID'))
+    return jsonify(payload), status
+
+
+@calculator_bp.route('/api/history', methods=['GET'])
+def history():
+    """
+    Calculation history endpoint.
+
+    Returns the history of the client named by the X-Client-ID header, newest
+    first. Query parameters:
+        limit      Entries per page (default 50, at most 500)
+        operation  Only this operation ('+', 'sin', 'expression', ...)
+        since      Only entries at or after this Unix timestamp
+        until      Only entries before this Unix timestamp
+        cursor     next_cursor from the previous page
+
+    Returns:
+        JSON response with the entries and next_cursor (null on the last page)
+    """
+    payload, status = handle_history(request.headers.get('X-Client-ID'), request.args)
+    return jsonify(payload), status
+
+
+@calculator_bp.route('/api/history', methods=['DELETE'])
+def clear_history():
+    """
+    Delete the history of the client named by the X-Client-ID header.
+
+    Returns:
+        JSON response with the number of deleted entries
+    """
+    payload, status = handle_history_clear(request.headers.get('X-Client-ID'))
+    return jsonify(payload), status
+
+
+@calculator_bp.route('/api/history/export', methods=['GET'])
+def export_history():
+    """
+    Bulk export of the client's whole history, oldest first.
+
+    The format query parameter selects 'ndjson' (default) or 'csv'. Rows are
+    read from the database in chunks while the response streams.
+
+    Returns:
+        Streaming NDJSON or CSV response
+    """
+    client_id = request.headers.get('X-Client-ID')
+    export_format = request.args.get('format', 'ndjson')
+    error = validate_history_export(client_id, export_format)
+    if error is not None:
+        payload, status = error
+        return jsonify(payload), status
+
+    mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+    response = Response(HISTORY.export(client_id, export_format), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=history.{export_format}'
+    return response
+
+
+@calculator_bp.route('/api/sessions', methods=['POST'])
+def create_session():
+    """
+    Start a calculation session holding an accumulator.
+
+    Expects an optional JSON body {"value": float} with the initial value (default 0).
+
+    Returns:
+        JSON response with the session ID and value (201)
+    """
+    payload, status = handle_session_create(request.get_json(silent=True))
+    return jsonify(payload), status
+
+
+@calculator_bp.route('/api/sessions/<session_id>', methods=['POST'])
+def apply_session_steps(session_id):
+    """
+    Apply operations to a session's accumulator.
+
+    Expects JSON body with one step:
+    {
+        "operation": str,  # Any /api/calculate operation
+        "operand": float   # Second operand (optional for sin, cos, tan, cot, log)
+    }
+    or a list of steps applied in order, all or nothing:
+    {
+        "steps": [{"operation": "+", "operand": 5}, {"operation": "sin"}]
+    }
+
+    Returns:
+        JSON response with the new value and step count
+    """
+    payload, status = handle_session_apply(session_id, request.get_json(silent=True),
+                                           current_app.config['MAX_BATCH_SIZE'])
+    return jsonify(payload), status
+
+
+@calculator_bp.route('/api/sessions/<session_id>', methods=['GET'])
+def get_session(session_id):
+    """
+    Session state endpoint.
+
+    Returns:
+        JSON response with the value, step count, creation time and recent steps
+    """
+    payload, status = handle_session_get(session_id)
+    return jsonify(payload), status
+
+
+@calculator_bp.route('/api/sessions/<session_id>', methods=['DELETE'])
+def delete_session(session_id):
+    """
+    End a session.
+
+    Returns:
+        JSON response confirming the deletion
+    """
+    payload, status = handle_session_delete(session_id)
+    return jsonify(payload), status
+
+
+@calculator_bp.route('/api/sessions/stats', methods=['GET'])
+def session_stats():
+    """
+    Session statistics endpoint.
+
+    Returns:
+        JSON response with session counts, limits, evictions and memory use
+    """
+    return jsonify(SESSIONS.stats()), 200
+
+
+@calculator_bp.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """
+    Result cache statistics endpoint.
+
+    Returns:
+        JSON response with cache size, hits, misses, evictions and hit rate
+    """
+    return jsonify(CalculatorService.cache_stats()), 200
+
+
+@calculator_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Prometheus metrics endpoint.
+
+    Returns:
+        Request counts, error counts by CalculatorError class and latency
+        histograms per operation, aggregated across worker processes
+    """
+    return Response(METRICS.render(), mimetype='text/plain; version=0.0.4')
 
 
 @calculator_bp.route('/api/health', methods=['GET'])
@@ -81,8 +357,4 @@ def health_check():
     Returns:
         JSON response indicating service health
     """
-    return jsonify({
-        'status': 'healthy',
-        'service': 'Calculator API',
-        'version': '1.0.0'
-    }), 200
+    return jsonify(HEALTH_PAYLOAD), 200
@@ -0,0 +1,279 @@
+"""
+Calculation Sessions
+Server-side accumulators that chain results without sending them back and forth.
+
+A session holds the current value, the number of steps applied and the last few
+steps. A step applies an operation to the accumulator: the value fills the
+operation's first required parameter and the step's operand the second, so
+'+ 5' computes value + 5, 'sin' computes sin(value°), 'log 2' computes
+log_2(value) and 'power 3' computes value^3. Operations without parameters
+(pi) replace the value. Steps run through CalculatorService.calculate, so they
+share its validation, metrics and result cache.
+
+Sessions live in a bounded table: a ResultCache by default, or a SharedResultCache
+when the workers should share them. Either evicts idle sessions after the idle
+timeout and the least recently used ones at capacity. A session is stored as a
+compact tuple: (value, steps, created, log of (operation, operand, result) tuples).
+"""
+import secrets
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from app.calculator_service import CalculatorService
+from app.result_cache import ResultCache, MISSING
+from Operators.Operator import CalculatorError
+from Operators.OperatorRegistry import OPERATIONS, OperationSpec
+
+
+# Bytes reserved per log entry and for the rest of a session in a shared record
+_SHARED_LOG_ENTRY_BYTES = 64
+_SHARED_BASE_BYTES = 96
+
+SessionState = Tuple[float, int, float, tuple]
+
+
+class _SessionMissing(Exception):
+    """Raised inside a table update to leave a missing session uncreated."""
+
+
+class _SessionChanged(Exception):
+    """Raised inside a table update when another request advanced the session first."""
+
+
+def chain_parameters(spec: OperationSpec) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Parameters that receive the accumulator and the step operand.
+
+    Returns:
+        (accumulator parameter, operand parameter); either may be None
+    """
+    required = [name for name, default in spec.params if default is not None]
+    return (required[0] if required else None), (required[1] if len(required) > 1 else None)
+
+
+def apply_step(value: float, step: Any) -> Tuple[float, tuple]:
+    """
+    Apply one step to an accumulator value.
+
+    Args:
+        value: Current accumulator
+        step: {"operation": str, "operand": number (optional)}; other parameters of
+              the operation (e.g. num1 for trigonometry) may be given by name
+
+    Returns:
+        (new value, log entry)
+
+    Raises:
+        CalculatorError: If the step or the calculation is invalid
+    """
+    if not isinstance(step, dict):
+        raise CalculatorError("Step must be an object")
+    operation = step.get('operation')
+    spec = OPERATIONS.get(operation) if isinstance(operation, str) else None
+    if spec is None:
+        raise CalculatorError(f"Unknown operation: {operation}")
+
+    accumulator, operand_name = chain_parameters(spec)
+    data = {name: step[name] for name in spec.param_names if name in step}
+    operand = step.get('operand')
+    if accumulator is not None:
+        data[accumulator] = value
+    if operand is not None:
+        if operand_name is None:
+            raise CalculatorError(f"Operation {operation} takes no operand")
+        data[operand_name] = operand
+
+    result = CalculatorService.calculate(spec.name, data)['result']
+    if isinstance(result, bool) or not isinstance(result, (int, float)):
+        # The accumulator must stay a real number for the next step and the response
+        raise CalculatorError("Result is not a real number")
+    return result, (spec.name, None if operand is None else float(data[operand_name]), result)
+
+
+class SessionStore:
+    """Bounded table of calculation sessions with idle eviction."""
+
+    def __init__(self):
+        self._table: Any = None
+        self.max_log = 10
+        self.created = 0
+        self.applied = 0
+        # Why a requested shared table fell back to a per-process one, if it did
+        self.fallback: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def configure(self, max_sessions: int, idle_timeout: Optional[float] = 900.0,
+                  max_log: int = 10, shared_path: Optional[str] = None) -> None:
+        """
+        Enable or disable sessions.
+
+        Args:
+            max_sessions: Sessions kept at most; 0 disables sessions
+            idle_timeout: Seconds without use after which a session expires (None: never)
+            max_log: Steps kept in each session's log
+            shared_path: Memory-mapped file shared by workers using the same path; if it
+                         cannot be used, sessions stay per-process
+        """
+        previous, self._table = self._table, None
+        if hasattr(previous, 'close'):
+            previous.close()
+        self.max_log = max_log
+        self.created = self.applied = 0
+        self.fallback = None
+        if max_sessions <= 0:
+            return
+        if shared_path:
+            try:
+                from app.shared_cache import SharedResultCache
+                record_size = _SHARED_BASE_BYTES + _SHARED_LOG_ENTRY_BYTES * max_log
+                self._table = SharedResultCache(shared_path, max_sessions, idle_timeout,
+                                                record_size=-(-record_size // 64) * 64)
+                return
+            except (OSError, ValueError) as e:
+                self.fallback = str(e)
+        self._table = ResultCache(max_sessions, idle_timeout)
+
+    @property
+    def enabled(self) -> bool:
+        return self._table is not None
+
+    @property
+    def shared(self) -> bool:
+        return self.enabled and not isinstance(self._table, ResultCache)
+
+    def create(self, value: float = 0.0) -> Tuple[str, SessionState]:
+        """
+        Start a session.
+
+        Args:
+            value: Initial accumulator
+
+        Returns:
+            (session ID, session state)
+        """
+        session_id = secrets.token_urlsafe(12)
+        state = (float(value), 0, time.time(), ())
+        self._table.set(session_id, state)
+        with self._lock:
+            self.created += 1
+        return session_id, state
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        """Return a session's state, or None if it does not exist or has expired."""
+        return self._table.get(session_id, None)
+
+    def apply(self, session_id: str, steps: Sequence[Any]) -> Optional[SessionState]:
+        """
+        Apply steps to a session atomically: if any step fails, the session is unchanged.
+
+        The steps are calculated without holding the table lock (for a shared table, a
+        lock stripe shared across processes), then stored only if no other request
+        advanced the session meanwhile; otherwise they are recalculated from the newer
+        state. The step count serves as the session's version.
+
+        Args:
+            session_id: Session ID
+            steps: Step objects as accepted by apply_step
+
+        Returns:
+            The new state, or None if the session does not exist or has expired
+
+        Raises:
+            CalculatorError: If a step fails; the message names the failing step
+        """
+        max_log = self.max_log
+
+        def advance(state):
+            value, count, created, log = state
+            entries = list(log)
+            for index, step in enumerate(steps):
+                try:
+                    value, entry = apply_step(value, step)
+                except CalculatorError as e:
+                    raise CalculatorError(f"Step {index}: {e}" if len(steps) > 1 else str(e))
+                entries.append(entry)
+            return value, count + len(steps), created, tuple(entries[-max_log:] if max_log else ())
+
+        while True:
+            current = self._table.get(session_id, None)
+            if current is None:
+                return None
+            new_state = advance(current)
+
+            def compare_and_set(stored, version=current[1], new_state=new_state):
+                if stored is MISSING:
+                    raise _SessionMissing()
+                if stored[1] != version:
+                    raise _SessionChanged()
+                return new_state
+
+            try:
+                state = self._table.update(session_id, compare_and_set)
+                break
+            except _SessionMissing:
+                return None
+            except _SessionChanged:
+                continue
+            except ValueError as e:
+                # Shared records are fixed-size; a log of very long operation names can overflow one
+                raise CalculatorError(f"Session state too large: {e}")
+        with self._lock:
+            self.applied += len(steps)
+        return state
+
+    def delete(self, session_id: str) -> bool:
+        """End a session; returns whether it existed."""
+        return self._table.delete(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Session counts, limits and memory use.
+
+        Returns:
+            Dictionary with the live session count, limits, created/applied/evicted/expired
+            counters and memory in bytes: the shared file size, or an estimate of the
+            session objects in this process
+        """
+        if self._table is None:
+            return {'enabled': False}
+        table = self._table.stats()
+        if self.shared:
+            memory = self._table.max_size * self._table.record_size
+            bound = self._table.record_size
+        else:
+            memory = sum(_state_size(state) for state in self._table.values())
+            bound = _state_size((0.0, 0, 0.0, (('power', 0.0, 0.0),) * self.max_log))
+        stats = {
+            'enabled': True,
+            'shared': self.shared,
+            'sessions': table['size'],
+            'max_sessions': table['max_size'],
+            'idle_timeout': table['ttl'],
+            'max_log': self.max_log,
+            'created': self.created,
+            'steps_applied': self.applied,
+            'evicted': table['evictions'],
+            'expired': table['expirations'],
+            'memory_bytes': memory,
+            'max_bytes_per_session': bound
+        }
+        if self.fallback:
+            stats['fallback'] = self.fallback
+        return stats
+
+
+def _state_size(state: SessionState) -> int:
+    """Approximate bytes held by one in-process session, including its key and table slot."""
+    value, count, created, log = state
+    size = sys.getsizeof(state) + sys.getsizeof(value) + sys.getsizeof(created) + sys.getsizeof(log)
+    for entry in log:
+        # Operation names are the registry's own strings, shared by every session
+        size += sys.getsizeof(entry) + sum(sys.getsizeof(item) for item in entry[1:])
+    # Session ID string, (expiry, state) entry tuple and ordered-dict slot
+    return size + sys.getsizeof('x' * 16) + sys.getsizeof((None, None)) + 104
+
+
+# Process-wide session store, configured by create_app
+SESSIONS = SessionStore()
@@ -0,0 +1,433 @@
+"""
+Shared Result Cache
+Result cache in a memory-mapped file that every worker process on a host shares.
+
+The file (on /dev/shm by default, so it lives in RAM) holds a fixed-size,
+set-associative hash table of fixed-width records. Writers take a per-stripe lock
+that is both a thread lock and an fcntl byte-range lock on the file, so threads and
+processes exclude each other. Readers take no lock: each record carries a sequence
+number that is odd while the record is being written and a CRC of its contents, and
+a read that sees a changing or inconsistent record counts as a miss.
+
+Layout (little endian):
+    header   magic, sets, ways, record size, stripes; then per stripe the entry and
+             eviction counters; padded to HEADER_SIZE
+    sets     per set: ways uint32 key tags (0 = empty), padded to 64 bytes, then
+             ways records of record_size bytes
+    record   seq u32, crc u32, expires f64 (0 = never), last use f64, key length u16,
+             value length u16, padding, then key and value bytes (marshal format 2)
+"""
+import marshal
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+import weakref
+import zlib
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from app.result_cache import MISSING
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows; configure_cache falls back
+    fcntl = None
+
+
+# Format version; bumping it reinitializes existing files (02: results cached as values)
+MAGIC = b'CALCRC02'
+HEADER_SIZE = 4096
+MAX_STRIPES = 128
+
+_LAYOUT = struct.Struct('<8sIIII')
+_COUNTERS = struct.Struct('<QQ')
+_COUNTERS_OFFSET = 64
+_RECORD = struct.Struct('<IIddHH')
+_RECORD_HEADER = 32
+_SEQ = struct.Struct('<I')
+_STAMP = struct.Struct('<d')
+_STAMP_OFFSET = 16
+_TAGS_SIZE = 64
+
+# fcntl lock byte used while creating or resetting the table (stripes lock bytes 0..stripes-1)
+_INIT_LOCK_OFFSET = HEADER_SIZE - 1
+
+
+def _reserve(fd: int, size: int) -> None:
+    """
+    Make a file at least size bytes long with every block allocated; never shrinks it.
+
+    Raises:
+        OSError: If the space cannot be allocated (e.g. the file system is full)
+    """
+    if hasattr(os, 'posix_fallocate'):
+        os.posix_fallocate(fd, 0, size)
+    elif os.fstat(fd).st_size < size:  # pragma: no cover - macOS; the file may stay sparse
+        os.ftruncate(fd, size)
+
+
+def default_path(name: str = 'result-cache') -> str:
+    """Shared-memory file used when a shared table is enabled with '1' instead of a path."""
+    directory = '/dev/shm' if os.path.isdir('/dev/shm') else '/tmp'
+    return os.path.join(directory, f'calculator-{name}-{os.getuid()}')
+
+
+class SharedResultCache:
+    """
+    Fixed-capacity result cache shared by all processes mapping the same file.
+
+    Interface-compatible with ResultCache. Within a set, eviction replaces an empty or
+    expired record, else the least recently used one. Keys and values must be
+    marshallable; other pairs, and pairs too large for a record, are not cached
+    (counted as 'oversize').
+    """
+
+    def __init__(self, path: str, max_size: int = 1024, ttl: Optional[float] = None,
+                 ways: int = 8, record_size: int = 256, stripes: int = 64):
+        """
+        Args:
+            path: Backing file; processes using the same path share the cache
+            max_size: Capacity in entries, rounded up to a whole number of sets
+            ttl: Seconds an entry stays valid, or None for no expiry
+            ways: Records per set
+            record_size: Bytes per record, including the 32 byte record header
+            stripes: Number of write locks the sets are spread over
+
+        Raises:
+            OSError: If the file cannot be created or mapped
+            ValueError: If the sizes are invalid
+        """
+        if fcntl is None:
+            raise OSError("fcntl locks are not available on this platform")
+        if max_size <= 0:
+            raise ValueError("Cache size must be positive")
+        if not 1 <= ways <= 16 or record_size <= _RECORD_HEADER or not 1 <= stripes <= MAX_STRIPES:
+            raise ValueError("Invalid shared cache layout")
+
+        self.path = path
+        self.ttl = ttl
+        self.ways = ways
+        self.record_size = record_size
+        self.sets = math.ceil(max_size / ways)
+        self.stripes = min(stripes, self.sets)
+        self.max_size = self.sets * ways
+        self._set_size = _TAGS_SIZE + ways * record_size
+        self._tags = struct.Struct(f'<{ways}I')
+        self._capacity = record_size - _RECORD_HEADER
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.oversize = 0
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            self._size = HEADER_SIZE + self.sets * self._set_size
+            self._attach()
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._reset_locks()
+        # A lock held by another thread at fork time would never be released in the child
+        reference = weakref.ref(self)
+        os.register_at_fork(after_in_child=lambda: reference() and reference()._reset_locks())
+
+    def _attach(self) -> None:
+        """Map the file, (re)initializing it if it is new or has a different layout."""
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, _INIT_LOCK_OFFSET)
+        try:
+            layout = _LAYOUT.pack(MAGIC, self.sets, self.ways, self.record_size, self.stripes)
+            current = os.pread(self._fd, _LAYOUT.size, 0)
+            # Allocate the blocks now: a page of a sparse file that cannot be backed when it
+            # is first touched (a full /dev/shm) kills the process with SIGBUS
+            _reserve(self._fd, self._size)
+            if current != layout:
+                # Zero the table in place instead of truncating it: another process may
+                # still map the old layout, and pages cut from under a mapping raise SIGBUS
+                zeros = bytes(1 << 20)
+                for offset in range(0, self._size, len(zeros)):
+                    os.pwrite(self._fd, zeros[:self._size - offset], offset)
+                os.pwrite(self._fd, layout, 0)
+            self._map = mmap.mmap(self._fd, self._size)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, _INIT_LOCK_OFFSET)
+
+    def _reset_locks(self) -> None:
+        # fcntl locks belong to the process, so threads also need a thread lock per stripe
+        self._locks = [threading.Lock() for _ in range(self.stripes)]
+
+    def _lock(self, stripe: int) -> None:
+        self._locks[stripe].acquire()
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, stripe)
+        except BaseException:
+            self._locks[stripe].release()
+            raise
+
+    def _unlock(self, stripe: int) -> None:
+        try:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, stripe)
+        finally:
+            self._locks[stripe].release()
+
+    @staticmethod
+    def _encode_key(key: Hashable) -> bytes:
+        return marshal.dumps(key, 2)
+
+    def _locate(self, encoded_key: bytes):
+        """Return (set offset, tag) for an encoded key."""
+        digest = zlib.crc32(encoded_key)
+        return HEADER_SIZE + (digest % self.sets) * self._set_size, digest or 1
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """
+        Look up a key without locking.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or default
+        """
+        try:
+            encoded_key = self._encode_key(key)
+        except ValueError:
+            self.misses += 1
+            return default
+        set_offset, tag = self._locate(encoded_key)
+        buffer = self._map
+        tags = self._tags.unpack_from(buffer, set_offset)
+        way = -1
+        while True:
+            try:
+                way = tags.index(tag, way + 1)
+            except ValueError:
+                self.misses += 1
+                return default
+
+            offset = set_offset + _TAGS_SIZE + way * self.record_size
+            seq, crc, expires, _, key_length, value_length = _RECORD.unpack_from(buffer, offset)
+            if seq & 1 or key_length != len(encoded_key):
+                continue
+            start = offset + _RECORD_HEADER
+            data = buffer[start:start + key_length + value_length]
+            if (data[:key_length] != encoded_key or zlib.crc32(data) != crc
+                    or _SEQ.unpack_from(buffer, offset)[0] != seq):
+                continue
+
+            now = time.time()
+            if expires and expires <= now:
+                self.expirations += 1
+                self.misses += 1
+                return default
+            # Unlocked and outside the CRC: a lost update only affects eviction order
+            _STAMP.pack_into(buffer, offset + _STAMP_OFFSET, now)
+            self.hits += 1
+            return marshal.loads(data[key_length:])
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, replacing the least recently used record of its set when full.
+
+        Args:
+            key: Cache key
+            value: Value to store; skipped if it cannot be marshalled or key and value
+                   exceed the record size
+        """
+        try:
+            encoded_key = self._encode_key(key)
+            encoded_value = marshal.dumps(value, 2)
+        except ValueError:
+            self.oversize += 1
+            return
+        if len(encoded_key) + len(encoded_value) > self._capacity:
+            self.oversize += 1
+            return
+
+        set_offset, tag = self._locate(encoded_key)
+        stripe = self._stripe(set_offset)
+        self._lock(stripe)
+        try:
+            self._write(set_offset, tag, stripe, encoded_key, encoded_value, time.time())
+        finally:
+            self._unlock(stripe)
+
+    def update(self, key: Hashable, function: Callable[[Any], Any]) -> Any:
+        """
+        Atomically replace a value with function(current value), across processes.
+
+        Args:
+            key: Cache key
+            function: Called with the live value, or MISSING if there is none; if it
+                      raises, the entry is left unchanged
+
+        Returns:
+            The stored value
+
+        Raises:
+            ValueError: If the key or new value cannot be marshalled or do not fit a record
+        """
+        encoded_key = self._encode_key(key)
+        set_offset, tag = self._locate(encoded_key)
+        stripe = self._stripe(set_offset)
+        self._lock(stripe)
+        try:
+            now = time.time()
+            value = MISSING
+            way = self._find(set_offset, tag, encoded_key)
+            if way >= 0:
+                offset = set_offset + _TAGS_SIZE + way * self.record_size
+                _, _, expires, _, key_length, value_length = _RECORD.unpack_from(self._map, offset)
+                if expires and expires <= now:
+                    self.expirations += 1
+                else:
+                    start = offset + _RECORD_HEADER + key_length
+                    value = marshal.loads(self._map[start:start + value_length])
+
+            value = function(value)
+            encoded_value = marshal.dumps(value, 2)
+            if len(encoded_key) + len(encoded_value) > self._capacity:
+                raise ValueError(f"Value exceeds the shared cache record size of {self.record_size} bytes")
+            self._write(set_offset, tag, stripe, encoded_key, encoded_value, now)
+            return value
+        finally:
+            self._unlock(stripe)
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove a key; returns whether it was present."""
+        try:
+            encoded_key = self._encode_key(key)
+        except ValueError:
+            return False
+        set_offset, tag = self._locate(encoded_key)
+        stripe = self._stripe(set_offset)
+        self._lock(stripe)
+        try:
+            way = self._find(set_offset, tag, encoded_key)
+            if way < 0:
+                return False
+            # Readers find records through their tag, so clearing it removes the entry
+            struct.pack_into('<I', self._map, set_offset + 4 * way, 0)
+            counters = _COUNTERS_OFFSET + stripe * _COUNTERS.size
+            entries, evictions = _COUNTERS.unpack_from(self._map, counters)
+            _COUNTERS.pack_into(self._map, counters, entries - 1, evictions)
+            return True
+        finally:
+            self._unlock(stripe)
+
+    def _stripe(self, set_offset: int) -> int:
+        return (set_offset - HEADER_SIZE) // self._set_size % self.stripes
+
+    def _find(self, set_offset: int, tag: int, encoded_key: bytes) -> int:
+        """Way holding the key in a locked set, or -1."""
+        for way, existing in enumerate(self._tags.unpack_from(self._map, set_offset)):
+            if existing == tag and self._record_key(
+                    self._map, set_offset + _TAGS_SIZE + way * self.record_size) == encoded_key:
+                return way
+        return -1
+
+    def _write(self, set_offset: int, tag: int, stripe: int, encoded_key: bytes,
+               encoded_value: bytes, now: float) -> None:
+        """Write a record into a set whose stripe lock is held."""
+        buffer = self._map
+        data = encoded_key + encoded_value
+        expires = now + self.ttl if self.ttl is not None else 0.0
+        tags = self._tags.unpack_from(buffer, set_offset)
+        way = self._choose_way(buffer, set_offset, tags, tag, encoded_key, now)
+        offset = set_offset + _TAGS_SIZE + way * self.record_size
+        seq = _SEQ.unpack_from(buffer, offset)[0]
+        counters = _COUNTERS_OFFSET + stripe * _COUNTERS.size
+        entries, evictions = _COUNTERS.unpack_from(buffer, counters)
+        if tags[way] == 0:
+            entries += 1
+        elif tags[way] != tag or self._record_key(buffer, offset) != encoded_key:
+            evictions += 1
+
+        # Odd sequence number marks the record as being written for lock-free readers
+        _SEQ.pack_into(buffer, offset, (seq + 1) & 0xFFFFFFFF)
+        start = offset + _RECORD_HEADER
+        buffer[start:start + len(data)] = data
+        _RECORD.pack_into(buffer, offset, (seq + 1) & 0xFFFFFFFF, zlib.crc32(data), expires, now,
+                          len(encoded_key), len(encoded_value))
+        _SEQ.pack_into(buffer, offset, (seq + 2) & 0xFFFFFFFF)
+        struct.pack_into('<I', buffer, set_offset + 4 * way, tag)
+        _COUNTERS.pack_into(buffer, counters, entries, evictions)
+
+    def _choose_way(self, buffer: Any, set_offset: int, tags: tuple, tag: int,
+                    encoded_key: bytes, now: float) -> int:
+        """Pick the record to write: the same key, else empty, else expired, else least recently used."""
+        oldest_way, oldest_stamp = 0, math.inf
+        empty = -1
+        for way, existing in enumerate(tags):
+            offset = set_offset + _TAGS_SIZE + way * self.record_size
+            if existing == 0:
+                if empty < 0:
+                    empty = way
+                continue
+            if existing == tag and self._record_key(buffer, offset) == encoded_key:
+                return way
+            _, _, expires, stamp, _, _ = _RECORD.unpack_from(buffer, offset)
+            if expires and expires <= now:
+                stamp = -math.inf
+            if stamp < oldest_stamp:
+                oldest_way, oldest_stamp = way, stamp
+        if empty >= 0 and oldest_stamp != -math.inf:
+            return empty
+        return oldest_way
+
+    @staticmethod
+    def _record_key(buffer: Any, offset: int) -> bytes:
+        key_length = _RECORD.unpack_from(buffer, offset)[4]
+        start = offset + _RECORD_HEADER
+        return buffer[start:start + key_length]
+
+    def clear(self) -> None:
+        """Remove all entries for every process and reset this process' statistics."""
+        for stripe in range(self.stripes):
+            self._lock(stripe)
+        try:
+            table = self._size - HEADER_SIZE
+            self._map[HEADER_SIZE:self._size] = bytes(table)
+            self._map[_COUNTERS_OFFSET:_COUNTERS_OFFSET + self.stripes * _COUNTERS.size] = \
+                bytes(self.stripes * _COUNTERS.size)
+        finally:
+            for stripe in reversed(range(self.stripes)):
+                self._unlock(stripe)
+        self.hits = self.misses = self.expirations = self.oversize = 0
+
+    def _counters(self) -> List[tuple]:
+        return [_COUNTERS.unpack_from(self._map, _COUNTERS_OFFSET + stripe * _COUNTERS.size)
+                for stripe in range(self.stripes)]
+
+    def __len__(self) -> int:
+        return sum(entries for entries, _ in self._counters())
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with the shared size and evictions, this process' hits, misses,
+            expirations and oversize skips, and the hit rate
+        """
+        counters = self._counters()
+        lookups = self.hits + self.misses
+        return {
+            'size': sum(entries for entries, _ in counters),
+            'max_size': self.max_size,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': sum(evictions for _, evictions in counters),
+            'expirations': self.expirations,
+            'oversize': self.oversize,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'path': self.path
+        }
+
+    def close(self) -> None:
+        """Unmap the file; the shared contents stay for other processes."""
+        self._map.close()
+        os.close(self._fd)
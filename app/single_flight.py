@@ -0,0 +1,96 @@
+"""
+Single-Flight Request Coalescing
+Concurrent identical computations within a worker process share one execution.
+
+The first caller of a key (the leader) computes; callers arriving with the same
+key while it runs wait for the leader and receive its result or error instead
+of computing again. Nothing is kept once the leader finishes, so this is not a
+cache: a request arriving after completion computes afresh.
+"""
+from _thread import allocate_lock
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+from app.metrics import METRICS
+from Operators.Operator import CalculatorError
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls with equal keys.
+
+    Leader election is a single dict.setdefault, which is atomic, so the
+    uncontended path takes no shared lock. Each call carries a held latch lock
+    that waiters block on until the leader releases it.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Args:
+            enabled: Whether calls are coalesced; when False, run() just calls the function
+        """
+        self.enabled = enabled
+        # (kind, key) -> [latch, result, error]
+        self._calls: Dict[Hashable, List[Any]] = {}
+        self.coalesced = 0
+        # Guards the counter only; waiters wake together, and += is not atomic
+        self._counter_lock = allocate_lock()
+
+    def configure(self, enabled: bool) -> None:
+        """Enable or disable coalescing."""
+        self.enabled = enabled
+
+    def run(self, kind: str, key: Hashable, function: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run function, or wait for an identical call already in flight.
+
+        Args:
+            kind: Metrics label ('calculate', 'expression', 'batch')
+            key: Hashable identity of the computation within its kind
+            function: Computation to run when no identical call is in flight
+
+        Returns:
+            (result, shared) where shared is True if the result came from another
+            caller's computation; callers must copy shared results before mutating them
+
+        Raises:
+            Whatever function raised; CalculatorErrors are re-raised as copies in waiters
+        """
+        if not self.enabled:
+            return function(), False
+
+        key = (kind, key)
+        latch = allocate_lock()
+        latch.acquire()
+        call = [latch, None, None]
+        existing = self._calls.setdefault(key, call)
+
+        if existing is call:
+            try:
+                call[1] = function()
+            except BaseException as e:
+                call[2] = e
+                raise
+            finally:
+                del self._calls[key]
+                latch.release()
+            return call[1], False
+
+        existing[0].acquire()
+        existing[0].release()
+        with self._counter_lock:
+            self.coalesced += 1
+        METRICS.record_coalesced(kind)
+        error = existing[2]
+        if error is not None:
+            if isinstance(error, CalculatorError):
+                raise CalculatorError(*error.args)
+            raise error
+        return existing[1], True
+
+    def stats(self) -> Dict[str, Any]:
+        """Return whether coalescing is on, calls in flight and calls coalesced so far."""
+        return {'enabled': self.enabled, 'in_flight': len(self._calls), 'coalesced': self.coalesced}
+
+
+# Process-wide coalescer, configured by create_app
+SINGLE_FLIGHT = SingleFlight()
@@ -19,6 +19,9 @@ const historyPanel = document.getElementById('historyPanel');
 const historyList = document.getElementById('historyList');
 const loading = document.getElementById('loading');
 
+// Identifies this browser to the server-side history (X-Client-ID header)
+const clientId = getClientId();
+
 /**
  * Initialize calculator on page load
  */
@@ -222,7 +225,8 @@ async function performCalculation(operation, data) {
         const response = await fetch('/api/calculate', {
             method: 'POST',
             headers: {
-                'Content-Type': 'application/json'
+                'Content-Type': 'application/json',
+                'X-Client-ID': clientId
             },
             body: JSON.stringify({ operation, ...data })
         });
@@ -383,6 +387,10 @@ function clearHistory() {
         calculatorState.history = [];
         saveHistory();
         renderHistory();
+        fetch('/api/history', {
+            method: 'DELETE',
+            headers: { 'X-Client-ID': clientId }
+        }).catch(() => {});
     }
 }
 
@@ -398,7 +406,7 @@ function saveHistory() {
 }
 
 /**
- * Load history from localStorage
+ * Load history from localStorage, then replace it with the server-side history when enabled
  */
 function loadHistory() {
     try {
@@ -410,6 +418,49 @@ function loadHistory() {
         console.error('Failed to load history:', error);
         calculatorState.history = [];
     }
+    loadServerHistory();
+}
+
+/**
+ * Fetch the latest 50 calculations from the server (404 means history is disabled)
+ */
+async function loadServerHistory() {
+    try {
+        const response = await fetch('/api/history?limit=50', {
+            headers: { 'X-Client-ID': clientId }
+        });
+        if (!response.ok) {
+            return;
+        }
+        const page = await response.json();
+        calculatorState.history = page.items.map(item => ({
+            operation: item.expression,
+            result: item.result,
+            timestamp: new Date(item.timestamp * 1000).toISOString()
+        }));
+        saveHistory();
+        renderHistory();
+    } catch (error) {
+        console.error('Failed to load server history:', error);
+    }
+}
+
+/**
+ * Return this browser's client ID, generating and storing one on first use
+ */
+function getClientId() {
+    const generated = Array.from(crypto.getRandomValues(new Uint8Array(16)),
+                                 byte => byte.toString(16).padStart(2, '0')).join('');
+    try {
+        const saved = localStorage.getItem('calculatorClientId');
+        if (saved) {
+            return saved;
+        }
+        localStorage.setItem('calculatorClientId', generated);
+    } catch (error) {
+        console.error('Failed to store client ID:', error);
+    }
+    return generated;
 }
 
 /**
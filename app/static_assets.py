@@ -0,0 +1,87 @@
+"""
+Static Asset Fingerprinting
+Serves the files under app/static at content-hashed names such as
+css/style.3f2a9c1b0d4e.css, so browsers and CDNs can cache them for a long time
+without revalidating: a changed file gets a new name. url_for('static', filename=...)
+emits the fingerprinted name, and the plain names keep working with the default
+(revalidated) caching.
+
+Hashes are computed once at startup, so a file edited while the server runs keeps
+its old name until the next restart.
+"""
+import hashlib
+import os
+import posixpath
+from typing import Dict
+
+# Hex digits of the SHA-256 content hash placed in the file name
+FINGERPRINT_LENGTH = 12
+
+
+def fingerprint_name(filename: str, digest: str) -> str:
+    """
+    Insert a content hash before the file extension.
+
+    Args:
+        filename: Path relative to the static folder, with '/' separators
+        digest: Hex digest of the file contents
+
+    Returns:
+        Fingerprinted path, e.g. 'js/calculator.0a1b2c3d4e5f.js'
+    """
+    root, extension = posixpath.splitext(filename)
+    return f"{root}.{digest[:FINGERPRINT_LENGTH]}{extension}"
+
+
+def build_manifest(directory: str) -> Dict[str, str]:
+    """
+    Hash every file under a directory.
+
+    Args:
+        directory: Static folder
+
+    Returns:
+        Dictionary mapping each relative path ('/' separators) to its fingerprinted path
+    """
+    manifest = {}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            filename = os.path.relpath(path, directory).replace(os.sep, '/')
+            manifest[filename] = fingerprint_name(filename, digest)
+    return manifest
+
+
+def init_app(app) -> None:
+    """
+    Fingerprint the static folder and serve fingerprinted names as immutable.
+
+    Args:
+        app: Flask application
+    """
+    from flask import send_from_directory
+
+    if not app.config['STATIC_FINGERPRINT'] or not app.has_static_folder:
+        return
+    manifest = build_manifest(app.static_folder)
+    originals = {fingerprinted: filename for filename, fingerprinted in manifest.items()}
+    max_age = app.config['HTTP_CACHE_MAX_AGE']
+    send_static_file = app.view_functions['static']
+
+    @app.url_defaults
+    def fingerprint_static_url(endpoint, values):
+        if endpoint == 'static' and values.get('filename') in manifest:
+            values['filename'] = manifest[values['filename']]
+
+    def static(filename):
+        original = originals.get(filename)
+        if original is None:
+            return send_static_file(filename=filename)
+        response = send_from_directory(app.static_folder, original, max_age=max_age)
+        if max_age > 0:
+            response.cache_control.immutable = True
+        return response
+
+    app.view_functions['static'] = static
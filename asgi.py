@@ -0,0 +1,13 @@
+"""
+ASGI application entry point.
+Serves the calculator API on an asyncio event loop, e.g.:
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+"""
+from app.asgi import create_asgi_app
+
+app = create_asgi_app()
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host='0.0.0.0', port=5000)
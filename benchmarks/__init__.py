@@ -0,0 +1 @@
+"""Benchmark scripts for calculator application."""
@@ -0,0 +1,64 @@
+"""
+Admission Control Benchmark
+Measures the per-request cost of the admission checks and how much cheaper a 429
+rejection is than serving the request, through the Flask test client.
+
+Usage:
+    python -m benchmarks.bench_admission [N]
+"""
+import os
+import sys
+import timeit
+from app.admission import AdmissionController
+
+
+def _check_ns(controller: AdmissionController, count: int, clients: int = 1000) -> float:
+    keys = [f'client-{i % clients}' for i in range(count)]
+
+    def loop():
+        for key in keys:
+            controller.check('/api/calculate', key)
+    return min(timeit.repeat(loop, number=1, repeat=5)) / count * 1e9
+
+
+def _requests_per_sec(client, count: int, body: dict) -> float:
+    seconds = min(timeit.repeat(lambda: client.post('/api/calculate', json=body), number=count, repeat=3))
+    return count / seconds
+
+
+def run(count: int = 100000) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        count: Checks per micro-benchmark; HTTP requests use count / 50
+
+    Returns:
+        Dictionary with ns per check and requests/sec for admitted and rejected requests
+    """
+    controller = AdmissionController()
+    results = {'check_disabled_ns': _check_ns(controller, count)}
+    controller.configure(client_rate=1e9, global_rate=1e9)
+    results['check_client_and_global_ns'] = _check_ns(controller, count)
+    controller.configure(client_rate=1e9, global_rate=1e9, max_concurrent=64)
+    results['check_and_slot_ns'] = min(timeit.repeat(
+        lambda: (controller.check('/api/calculate', 'a'), controller.acquire(), controller.release()),
+        number=count, repeat=5)) / count * 1e9
+
+    from app import create_app
+    requests = max(100, count // 50)
+    body = {'operation': 'power', 'base': 2, 'exponent': 10}
+    os.environ['RATE_LIMIT_PER_CLIENT'] = '1e9'
+    client = create_app().test_client()
+    results['admitted_requests_per_sec'] = _requests_per_sec(client, requests, body)
+    os.environ['RATE_LIMIT_PER_CLIENT'] = '1e-9'
+    client = create_app().test_client()
+    results['rejected_requests_per_sec'] = _requests_per_sec(client, requests, body)
+    del os.environ['RATE_LIMIT_PER_CLIENT']
+    return results
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for key, value in run(n).items():
+        print(f"{key:32s} {value:12.1f}")
@@ -0,0 +1,70 @@
+"""
+Batch Endpoint Benchmark
+Compares N single /api/calculate calls against one /api/calculate/batch call.
+
+Usage:
+    python -m benchmarks.bench_batch [N]
+"""
+import sys
+import time
+from app import create_app
+
+
+OPERATION_MIX = [
+    {'operation': '+', 'num1': 5, 'num2': 3},
+    {'operation': '/', 'num1': 10, 'num2': 4},
+    {'operation': 'sin', 'angle': 30},
+    {'operation': 'log', 'number': 100, 'base': 10},
+    {'operation': 'power', 'base': 2, 'exponent': 8},
+    {'operation': 'mod', 'num1': 10, 'num2': 3}
+]
+
+
+def build_operations(count: int) -> list:
+    """Build a list of operations cycling through the operation mix."""
+    return [OPERATION_MIX[i % len(OPERATION_MIX)] for i in range(count)]
+
+
+def run(count: int = 1000) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        count: Number of operations to evaluate
+
+    Returns:
+        Dictionary with timings and throughput for both modes
+    """
+    app = create_app()
+    app.config['MAX_BATCH_SIZE'] = max(count, app.config['MAX_BATCH_SIZE'])
+    client = app.test_client()
+    operations = build_operations(count)
+
+    start = time.perf_counter()
+    for operation in operations:
+        client.post('/api/calculate', json=operation)
+    single_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    client.post('/api/calculate/batch', json={'operations': operations})
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        'count': count,
+        'single_seconds': single_seconds,
+        'batch_seconds': batch_seconds,
+        'single_ops_per_sec': count / single_seconds,
+        'batch_ops_per_sec': count / batch_seconds,
+        'speedup': single_seconds / batch_seconds
+    }
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    stats = run(n)
+    print(f"Operations:       {stats['count']}")
+    print(f"Single calls:     {stats['single_seconds']:.3f}s "
+          f"({stats['single_ops_per_sec']:.0f} ops/sec)")
+    print(f"One batch call:   {stats['batch_seconds']:.3f}s "
+          f"({stats['batch_ops_per_sec']:.0f} ops/sec)")
+    print(f"Speedup:          {stats['speedup']:.1f}x")
@@ -0,0 +1,56 @@
+"""
+CLI Batch Mode Benchmark
+Measures batch-mode throughput for each input format, in process and with
+1..N worker processes.
+
+Usage:
+    python -m benchmarks.bench_cli [N] [MAX_WORKERS]
+"""
+import io
+import json
+import os
+import sys
+from app import cli
+from benchmarks.bench_batch import OPERATION_MIX, build_operations
+
+
+CSV_COLUMNS = ['operation', 'num1', 'num2', 'angle', 'number', 'base', 'exponent']
+
+
+def build_inputs(count: int) -> dict:
+    """Build the same operation mix as JSON lines, CSV and expression text."""
+    operations = build_operations(count)
+    rows = [','.join(str(item.get(column, '')) for column in CSV_COLUMNS) for item in operations]
+    expressions = ['5+3', '10/4', 'sin(30)', 'log(100, 10)', '2^8', '10 mod 3']
+    assert len(expressions) == len(OPERATION_MIX)
+    return {
+        'jsonl': ''.join(json.dumps(item) + '\n' for item in operations),
+        'csv': ','.join(CSV_COLUMNS) + '\n' + '\n'.join(rows) + '\n',
+        'text': ''.join(expressions[i % len(expressions)] + '\n' for i in range(count)),
+    }
+
+
+def run(count: int = 200000, max_workers: int = 0) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        count: Records per input
+        max_workers: Largest worker count to try (default: CPU count)
+
+    Returns:
+        Dictionary mapping format and worker count to records per second
+    """
+    results = {}
+    for input_format, text in build_inputs(count).items():
+        for workers in range(0, (max_workers or os.cpu_count() or 1) + 1):
+            stats = cli.run(io.StringIO(text), io.StringIO(), input_format, workers=workers)
+            results[f'{input_format}_workers_{workers}_records_per_sec'] = stats['records_per_sec']
+    return results
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    for name, throughput in run(n, workers).items():
+        print(f"{name:40s} {throughput:12.0f}")
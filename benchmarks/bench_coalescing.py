@@ -0,0 +1,83 @@
+"""
+Request Coalescing Benchmark
+Simulates bursts of identical requests (dashboard widgets polling the same formula)
+from many threads at once, with single-flight coalescing on and off, and measures the
+per-request overhead of coalescing when there is nothing to share.
+
+Usage:
+    python -m benchmarks.bench_coalescing [clients]
+"""
+import sys
+import threading
+import time
+import timeit
+from app.api_handlers import handle_batch, handle_calculate
+from app.single_flight import SINGLE_FLIGHT
+from benchmarks.bench_batch import build_operations
+
+# Each workload runs longer than the interpreter's thread switch interval (5 ms), so
+# concurrent requests overlap even on one core
+PRECISE = {'operation': 'sin', 'num1': 2, 'angle': 31, 'numeric': 'decimal', 'precision': 600}
+BATCH = {'operations': build_operations(5000)}
+
+
+def _burst(clients: int, request, rounds: int = 5) -> float:
+    """Seconds for clients threads to each send one identical request at the same moment."""
+    best = float('inf')
+    for _ in range(rounds):
+        barrier = threading.Barrier(clients + 1)
+
+        def client():
+            barrier.wait()
+            request()
+
+        threads = [threading.Thread(target=client) for _ in range(clients)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(clients: int = 32) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        clients: Concurrent identical requests per burst
+
+    Returns:
+        Dictionary of burst times, coalescing counts and single-request overhead
+    """
+    workloads = {
+        'decimal_sin': lambda: handle_calculate(PRECISE),
+        'batch': lambda: handle_batch(BATCH, 5000),
+    }
+    results = {}
+    previous = SINGLE_FLIGHT.enabled
+    try:
+        for enabled in (False, True):
+            SINGLE_FLIGHT.configure(enabled)
+            label = 'coalesced' if enabled else 'independent'
+            for name, request in workloads.items():
+                before = SINGLE_FLIGHT.coalesced
+                results[f'{name}_burst_{label}_ms'] = _burst(clients, request) * 1e3
+                if enabled:
+                    results[f'{name}_coalesced_per_burst'] = (SINGLE_FLIGHT.coalesced - before) / 5
+
+            # No concurrency: pure overhead of the single-flight bookkeeping
+            payload = {'operation': '+', 'num1': 10, 'num2': 5}
+            results[f'calculate_single_{label}_us'] = min(timeit.repeat(
+                lambda: handle_calculate(payload), number=20000, repeat=5)) / 20000 * 1e6
+    finally:
+        SINGLE_FLIGHT.configure(previous)
+    return results
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    for key, value in run(n).items():
+        print(f"{key:36s} {value:10.2f}")
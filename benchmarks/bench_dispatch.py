@@ -0,0 +1,103 @@
+"""
+Dispatch Overhead Microbenchmark
+Compares the per-call overhead of the previous dict-of-lambdas / if-elif dispatch
+with the precomputed operator registry.
+
+Usage:
+    python -m benchmarks.bench_dispatch [N]
+"""
+import math
+import sys
+import timeit
+from Operators.Operator import Operator, CalculatorError
+from app.calculator_service import CalculatorService
+
+
+def legacy_basic_operation(operator: str, num1: float, num2: float) -> float:
+    """Previous Operator.perform_basic_operation: rebuilds lambdas on every call."""
+    operations = {
+        "+": lambda a, b: a + b,
+        "-": lambda a, b: a - b,
+        "*": lambda a, b: a * b,
+        "/": lambda a, b: a / b if b != 0 else None
+    }
+    if operator not in operations:
+        raise CalculatorError(f"Invalid operator: {operator}")
+    result = operations[operator](num1, num2)
+    if result is None:
+        raise CalculatorError("Division by zero")
+    return result
+
+
+def legacy_trigonometric_function(operator: str, angle_degrees: float) -> float:
+    """Previous Operator.perform_trigonometric_function: rebuilds lambdas on every call."""
+    angle_radians = math.radians(angle_degrees)
+    operations = {
+        "sin": lambda a: math.sin(a),
+        "cos": lambda a: math.cos(a),
+        "tan": lambda a: math.tan(a),
+        "cot": lambda a: 1 / math.tan(a)
+    }
+    if operator not in operations:
+        raise CalculatorError(f"Invalid trigonometric operator: {operator}")
+    return operations[operator](angle_radians)
+
+
+def legacy_calculate(operation: str, data: dict) -> dict:
+    """Previous CalculatorService.calculate: if/elif chain with list membership tests."""
+    if operation in ['+', '-', '*', '/']:
+        num1 = float(data.get('num1', 0))
+        num2 = float(data.get('num2', 0))
+        result = legacy_basic_operation(operation, num1, num2)
+        return {'success': True, 'result': result, 'operation': f"{num1} {operation} {num2}"}
+    elif operation in ['sin', 'cos', 'tan', 'cot']:
+        angle = float(data.get('angle', 0))
+        result = legacy_trigonometric_function(operation, angle)
+        return {'success': True, 'result': result, 'operation': f"{operation}({angle}°)"}
+    elif operation == 'log':
+        pass
+    elif operation == 'power':
+        pass
+    elif operation == 'mod':
+        num1 = float(data.get('num1', 0))
+        num2 = float(data.get('num2', 1))
+        result = Operator.perform_modulo(num1, num2)
+        return {'success': True, 'result': result, 'operation': f"{num1} mod {num2}"}
+    raise CalculatorError(f"Unknown operation: {operation}")
+
+
+CASES = [
+    ('basic', lambda: legacy_basic_operation('*', 3.0, 4.0),
+     lambda: Operator.perform_basic_operation('*', 3.0, 4.0)),
+    ('trig', lambda: legacy_trigonometric_function('cos', 60.0),
+     lambda: Operator.perform_trigonometric_function('cos', 60.0)),
+    ('service +', lambda: legacy_calculate('+', {'num1': 1, 'num2': 2}),
+     lambda: CalculatorService.calculate('+', {'num1': 1, 'num2': 2})),
+    ('service mod', lambda: legacy_calculate('mod', {'num1': 10, 'num2': 3}),
+     lambda: CalculatorService.calculate('mod', {'num1': 10, 'num2': 3})),
+]
+
+
+def run(number: int = 200000) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        number: Calls per case
+
+    Returns:
+        Dictionary mapping case name to (before, after) nanoseconds per call
+    """
+    stats = {}
+    for name, before, after in CASES:
+        before_ns = min(timeit.repeat(before, number=number, repeat=3)) / number * 1e9
+        after_ns = min(timeit.repeat(after, number=number, repeat=3)) / number * 1e9
+        stats[name] = (before_ns, after_ns)
+    return stats
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    for name, (before, after) in run(n).items():
+        print(f"{name:12s} before {before:7.0f} ns  after {after:7.0f} ns  "
+              f"({before / after:.2f}x)")
@@ -0,0 +1,63 @@
+"""
+Expression Evaluation Benchmark
+Compares cold compilation, cached evaluation and the equivalent chain of single operations.
+
+Usage:
+    python -m benchmarks.bench_expression [N]
+"""
+import sys
+import time
+from app.calculator_service import CalculatorService
+from Operators.ExpressionEvaluator import ExpressionEvaluator
+
+
+EXPRESSION = '2*sin(30)+log(8,2)^2 mod 3'
+
+
+def run(count: int = 10000) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        count: Number of evaluations per mode
+
+    Returns:
+        Dictionary with per-evaluation timings in microseconds
+    """
+    start = time.perf_counter()
+    for _ in range(count):
+        ExpressionEvaluator.clear_cache()
+        ExpressionEvaluator.evaluate(EXPRESSION)
+    cold = time.perf_counter() - start
+
+    ExpressionEvaluator.evaluate(EXPRESSION)
+    start = time.perf_counter()
+    for _ in range(count):
+        ExpressionEvaluator.evaluate(EXPRESSION)
+    cached = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(count):
+        sin = CalculatorService.calculate('sin', {'angle': 30})['result']
+        log = CalculatorService.calculate('log', {'number': 8, 'base': 2})['result']
+        squared = CalculatorService.calculate('power', {'base': log, 'exponent': 2})['result']
+        remainder = CalculatorService.calculate('mod', {'num1': squared, 'num2': 3})['result']
+        product = CalculatorService.calculate('*', {'num1': 2, 'num2': sin})['result']
+        CalculatorService.calculate('+', {'num1': product, 'num2': remainder})
+    chained = time.perf_counter() - start
+
+    return {
+        'count': count,
+        'cold_us': cold / count * 1e6,
+        'cached_us': cached / count * 1e6,
+        'chained_us': chained / count * 1e6
+    }
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    stats = run(n)
+    print(f"Expression: {EXPRESSION} ({stats['count']} evaluations)")
+    print(f"Parse + evaluate:       {stats['cold_us']:.1f} us")
+    print(f"Cached evaluate:        {stats['cached_us']:.1f} us")
+    print(f"Six single operations:  {stats['chained_us']:.1f} us")
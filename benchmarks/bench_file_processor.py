@@ -0,0 +1,92 @@
+"""
+Columnar File Processor Benchmark
+Generates an operand CSV (num1,num2,operator) and evaluates it with the memory-mapped
+columnar processor, reporting rows/sec, MB/sec and peak RSS for several chunk sizes.
+Peak RSS should track the chunk size, not the file size.
+
+Usage:
+    python -m benchmarks.bench_file_processor [--rows N] [--chunk-mb 1,4,16] [--keep FILE]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+from benchmarks.common import save_results
+
+
+OPERATORS = ['+', '-', '*', '/', 'sin', 'cos', 'tan', 'log', 'power', 'mod']
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def generate(path: str, rows: int, seed: int = 7, block: int = 100000) -> int:
+    """Write rows random operand rows to path in blocks; returns the file size in bytes."""
+    rng = random.Random(seed)
+    with open(path, 'w') as handle:
+        handle.write('num1,num2,operator\n')
+        for first in range(0, rows, block):
+            handle.write(''.join(
+                f"{rng.uniform(-1000, 1000):.6f},{rng.uniform(0.5, 10):.4f},{rng.choice(OPERATORS)}\n"
+                for _ in range(min(block, rows - first))
+            ))
+    return os.path.getsize(path)
+
+
+def measure(path: str, chunk_bytes: int) -> Dict[str, float]:
+    """Process the file in a fresh interpreter so peak RSS reflects only the processing."""
+    script = (
+        "import json, sys\n"
+        "from app.file_processor import process_file\n"
+        f"stats = process_file({path!r}, {path + '.out'!r}, 'f64', {chunk_bytes})\n"
+        "print(json.dumps(stats))\n"
+    )
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True,
+                            cwd=ROOT, check=True).stdout
+    os.remove(path + '.out')
+    return json.loads(output)
+
+
+def run(rows: int = 2000000, chunk_sizes_mb: List[float] = (1, 4, 16), path: str = None) -> Dict:
+    """
+    Run the benchmark.
+
+    Args:
+        rows: Rows in the generated file
+        chunk_sizes_mb: Chunk sizes to compare
+        path: Keep the generated file here instead of a temporary directory
+
+    Returns:
+        Dictionary with the file size and per chunk size statistics
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = path or os.path.join(directory, 'operands.csv')
+        size = generate(path, rows)
+        results = {'rows': rows, 'file_mb': size / (1024 * 1024)}
+        for chunk_mb in chunk_sizes_mb:
+            stats = measure(path, int(chunk_mb * 1024 * 1024))
+            results[f'chunk_{chunk_mb}mb'] = {
+                key: stats[key] for key in ('rows_per_sec', 'mb_per_sec', 'peak_rss_mb', 'chunks', 'errors')
+            }
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Columnar file processor benchmark')
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--chunk-mb', default='1,4,16', help='Comma-separated chunk sizes in MB')
+    parser.add_argument('--keep', help='Write the generated file here and keep it')
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/...)')
+    args = parser.parse_args()
+
+    results = run(args.rows, [float(size) for size in args.chunk_mb.split(',')], args.keep)
+    print(f"Rows: {results['rows']}  file: {results['file_mb']:.1f} MB")
+    for name, stats in results.items():
+        if isinstance(stats, dict):
+            print(f"{name:14s} {stats['rows_per_sec']:12.0f} rows/sec {stats['mb_per_sec']:8.1f} MB/sec "
+                  f"peak RSS {stats['peak_rss_mb']:7.1f} MB")
+    print(f"Saved results to {save_results('file_processor', results, args.output)}")
@@ -0,0 +1,113 @@
+"""
+Calculation History Benchmark
+Measures what history logging adds to a calculate request: disabled, the batched
+background writer, and a synchronous insert-and-commit per request for comparison.
+record_only_us is the request-path cost alone; calculate_batched_history_us also
+includes the writer thread's CPU time when it shares a core with the requests.
+Also reports writer throughput and paged query latency on a populated database.
+
+Usage:
+    python -m benchmarks.bench_history [requests]
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import timeit
+from app.api_handlers import handle_calculate
+from app.history import HISTORY, CalculationHistory
+
+PAYLOAD = {'operation': '+', 'num1': 10, 'num2': 5}
+
+
+def _per_request_us(requests: int, client_id=None) -> float:
+    """Microseconds per handle_calculate call, best of three runs."""
+    seconds = min(timeit.repeat(lambda: handle_calculate(PAYLOAD, client_id),
+                                number=requests, repeat=3))
+    return seconds / requests * 1e6
+
+
+def _synchronous_us(path: str, requests: int) -> float:
+    """Naive logging: one INSERT and COMMIT inside every request."""
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    connection.execute('CREATE TABLE IF NOT EXISTS log (client_id, created_at, result)')
+
+    def request():
+        payload, _ = handle_calculate(PAYLOAD)
+        with connection:
+            connection.execute('INSERT INTO log VALUES (?, ?, ?)',
+                               ('bench', time.time(), payload['result']))
+
+    seconds = min(timeit.repeat(request, number=requests, repeat=3))
+    connection.close()
+    return seconds / requests * 1e6
+
+
+def run(requests: int = 20000) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        requests: Calculate calls per measurement
+
+    Returns:
+        Dictionary of per-request latencies, writer throughput and query latencies
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        HISTORY.configure(None)
+        results['calculate_no_history_us'] = _per_request_us(requests)
+
+        HISTORY.configure(os.path.join(directory, 'history.db'), max_entries_per_client=0)
+        results['calculate_batched_history_us'] = _per_request_us(requests, 'bench')
+        start = time.perf_counter()
+        HISTORY.flush()
+        results['drain_after_load_s'] = time.perf_counter() - start
+        results['dropped'] = HISTORY.stats()['dropped']
+        HISTORY.configure(None)
+
+        # The request-path cost alone, with the writer idle
+        store = CalculationHistory(os.path.join(directory, 'record.db'), flush_interval=3600,
+                                   batch_size=10 ** 9, queue_size=10 ** 9)
+        result = {'result': 15.0, 'operation': '10.0 + 5.0'}
+        results['record_only_us'] = min(timeit.repeat(
+            lambda: store.record('bench', '+', result), number=requests, repeat=3)) / requests * 1e6
+        store.shutdown()
+
+        results['calculate_sync_insert_us'] = _synchronous_us(
+            os.path.join(directory, 'sync.db'), max(requests // 10, 1)
+        )
+
+        # Writer throughput and queries on a database with 100k rows across 100 clients
+        store = CalculationHistory(os.path.join(directory, 'query.db'), max_entries_per_client=0,
+                                   flush_interval=0.05, queue_size=200000)
+        start = time.perf_counter()
+        for i in range(100000):
+            store.record(f'client-{i % 100}', '+' if i % 4 else 'sin', result)
+        store.flush()
+        results['writer_rows_per_s'] = 100000 / (time.perf_counter() - start)
+
+        page = store.query('client-8', limit=50)
+        results['query_first_page_us'] = min(timeit.repeat(
+            lambda: store.query('client-8', limit=50), number=200, repeat=3)) / 200 * 1e6
+        results['query_next_page_us'] = min(timeit.repeat(
+            lambda: store.query('client-8', limit=50, cursor=page['next_cursor']),
+            number=200, repeat=3)) / 200 * 1e6
+        results['query_by_operation_us'] = min(timeit.repeat(
+            lambda: store.query('client-8', limit=50, operation='sin'),
+            number=200, repeat=3)) / 200 * 1e6
+        start = time.perf_counter()
+        exported = sum(len(chunk) for chunk in store.export('client-8'))
+        results['export_1000_rows_ms'] = (time.perf_counter() - start) * 1e3
+        results['export_bytes'] = exported
+        store.shutdown()
+    return results
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for key, value in run(n).items():
+        print(f"{key:32s} {value:12.2f}")
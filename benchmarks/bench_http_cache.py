@@ -0,0 +1,52 @@
+"""
+HTTP Caching Benchmark
+Measures requests/sec through the Flask test client for a calculation sent as a POST,
+as a GET of its canonical URL, as a conditional GET answered with 304, and as a
+non-canonical GET answered with a redirect, plus the response bytes of each.
+
+Usage:
+    python -m benchmarks.bench_http_cache [N]
+"""
+import sys
+import timeit
+from app import create_app
+
+BODY = {'operation': 'log', 'number': 8, 'base': 2}
+CANONICAL = '/api/calculate?operation=log&number=8.0&base=2.0'
+
+
+def run(count: int = 2000) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        count: Requests per variant
+
+    Returns:
+        Dictionary with requests/sec and response bytes per variant
+    """
+    client = create_app().test_client()
+    etag = client.get(CANONICAL).headers['ETag']
+    variants = {
+        'post': lambda: client.post('/api/calculate', json=BODY),
+        'get': lambda: client.get(CANONICAL),
+        'get_304': lambda: client.get(CANONICAL, headers={'If-None-Match': etag}),
+        'get_redirect': lambda: client.get('/api/calculate?operation=log&number=8&base=2')
+    }
+    results = {}
+    for name, request in variants.items():
+        results[f'{name}_response_bytes'] = len(request().data)
+    # Interleaved repeats, so drift on a noisy machine affects every variant alike
+    best = dict.fromkeys(variants, float('inf'))
+    for _ in range(3):
+        for name, request in variants.items():
+            best[name] = min(best[name], timeit.timeit(request, number=count))
+    for name, seconds in best.items():
+        results[f'{name}_requests_per_sec'] = count / seconds
+    return results
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for key, value in run(n).items():
+        print(f"{key:34s} {value:10.3f}")
@@ -0,0 +1,69 @@
+"""
+JSON Codec Benchmark
+Compares the installed JSON backends on request decoding, response encoding and
+end-to-end /api/calculate throughput.
+
+Usage:
+    python -m benchmarks.bench_json [iterations]
+"""
+import json
+import os
+import sys
+import timeit
+from app import create_app
+from app.calculator_service import CalculatorService
+from app.json_codec import JSON_CODEC, BACKENDS, JSONCodec
+from benchmarks.bench_batch import build_operations
+
+
+def run(iterations: int = 20000) -> dict:
+    """
+    Run the benchmark for every installed backend.
+
+    Args:
+        iterations: Calls per single-payload measurement
+
+    Returns:
+        Dictionary mapping backend to per-call timings in microseconds
+    """
+    request_body = json.dumps({'operation': 'sin', 'num1': 2, 'angle': 30}).encode()
+    response = CalculatorService.calculate('sin', {'num1': 2, 'angle': 30})
+    batch_response = {'success': True, 'count': 1000,
+                      'results': CalculatorService.calculate_batch(build_operations(1000))}
+
+    results = {}
+    for backend in BACKENDS:
+        try:
+            codec = JSONCodec(backend)
+        except ValueError:
+            continue
+
+        os.environ['JSON_CODEC'] = backend
+        client = create_app().test_client()
+        end_to_end = timeit.timeit(
+            lambda: client.post('/api/calculate', data=request_body,
+                                content_type='application/json'),
+            number=iterations // 10
+        ) / (iterations // 10)
+
+        results[backend] = {
+            'decode_request_us': timeit.timeit(lambda: codec.loads(request_body),
+                                               number=iterations) / iterations * 1e6,
+            'encode_response_us': timeit.timeit(lambda: codec.dumps(response),
+                                                number=iterations) / iterations * 1e6,
+            'encode_batch_1000_us': timeit.timeit(lambda: codec.dumps(batch_response),
+                                                  number=50) / 50 * 1e6,
+            'calculate_request_us': end_to_end * 1e6
+        }
+
+    os.environ.pop('JSON_CODEC', None)
+    JSON_CODEC.configure('auto')
+    return results
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for backend, timings in run(n).items():
+        print(backend)
+        for name, micros in timings.items():
+            print(f"  {name:22s} {micros:10.2f} µs")
@@ -0,0 +1,63 @@
+"""
+Numeric Backend Benchmark
+Compares the cost of one CalculatorService.calculate call with the default float
+path and with the decimal (at several precisions) and fraction backends.
+
+Usage:
+    python -m benchmarks.bench_numeric [iterations]
+"""
+import sys
+import timeit
+from app.calculator_service import CalculatorService
+from Operators.Operator import CalculatorError
+
+
+WORKLOADS = {
+    'add': ('+', {'num1': '0.1', 'num2': '0.2'}),
+    'divide': ('/', {'num1': 1, 'num2': 3}),
+    'power': ('power', {'base': '1.0001', 'exponent': 10000}),
+    'sin': ('sin', {'num1': 2, 'angle': 31}),
+    'log': ('log', {'number': 1000, 'base': 7}),
+}
+
+
+def _time(operation: str, data: dict, iterations: int) -> float:
+    """Microseconds per call, best of five runs."""
+    seconds = min(timeit.repeat(lambda: CalculatorService.calculate(operation, data),
+                                number=iterations, repeat=5))
+    return seconds / iterations * 1e6
+
+
+def run(iterations: int = 2000) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        iterations: Calls per measurement
+
+    Returns:
+        Dictionary mapping '<workload>_<backend>_us' to microseconds per call
+    """
+    modes = {
+        'float': {},
+        'decimal28': {'numeric': 'decimal'},
+        'decimal100': {'numeric': 'decimal', 'precision': 100},
+        'fraction': {'numeric': 'fraction'},
+    }
+    results = {}
+    for name, (operation, data) in WORKLOADS.items():
+        for mode, fields in modes.items():
+            payload = {**data, **fields}
+            try:
+                CalculatorService.calculate(operation, payload)
+            except CalculatorError:
+                # e.g. power and trig are not supported by the fraction backend
+                continue
+            results[f'{name}_{mode}_us'] = _time(operation, payload, iterations)
+    return results
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for key, value in run(n).items():
+        print(f"{key:28s} {value:10.2f}")
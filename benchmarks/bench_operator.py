@@ -0,0 +1,106 @@
+"""
+Operator and Service Microbenchmarks
+Times every Operator method and every CalculatorService.calculate path.
+
+Usage:
+    python -m benchmarks.bench_operator [--repeat N] [--output FILE]
+"""
+import argparse
+import timeit
+from typing import Callable, Dict, List, Tuple
+from Operators.Operator import Operator, CalculatorError
+from app.calculator_service import CalculatorService
+from benchmarks.common import save_results
+
+
+# Representative payload per operation for the service paths
+SERVICE_PAYLOADS = {
+    '+': {'num1': 5, 'num2': 3},
+    '-': {'num1': 5, 'num2': 3},
+    '*': {'num1': 5, 'num2': 3},
+    '/': {'num1': 10, 'num2': 4},
+    'sin': {'angle': 30},
+    'cos': {'angle': 60},
+    'tan': {'angle': 45},
+    'cot': {'angle': 45},
+    'log': {'number': 100, 'base': 10},
+    'power': {'base': 2, 'exponent': 8},
+    'mod': {'num1': 10, 'num2': 3},
+    'pi': {}
+}
+
+
+def _expect_error(function: Callable[[], object]) -> Callable[[], None]:
+    """Wrap a call that is expected to raise CalculatorError."""
+    def call():
+        try:
+            function()
+        except CalculatorError:
+            pass
+    return call
+
+
+def build_cases() -> List[Tuple[str, Callable[[], object]]]:
+    """Build (name, callable) pairs for every benchmarked path."""
+    cases = []
+    for symbol in ('+', '-', '*', '/'):
+        cases.append((f'Operator.perform_basic_operation[{symbol}]',
+                      lambda s=symbol: Operator.perform_basic_operation(s, 10.0, 4.0)))
+    for name in ('sin', 'cos', 'tan', 'cot'):
+        cases.append((f'Operator.perform_trigonometric_function[{name}]',
+                      lambda n=name: Operator.perform_trigonometric_function(n, 30.0)))
+        cases.append((f'Operator.perform_trigonometric_operation[{name}]',
+                      lambda n=name: Operator.perform_trigonometric_operation(n, 2.0, 30.0)))
+    cases.extend([
+        ('Operator.perform_logarithm', lambda: Operator.perform_logarithm(100.0, 10.0)),
+        ('Operator.perform_power', lambda: Operator.perform_power(2.0, 8.0)),
+        ('Operator.perform_modulo', lambda: Operator.perform_modulo(10.0, 3.0)),
+        ('Operator.get_pi', Operator.get_pi),
+        ('Operator.perform_basic_operation[/ by zero]',
+         _expect_error(lambda: Operator.perform_basic_operation('/', 1.0, 0.0))),
+    ])
+
+    for operation, payload in SERVICE_PAYLOADS.items():
+        data = dict(payload, operation=operation)
+        cases.append((f'CalculatorService.calculate[{operation}]',
+                      lambda o=operation, d=data: CalculatorService.calculate(o, d)))
+    cases.extend([
+        ('CalculatorService.calculate[sin with num1]',
+         lambda: CalculatorService.calculate('sin', {'num1': 2, 'angle': 30})),
+        ('CalculatorService.calculate[/ by zero]',
+         _expect_error(lambda: CalculatorService.calculate('/', {'num1': 1, 'num2': 0}))),
+        ('CalculatorService.calculate[unknown]',
+         _expect_error(lambda: CalculatorService.calculate('sqrt', {}))),
+    ])
+    return cases
+
+
+def run(repeat: int = 5) -> Dict[str, float]:
+    """
+    Run all microbenchmarks.
+
+    Args:
+        repeat: Timing repetitions per case; the fastest is reported
+
+    Returns:
+        Dictionary mapping case name to nanoseconds per call
+    """
+    results = {}
+    for name, function in build_cases():
+        timer = timeit.Timer(function)
+        number, _ = timer.autorange()
+        best = min(timer.repeat(repeat=repeat, number=number))
+        results[name] = best / number * 1e9
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/...)')
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    for name, nanoseconds in results.items():
+        print(f"{name:55s} {nanoseconds:9.0f} ns")
+    print(f"Saved results to {save_results('operator', results, args.output)}")
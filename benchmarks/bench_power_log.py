@@ -0,0 +1,127 @@
+"""
+Power and Logarithm Fast Path Benchmark
+Compares the fixed-base logarithms and the exact integer power path with the previous
+math.log(number, base) and libm pow paths, on workloads of hot fixed bases, large
+integer powers and arbitrary operands, and reports the error of both against the
+exact result in ulps.
+
+Usage:
+    python -m benchmarks.bench_power_log [N]
+"""
+import math
+import random
+import sys
+import timeit
+from decimal import Decimal, localcontext
+from Operators.Operator import Operator, CalculatorError
+
+
+def libm_logarithm(number: float, base: float) -> float:
+    """Previous Operator.perform_logarithm."""
+    try:
+        if number <= 0:
+            raise CalculatorError("Logarithm requires positive number")
+        if base <= 0 or base == 1:
+            raise CalculatorError("Logarithm base must be positive and not equal to 1")
+        return math.log(number, base)
+    except (ValueError, ZeroDivisionError) as e:
+        raise CalculatorError(f"Logarithm calculation error: {str(e)}")
+
+
+def libm_power(base: float, exponent: float) -> float:
+    """Previous Operator.perform_power."""
+    try:
+        return base ** exponent
+    except (ValueError, OverflowError) as e:
+        raise CalculatorError(f"Power calculation error: {str(e)}")
+
+
+def _compare(previous, new, pairs, repeats: int = 7) -> tuple:
+    """Nanoseconds per call of both functions over the operand pairs, best of interleaved runs."""
+    def loop(function):
+        for a, b in pairs:
+            function(a, b)
+    best = [float('inf'), float('inf')]
+    for _ in range(repeats):
+        for index, function in enumerate((previous, new)):
+            best[index] = min(best[index], timeit.timeit(lambda: loop(function), number=1))
+    return best[0] / len(pairs) * 1e9, best[1] / len(pairs) * 1e9
+
+
+def _ulps(value: float, exact: Decimal) -> float:
+    return float(abs(Decimal(value) - exact) / Decimal(math.ulp(float(exact))))
+
+
+def _log_errors(pairs) -> tuple:
+    """Largest error in ulps of the previous and the new logarithm."""
+    worst_previous = worst_new = 0.0
+    with localcontext() as context:
+        context.prec = 50
+        for number, base in pairs:
+            exact = Decimal(number).ln() / Decimal(base).ln()
+            worst_previous = max(worst_previous, _ulps(libm_logarithm(number, base), exact))
+            worst_new = max(worst_new, _ulps(Operator.perform_logarithm(number, base), exact))
+    return worst_previous, worst_new
+
+
+def _power_errors(pairs) -> tuple:
+    """Largest error in ulps, and count of inexact results, for integer power pairs."""
+    worst_previous = worst_new = 0.0
+    inexact_previous = inexact_new = 0
+    for base, exponent in pairs:
+        power = int(base) ** abs(int(exponent))
+        exact = Decimal(power) if exponent >= 0 else Decimal(1) / Decimal(power)
+        correct = float(power) if exponent >= 0 else 1 / power
+        previous, new = libm_power(base, exponent), Operator.perform_power(base, exponent)
+        worst_previous = max(worst_previous, _ulps(previous, exact))
+        worst_new = max(worst_new, _ulps(new, exact))
+        inexact_previous += previous != correct
+        inexact_new += new != correct
+    return worst_previous, worst_new, inexact_previous, inexact_new
+
+
+def run(count: int = 100000) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        count: Operand pairs per workload
+
+    Returns:
+        Dictionary with ns/call per workload and implementation, and accuracy figures
+    """
+    rng = random.Random(1)
+    numbers = [math.exp(rng.uniform(-50, 50)) for _ in range(count)]
+    log_workloads = {
+        'log_fixed_bases': [(x, rng.choice((2.0, 10.0))) for x in numbers],
+        'log_hot_bases': [(x, rng.choice((math.e, 3.0, 16.0))) for x in numbers],
+        'log_arbitrary_bases': [(x, rng.uniform(1.5, 50)) for x in numbers],
+    }
+    power_workloads = {
+        'power_fixed_bases': [(rng.choice((2.0, 10.0)), float(rng.randrange(-30, 31))) for _ in range(count)],
+        'power_integer_pairs': [(float(rng.randrange(2, 40)), float(rng.randrange(0, 40))) for _ in range(count)],
+        'power_large_integers': [(float(rng.randrange(2, 40)), float(rng.randrange(40, 120))) for _ in range(count)],
+        'power_arbitrary': [(rng.uniform(0.5, 4), rng.uniform(-10, 10)) for _ in range(count)],
+    }
+
+    results = {}
+    for name, pairs in log_workloads.items():
+        results[f'{name}_libm_ns'], results[f'{name}_fast_ns'] = _compare(
+            libm_logarithm, Operator.perform_logarithm, pairs)
+    for name, pairs in power_workloads.items():
+        results[f'{name}_libm_ns'], results[f'{name}_fast_ns'] = _compare(
+            libm_power, Operator.perform_power, pairs)
+
+    sample = [(x, base) for x in numbers[:3000] for base in (2.0, 10.0, math.e)]
+    results['log_fixed_max_ulps_libm'], results['log_fixed_max_ulps_fast'] = _log_errors(sample)
+    integer_pairs = [(float(b), float(e)) for b in range(2, 100) for e in range(-64, 65)
+                     if abs(e) * math.log2(b) < 1000]
+    (results['power_max_ulps_libm'], results['power_max_ulps_fast'],
+     results['power_inexact_libm'], results['power_inexact_fast']) = _power_errors(integer_pairs)
+    return results
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for key, value in run(n).items():
+        print(f"{key:34s} {value:10.4g}")
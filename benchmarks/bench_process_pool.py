@@ -0,0 +1,67 @@
+"""
+Process Pool Scaling Benchmark
+Measures batch throughput inline and with 1..N worker processes.
+
+Usage:
+    python -m benchmarks.bench_process_pool [--operations N] [--max-workers N] [--output FILE]
+"""
+import argparse
+import os
+import time
+from typing import Dict
+from app.calculator_service import CalculatorService
+from app.process_pool import BatchProcessPool
+from benchmarks.bench_batch import build_operations
+from benchmarks.common import save_results
+
+
+def run(operations: int = 200000, max_workers: int = 0, rounds: int = 3) -> Dict[str, float]:
+    """
+    Run the benchmark.
+
+    Args:
+        operations: Operations per batch
+        max_workers: Largest pool size to try (default: CPU count)
+        rounds: Batches per configuration; the fastest is reported
+
+    Returns:
+        Dictionary mapping configuration to operations per second
+    """
+    batch = build_operations(operations)
+    results = {}
+
+    best = min(_timed(lambda: CalculatorService.calculate_batch(batch)) for _ in range(rounds))
+    results['inline_ops_per_sec'] = operations / best
+
+    for workers in range(1, (max_workers or os.cpu_count() or 1) + 1):
+        pool = BatchProcessPool(workers=workers, min_batch_size=1)
+        pool.start()
+        try:
+            # The first batch calibrates the chunk size
+            pool.calculate_batch(batch)
+            best = min(_timed(lambda: pool.calculate_batch(batch)) for _ in range(rounds))
+        finally:
+            pool.shutdown()
+        results[f'workers_{workers}_ops_per_sec'] = operations / best
+
+    return results
+
+
+def _timed(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Batch process pool scaling benchmark')
+    parser.add_argument('--operations', type=int, default=200000)
+    parser.add_argument('--max-workers', type=int, default=0)
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/...)')
+    args = parser.parse_args()
+
+    results = run(args.operations, args.max_workers)
+    print(f"CPU cores: {os.cpu_count()}  operations per batch: {args.operations}")
+    for name, throughput in results.items():
+        print(f"{name:28s} {throughput:12.0f} ops/sec")
+    print(f"Saved results to {save_results('process_pool', results, args.output)}")
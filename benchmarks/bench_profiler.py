@@ -0,0 +1,69 @@
+"""
+Request Profiler Benchmark
+Measures /api/calculate requests/sec through the Flask test client with profiling
+disabled, armed but not triggered, sampled at 1% and applied to every request, and
+the phase breakdown of a profiled request.
+
+Usage:
+    python -m benchmarks.bench_profiler [N]
+"""
+import os
+import sys
+import tempfile
+import timeit
+from app import create_app
+from app.profiler import PROFILER
+
+BODY = {'operation': 'power', 'base': 3, 'exponent': 70}
+
+
+def _client(**env):
+    for name in ('PROFILE_TOKEN', 'PROFILE_SAMPLE_RATE'):
+        os.environ.pop(name, None)
+    os.environ.update(env)
+    return create_app().test_client()
+
+
+def _requests_per_sec(client, count: int, headers=None) -> float:
+    seconds = min(timeit.repeat(lambda: client.post('/api/calculate', json=BODY, headers=headers),
+                                number=count, repeat=3))
+    return count / seconds
+
+
+def run(count: int = 2000) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        count: Requests per configuration
+
+    Returns:
+        Dictionary with requests/sec per configuration and milliseconds per phase of
+        one profiled request
+    """
+    directory = tempfile.mkdtemp(prefix='bench-profiler-')
+    os.environ['PROFILE_DIR'] = directory
+    results = {'disabled_requests_per_sec': _requests_per_sec(_client(), count)}
+    # PROFILER is process-wide, so each app is measured before the next one reconfigures it
+    results['sampled_1pct_requests_per_sec'] = _requests_per_sec(
+        _client(PROFILE_SAMPLE_RATE='0.01'), count)
+    client = _client(PROFILE_TOKEN='bench')
+    results['armed_requests_per_sec'] = _requests_per_sec(client, count)
+    results['profiled_requests_per_sec'] = _requests_per_sec(
+        client, max(count // 10, 10), {'X-Profile': 'bench'})
+
+    timing = client.post('/api/calculate', json=BODY, headers={'X-Profile': 'bench'}).headers['Server-Timing']
+    for item in timing.split(', '):
+        phase, ms = item.split(';dur=')
+        results[f'profiled_{phase}_ms'] = float(ms)
+
+    for name in ('PROFILE_TOKEN', 'PROFILE_SAMPLE_RATE', 'PROFILE_DIR'):
+        os.environ.pop(name, None)
+    PROFILER.configure()
+    return results
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for key, value in run(n).items():
+        print(f"{key:34s} {value:10.3f}")
@@ -0,0 +1,82 @@
+"""
+Result Object Benchmark
+Builds a batch of results as the previous response dictionaries (with the operation
+description formatted up front) and as CalculationResult objects, and reports the
+allocations and bytes each batch holds, build time and JSON encoding time.
+
+Usage:
+    python -m benchmarks.bench_results [N]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+from app.json_codec import JSON_CODEC
+from Operators.OperatorRegistry import OPERATIONS
+
+WORKLOAD = [('+', (1.5, 2.0)), ('sin', (None, 30.0)), ('log', (8.0, 2.0)), ('power', (2.0, 10.0))]
+
+
+def _build_dicts(items):
+    """Previous OperationSpec.run: a dictionary with the description formatted eagerly."""
+    return [{'success': True, 'result': spec.handler(*args), 'operation': spec.describe(*args)}
+            for spec, args in items]
+
+
+def _build_results(items):
+    return [spec.run(args) for spec, args in items]
+
+
+def _held(build, items) -> dict:
+    """Net allocated blocks and bytes per result while the batch is alive."""
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    batch = build(items)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocations = sys.getallocatedblocks() - blocks
+    del batch
+    return {
+        'allocations_per_result': allocations / len(items),
+        'bytes_per_result': current / len(items),
+        'peak_mb': peak / 2 ** 20
+    }
+
+
+def _timed(build, items) -> dict:
+    gc.collect()
+    start = time.perf_counter()
+    batch = build(items)
+    built = time.perf_counter()
+    JSON_CODEC.dumps({'results': batch})
+    encoded = time.perf_counter()
+    return {'build_seconds': built - start, 'encode_seconds': encoded - built}
+
+
+def run(count: int = 1000000) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        count: Results per batch
+
+    Returns:
+        Dictionary with allocations and bytes per result, peak traced MB, and build and
+        encode seconds for each representation
+    """
+    items = [(OPERATIONS[name], args) for name, args in WORKLOAD] * (count // len(WORKLOAD))
+    results = {}
+    for label, build in (('dict', _build_dicts), ('slots', _build_results)):
+        for key, value in _held(build, items).items():
+            results[f'{label}_{key}'] = value
+    for label, build in (('dict', _build_dicts), ('slots', _build_results)):
+        for key, value in _timed(build, items).items():
+            results[f'{label}_{key}'] = value
+    return results
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    for key, value in run(n).items():
+        print(f"{key:34s} {value:10.3f}")
@@ -0,0 +1,86 @@
+"""
+Calculation Session Benchmark
+Compares chaining N operations by feeding each result back through /api/calculate,
+one session step per request, and all N steps in one session request; then measures
+memory per session with tracemalloc against the store's own estimate.
+
+Usage:
+    python -m benchmarks.bench_sessions [STEPS] [SESSIONS]
+"""
+import sys
+import time
+import tracemalloc
+from app import create_app
+from app.sessions import SessionStore
+
+
+def _steps(count: int):
+    return [{'operation': '*' if i % 2 else '+', 'operand': 1.0001} for i in range(count)]
+
+
+def _round_trips(client, steps) -> float:
+    start = time.perf_counter()
+    value = 1.0
+    for step in steps:
+        body = {'operation': step['operation'], 'num1': value, 'num2': step['operand']}
+        value = client.post('/api/calculate', json=body).get_json()['result']
+    return time.perf_counter() - start
+
+
+def _session_steps(client, steps, batched: bool) -> float:
+    session = client.post('/api/sessions', json={'value': 1.0}).get_json()['session']
+    start = time.perf_counter()
+    if batched:
+        client.post(f'/api/sessions/{session}', json={'steps': steps})
+    else:
+        for step in steps:
+            client.post(f'/api/sessions/{session}', json=step)
+    return time.perf_counter() - start
+
+
+def _memory_per_session(count: int) -> dict:
+    store = SessionStore()
+    store.configure(count, max_log=10)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(count):
+        session_id, _ = store.create(1.0)
+        store.apply(session_id, [{'operation': '+', 'operand': 1}] * 10)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    traced = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    stats = store.stats()
+    return {
+        'traced_bytes_per_session': traced / count,
+        'estimated_bytes_per_session': stats['memory_bytes'] / count,
+        'max_bytes_per_session': stats['max_bytes_per_session']
+    }
+
+
+def run(steps: int = 200, sessions: int = 10000) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        steps: Operations in the chain
+        sessions: Sessions created for the memory measurement
+
+    Returns:
+        Dictionary with steps/sec per chaining method and bytes per session
+    """
+    client = create_app().test_client()
+    chain = _steps(steps)
+    results = {
+        'round_trip_steps_per_sec': steps / _round_trips(client, chain),
+        'session_step_per_request_per_sec': steps / _session_steps(client, chain, batched=False),
+        'session_steps_batched_per_sec': steps / _session_steps(client, chain, batched=True)
+    }
+    results.update(_memory_per_session(sessions))
+    return results
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    s = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    for key, value in run(n, s).items():
+        print(f"{key:36s} {value:12.1f}")
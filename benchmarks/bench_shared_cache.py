@@ -0,0 +1,86 @@
+"""
+Shared Result Cache Benchmark
+Compares lookup/store cost of the per-process ResultCache and the shared-memory
+SharedResultCache, and the combined hit rate of several worker processes serving
+the same request mix with one cache each versus one shared cache.
+
+Usage:
+    python -m benchmarks.bench_shared_cache [N] [WORKERS]
+"""
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import timeit
+from app.result_cache import ResultCache
+from app.shared_cache import SharedResultCache
+
+
+def _keys(count: int, distinct: int, seed: int):
+    rng = random.Random(seed)
+    return [('+', float(rng.randrange(distinct)), 1.0) for _ in range(count)]
+
+
+def _per_call_ns(cache, keys) -> dict:
+    value = (True, {'result': 3.0, 'operation': '2.0 + 1.0 = 3.0'})
+    store = min(timeit.repeat(lambda: [cache.set(key, value) for key in keys], number=1, repeat=3))
+    lookup = min(timeit.repeat(lambda: [cache.get(key) for key in keys], number=1, repeat=3))
+    return {'set_ns': store / len(keys) * 1e9, 'get_hit_ns': lookup / len(keys) * 1e9}
+
+
+def _worker(path, count, distinct, seed, queue):
+    """Serve a request mix like one gunicorn worker, counting cache hits."""
+    # Room for every distinct key, with headroom for the shared table's set conflicts
+    cache = SharedResultCache(path, 2 * distinct) if path else ResultCache(2 * distinct)
+    hits = 0
+    for key in _keys(count, distinct, seed):
+        if cache.get(key, None) is None:
+            cache.set(key, (True, {'result': key[1] + 1}))
+        else:
+            hits += 1
+    queue.put(hits)
+
+
+def _hit_rate(path, workers: int, count: int, distinct: int) -> float:
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    processes = [context.Process(target=_worker, args=(path, count, distinct, seed, queue))
+                 for seed in range(workers)]
+    for process in processes:
+        process.start()
+    hits = sum(queue.get() for _ in processes)
+    for process in processes:
+        process.join()
+    return hits / (workers * count)
+
+
+def run(count: int = 20000, workers: int = 4) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        count: Requests per measurement and per simulated worker
+        workers: Simulated worker processes for the hit-rate comparison
+
+    Returns:
+        Dictionary with ns per get/set for both caches and the combined hit rates
+    """
+    distinct = count // 4
+    keys = _keys(count, distinct, 0)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'results.cache')
+        for name, cache in (('process', ResultCache(count)), ('shared', SharedResultCache(path, count))):
+            for metric, value in _per_call_ns(cache, keys).items():
+                results[f'{name}_{metric}'] = value
+        results['process_hit_rate'] = _hit_rate(None, workers, count, distinct)
+        results['shared_hit_rate'] = _hit_rate(os.path.join(directory, 'workers.cache'), workers, count, distinct)
+    return results
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    w = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    for key, value in run(n, w).items():
+        print(f"{key:24s} {value:12.3f}")
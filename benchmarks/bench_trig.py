@@ -0,0 +1,99 @@
+"""
+Trigonometric Table Benchmark
+Compares the precomputed trig table with the previous math.radians plus libm path,
+for whole-degree angles (table hits), tenth-degree angles (hits only at resolution 10)
+and arbitrary angles (misses), and reports how the table's values differ from libm.
+
+Usage:
+    python -m benchmarks.bench_trig [N]
+"""
+import math
+import random
+import sys
+import timeit
+from Operators.Operator import (
+    Operator, CalculatorError, SPECIAL_ANGLE_VALUES, TRIGONOMETRIC_FUNCTIONS
+)
+
+
+def libm_trigonometric_function(operator: str, angle_degrees: float) -> float:
+    """Previous Operator.perform_trigonometric_function."""
+    function = TRIGONOMETRIC_FUNCTIONS.get(operator)
+    if function is None:
+        raise CalculatorError(f"Invalid trigonometric operator: {operator}")
+    try:
+        return function(math.radians(angle_degrees))
+    except (ValueError, ZeroDivisionError) as e:
+        raise CalculatorError(f"Trigonometric calculation error: {str(e)}")
+
+
+def _time(function, angles, operator: str = 'sin') -> float:
+    """Nanoseconds per call over the angle list, best of five runs."""
+    def loop():
+        for angle in angles:
+            try:
+                function(operator, angle)
+            except CalculatorError:
+                pass
+    return min(timeit.repeat(loop, number=1, repeat=5)) / len(angles) * 1e9
+
+
+def _max_relative_deviation(angles) -> float:
+    """Largest relative table vs libm difference over all functions and the given angles."""
+    worst = 0.0
+    for operator in TRIGONOMETRIC_FUNCTIONS:
+        for angle in angles:
+            try:
+                expected = libm_trigonometric_function(operator, angle)
+                actual = Operator.perform_trigonometric_function(operator, angle)
+            except CalculatorError:
+                continue
+            if abs(expected) < 1e12:
+                worst = max(worst, abs(actual - expected) / max(abs(expected), 1e-300))
+    return worst
+
+
+def run(count: int = 100000) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        count: Angles per workload
+
+    Returns:
+        Dictionary with ns/call per workload and implementation, and accuracy figures
+    """
+    rng = random.Random(1)
+    workloads = {
+        'whole_degrees': [float(rng.randrange(0, 360)) for _ in range(count)],
+        'tenth_degrees': [rng.randrange(0, 3600) / 10 for _ in range(count)],
+        'arbitrary': [rng.uniform(0, 360) for _ in range(count)],
+    }
+
+    results = {}
+    for resolution in (1, 10):
+        Operator.configure_trig_table(resolution)
+        for name, angles in workloads.items():
+            results[f'{name}_libm_ns'] = _time(libm_trigonometric_function, angles)
+            results[f'{name}_table_r{resolution}_ns'] = _time(
+                Operator.perform_trigonometric_function, angles
+            )
+    Operator.configure_trig_table(1)
+
+    # How many exact special-angle values libm misses (e.g. sin 30° = 0.49999999999999994)
+    results['special_angles_inexact_in_libm'] = sum(
+        1 for operator, values in SPECIAL_ANGLE_VALUES.items()
+        for angle, exact in values.items()
+        if exact is not None and libm_trigonometric_function(operator, angle) != exact
+    )
+    # Non-special angles outside [0, 360) are reduced first, so they may differ by rounding
+    results['max_relative_deviation_from_libm'] = _max_relative_deviation(
+        [angle for angle in range(-720, 720) if angle % 15]
+    )
+    return results
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    for key, value in run(n).items():
+        print(f"{key:40s} {value:10.4g}")
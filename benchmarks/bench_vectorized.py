@@ -0,0 +1,59 @@
+"""
+Vectorized Engine Benchmark
+Compares VectorizedOperator NumPy kernels against the scalar Operator path.
+
+Usage:
+    python -m benchmarks.bench_vectorized [N]
+"""
+import random
+import sys
+import time
+from Operators.VectorizedOperator import VectorizedOperator, HAS_NUMPY
+
+
+OPERATORS = ['+', '-', '*', '/', 'sin', 'cos', 'tan', 'cot', 'log', 'power', 'mod']
+
+
+def build_columns(count: int, seed: int = 42) -> tuple:
+    """Build a mixed operator column and two operand columns."""
+    rng = random.Random(seed)
+    operators = [rng.choice(OPERATORS) for _ in range(count)]
+    operand1 = [rng.uniform(-100, 100) for _ in range(count)]
+    operand2 = [rng.uniform(-10, 10) for _ in range(count)]
+    return operators, operand1, operand2
+
+
+def run(count: int = 100000) -> dict:
+    """
+    Run the benchmark.
+
+    Args:
+        count: Number of elements per column
+
+    Returns:
+        Dictionary with timings for homogeneous and mixed columns
+    """
+    operators, operand1, operand2 = build_columns(count)
+    stats = {'count': count, 'numpy': HAS_NUMPY}
+
+    for label, column in (('homogeneous', '*'), ('mixed', operators)):
+        start = time.perf_counter()
+        VectorizedOperator.evaluate_scalar(column, operand1, operand2)
+        stats[f'{label}_scalar_seconds'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        VectorizedOperator.evaluate(column, operand1, operand2)
+        stats[f'{label}_vectorized_seconds'] = time.perf_counter() - start
+
+    return stats
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    stats = run(n)
+    print(f"Elements: {stats['count']} (NumPy available: {stats['numpy']})")
+    for label in ('homogeneous', 'mixed'):
+        scalar = stats[f'{label}_scalar_seconds']
+        vectorized = stats[f'{label}_vectorized_seconds']
+        print(f"{label:12s} scalar {scalar:.3f}s  vectorized {vectorized:.3f}s  "
+              f"speedup {scalar / vectorized:.1f}x")
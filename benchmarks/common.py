@@ -0,0 +1,103 @@
+"""
+Benchmark Utilities
+Shared timing statistics, result persistence and comparison helpers.
+"""
+import json
+import os
+import platform
+import subprocess
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of pre-sorted values.
+
+    Args:
+        sorted_values: Values in ascending order
+        fraction: Percentile as a fraction (0.95 for p95)
+
+    Returns:
+        Percentile value, or 0.0 for no values
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def latency_summary(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """
+    Summarize request latencies.
+
+    Args:
+        latencies: Per-request latencies in seconds
+        elapsed: Wall-clock duration of the run in seconds
+
+    Returns:
+        Dictionary with count, throughput and p50/p95/p99/max latency in milliseconds
+    """
+    ordered = sorted(latencies)
+    return {
+        'count': len(ordered),
+        'elapsed_seconds': elapsed,
+        'throughput_per_sec': len(ordered) / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(ordered, 0.50) * 1000,
+        'p95_ms': percentile(ordered, 0.95) * 1000,
+        'p99_ms': percentile(ordered, 0.99) * 1000,
+        'max_ms': (ordered[-1] * 1000) if ordered else 0.0
+    }
+
+
+def git_revision() -> Optional[str]:
+    """Return the current git commit hash, or None outside a git checkout."""
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(RESULTS_DIR))
+        return output.stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(name: str, results: Dict[str, Any], path: Optional[str] = None) -> str:
+    """
+    Save benchmark results as JSON with environment metadata.
+
+    Args:
+        name: Benchmark name, used in the default file name
+        results: Benchmark results
+        path: Output file, defaults to benchmarks/results/<name>-<revision>-<timestamp>.json
+
+    Returns:
+        Path of the written file
+    """
+    revision = git_revision()
+    document = {
+        'benchmark': name,
+        'revision': revision,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': results
+    }
+
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        path = os.path.join(RESULTS_DIR, f'{name}-{revision or "unknown"}-{stamp}.json')
+
+    with open(path, 'w') as handle:
+        json.dump(document, handle, indent=2)
+    return path
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Load a results file written by save_results."""
+    with open(path) as handle:
+        return json.load(handle)
@@ -0,0 +1,75 @@
+"""
+Benchmark Comparison
+Compares two results files written by the benchmark suite and flags regressions.
+
+Usage:
+    python -m benchmarks.compare BASELINE.json CANDIDATE.json [--threshold 10]
+
+Exits with status 1 if any metric regressed by more than the threshold percentage.
+"""
+import argparse
+import sys
+from typing import Dict, List, Tuple
+from benchmarks.common import load_results
+
+
+# Metrics where a higher value is better; every other numeric metric is lower-is-better
+HIGHER_IS_BETTER = {'throughput_per_sec'}
+# Metrics that describe the run rather than its performance
+IGNORED = {'count', 'elapsed_seconds', 'concurrency', 'duration'}
+
+
+def numeric_metrics(results: Dict) -> Dict[str, float]:
+    """Flatten the comparable numeric metrics of a results document."""
+    return {
+        name: float(value) for name, value in results['results'].items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and name not in IGNORED
+    }
+
+
+def compare(baseline: Dict, candidate: Dict, threshold: float) -> List[Tuple[str, float, float, float, bool]]:
+    """
+    Compare metrics present in both documents.
+
+    Args:
+        baseline: Baseline results document
+        candidate: Candidate results document
+        threshold: Regression threshold in percent
+
+    Returns:
+        List of (metric, baseline, candidate, change %, regressed) tuples, where a positive
+        change always means the candidate is worse
+    """
+    before = numeric_metrics(baseline)
+    after = numeric_metrics(candidate)
+    rows = []
+    for name in before:
+        if name not in after or before[name] == 0:
+            continue
+        change = (after[name] - before[name]) / before[name] * 100
+        if name in HIGHER_IS_BETTER:
+            change = -change
+        rows.append((name, before[name], after[name], change, change > threshold))
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare two benchmark results files')
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Regression threshold in percent (default 10)')
+    args = parser.parse_args()
+
+    baseline = load_results(args.baseline)
+    candidate = load_results(args.candidate)
+    if baseline['benchmark'] != candidate['benchmark']:
+        sys.exit(f"Cannot compare {baseline['benchmark']} with {candidate['benchmark']} results")
+
+    print(f"{baseline['benchmark']}: {baseline['revision']} -> {candidate['revision']}")
+    rows = compare(baseline, candidate, args.threshold)
+    for name, before, after, change, regressed in rows:
+        flag = '  REGRESSION' if regressed else ''
+        print(f"{name:55s} {before:12.2f} {after:12.2f} {change:+7.1f}%{flag}")
+
+    sys.exit(1 if any(row[4] for row in rows) else 0)
@@ -0,0 +1,113 @@
+"""
+Startup Import Profile
+Runs each startup target in a fresh interpreter with -X importtime and reports
+wall time, peak RSS and the slowest imported modules.
+
+Usage:
+    python -m benchmarks.import_profile [--top N] [--output FILE]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+from benchmarks.common import save_results
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Target name -> statement executed in a fresh interpreter
+TARGETS = {
+    'operator': 'from Operators.Operator import Operator',
+    'calculator_service': 'from app.calculator_service import CalculatorService',
+    'create_app': 'from app import create_app; create_app()',
+    'cli': 'import calculatorModel, app.cli',
+}
+
+# Prints wall time and peak RSS of the statement as JSON on the last stdout line
+_MEASURE = """
+import resource, sys, time
+_baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+_start = time.perf_counter()
+exec({statement!r})
+_elapsed = time.perf_counter() - _start
+_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+import json
+print(json.dumps({{'seconds': _elapsed, 'peak_rss_kb': _peak, 'rss_delta_kb': _peak - _baseline,
+                  'modules': len(sys.modules)}}))
+"""
+
+
+def measure(statement: str) -> Dict[str, Any]:
+    """
+    Run a statement in a fresh interpreter.
+
+    Args:
+        statement: Python code to time, e.g. an import
+
+    Returns:
+        Dictionary with seconds, peak_rss_kb, rss_delta_kb (peak RSS growth over the
+        bare interpreter), modules (entries in sys.modules) and the raw importtime log
+    """
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _MEASURE.format(statement=statement)],
+        capture_output=True, text=True, cwd=ROOT, check=True
+    )
+    result = json.loads(process.stdout.strip().splitlines()[-1])
+    result['importtime'] = process.stderr
+    return result
+
+
+def slowest_imports(importtime_log: str, top: int = 10) -> List[Tuple[str, float]]:
+    """
+    Parse -X importtime output into the modules with the highest cumulative time.
+
+    Returns:
+        (module, milliseconds) pairs, slowest first
+    """
+    entries = []
+    for line in importtime_log.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        entries.append((name.strip(), int(cumulative) / 1000))
+    return sorted(entries, key=lambda entry: entry[1], reverse=True)[:top]
+
+
+def run(top: int = 10) -> Dict[str, Any]:
+    """
+    Profile every startup target.
+
+    Args:
+        top: Slowest modules to list per target
+
+    Returns:
+        Dictionary mapping target to its measurements and slowest imports
+    """
+    results = {}
+    for name, statement in TARGETS.items():
+        measurement = measure(statement)
+        results[name] = {
+            'seconds': measurement['seconds'],
+            'peak_rss_kb': measurement['peak_rss_kb'],
+            'rss_delta_kb': measurement['rss_delta_kb'],
+            'modules': measurement['modules'],
+            'slowest_imports_ms': dict(slowest_imports(measurement['importtime'], top)),
+        }
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Startup import-time profile')
+    parser.add_argument('--top', type=int, default=10, help='Slowest modules to list per target')
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/...)')
+    args = parser.parse_args()
+
+    results = run(args.top)
+    for name, result in results.items():
+        print(f"{name}: {result['seconds'] * 1000:.1f} ms, peak RSS {result['peak_rss_kb'] / 1024:.1f} MB "
+              f"(+{result['rss_delta_kb'] / 1024:.1f} MB), {result['modules']} modules")
+        for module, milliseconds in result['slowest_imports_ms'].items():
+            print(f"    {module:40s} {milliseconds:8.1f} ms")
+    print(f"Saved results to {save_results('import_profile', results, args.output)}")
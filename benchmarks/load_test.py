@@ -0,0 +1,249 @@
+"""
+Load Generator
+Drives the calculator API with a configurable operation mix and concurrency,
+through the Flask test client, a local gunicorn server or an existing URL.
+
+Usage:
+    python -m benchmarks.load_test --target client --requests 5000 --concurrency 4
+    python -m benchmarks.load_test --target gunicorn --workers 4 --threads 2 --duration 10
+    python -m benchmarks.load_test --url http://localhost:5000 --mix scientific
+    python -m benchmarks.load_test --mix my_mix.json   # {"+": 3, "sin": 1, ...}
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from benchmarks.common import latency_summary, save_results
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAYLOADS = {
+    '+': {'operation': '+', 'num1': 5, 'num2': 3},
+    '-': {'operation': '-', 'num1': 5, 'num2': 3},
+    '*': {'operation': '*', 'num1': 5, 'num2': 3},
+    '/': {'operation': '/', 'num1': 10, 'num2': 4},
+    '/0': {'operation': '/', 'num1': 10, 'num2': 0},
+    'sin': {'operation': 'sin', 'angle': 30},
+    'cos': {'operation': 'cos', 'angle': 60},
+    'tan': {'operation': 'tan', 'angle': 45},
+    'cot': {'operation': 'cot', 'angle': 45},
+    'log': {'operation': 'log', 'number': 100, 'base': 10},
+    'power': {'operation': 'power', 'base': 2, 'exponent': 8},
+    'mod': {'operation': 'mod', 'num1': 10, 'num2': 3},
+    'pi': {'operation': 'pi'}
+}
+
+# Named operation mixes: payload name -> relative weight
+MIXES = {
+    'basic': {'+': 1, '-': 1, '*': 1, '/': 1},
+    'scientific': {'sin': 1, 'cos': 1, 'tan': 1, 'cot': 1, 'log': 1, 'power': 1, 'mod': 1},
+    'mixed': {'+': 4, '-': 2, '*': 2, '/': 2, 'sin': 1, 'cos': 1, 'log': 1, 'power': 1, 'mod': 1, 'pi': 1},
+    'errors': {'+': 8, '/0': 2}
+}
+
+
+def load_mix(name: str) -> Dict[str, float]:
+    """Resolve a named mix or load one from a JSON file of weights."""
+    if name in MIXES:
+        return MIXES[name]
+    with open(name) as handle:
+        mix = json.load(handle)
+    unknown = set(mix) - set(PAYLOADS)
+    if unknown:
+        raise ValueError(f"Unknown payloads in mix: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def build_schedule(mix: Dict[str, float], count: int, seed: int) -> List[bytes]:
+    """Pre-encode a reproducible sequence of request bodies following the mix weights."""
+    rng = random.Random(seed)
+    names = list(mix)
+    choices = rng.choices(names, weights=[mix[name] for name in names], k=count)
+    encoded = {name: json.dumps(PAYLOADS[name]).encode() for name in names}
+    return [encoded[name] for name in choices]
+
+
+def client_sender() -> Callable[[], Callable[[bytes], int]]:
+    """Factory of per-thread senders using the Flask test client."""
+    sys.path.insert(0, PROJECT_ROOT)
+    from app import create_app
+    app = create_app()
+
+    def make():
+        client = app.test_client()
+
+        def send(body: bytes) -> int:
+            return client.post('/api/calculate', data=body,
+                               content_type='application/json').status_code
+        return send
+    return make
+
+
+def http_sender(url: str) -> Callable[[], Callable[[bytes], int]]:
+    """Factory of per-thread senders using keep-alive HTTP connections."""
+    parsed = urlparse(url)
+    host, port = parsed.hostname, parsed.port or 80
+    path = (parsed.path.rstrip('/') or '') + '/api/calculate'
+    headers = {'Content-Type': 'application/json'}
+
+    def make():
+        connection = http.client.HTTPConnection(host, port, timeout=30)
+
+        def send(body: bytes) -> int:
+            nonlocal connection
+            try:
+                connection.request('POST', path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                return response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(host, port, timeout=30)
+                return 0
+        return send
+    return make
+
+
+def run_load(make_sender: Callable[[], Callable[[bytes], int]], schedule: List[bytes],
+             concurrency: int, duration: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Send the schedule from `concurrency` threads and collect latencies.
+
+    With a duration, threads cycle through the schedule until time runs out;
+    otherwise each request in the schedule is sent once.
+    """
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    statuses: List[Dict[int, int]] = [{} for _ in range(concurrency)]
+    start_barrier = threading.Barrier(concurrency + 1)
+
+    def worker(index: int) -> None:
+        send = make_sender()
+        own = schedule[index::concurrency] or schedule
+        local_latencies = latencies[index]
+        local_statuses = statuses[index]
+        start_barrier.wait()
+        deadline = time.perf_counter() + duration if duration else None
+        position = 0
+        while True:
+            if deadline is None:
+                if position >= len(own):
+                    return
+            elif time.perf_counter() >= deadline:
+                return
+            body = own[position % len(own)]
+            position += 1
+            began = time.perf_counter()
+            status = send(body)
+            local_latencies.append(time.perf_counter() - began)
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    began = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    merged_statuses: Dict[str, int] = {}
+    for local in statuses:
+        for status, count in local.items():
+            merged_statuses[str(status)] = merged_statuses.get(str(status), 0) + count
+
+    summary = latency_summary([value for local in latencies for value in local], elapsed)
+    summary['status_counts'] = merged_statuses
+    return summary
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(workers: int, threads: int) -> Tuple[subprocess.Popen, str]:
+    """Start gunicorn on a free localhost port and wait until /api/health answers."""
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}',
+         '--workers', str(workers), '--threads', str(threads), 'main:app'],
+        cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('gunicorn exited during startup')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/api/health')
+            if connection.getresponse().status == 200:
+                return process, url
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError('gunicorn did not become ready within 30 seconds')
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Parse arguments, run the load test and save the results."""
+    parser = argparse.ArgumentParser(description='Calculator API load generator')
+    parser.add_argument('--target', choices=['client', 'gunicorn'], default='client')
+    parser.add_argument('--url', help='Drive an already running server instead of --target')
+    parser.add_argument('--mix', default='mixed',
+                        help=f"Operation mix: {', '.join(MIXES)} or a JSON weights file")
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--duration', type=float, help='Run for N seconds instead of --requests')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn workers')
+    parser.add_argument('--threads', type=int, default=2, help='gunicorn threads per worker')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/...)')
+    args = parser.parse_args(argv)
+
+    schedule = build_schedule(load_mix(args.mix), args.requests, args.seed)
+    process = None
+    try:
+        if args.url:
+            target, make_sender = args.url, http_sender(args.url)
+        elif args.target == 'gunicorn':
+            process, url = start_gunicorn(args.workers, args.threads)
+            target, make_sender = f'gunicorn {args.workers}x{args.threads}', http_sender(url)
+        else:
+            target, make_sender = 'test client', client_sender()
+
+        summary = run_load(make_sender, schedule, args.concurrency, args.duration)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    results = {
+        'target': target,
+        'mix': args.mix,
+        'concurrency': args.concurrency,
+        'duration': args.duration,
+        **summary
+    }
+    print(f"Target:      {target}  mix={args.mix}  concurrency={args.concurrency}")
+    print(f"Requests:    {summary['count']} in {summary['elapsed_seconds']:.2f}s "
+          f"({summary['throughput_per_sec']:.0f} req/s)")
+    print(f"Latency ms:  p50 {summary['p50_ms']:.2f}  p95 {summary['p95_ms']:.2f}  "
+          f"p99 {summary['p99_ms']:.2f}  max {summary['max_ms']:.2f}")
+    print(f"Statuses:    {summary['status_counts']}")
+    print(f"Saved results to {save_results('load', results, args.output)}")
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,16 @@
-from Operators.Operator import Operator
-import keyboard
+"""
+Command line calculator.
+Interactive when run without arguments on a terminal; otherwise evaluates
+operations or expressions in bulk (see app.cli, or run with --help).
+"""
+import sys
+from Operators.Operator import Operator, CalculatorError
 import math
 
-performBasicOperation = Operator.performBasicOperation
-performAdvanceOperation = Operator.performAdvanceOperation
-performTrigOperation = Operator.trigonometryOperation
+performBasicOperation = Operator.perform_basic_operation
+performAdvanceOperation = Operator.perform_trigonometric_operation
+performTrigOperation = Operator.perform_trigonometric_function
+performLogarithm = Operator.perform_logarithm
 validBasicOperators = ["+", "-", "*", "/"]
 
 def getFloatInput(prompt):
@@ -31,12 +37,20 @@ def calculator():
                 num1 = float(userInput)
             elif userInput in ["sin", "cos", "tan", "cot"]:
                 angle = getFloatInput("Enter the angle in degrees (for trigonometric operations): ")
-                num1 = performTrigOperation(userInput, angle)
+                try:
+                    num1 = performTrigOperation(userInput, angle)
+                except CalculatorError as e:
+                    print(e)
+                    continue
                 print("Current Trigonometric result:", num1)
             elif userInput == 'log':
                 number = getFloatInput("Enter a log number: ")
                 base = getFloatInput("Enter the base: ")
-                num1 = math.log(number, base)
+                try:
+                    num1 = performLogarithm(number, base)
+                except CalculatorError as e:
+                    print(e)
+                    continue
                 print("Current log result:", num1)
             else:
                 print("Invalid input. Please enter a valid number, 'pi', or 'exit'.")
@@ -46,24 +60,45 @@ def calculator():
         if chooseOperator == 'back':
             num1 = None
             continue
-        elif chooseOperator in ["+", "-", "*", "/"]:
-            num2 = getFloatInput("Enter another number: ")
-            result = performBasicOperation(chooseOperator, num1, num2)
-        elif chooseOperator in ["sin", "cos", "tan", "cot"]:
-            angle = getFloatInput("Enter a digit in degrees: ")
-            result = performAdvanceOperation(chooseOperator, num1, angle)
-        elif chooseOperator == "log":
-            number = getFloatInput("Enter a number: ")
-            log_base = getFloatInput("Enter the base: ")
-            result = performAdvanceOperation(chooseOperator, number, log_base)
-        else:
-            print("Invalid operator. Please try again.")
+        try:
+            if chooseOperator in ["+", "-", "*", "/"]:
+                num2 = getFloatInput("Enter another number: ")
+                result = performBasicOperation(chooseOperator, num1, num2)
+            elif chooseOperator in ["sin", "cos", "tan", "cot"]:
+                angle = getFloatInput("Enter a digit in degrees: ")
+                result = performAdvanceOperation(chooseOperator, num1, angle)
+            elif chooseOperator == "log":
+                number = getFloatInput("Enter a number: ")
+                log_base = getFloatInput("Enter the base: ")
+                result = performLogarithm(number, log_base)
+            elif chooseOperator == "mod":
+                num2 = getFloatInput("Enter another number: ")
+                result = Operator.perform_modulo(num1, num2)
+            elif chooseOperator == "power":
+                exponent = getFloatInput("Enter the exponent: ")
+                result = Operator.perform_power(num1, exponent)
+            elif chooseOperator == "pi":
+                result = performBasicOperation("*", num1, Operator.get_pi())
+            else:
+                print("Invalid operator. Please try again.")
+                continue
+        except CalculatorError as e:
+            print(e)
             continue
 
         if result is not None:
             print("Current result:", result)
             num1 = result
 
+def main(argv=None):
+    """Run the interactive calculator on a terminal with no arguments, else batch mode."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv and sys.stdin.isatty():
+        calculator()
+        return 0
+    from app.cli import main as batch_main
+    return batch_main(argv)
+
 if __name__ == "__main__":
-    calculator()
+    sys.exit(main())
 
@@ -0,0 +1,108 @@
+"""
+Minimal in-process ASGI test client.
+Mirrors the parts of Flask's test client used by the API tests.
+"""
+import asyncio
+import json as json_module
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+class ASGIResponse:
+    """Response captured from an ASGI application."""
+
+    def __init__(self, status_code: int, headers: List[Tuple[bytes, bytes]], data: bytes):
+        self.status_code = status_code
+        self.headers = {name.decode('latin-1').title(): value.decode('latin-1')
+                        for name, value in headers}
+        self.data = data
+
+    @property
+    def mimetype(self) -> str:
+        return self.headers.get('Content-Type', '').split(';', 1)[0].strip()
+
+    def get_data(self, as_text: bool = False):
+        return self.data.decode('utf-8') if as_text else self.data
+
+    def get_json(self) -> Any:
+        return json_module.loads(self.data)
+
+
+class ASGITestClient:
+    """Drive an ASGI application in-process, one event loop per request."""
+
+    def __init__(self, asgi_app):
+        self.asgi_app = asgi_app
+        self.application = asgi_app.flask_app
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def get(self, path: str, **kwargs) -> ASGIResponse:
+        return self.open('GET', path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> ASGIResponse:
+        return self.open('POST', path, **kwargs)
+
+    def delete(self, path: str, **kwargs) -> ASGIResponse:
+        return self.open('DELETE', path, **kwargs)
+
+    def open(self, method: str, path: str, **kwargs) -> ASGIResponse:
+        return asyncio.run(self.open_async(method, path, **kwargs))
+
+    async def open_async(self, method: str, path: str, json: Any = None, data: Any = None,
+                         content_type: Optional[str] = None,
+                         headers: Optional[Dict[str, str]] = None) -> ASGIResponse:
+        """Send a request on the running event loop, e.g. to run several concurrently."""
+        header_list = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                       for name, value in (headers or {}).items()]
+        if json is not None:
+            body = json_module.dumps(json).encode()
+            content_type = 'application/json'
+        elif isinstance(data, str):
+            body = data.encode()
+        else:
+            body = data or b''
+        if content_type:
+            header_list.append((b'content-type', content_type.encode('latin-1')))
+        if body:
+            header_list.append((b'content-length', str(len(body)).encode()))
+
+        parts = urlsplit(path)
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': method,
+            'scheme': 'http',
+            'path': parts.path,
+            'raw_path': parts.path.encode(),
+            'query_string': parts.query.encode(),
+            'root_path': '',
+            'headers': header_list,
+            'client': ('127.0.0.1', 12345),
+            'server': ('localhost', 80),
+        }
+        return await self._request(scope, body)
+
+    async def _request(self, scope: Dict[str, Any], body: bytes) -> ASGIResponse:
+        messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+        started: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            await asyncio.sleep(3600)
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                started.update(message)
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+
+        await self.asgi_app(scope, receive, send)
+        return ASGIResponse(started['status'], started.get('headers', []), b''.join(chunks))
@@ -0,0 +1,45 @@
+"""
+Local stand-in for the shared rate-limit store.
+Implements the contract of app.admission.TOKEN_BUCKET_SCRIPT behind Redis' eval API,
+so RedisBackend can be tested without a Redis server.
+"""
+import threading
+import time
+from typing import Dict, List
+
+from app.admission import TOKEN_BUCKET_SCRIPT
+
+
+class StoreUnavailable(Exception):
+    """Raised by the stand-in while it simulates an outage."""
+
+
+class RedisStandIn:
+    """One shared in-memory store; every RedisBackend given it shares the same buckets."""
+
+    def __init__(self):
+        self.hashes: Dict[str, Dict[str, float]] = {}
+        self.calls = 0
+        self.available = True
+        self._lock = threading.Lock()
+
+    def eval(self, script: str, numkeys: int, *keys_and_args) -> bytes:
+        if not self.available:
+            raise StoreUnavailable('connection refused')
+        assert script == TOKEN_BUCKET_SCRIPT and numkeys == 1
+        key, rate, burst, cost = keys_and_args[0], *map(float, keys_and_args[1:])
+        with self._lock:
+            self.calls += 1
+            now = time.time()
+            state = self.hashes.setdefault(key, {'tokens': burst, 'updated': now})
+            tokens = min(burst, state['tokens'] + max(0.0, now - state['updated']) * rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate
+            state.update(tokens=tokens, updated=now)
+        return repr(wait).encode()
+
+    def keys(self) -> List[str]:
+        return sorted(self.hashes)
@@ -0,0 +1,153 @@
+"""
+Unit tests for admission control
+Tests token buckets, the shared backend, queue-wait shedding and the concurrency limiter.
+"""
+import sys
+import threading
+import time
+import pytest
+from app import admission, create_app
+from app.admission import AdmissionController, MemoryBackend, RedisBackend
+from tests.redis_stand_in import RedisStandIn
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(admission.time, 'monotonic', clock)
+    return clock
+
+
+class TestMemoryBackend:
+    """Test token bucket arithmetic."""
+
+    def test_burst_then_refill(self, clock):
+        backend = MemoryBackend()
+        assert [backend.take('a', rate=2, burst=3) for _ in range(3)] == [0, 0, 0]
+        assert backend.take('a', rate=2, burst=3) == pytest.approx(0.5)
+        clock.now += 0.5
+        assert backend.take('a', rate=2, burst=3) == 0
+        assert backend.take('b', rate=2, burst=3) == 0
+
+    def test_refill_capped_at_burst(self, clock):
+        backend = MemoryBackend()
+        backend.take('a', rate=1, burst=2)
+        clock.now += 100
+        assert [backend.take('a', rate=1, burst=2) for _ in range(3)][-1] > 0
+
+    def test_prunes_idle_buckets(self, clock):
+        backend = MemoryBackend(max_keys=2)
+        backend.take('a', 1, 1)
+        backend.take('b', 1, 1)
+        clock.now += 120
+        backend.take('c', 1, 1)
+        assert sorted(backend._buckets) == ['c']
+
+
+class TestAdmissionController:
+    """Test request checks."""
+
+    def test_disabled_by_default(self):
+        controller = AdmissionController()
+        assert not controller.enabled
+        assert controller.check('/api/calculate', 'x') is None
+        assert controller.acquire() is None
+
+    def test_per_client_limit(self, clock):
+        controller = AdmissionController()
+        controller.configure(client_rate=1, client_burst=2)
+        assert controller.check('/api/calculate', 'a') is None
+        assert controller.check('/api/calculate', 'a') is None
+        payload, status, retry_after = controller.check('/api/calculate', 'a')
+        assert status == 429 and payload['error'] == 'Rate limit exceeded' and retry_after == 1
+        assert controller.check('/api/calculate', 'b') is None
+        assert controller.stats()['rejected'] == {'client_rate': 1}
+
+    def test_global_limit(self, clock):
+        controller = AdmissionController()
+        controller.configure(global_rate=0.5, global_burst=1)
+        assert controller.check('/api/expression', 'a') is None
+        payload, status, retry_after = controller.check('/api/expression', 'b')
+        assert status == 429 and retry_after == 2
+
+    def test_exempt_paths(self, clock):
+        controller = AdmissionController()
+        controller.configure(global_rate=1, global_burst=1)
+        controller.check('/api/calculate', 'a')
+        for path in ('/api/health', '/metrics', '/', '/static/js/calculator.js'):
+            assert controller.check(path, 'a') is None
+
+    @pytest.mark.parametrize('header_format', ['t={:.3f}', '{:.0f}', 't={:.0f}'])
+    def test_queue_wait_header(self, header_format):
+        controller = AdmissionController()
+        controller.configure(max_concurrent=4, max_queue_wait=0.5)
+        scale = {'t={:.3f}': 1, '{:.0f}': 1000, 't={:.0f}': 1000000}[header_format]
+        fresh = header_format.format((time.time() - 0.1) * scale)
+        stale = header_format.format((time.time() - 2) * scale)
+        assert controller.check('/api/calculate', 'a', fresh) is None
+        assert controller.check('/api/calculate', 'a', stale)[1] == 503
+        assert controller.check('/api/calculate', 'a', 'garbage') is None
+
+    def test_concurrency_sheds_after_queue_wait(self):
+        controller = AdmissionController()
+        controller.configure(max_concurrent=1, max_queue_wait=0.05)
+        assert controller.acquire() is None
+        start = time.perf_counter()
+        payload, status, _ = controller.acquire()
+        assert status == 503 and time.perf_counter() - start >= 0.04
+        controller.release()
+        assert controller.acquire() is None
+        controller.release()
+
+    def test_waiting_request_gets_released_slot(self):
+        controller = AdmissionController()
+        controller.configure(max_concurrent=1, max_queue_wait=2)
+        controller.acquire()
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(controller.acquire()))
+        waiter.start()
+        time.sleep(0.02)
+        controller.release()
+        waiter.join()
+        assert results == [None]
+        controller.release()
+
+
+class TestSharedBackend:
+    """Test limits shared through the stand-in store."""
+
+    def test_workers_share_buckets(self):
+        store = RedisStandIn()
+        workers = [AdmissionController(), AdmissionController()]
+        for worker in workers:
+            worker.configure(client_rate=0.001, client_burst=3, backend=RedisBackend(store))
+        results = [workers[i % 2].check('/api/calculate', 'a') for i in range(4)]
+        assert results[:3] == [None, None, None]
+        assert results[3][1] == 429
+        assert store.keys() == ['calculator:bucket:client:a']
+
+    def test_outage_falls_back_to_local_buckets(self):
+        store = RedisStandIn()
+        controller = AdmissionController()
+        controller.configure(client_rate=0.001, client_burst=1, backend=RedisBackend(store))
+        store.available = False
+        assert controller.check('/api/calculate', 'a') is None
+        assert controller.check('/api/calculate', 'a')[1] == 429
+        assert controller.stats()['backend_errors'] == 2
+        assert controller.stats()['shared_backend'] is True
+
+    def test_missing_redis_package_is_a_configuration_error(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, 'redis', None)
+        monkeypatch.setenv('RATE_LIMIT_REDIS_URL', 'redis://localhost:6379/0')
+        with pytest.raises(ValueError, match='RATE_LIMIT_REDIS_URL .* redis package'):
+            create_app()
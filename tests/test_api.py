@@ -2,17 +2,33 @@
 Integration tests for Flask API endpoints
 Tests REST API functionality and error handling.
 """
+import asyncio
+import json
+import re
+import sys
+import threading
 import pytest
 from app import create_app
+from app.admission import ADMISSION
+from app.asgi import create_asgi_app
+from app.calculator_service import CalculatorService
+from app.history import HISTORY
+from app.profiler import PROFILER
+from Operators.OperatorRegistry import register_operation, unregister_operation
+from tests.asgi_client import ASGITestClient
 
 
-@pytest.fixture
-def client():
-    """Create test client."""
+@pytest.fixture(params=['wsgi', 'asgi'])
+def client(request):
+    """Create test client for the WSGI (Flask) and ASGI serving modes."""
     app = create_app()
     app.config['TESTING'] = True
-    with app.test_client() as client:
-        yield client
+    if request.param == 'asgi':
+        with ASGITestClient(create_asgi_app(app)) as client:
+            yield client
+    else:
+        with app.test_client() as client:
+            yield client
 
 
 class TestHealthEndpoint:
@@ -157,6 +173,35 @@ class TestErrorHandling:
         assert data['success'] is False
         assert 'error' in data
 
+    def test_complex_power(self, client):
+        response = client.post('/api/calculate',
+                                json={'operation': 'power', 'base': -8, 'exponent': 0.5})
+        assert response.status_code == 400
+        assert response.get_json() == {'success': False, 'error': 'Result is not a real number'}
+
+    @pytest.mark.parametrize('path, body', [
+        ('/api/calculate', {'operation': 'opaque'}),
+        ('/api/calculate/batch', {'operations': [{'operation': 'pi'}, {'operation': 'opaque'}]}),
+        ('/api/sessions', {'value': 1}),
+    ])
+    def test_unserializable_result_is_json_error(self, client, monkeypatch, path, body):
+        register_operation('opaque', lambda: object(), (), lambda: 'opaque')
+        if path == '/api/sessions':
+            monkeypatch.setattr('app.routes.handle_session_create', lambda data: ({'value': object()}, 201))
+        try:
+            response = client.post(path, json=body)
+        finally:
+            unregister_operation('opaque')
+        assert response.status_code == 500
+        assert response.mimetype == 'application/json'
+        data = response.get_json()
+        assert data['success'] is False and data['error'].startswith('Server error')
+
+    def test_http_errors_unchanged(self, client):
+        response = client.get('/api/missing')
+        assert response.status_code == 404
+        assert client.delete('/api/calculate').status_code == 405
+
     def test_invalid_input_type(self, client):
         response = client.post('/api/calculate',
                                 json={'operation': '+', 'num1': 'abc', 'num2': 3})
@@ -174,3 +219,625 @@ class TestIndexRoute:
         assert response.status_code == 200
         assert b'<!DOCTYPE html>' in response.data
         assert b'Scientific Calculator' in response.data
+
+
+class TestStaticAssetsAPI:
+    """Test fingerprinted static file names."""
+
+    def test_fingerprinted_urls_are_immutable(self, client):
+        html = client.get('/').get_data(as_text=True)
+        urls = re.findall(r'/static/[^"]+', html)
+        assert len(urls) == 2
+        for url in urls:
+            assert re.search(r'\.[0-9a-f]{12}\.(css|js)$', url)
+            response = client.get(url)
+            assert response.status_code == 200
+            assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+
+    def test_plain_and_stale_names(self, client):
+        response = client.get('/static/css/style.css')
+        assert response.status_code == 200
+        assert 'immutable' not in response.headers.get('Cache-Control', '')
+        assert client.get('/static/css/style.000000000000.css').status_code == 404
+
+    def test_fingerprinting_disabled(self, monkeypatch):
+        monkeypatch.setenv('STATIC_FINGERPRINT', '0')
+        html = create_app().test_client().get('/').get_data(as_text=True)
+        assert '/static/css/style.css' in html
+
+
+class TestCalculateQueryAPI:
+    """Test the cacheable GET variant of /api/calculate."""
+
+    CANONICAL = '/api/calculate?operation=%2B&num1=5.0&num2=3.0'
+
+    def test_canonical_url_is_cacheable(self, client):
+        response = client.get(self.CANONICAL)
+        assert response.status_code == 200
+        assert response.get_json() == {'success': True, 'result': 8.0, 'operation': '5.0 + 3.0'}
+        assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+        etag = response.headers['Etag']
+        assert etag.startswith('"') and not etag.startswith('W/')
+
+    @pytest.mark.parametrize('query', [
+        'operation=%2B&num1=5&num2=3',
+        'num2=3&operation=%2B&num1=5.000',
+        'operation=%2B&num1=5.0&num2=3.0&cachebust=1',
+    ])
+    def test_other_spellings_redirect(self, client, query):
+        response = client.get(f'/api/calculate?{query}')
+        assert response.status_code == 301
+        assert response.headers['Location'] == self.CANONICAL
+        assert response.headers['Cache-Control'] == 'public, max-age=3600'
+
+    def test_optional_parameters(self, client):
+        response = client.get('/api/calculate?operation=sin&angle=30')
+        assert response.headers['Location'] == '/api/calculate?operation=sin&angle=30.0'
+        response = client.get('/api/calculate?operation=sin&angle=30.0')
+        assert response.get_json()['operation'] == 'sin(30.0°)'
+
+    def test_if_none_match(self, client):
+        etag = client.get(self.CANONICAL).headers['Etag']
+        response = client.get(self.CANONICAL, headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+        response = client.get(self.CANONICAL, headers={'If-None-Match': '"other"'})
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize('query', [
+        'operation=%2B&num1=1.0&num2=1.0&numeric=decimal',
+        'operation=%2B&num1=1.0&num2=1.0&numeric=fraction',
+        'operation=%2F&num1=1.0&num2=3.0&numeric=decimal&precision=50',
+        'operation=%2F&num1=1.0&num2=3.0&precision=50',
+    ])
+    def test_numeric_backends_rejected_not_redirected(self, client, query):
+        response = client.get(f'/api/calculate?{query}')
+        assert response.status_code == 400
+        assert 'POST /api/calculate' in response.get_json()['error']
+        assert 'Location' not in response.headers
+        assert 'max-age' not in response.headers.get('Cache-Control', '')
+
+    def test_explicit_float_backend_redirects(self, client):
+        response = client.get('/api/calculate?operation=%2B&num1=5.0&num2=3.0&numeric=float')
+        assert response.status_code == 301
+        assert response.headers['Location'] == self.CANONICAL
+
+    @pytest.mark.parametrize('query, status, error', [
+        ('', 400, 'Operation not specified'),
+        ('operation=nope', 400, 'Unknown operation: nope'),
+        ('operation=log&number=abc', 400, 'Invalid input'),
+        ('operation=%2F&num1=1.0&num2=0.0', 400, 'Division by zero'),
+    ])
+    def test_errors_not_cached(self, client, query, status, error):
+        response = client.get(f'/api/calculate?{query}')
+        assert response.status_code == status
+        assert error in response.get_json()['error']
+        assert 'max-age' not in response.headers.get('Cache-Control', '')
+        assert 'Etag' not in response.headers
+
+    def test_max_age_zero(self, monkeypatch):
+        monkeypatch.setenv('HTTP_CACHE_MAX_AGE', '0')
+        response = create_app().test_client().get(self.CANONICAL)
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == 'no-cache'
+
+
+class TestBatchAPI:
+    """Test batch calculation endpoint."""
+
+    def test_batch_results_in_order(self, client):
+        response = client.post('/api/calculate/batch', json={'operations': [
+            {'operation': '+', 'num1': 5, 'num2': 3},
+            {'operation': 'sin', 'angle': 30},
+            {'operation': 'power', 'base': 2, 'exponent': 8}
+        ]})
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['success'] is True
+        assert data['count'] == 3
+        assert data['results'][0]['result'] == 8
+        assert abs(data['results'][1]['result'] - 0.5) < 1e-10
+        assert data['results'][2]['result'] == 256
+
+    def test_complex_power_item_does_not_fail_batch(self, client):
+        response = client.post('/api/calculate/batch', json={'operations': [
+            {'operation': '+', 'num1': 1, 'num2': 2},
+            {'operation': 'power', 'base': -8, 'exponent': 0.5},
+            {'operation': 'power', 'base': 2, 'exponent': 3}
+        ]})
+        assert response.status_code == 200
+        results = response.get_json()['results']
+        assert results[0]['result'] == 3 and results[2]['result'] == 8
+        assert results[1] == {'success': False, 'error': 'Result is not a real number'}
+
+    def test_batch_item_errors_do_not_fail_batch(self, client):
+        response = client.post('/api/calculate/batch', json={'operations': [
+            {'operation': '/', 'num1': 10, 'num2': 0},
+            {'num1': 5},
+            'not an object',
+            {'operation': '-', 'num1': 10, 'num2': 3}
+        ]})
+        assert response.status_code == 200
+        results = response.get_json()['results']
+        assert results[0] == {'success': False, 'error': 'Division by zero'}
+        assert results[1]['success'] is False
+        assert results[2]['success'] is False
+        assert results[3]['success'] is True
+        assert results[3]['result'] == 7
+
+    def test_large_batch_keeps_order(self, client):
+        operations = [{'operation': '+', 'num1': i, 'num2': 1} for i in range(200)]
+        response = client.post('/api/calculate/batch', json={'operations': operations})
+        assert response.status_code == 200
+        results = response.get_json()['results']
+        assert [item['result'] for item in results] == [i + 1 for i in range(200)]
+
+    def test_batch_expression_items(self, client):
+        response = client.post('/api/calculate/batch', json={'operations': [
+            {'expression': '2 * (3 + 4)'},
+            {'expression': '1 / 0'}
+        ]})
+        results = response.get_json()['results']
+        assert results[0]['result'] == 14
+        assert results[1] == {'success': False, 'error': 'Division by zero'}
+
+    def test_batch_missing_operations(self, client):
+        response = client.post('/api/calculate/batch', json={'operation': '+'})
+        assert response.status_code == 400
+        assert response.get_json()['success'] is False
+
+    def test_batch_size_limit(self, client):
+        client.application.config['MAX_BATCH_SIZE'] = 2
+        response = client.post('/api/calculate/batch', json={'operations': [
+            {'operation': 'pi'}, {'operation': 'pi'}, {'operation': 'pi'}
+        ]})
+        assert response.status_code == 413
+        assert response.get_json()['success'] is False
+
+
+class TestNumericBackendsAPI:
+    """Test decimal and fraction computation modes."""
+
+    def test_decimal_addition_is_exact(self, client):
+        response = client.post('/api/calculate', json={
+            'operation': '+', 'num1': 0.1, 'num2': 0.2, 'numeric': 'decimal'
+        })
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['result'] == '0.3'
+        assert data['numeric'] == 'decimal'
+
+    def test_decimal_precision(self, client):
+        response = client.post('/api/calculate', json={
+            'operation': 'power', 'base': '2', 'exponent': '0.5',
+            'numeric': 'decimal', 'precision': 40
+        })
+        assert response.get_json()['result'] == '1.414213562373095048801688724209698078570'
+
+    def test_fraction_division(self, client):
+        response = client.post('/api/calculate', json={
+            'operation': '/', 'num1': 1, 'num2': '3', 'numeric': 'fraction'
+        })
+        assert response.get_json()['result'] == '1/3'
+
+    def test_unsupported_fraction_operation(self, client):
+        response = client.post('/api/calculate', json={
+            'operation': 'log', 'number': 8, 'base': 2, 'numeric': 'fraction'
+        })
+        assert response.status_code == 400
+        assert 'not supported by the fraction backend' in response.get_json()['error']
+
+    def test_invalid_backend_and_precision(self, client):
+        response = client.post('/api/calculate', json={'operation': '+', 'numeric': 'binary'})
+        assert response.get_json()['error'] == 'Unknown numeric backend: binary'
+        response = client.post('/api/calculate', json={
+            'operation': '+', 'numeric': 'decimal', 'precision': 5000
+        })
+        assert response.status_code == 400
+        assert 'Precision must be' in response.get_json()['error']
+
+    def test_float_backend_is_default(self, client):
+        explicit = client.post('/api/calculate', json={
+            'operation': '+', 'num1': 0.1, 'num2': 0.2, 'numeric': 'float'
+        }).get_json()
+        default = client.post('/api/calculate', json={
+            'operation': '+', 'num1': 0.1, 'num2': 0.2
+        }).get_json()
+        assert explicit == default
+        assert default['result'] == 0.30000000000000004
+
+    def test_batch_items(self, client):
+        response = client.post('/api/calculate/batch', json={'operations': [
+            {'operation': 'mod', 'num1': '-7.5', 'num2': '2', 'numeric': 'decimal'},
+            {'operation': '*', 'num1': '1/3', 'num2': 3, 'numeric': 'fraction'}
+        ]})
+        results = response.get_json()['results']
+        assert results[0]['result'] == '0.5'
+        assert results[1]['result'] == '1'
+
+    @pytest.mark.parametrize('body, error', [
+        ({'operation': 'sin', 'angle': '1e40', 'numeric': 'decimal'}, 'operand too large'),
+        ({'operation': 'mod', 'num1': '1e100', 'num2': 3, 'numeric': 'decimal'}, 'operand too large'),
+        ({'operation': '*', 'num1': '1e999999', 'num2': '1e999999', 'numeric': 'decimal'}, 'exponent beyond'),
+        ({'operation': '+', 'num1': '1e5000000', 'num2': 1, 'numeric': 'fraction'}, 'exponent beyond'),
+    ])
+    def test_decimal_signals_are_client_errors(self, client, body, error):
+        response = client.post('/api/calculate', json=body)
+        assert response.status_code == 400
+        assert error in response.get_json()['error']
+
+
+class TestExpressionAPI:
+    """Test expression evaluation endpoint."""
+
+    def test_expression(self, client):
+        response = client.post('/api/expression',
+                                json={'expression': '2*sin(30)+log(8,2)^2 mod 3'})
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['success'] is True
+        assert abs(data['result'] - 1) < 1e-10
+
+    def test_expression_error(self, client):
+        response = client.post('/api/expression', json={'expression': '1 / 0'})
+        assert response.status_code == 400
+        data = response.get_json()
+        assert data['success'] is False
+        assert data['error'] == 'Division by zero'
+
+    def test_missing_expression(self, client):
+        response = client.post('/api/expression', json={'operation': '+'})
+        assert response.status_code == 400
+        assert response.get_json()['success'] is False
+
+    def test_expression_length_limit(self, client):
+        client.application.config['MAX_EXPRESSION_LENGTH'] = 5
+        response = client.post('/api/expression', json={'expression': '1 + 2 + 3'})
+        assert response.status_code == 413
+
+
+class TestStreamAPI:
+    """Test streaming NDJSON calculation endpoint."""
+
+    def test_stream_results_and_summary(self, client):
+        body = '\n'.join([
+            '{"operation": "+", "num1": 1, "num2": 2}',
+            '',
+            'not json',
+            '{"operation": "/", "num1": 1, "num2": 0}',
+            '{"operation": "sin", "angle": 30}'
+        ])
+        response = client.post('/api/calculate/stream', data=body,
+                               content_type='application/x-ndjson')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert lines[0]['result'] == 3
+        assert lines[1] == {'success': False, 'error': 'Invalid JSON'}
+        assert lines[2] == {'success': False, 'error': 'Division by zero'}
+        assert abs(lines[3]['result'] - 0.5) < 1e-10
+        assert lines[4] == {'summary': {'count': 4, 'succeeded': 2, 'errors': 2}}
+
+    def test_unserializable_item_does_not_cut_stream(self, client):
+        register_operation('opaque', lambda: object(), (), lambda: 'opaque')
+        try:
+            body = '\n'.join(['{"operation": "pi"}', '{"operation": "opaque"}', '{"operation": "pi"}'])
+            response = client.post('/api/calculate/stream', data=body,
+                                   content_type='application/x-ndjson')
+            # The WSGI response is generated as it is read
+            text = response.get_data(as_text=True)
+        finally:
+            unregister_operation('opaque')
+        lines = [json.loads(line) for line in text.splitlines()]
+        assert len(lines) == 4
+        assert lines[0]['success'] is True and lines[2]['success'] is True
+        assert lines[1]['success'] is False and lines[1]['error'].startswith('Server error')
+        assert lines[3] == {'summary': {'count': 3, 'succeeded': 2, 'errors': 1}}
+
+    def test_stream_line_length_limit(self, client):
+        client.application.config['MAX_STREAM_LINE_LENGTH'] = 64
+        body = 'x' * 200 + '\n{"operation": "pi"}\n'
+        response = client.post('/api/calculate/stream', data=body)
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert lines[0]['error'] == 'Line exceeds maximum length'
+        assert lines[1]['success'] is True
+
+    def test_stream_consumes_input_lazily(self):
+        pulled = []
+
+        def lines():
+            for i in range(1000):
+                pulled.append(i)
+                yield b'{"operation": "pi"}'
+
+        results = CalculatorService.calculate_stream(lines())
+        next(results)
+        next(results)
+        assert len(pulled) == 2
+
+
+@pytest.fixture
+def history(tmp_path):
+    """Enable calculation history in a temporary database."""
+    HISTORY.configure(str(tmp_path / 'history.db'), flush_interval=0.01)
+    yield HISTORY
+    HISTORY.configure(None)
+
+
+class TestHistoryAPI:
+    """Test server-side calculation history endpoints."""
+
+    HEADERS = {'X-Client-ID': 'client-1'}
+
+    def test_records_calculations_and_expressions(self, client, history):
+        client.post('/api/calculate', json={'operation': '+', 'num1': 1, 'num2': 2},
+                    headers=self.HEADERS)
+        client.post('/api/calculate', json={'operation': '/', 'num1': 1, 'num2': 0},
+                    headers=self.HEADERS)
+        client.post('/api/expression', json={'expression': '2*3'}, headers=self.HEADERS)
+        client.post('/api/calculate', json={'operation': 'pi'})
+        history.flush()
+
+        response = client.get('/api/history', headers=self.HEADERS)
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['count'] == 2
+        assert [item['operation'] for item in data['items']] == ['expression', '+']
+        assert data['items'][0]['result'] == 6
+        assert data['items'][1]['expression'] == '1.0 + 2.0'
+        assert data['next_cursor'] is None
+
+    def test_paging_and_operation_filter(self, client, history):
+        for i in range(5):
+            client.post('/api/calculate', json={'operation': '*', 'num1': i, 'num2': 2},
+                        headers=self.HEADERS)
+        client.post('/api/calculate', json={'operation': 'pi'}, headers=self.HEADERS)
+        history.flush()
+
+        first = client.get('/api/history?limit=2&operation=*', headers=self.HEADERS).get_json()
+        assert [item['result'] for item in first['items']] == [8, 6]
+        second = client.get(f"/api/history?limit=2&operation=*&cursor={first['next_cursor']}",
+                            headers=self.HEADERS).get_json()
+        assert [item['result'] for item in second['items']] == [4, 2]
+
+    def test_export_and_clear(self, client, history):
+        client.post('/api/calculate', json={'operation': '-', 'num1': 5, 'num2': 2},
+                    headers=self.HEADERS)
+        history.flush()
+
+        response = client.get('/api/history/export?format=csv', headers=self.HEADERS)
+        assert response.mimetype == 'text/csv'
+        lines = response.get_data(as_text=True).splitlines()
+        assert lines[0] == 'id,timestamp,operation,expression,result'
+        assert lines[1].endswith(',-,5.0 - 2.0,3.0')
+
+        response = client.delete('/api/history', headers=self.HEADERS)
+        assert response.get_json()['deleted'] == 1
+        assert client.get('/api/history', headers=self.HEADERS).get_json()['count'] == 0
+
+    def test_errors(self, client, history):
+        assert client.get('/api/history').status_code == 400
+        assert client.get('/api/history', headers={'X-Client-ID': 'a b'}).status_code == 400
+        response = client.get('/api/history?limit=0', headers=self.HEADERS)
+        assert 'Limit must be' in response.get_json()['error']
+        response = client.get('/api/history/export?format=xml', headers=self.HEADERS)
+        assert response.status_code == 400
+
+    def test_disabled(self, client):
+        response = client.get('/api/history', headers=self.HEADERS)
+        assert response.status_code == 404
+        assert response.get_json()['error'] == 'History is not enabled'
+
+
+
+@pytest.fixture(params=['wsgi', 'asgi'])
+def limited_client(request, monkeypatch):
+    """Client for an app with a per-client limit of 2 requests and a 1 slot concurrency limit."""
+    monkeypatch.setenv('RATE_LIMIT_PER_CLIENT', '0.01')
+    monkeypatch.setenv('RATE_LIMIT_CLIENT_BURST', '2')
+    monkeypatch.setenv('MAX_CONCURRENT_REQUESTS', '1')
+    monkeypatch.setenv('MAX_QUEUE_WAIT_MS', '500')
+    app = create_app()
+    app.config['TESTING'] = True
+    if request.param == 'asgi':
+        with ASGITestClient(create_asgi_app(app)) as client:
+            yield client
+    else:
+        with app.test_client() as client:
+            yield client
+    ADMISSION.configure()
+
+
+class TestAdmissionAPI:
+    """Test rate limiting and load shedding on the API."""
+
+    def test_rate_limit_rejects_before_parsing(self, limited_client):
+        for _ in range(2):
+            response = limited_client.post('/api/calculate', json={'operation': '+', 'num1': 1, 'num2': 2})
+            assert response.status_code == 200
+        # An exhausted client is refused without its body being parsed
+        response = limited_client.post('/api/calculate', data='{not json', content_type='application/json')
+        assert response.status_code == 429
+        assert response.get_json() == {'success': False, 'error': 'Rate limit exceeded'}
+        assert int(response.headers['Retry-After']) >= 1
+
+    def test_health_and_ui_exempt(self, limited_client):
+        for _ in range(3):
+            limited_client.post('/api/expression', json={'expression': '1+1'})
+        assert limited_client.get('/api/health').status_code == 200
+        assert limited_client.get('/').status_code == 200
+
+    def test_stale_queued_request_shed(self, limited_client):
+        response = limited_client.post('/api/calculate', json={'operation': 'pi'},
+                                       headers={'X-Request-Start': 't=1000000000.000'})
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
+
+    def test_rejections_in_metrics(self, limited_client):
+        for _ in range(3):
+            limited_client.post('/api/calculate', json={'operation': 'pi'})
+        text = limited_client.get('/metrics').get_data(as_text=True)
+        assert 'calculator_rejected_total{reason="client_rate"}' in text
+        assert 'calculator_requests_total{endpoint="/api/calculate",status="429"}' in text
+
+
+@pytest.fixture(params=['wsgi', 'asgi'])
+def profiled_client(request, monkeypatch, tmp_path):
+    """Client for an app that profiles requests sent with X-Profile: secret."""
+    monkeypatch.setenv('PROFILE_TOKEN', 'secret')
+    monkeypatch.setenv('PROFILE_DIR', str(tmp_path))
+    app = create_app()
+    app.config['TESTING'] = True
+    if request.param == 'asgi':
+        with ASGITestClient(create_asgi_app(app)) as client:
+            yield client
+    else:
+        with app.test_client() as client:
+            yield client
+    PROFILER.configure()
+
+
+class TestProfilingAPI:
+    """Test per-request profiles triggered by the X-Profile header."""
+
+    BODY = {'operation': 'power', 'base': 3, 'exponent': 70}
+
+    def test_profiled_request(self, profiled_client, tmp_path):
+        response = profiled_client.post('/api/calculate', json=self.BODY,
+                                        headers={'X-Profile': 'secret'})
+        assert response.status_code == 200
+        assert response.get_json()['result'] == float(3 ** 70)
+        timings = dict(item.split(';dur=') for item in response.headers['Server-Timing'].split(', '))
+        assert float(timings['operator']) > 0 and float(timings['json_decode']) > 0
+        assert float(timings['dispatch']) > 0 and float(timings['response_encode']) > 0
+        folded = (tmp_path / f"{response.headers['X-Profile-Id']}.folded").read_text()
+        assert 'Operators.Operator:Operator.perform_power' in folded
+        assert all(line.startswith('POST /api/calculate') for line in folded.splitlines())
+
+    def test_unprofiled_requests(self, profiled_client, tmp_path):
+        for headers in ({}, {'X-Profile': 'wrong'}):
+            response = profiled_client.post('/api/calculate', json=self.BODY, headers=headers)
+            assert response.status_code == 200
+            assert 'Server-Timing' not in response.headers
+        assert sys.getprofile() is None
+        assert not list(tmp_path.iterdir())
+
+    def test_bridged_route_uses_rule(self, profiled_client, tmp_path):
+        session = profiled_client.post('/api/sessions', json={}).get_json()['session']
+        response = profiled_client.get(f'/api/sessions/{session}', headers={'X-Profile': 'secret'})
+        folded = (tmp_path / f"{response.headers['X-Profile-Id']}.folded").read_text()
+        assert folded.startswith('GET /api/sessions/<session_id>')
+
+    def test_disabled_registers_no_hooks(self):
+        app = create_app()
+        hooks = [function.__name__ for function in app.before_request_funcs.get(None, [])]
+        assert 'start_profile' not in hooks
+        response = app.test_client().post('/api/calculate', json=self.BODY,
+                                          headers={'X-Profile': 'secret'})
+        assert 'Server-Timing' not in response.headers
+
+
+class TestSessionAPI:
+    """Test calculation sessions with a server-side accumulator."""
+
+    def _create(self, client, value=None):
+        response = client.post('/api/sessions', json={} if value is None else {'value': value})
+        assert response.status_code == 201
+        return response.get_json()['session']
+
+    def test_chained_steps(self, client):
+        session = self._create(client, 10)
+        response = client.post(f'/api/sessions/{session}', json={'operation': '+', 'operand': 5})
+        assert response.get_json() == {'success': True, 'session': session, 'value': 15, 'steps': 1}
+        response = client.post(f'/api/sessions/{session}', json={
+            'steps': [{'operation': '*', 'operand': 2}, {'operation': 'power', 'operand': 2}]
+        })
+        assert response.get_json()['value'] == 900
+        assert response.get_json()['steps'] == 3
+
+    def test_failed_step_leaves_session_unchanged(self, client):
+        session = self._create(client, 1)
+        response = client.post(f'/api/sessions/{session}', json={
+            'steps': [{'operation': '+', 'operand': 1}, {'operation': '/', 'operand': 0}]
+        })
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'Step 1: Division by zero'
+        assert client.get(f'/api/sessions/{session}').get_json()['value'] == 1
+
+    def test_get_returns_log(self, client):
+        session = self._create(client)
+        client.post(f'/api/sessions/{session}', json={'steps': [{'operation': 'pi'}, {'operation': 'cos'}]})
+        data = client.get(f'/api/sessions/{session}').get_json()
+        assert [entry['operation'] for entry in data['log']] == ['pi', 'cos']
+        assert data['log'][1]['operand'] is None and data['steps'] == 2
+
+    def test_delete_and_unknown_session(self, client):
+        session = self._create(client)
+        assert client.delete(f'/api/sessions/{session}').status_code == 200
+        for response in (client.get(f'/api/sessions/{session}'),
+                         client.post(f'/api/sessions/{session}', json={'operation': 'pi'}),
+                         client.delete(f'/api/sessions/{session}'),
+                         client.get('/api/sessions/not%20an%20id')):
+            assert response.status_code == 404
+
+    @pytest.mark.parametrize('body,error', [
+        ({}, 'No data provided'),
+        ({'steps': []}, 'Operation or steps not specified'),
+        ({'operation': 'pi', 'operand': 2}, 'Operation pi takes no operand'),
+        ({'operation': 'nope'}, 'Unknown operation: nope'),
+    ])
+    def test_invalid_steps(self, client, body, error):
+        session = self._create(client)
+        response = client.post(f'/api/sessions/{session}', json=body)
+        assert response.status_code == 400
+        assert response.get_json()['error'] == error
+
+    def test_stats(self, client):
+        session = self._create(client)
+        client.post(f'/api/sessions/{session}', json={'operation': '-', 'operand': 1})
+        stats = client.get('/api/sessions/stats').get_json()
+        assert stats['enabled'] is True and stats['sessions'] >= 1
+        assert stats['memory_bytes'] > 0 and stats['max_bytes_per_session'] > 0
+
+
+class TestMetricsEndpoint:
+    """Test Prometheus metrics endpoint."""
+
+    def test_metrics(self, client):
+        client.post('/api/calculate', json={'operation': '/', 'num1': 1, 'num2': 0})
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        text = response.get_data(as_text=True)
+        assert 'calculator_requests_total{endpoint="/api/calculate",status="400"}' in text
+        assert 'calculator_operation_errors_total{operation="/",error="division_by_zero"}' in text
+
+
+class TestASGIEventLoop:
+    """Test that native ASGI endpoints keep calculations off the event loop."""
+
+    @pytest.mark.parametrize('path, body', [
+        ('/api/calculate', {'operation': 'stall', 'x': 1}),
+        ('/api/calculate/batch', {'operations': [{'operation': 'stall', 'x': 1}]}),
+    ])
+    def test_slow_calculation_does_not_block_other_requests(self, path, body):
+        release = threading.Event()
+        register_operation('stall', lambda x: float(release.wait(5)), (('x', 0.0),),
+                           lambda x: 'stall')
+        client = ASGITestClient(create_asgi_app(create_app()))
+
+        async def scenario():
+            slow = asyncio.ensure_future(client.open_async('POST', path, json=body))
+            health = await asyncio.wait_for(client.open_async('GET', '/api/health'), 2)
+            # The health check was answered while the calculation was still running
+            assert not slow.done()
+            release.set()
+            return health, await slow
+
+        try:
+            health, slow = asyncio.run(scenario())
+        finally:
+            release.set()
+            unregister_operation('stall')
+        assert health.status_code == 200
+        assert slow.status_code == 200
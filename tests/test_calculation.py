@@ -0,0 +1,91 @@
+"""
+Unit tests for calculation value objects
+Tests the lazy operation description, mapping behaviour, pickling and serialization.
+"""
+import pickle
+import pytest
+from app.json_codec import JSONCodec
+from Operators.Calculation import CalculationRequest, CalculationResult
+from Operators.OperatorRegistry import OPERATIONS, OperationSpec
+
+
+@pytest.fixture
+def counted_spec():
+    """Operation counting how often its description is built."""
+    calls = []
+
+    def describe(num1, num2):
+        calls.append((num1, num2))
+        return f"{num1} plus {num2}"
+
+    spec = OperationSpec('plus', lambda num1, num2: num1 + num2, (('num1', 0), ('num2', 0)), describe)
+    return spec, calls
+
+
+class TestCalculationRequest:
+    """Test decoded requests."""
+
+    def test_key_and_run(self):
+        request = CalculationRequest(OPERATIONS['power'], (2.0, 10.0))
+        assert request.key == ('power', 2.0, 10.0)
+        assert request.run()['result'] == 1024.0
+
+    def test_key_keeps_sign_of_zero(self):
+        positive = CalculationRequest(OPERATIONS['*'], (0.0, 5.0)).key
+        negative = CalculationRequest(OPERATIONS['*'], (-0.0, 5.0)).key
+        assert positive != negative
+        assert CalculationRequest(OPERATIONS['*'], (0.0, 5.0)).key == positive
+
+    def test_slots(self):
+        request = CalculationRequest(OPERATIONS['pi'], ())
+        with pytest.raises(AttributeError):
+            request.extra = 1
+
+
+class TestCalculationResult:
+    """Test result objects."""
+
+    def test_description_built_lazily_once(self, counted_spec):
+        spec, calls = counted_spec
+        result = spec.run((1.0, 2.0))
+        assert result['result'] == 3.0 and result.result == 3.0
+        assert calls == []
+        assert result['operation'] == '1.0 plus 2.0'
+        assert result.operation == '1.0 plus 2.0'
+        assert calls == [(1.0, 2.0)]
+
+    def test_mapping_interface(self):
+        result = OPERATIONS['+'].run((1.0, 2.0))
+        expected = {'success': True, 'result': 3.0, 'operation': '1.0 + 2.0'}
+        assert result == expected and expected == result
+        assert dict(result) == expected == result.to_dict()
+        assert list(result) == ['success', 'result', 'operation'] and len(result) == 3
+        assert result.get('error') is None and result.get('success') is True
+        assert 'error' not in result
+        with pytest.raises(KeyError):
+            result['error']
+
+    def test_read_only_and_compact(self):
+        result = CalculationResult(1.0, operation='x')
+        with pytest.raises(TypeError):
+            result['result'] = 2.0
+        with pytest.raises(AttributeError):
+            result.extra = 1
+        assert not hasattr(result, '__dict__')
+
+    def test_pickle_formats_description(self, counted_spec):
+        spec, calls = counted_spec
+        restored = pickle.loads(pickle.dumps(spec.run((1.0, 2.0))))
+        assert restored.to_dict() == {'success': True, 'result': 3.0, 'operation': '1.0 plus 2.0'}
+        assert len(calls) == 1
+
+    @pytest.mark.parametrize('backend', ['json', 'orjson', 'msgspec'])
+    def test_serialized_like_a_dict(self, backend):
+        try:
+            codec = JSONCodec(backend)
+        except ValueError:
+            pytest.skip(f'{backend} not installed')
+        results = [OPERATIONS['sin'].run((None, 30.0)), CalculationResult(7.0, operation='3+4')]
+        expected = [{'success': True, 'result': 0.5, 'operation': 'sin(30.0°)'},
+                    {'success': True, 'result': 7.0, 'operation': '3+4'}]
+        assert codec.dumps({'results': results}) == codec.dumps({'results': expected})
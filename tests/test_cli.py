@@ -0,0 +1,127 @@
+"""
+Tests for the command line calculator
+Tests batch mode formats, statistics and parallel evaluation, and the interactive loop.
+"""
+import io
+import json
+import pytest
+import calculatorModel
+from app import cli
+
+
+def run_batch(text, input_format, **kwargs):
+    """Run batch mode over text, returning (output lines, statistics)."""
+    output = io.StringIO()
+    stats = cli.run(io.StringIO(text), output, input_format, **kwargs)
+    return output.getvalue().splitlines(), stats
+
+
+class TestFormatDetection:
+    """Test input format detection."""
+
+    @pytest.mark.parametrize('path,first_line,expected', [
+        ('ops.csv', '', 'csv'),
+        ('ops.ndjson', '', 'jsonl'),
+        ('-', '{"operation": "+"}', 'jsonl'),
+        ('-', 'operation,num1,num2', 'csv'),
+        ('-', '2*sin(30), 4', 'text'),
+        ('-', 'log(8, 2)', 'text'),
+    ])
+    def test_detect_format(self, path, first_line, expected):
+        assert cli.detect_format(path, first_line) == expected
+
+
+class TestBatchMode:
+    """Test evaluation of each input format."""
+
+    def test_jsonl(self):
+        lines, stats = run_batch(
+            '{"operation": "+", "num1": 1, "num2": 2}\n\n{"expression": "2^10"}\nnot json\n', 'jsonl'
+        )
+        results = [json.loads(line) for line in lines]
+        assert [result.get('result') for result in results] == [3, 1024, None]
+        assert results[2]['error'] == 'Invalid JSON'
+        assert stats['count'] == 3 and stats['succeeded'] == 2 and stats['errors'] == 1
+
+    def test_csv_omits_empty_cells(self):
+        text = 'operation,num1,num2,angle\n+,1,2,\nsin,,,30\n/,1,0,\n'
+        lines, stats = run_batch(text, 'csv')
+        results = [json.loads(line) for line in lines]
+        assert results[0]['result'] == 3
+        assert results[1]['operation'] == 'sin(30.0°)'
+        assert results[2]['error'] == 'Division by zero'
+        assert stats['errors'] == 1
+
+    def test_csv_decimal_precision(self):
+        text = 'operation,num1,num2,numeric,precision\n/,1,3,decimal,50\n/,1,3,decimal,\n/,1,3,decimal,many\n'
+        lines, stats = run_batch(text, 'csv')
+        results = [json.loads(line) for line in lines]
+        assert results[0]['result'] == '0.' + '3' * 50
+        assert results[1]['result'] == '0.' + '3' * 28
+        assert results[2]['error'] == 'Precision must be an integer between 1 and 1000'
+        assert stats['errors'] == 1
+
+    def test_text_expressions_with_csv_output(self):
+        lines, _ = run_batch('2+3\n\nlog(8, 2)\n1/0\n', 'text', output_format='csv')
+        assert lines[0] == 'success,result,operation,error'
+        assert lines[1] == 'true,5.0,2+3,'
+        assert lines[2].startswith('true,3.0')
+        assert lines[3].startswith('false,,,')
+
+    def test_results_stream_in_chunks(self):
+        text = ''.join(f'{i}+1\n' for i in range(25))
+        lines, stats = run_batch(text, 'text', chunk_size=4)
+        assert stats['count'] == 25
+        assert json.loads(lines[-1])['result'] == 25
+
+    def test_parallel_matches_inline(self):
+        text = ''.join(f'{{"operation": "power", "base": {i}, "exponent": 2}}\n' for i in range(50))
+        inline, _ = run_batch(text, 'jsonl')
+        parallel, stats = run_batch(text, 'jsonl', workers=2, chunk_size=7)
+        assert parallel == inline
+        assert stats['workers'] == 2
+
+
+class TestMain:
+    """Test the entry point and exit status."""
+
+    def test_files_and_stats(self, tmp_path, capsys):
+        source = tmp_path / 'ops.csv'
+        source.write_text('expression\n2*3\n')
+        target = tmp_path / 'out.jsonl'
+        assert calculatorModel.main([str(source), '-o', str(target), '--stats']) == 0
+        assert json.loads(target.read_text())['result'] == 6
+        assert '1 records (1 succeeded, 0 errors)' in capsys.readouterr().err
+
+    def test_stdin_autodetect_and_error_status(self, monkeypatch, capsys):
+        monkeypatch.setattr('sys.stdin', io.StringIO('\noperation,num1,num2\nmod,7,0\n'))
+        assert calculatorModel.main(['-']) == 1
+        assert json.loads(capsys.readouterr().out)['error'] == 'Modulo by zero'
+
+    def test_columnar(self, tmp_path, capsys):
+        source = tmp_path / 'operands.csv'
+        source.write_text('num1,num2,operator\n6,7,*\n')
+        target = tmp_path / 'results.csv'
+        assert calculatorModel.main([str(source), '--columnar', '-o', str(target), '--stats']) == 0
+        assert target.read_text() == 'result,error\n42.0,\n'
+        assert 'rows/sec' in capsys.readouterr().err
+        with pytest.raises(SystemExit):
+            calculatorModel.main([str(source), '--columnar'])
+
+    def test_invalid_arguments(self):
+        with pytest.raises(SystemExit):
+            calculatorModel.main(['--workers', '-1'])
+
+
+class TestInteractive:
+    """Test the interactive loop uses the current Operator API."""
+
+    def test_session(self, monkeypatch, capsys):
+        answers = iter(['8', '/', '0', '/', '2', 'power', '2', 'back', 'sin', '30', 'back', 'exit'])
+        monkeypatch.setattr('builtins.input', lambda prompt: next(answers))
+        calculatorModel.calculator()
+        output = capsys.readouterr().out
+        assert 'Division by zero' in output
+        assert 'Current result: 4.0' in output
+        assert 'Current result: 16.0' in output
+        assert 'Current Trigonometric result: 0.5' in output
@@ -0,0 +1,73 @@
+"""
+Unit tests for ExpressionEvaluator
+Tests tokenizing, precedence, functions, caching and error handling.
+"""
+import math
+import pytest
+from Operators.ExpressionEvaluator import ExpressionEvaluator
+from Operators.Operator import CalculatorError
+
+
+class TestExpressionEvaluation:
+    """Test expression results."""
+
+    def test_precedence(self):
+        assert ExpressionEvaluator.evaluate('2 + 3 * 4') == 14
+        assert ExpressionEvaluator.evaluate('(2 + 3) * 4') == 20
+        assert ExpressionEvaluator.evaluate('10 - 4 - 3') == 3
+        assert ExpressionEvaluator.evaluate('2 ^ 3 ^ 2') == 512
+
+    def test_unary_minus(self):
+        assert ExpressionEvaluator.evaluate('-2 ^ 2') == -4
+        assert ExpressionEvaluator.evaluate('(-2) ^ 2') == 4
+        assert ExpressionEvaluator.evaluate('3 - -2') == 5
+
+    def test_functions_and_pi(self):
+        assert abs(ExpressionEvaluator.evaluate('sin(30)') - 0.5) < 1e-10
+        assert abs(ExpressionEvaluator.evaluate('log(100)') - 2) < 1e-10
+        assert abs(ExpressionEvaluator.evaluate('log(8, 2)') - 3) < 1e-10
+        assert ExpressionEvaluator.evaluate('power(2, 8)') == 256
+        assert ExpressionEvaluator.evaluate('mod(10, 3)') == 1
+        assert ExpressionEvaluator.evaluate('2 * pi') == 2 * math.pi
+
+    def test_full_formula(self):
+        result = ExpressionEvaluator.evaluate('2*sin(30)+log(8,2)^2 mod 3')
+        assert abs(result - 1) < 1e-10
+        assert ExpressionEvaluator.evaluate('10 % 4') == 2
+
+
+class TestExpressionErrors:
+    """Test malformed expressions and evaluation errors."""
+
+    @pytest.mark.parametrize('expression, message', [
+        ('', 'Expression is empty'),
+        ('1 +', 'Unexpected end of expression'),
+        ('2 * (3', "Expected '\\)'"),
+        ('foo(1)', "Unknown name 'foo'"),
+        ('sin(1, 2)', 'expects 1 argument'),
+        ('1 $ 2', "Unexpected character '\\$'"),
+        ('1 / 0', 'Division by zero'),
+        ('log(-1)', 'Logarithm requires positive number'),
+        ('(-8) ^ (1/3)', 'Result is not a real number'),
+        ('(' * 2000 + '1' + ')' * 2000, 'nested too deeply'),
+    ])
+    def test_errors(self, expression, message):
+        with pytest.raises(CalculatorError, match=message):
+            ExpressionEvaluator.evaluate(expression)
+
+    def test_python_eval_is_not_used(self):
+        with pytest.raises(CalculatorError):
+            ExpressionEvaluator.evaluate('__import__("os")')
+
+
+class TestExpressionCache:
+    """Test compiled expression caching."""
+
+    def test_repeated_expression_hits_cache(self):
+        ExpressionEvaluator.clear_cache()
+        first = ExpressionEvaluator.compile('1 + 2 * 3')
+        second = ExpressionEvaluator.compile('1 + 2 * 3')
+        assert first is second
+        info = ExpressionEvaluator.cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
@@ -0,0 +1,106 @@
+"""
+Unit tests for the columnar file processor
+Tests chunking, parsing, error reporting and both output formats.
+"""
+import math
+import struct
+import pytest
+from app import file_processor
+from app.file_processor import iter_chunks, process_file
+from Operators import VectorizedOperator as vectorized_module
+from Operators.Operator import CalculatorError
+
+
+ROWS = [('1', '2', '+'), ('10', '0', '/'), ('2', '30', 'sin'), ('100', '10', 'log'),
+        ('2', '8', 'power'), ('7', '0', 'mod'), ('1', '1', 'sqrt'), ('9', '4', '-')]
+
+
+@pytest.fixture(params=['numpy', 'fallback'])
+def engine(request, monkeypatch):
+    """Run each test with NumPy parsing and kernels and with the pure Python fallback."""
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(file_processor, 'HAS_NUMPY', False)
+        monkeypatch.setattr(vectorized_module, 'HAS_NUMPY', False)
+
+
+def write_input(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def read_csv_output(path):
+    lines = path.read_text().splitlines()
+    assert lines[0] == 'result,error'
+    return [line.split(',', 1) for line in lines[1:]]
+
+
+class TestChunking:
+    """Test chunks end at line boundaries."""
+
+    def test_chunks_cover_input(self):
+        data = b''.join(b'%d,1,+\n' % i for i in range(100))
+        chunks = list(iter_chunks(data, 0, 64))
+        assert b''.join(chunks) == data
+        assert all(chunk.endswith(b'\n') and len(chunk) <= 64 for chunk in chunks)
+
+    def test_long_line_and_missing_final_newline(self):
+        chunks = list(iter_chunks(b'123456789,1,+\n1,2,+', 0, 4))
+        assert chunks == [b'123456789,1,+\n', b'1,2,+\n']
+
+
+class TestProcessFile:
+    """Test results and errors per row."""
+
+    @pytest.mark.parametrize('chunk_bytes', [16, 1 << 20])
+    def test_results_match_operator(self, engine, tmp_path, chunk_bytes):
+        text = 'num1,num2,operator\n' + ''.join(','.join(row) + '\n' for row in ROWS)
+        source = write_input(tmp_path / 'in.csv', text)
+        stats = process_file(source, str(tmp_path / 'out.csv'), chunk_bytes=chunk_bytes)
+        results = read_csv_output(tmp_path / 'out.csv')
+        assert [value for value, _ in results] == ['3.0', '', '1.0', '2.0', '256.0', '', '', '5.0']
+        assert results[1][1] == 'Division by zero'
+        assert results[5][1] == 'Modulo by zero'
+        assert results[6][1] == 'Unknown operation: sqrt'
+        assert stats['rows'] == len(ROWS) and stats['errors'] == 3
+
+    def test_header_order_and_malformed_rows(self, engine, tmp_path):
+        text = 'operation,num2,num1\r\n+ ,2,1\r\n\r\n*,x,3\r\n"-",1,5\r\n/,1\r\n'
+        source = write_input(tmp_path / 'in.csv', text)
+        stats = process_file(source, str(tmp_path / 'out.csv'))
+        results = read_csv_output(tmp_path / 'out.csv')
+        assert results == [['3.0', ''], ['', 'Blank line'], ['', 'Invalid number'], ['4.0', ''],
+                           ['', '"Expected 3 columns, got 2"']]
+        assert stats['rows'] == 5 and stats['errors'] == 3
+
+    @pytest.mark.parametrize('chunk_bytes', [8, 1 << 20])
+    def test_blank_lines_keep_rows_aligned(self, engine, tmp_path, chunk_bytes):
+        source = write_input(tmp_path / 'in.csv', '1,2,+\n\n  \n3,4,*\n\n')
+        process_file(source, str(tmp_path / 'out.csv'), chunk_bytes=chunk_bytes)
+        results = read_csv_output(tmp_path / 'out.csv')
+        assert results == [['3.0', ''], ['', 'Blank line'], ['', 'Blank line'], ['12.0', ''],
+                           ['', 'Blank line']]
+
+    def test_headerless_f64_output(self, engine, tmp_path):
+        source = write_input(tmp_path / 'in.csv', '3,4,*\n1,0,/\n2,10,power')
+        process_file(source, str(tmp_path / 'out.f64'), output_format='f64')
+        values = struct.unpack('<3d', (tmp_path / 'out.f64').read_bytes())
+        assert values[0] == 12 and math.isnan(values[1]) and values[2] == 1024
+
+    def test_empty_file(self, tmp_path):
+        source = write_input(tmp_path / 'in.csv', '')
+        assert process_file(source, str(tmp_path / 'out.csv'))['rows'] == 0
+        assert (tmp_path / 'out.csv').read_text() == 'result,error\n'
+
+    def test_missing_column(self, tmp_path):
+        source = write_input(tmp_path / 'in.csv', 'num1,operator\n1,+\n')
+        with pytest.raises(CalculatorError, match='num1, num2 and operator'):
+            process_file(source, str(tmp_path / 'out.csv'))
+
+    def test_statistics(self, tmp_path):
+        source = write_input(tmp_path / 'in.csv', ''.join(f'{i},2,*\n' for i in range(1000)))
+        stats = process_file(source, str(tmp_path / 'out.csv'), chunk_bytes=1024)
+        assert stats['rows'] == 1000 and stats['chunks'] > 1
+        assert stats['rows_per_sec'] > 0
+        assert stats['peak_rss_mb'] is None or stats['peak_rss_mb'] > 0
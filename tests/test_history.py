@@ -0,0 +1,198 @@
+"""
+Unit tests for the SQLite calculation history
+Tests batched background writes, paged queries, retention and export.
+"""
+import json
+import time
+import pytest
+from app.history import CalculationHistory, valid_client_id
+from Operators.Operator import CalculatorError
+
+
+@pytest.fixture
+def store(tmp_path):
+    history = CalculationHistory(str(tmp_path / 'history.db'), flush_interval=0.01)
+    yield history
+    history.shutdown()
+
+
+def record(store, client_id, count, operation='+'):
+    for i in range(count):
+        store.record(client_id, operation, {'result': float(i), 'operation': f'{i} + 0'})
+
+
+class TestWriting:
+    """Test the asynchronous batched writer."""
+
+    def test_record_is_queued_then_written(self, tmp_path):
+        store = CalculationHistory(str(tmp_path / 'history.db'), flush_interval=60)
+        try:
+            record(store, 'a', 3)
+            assert store.stats()['written'] == 0
+            store.flush()
+            assert store.stats()['written'] == 3
+            assert store.query('a')['count'] == 3
+        finally:
+            store.shutdown()
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path):
+        store = CalculationHistory(str(tmp_path / 'history.db'), flush_interval=60,
+                                   batch_size=1000, queue_size=5)
+        try:
+            start = time.perf_counter()
+            record(store, 'a', 100)
+            assert time.perf_counter() - start < 1
+            store.flush()
+            stats = store.stats()
+            assert stats['written'] + stats['dropped'] == 100
+            assert stats['dropped'] >= 90
+        finally:
+            store.shutdown()
+
+    def test_shutdown_writes_queued_entries(self, tmp_path):
+        path = str(tmp_path / 'history.db')
+        store = CalculationHistory(path, flush_interval=60)
+        record(store, 'a', 4)
+        store.shutdown()
+        assert CalculationHistory(path).query('a')['count'] == 4
+
+    def test_unencodable_batch_is_dropped_not_fatal(self, store):
+        store.record('a', 'power', {'result': complex(0, 1), 'operation': '-1.0^0.5'})
+        assert store.flush(timeout=5)
+        record(store, 'a', 2)
+        assert store.flush(timeout=5)
+        stats = store.stats()
+        assert stats['dropped'] == 1 and stats['written'] == 2
+        assert store.clear('a') == 2
+
+    def test_flush_returns_when_writer_stopped(self, tmp_path, monkeypatch):
+        store = CalculationHistory(str(tmp_path / 'history.db'), flush_interval=0.01)
+        monkeypatch.setattr(store, '_write_loop', lambda: None)
+        record(store, 'a', 1)
+        start = time.perf_counter()
+        assert store.flush() is False
+        assert time.perf_counter() - start < 5
+        assert store.flush(timeout=0.2) is False
+
+    def test_disabled_store_ignores_records(self):
+        store = CalculationHistory()
+        record(store, 'a', 3)
+        assert not store.enabled
+        assert store.stats()['queued'] == 0
+
+
+class TestQuery:
+    """Test paged and filtered queries."""
+
+    def test_pages_cover_everything_once(self, store):
+        record(store, 'a', 25)
+        store.flush()
+        seen, cursor = [], None
+        while True:
+            page = store.query('a', limit=10, cursor=cursor)
+            seen.extend(item['result'] for item in page['items'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        assert seen == [float(i) for i in reversed(range(25))]
+
+    def test_result_types_round_trip(self, store):
+        results = [3, 2.5, -0.0, '1/3', '0.30000', float('nan'), float('inf'), None]
+        for result in results:
+            store.record('a', '+', {'result': result, 'operation': 'x'})
+        store.flush()
+        items = store.query('a')['items'][::-1]
+        assert [repr(item['result']) for item in items] == [repr(result) for result in results]
+
+    def test_clients_are_isolated(self, store):
+        record(store, 'a', 2)
+        record(store, 'b', 3)
+        store.flush()
+        assert store.query('a')['count'] == 2
+        assert store.query('b')['count'] == 3
+
+    def test_filters(self, store):
+        record(store, 'a', 3, operation='sin')
+        store.flush()
+        middle = time.time()
+        time.sleep(0.01)
+        record(store, 'a', 2, operation='log')
+        store.flush()
+        assert store.query('a', operation='sin')['count'] == 3
+        assert store.query('a', since=middle)['count'] == 2
+        assert store.query('a', until=middle)['count'] == 3
+
+    @pytest.mark.parametrize('kwargs,message', [
+        ({'limit': 0}, 'Limit must be'),
+        ({'limit': 501}, 'Limit must be'),
+        ({'cursor': 'abc'}, 'Invalid cursor'),
+    ])
+    def test_invalid_arguments(self, store, kwargs, message):
+        with pytest.raises(CalculatorError, match=message):
+            store.query('a', **kwargs)
+
+    def test_client_id_validation(self):
+        assert valid_client_id('3f2b-41aa_x.1')
+        assert not valid_client_id('')
+        assert not valid_client_id('a' * 65)
+        assert not valid_client_id('a;drop')
+        assert not valid_client_id(None)
+
+
+class TestRetention:
+    """Test per-client and age limits."""
+
+    def test_max_entries_per_client(self, tmp_path):
+        store = CalculationHistory(str(tmp_path / 'history.db'), max_entries_per_client=5,
+                                   flush_interval=0.01)
+        try:
+            record(store, 'a', 12)
+            record(store, 'b', 2)
+            store.flush()
+            page = store.query('a')
+            assert [item['result'] for item in page['items']] == [11.0, 10.0, 9.0, 8.0, 7.0]
+            assert store.query('b')['count'] == 2
+        finally:
+            store.shutdown()
+
+    def test_max_age(self, tmp_path):
+        store = CalculationHistory(str(tmp_path / 'history.db'), max_age=0.05,
+                                   flush_interval=0.01)
+        try:
+            record(store, 'a', 3)
+            store.flush()
+            time.sleep(0.1)
+            store._last_expiry = 0.0
+            record(store, 'a', 1)
+            store.flush()
+            assert store.query('a')['count'] == 1
+        finally:
+            store.shutdown()
+
+    def test_clear(self, store):
+        record(store, 'a', 3)
+        record(store, 'b', 1)
+        assert store.clear('a') == 3
+        assert store.query('a')['count'] == 0
+        assert store.query('b')['count'] == 1
+
+
+class TestExport:
+    """Test bulk export."""
+
+    def test_ndjson_oldest_first(self, store):
+        record(store, 'a', 5)
+        store.flush()
+        lines = ''.join(store.export('a', chunk_size=2)).splitlines()
+        assert [json.loads(line)['result'] for line in lines] == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    def test_csv(self, store):
+        store.record('a', 'expression', {'result': 6, 'operation': '2*3'})
+        store.flush()
+        lines = ''.join(store.export('a', 'csv')).splitlines()
+        assert lines[0] == 'id,timestamp,operation,expression,result'
+        assert lines[1].endswith(',expression,2*3,6')
+
+    def test_unknown_format(self, store):
+        with pytest.raises(CalculatorError, match='Export format'):
+            store.export('a', 'xml')
@@ -0,0 +1,134 @@
+"""
+Unit tests for the pluggable JSON codec
+Every installed backend must produce exactly the stdlib output and accept exactly
+the documents the stdlib accepts.
+"""
+import json
+import math
+import random
+from decimal import Decimal
+import pytest
+from app import create_app
+from app.json_codec import JSONCodec, JSON_CODEC, orjson, msgspec
+
+BACKENDS = ['json'] + (['orjson'] if orjson else []) + (['msgspec'] if msgspec else [])
+
+
+def reference(obj):
+    """Flask's default compact output."""
+    return json.dumps(obj, ensure_ascii=True, sort_keys=True, separators=(',', ':'), default=str)
+
+
+@pytest.fixture(params=BACKENDS)
+def codec(request):
+    return JSONCodec(request.param)
+
+
+class TestEncoding:
+    """Test that every backend encodes like the stdlib."""
+
+    def test_calculate_payload(self, codec):
+        payload = {'success': True, 'result': 1.0, 'operation': '2.0 × sin(30.0°)'}
+        assert codec.dumps(payload) == reference(payload)
+
+    @pytest.mark.parametrize('value', [
+        0.0, -0.0, 1.0, 0.1 + 0.2, 1e15, 1e16, 1.5e16, 1e22, 1e-4, 1e-5, 1.234e-7,
+        5e-324, 1.7976931348623157e308, 123456789.125, 2 ** 63, -2 ** 63 - 1
+    ])
+    def test_number_formatting(self, codec, value):
+        payload = {'result': value, 'values': [value, -value]}
+        assert codec.dumps(payload) == reference(payload)
+
+    def test_random_floats(self, codec):
+        rng = random.Random(42)
+        values = [rng.uniform(-1, 1) * 10 ** rng.randint(-30, 30) for _ in range(2000)]
+        assert codec.dumps(values) == reference(values)
+
+    @pytest.mark.parametrize('value', [math.nan, math.inf, -math.inf])
+    def test_non_finite_floats(self, codec, value):
+        assert codec.dumps({'result': value}) == reference({'result': value})
+
+    @pytest.mark.parametrize('text', [
+        'π', '°×÷', 'é \\x41 π', '\x7f', '\x00\x1f\b\f\n\r\t', '"quoted" \\ slash/',
+        ' ', '😀', '1e5 0.00001'
+    ])
+    def test_string_escaping(self, codec, text):
+        payload = {text: text}
+        assert codec.dumps(payload) == reference(payload)
+
+    def test_key_order_and_nesting(self, codec):
+        payload = {'b': [{'z': None, 'a': False}], 'a': {'y': 1, 'x': [1, 2.5, 'three']}}
+        assert codec.dumps(payload) == reference(payload)
+
+    def test_decimal(self, codec):
+        payload = {'result': Decimal('0.1')}
+        assert codec.dumps(payload) == '{"result":"0.1"}'
+
+    def test_unserializable(self, codec):
+        with pytest.raises(TypeError):
+            codec.dumps({'value': object()})
+
+
+class TestDecoding:
+    """Test that every backend decodes like the stdlib."""
+
+    @pytest.mark.parametrize('document', [
+        b'{"operation": "+", "num1": 10, "num2": 5.5}',
+        b'[1E5, -0, -0.0, 1e400, NaN, -Infinity]',
+        b'{"a": 1, "a": 2}',
+        b'"\\ud800"',
+        b'12345678901234567890123',
+        b'-9223372036854775809',
+        '﻿{"a": 1}'.encode('utf-8'),
+        '{"a": "π"}'.encode('utf-16'),
+    ])
+    def test_matches_stdlib(self, codec, document):
+        expected = json.loads(document)
+        decoded = codec.loads(document)
+        assert repr(decoded) == repr(expected)
+
+    def test_str_input(self, codec):
+        assert codec.loads('{"x": [1, 2]}') == {'x': [1, 2]}
+
+    @pytest.mark.parametrize('document', [b'', b'{', b'{"a": }', b'\xff'])
+    def test_invalid(self, codec, document):
+        with pytest.raises(ValueError):
+            codec.loads(document)
+
+
+class TestConfiguration:
+    """Test backend selection and the Flask provider."""
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            JSONCodec('yaml')
+
+    def test_auto_prefers_fast_backend(self):
+        assert JSONCodec('auto').backend == BACKENDS[1 if len(BACKENDS) > 1 else 0]
+
+    @pytest.mark.parametrize('backend', BACKENDS)
+    def test_api_output_identical(self, monkeypatch, backend):
+        monkeypatch.setenv('JSON_CODEC', backend)
+        app = create_app()
+        app.config['TESTING'] = True
+        try:
+            response = app.test_client().post('/api/calculate/batch', json={'operations': [
+                {'operation': 'sin', 'num1': 2, 'angle': 30},
+                {'operation': 'power', 'base': 10, 'exponent': -7},
+                {'operation': '/', 'num1': 1, 'num2': 0}
+            ]})
+            assert JSON_CODEC.backend == backend
+            assert response.get_data(as_text=True) == reference(response.get_json()) + '\n'
+        finally:
+            JSON_CODEC.configure('auto')
+
+    def test_debug_mode_indented_output(self):
+        app = create_app()
+        app.debug = True
+        client = app.test_client()
+        response = client.post('/api/calculate', json={'operation': '+', 'num1': 1, 'num2': 2})
+        assert response.status_code == 200
+        assert '\n  ' in response.get_data(as_text=True)
+        assert response.get_json() == {'success': True, 'result': 3.0, 'operation': '1.0 + 2.0'}
+        response = client.post('/api/calculate/batch', json={'operations': [{'expression': '1+2'}]})
+        assert response.get_json()['results'] == [{'success': True, 'result': 3, 'operation': '1+2'}]
@@ -0,0 +1,86 @@
+"""
+Unit tests for Metrics
+Tests per-thread recording, cross-process aggregation and exposition output.
+"""
+import json
+import os
+import subprocess
+import sys
+import threading
+from app.metrics import Metrics, error_class
+
+
+class TestErrorClass:
+    """Test error message classification."""
+
+    def test_error_class(self):
+        assert error_class('Division by zero') == 'division_by_zero'
+        assert error_class('Unknown operation: foo') == 'unknown_operation'
+        assert error_class('') == 'unknown'
+
+
+class TestMetrics:
+    """Test metric recording and rendering."""
+
+    def test_threads_aggregate(self):
+        metrics = Metrics()
+
+        def work():
+            for _ in range(1000):
+                metrics.record_operation('+', 0.00002)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        collected = metrics.collect()
+        assert collected[('calculator_operations_total', (('operation', '+'),))] == 4000
+        histogram = collected[('calculator_operation_duration_seconds', (('operation', '+'),))]
+        assert sum(histogram[:-1]) == 4000
+
+    def test_unknown_operation_label(self):
+        metrics = Metrics()
+        metrics.record_operation('sqrt', 0.001, 'Unknown operation: sqrt')
+        collected = metrics.collect()
+        key = ('calculator_operation_errors_total',
+               (('operation', 'unknown'), ('error', 'unknown_operation')))
+        assert collected[key] == 1
+
+    def test_workers_aggregate_through_directory(self, tmp_path, monkeypatch):
+        monkeypatch.setattr('app.metrics._process_alive', lambda pid: True)
+        workers = []
+        for pid in (101, 102):
+            monkeypatch.setattr('app.metrics.os.getpid', lambda pid=pid: pid)
+            worker = Metrics(str(tmp_path))
+            worker.record_request('/api/calculate', 200, 0.001)
+            worker.flush()
+            workers.append(worker)
+
+        collected = workers[0].collect()
+        key = ('calculator_requests_total', (('endpoint', '/api/calculate'), ('status', '200')))
+        assert collected[key] == 2
+
+    def test_exited_workers_are_dropped(self, tmp_path):
+        exited = subprocess.Popen([sys.executable, '-c', ''])
+        exited.wait()
+        stale = tmp_path / f'worker-{exited.pid}.json'
+        key = ['calculator_requests_total', [['endpoint', '/api/calculate'], ['status', '200']]]
+        stale.write_text(json.dumps([key + [5]]))
+        metrics = Metrics(str(tmp_path))
+        metrics.record_request('/api/calculate', 200, 0.001)
+        collected = metrics.collect()
+        assert collected[('calculator_requests_total', (('endpoint', '/api/calculate'), ('status', '200')))] == 1
+        assert not stale.exists()
+        assert (tmp_path / f'worker-{os.getpid()}.json').exists()
+
+    def test_render_histogram(self):
+        metrics = Metrics()
+        metrics.record_operation('log', 0.00003)
+        text = metrics.render()
+        assert '# TYPE calculator_operation_duration_seconds histogram' in text
+        assert 'calculator_operation_duration_seconds_bucket{operation="log",le="2.5e-05"} 0' in text
+        assert 'calculator_operation_duration_seconds_bucket{operation="log",le="5e-05"} 1' in text
+        assert 'calculator_operation_duration_seconds_bucket{operation="log",le="+Inf"} 1' in text
+        assert 'calculator_operation_duration_seconds_count{operation="log"} 1' in text
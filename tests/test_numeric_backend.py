@@ -0,0 +1,124 @@
+"""
+Unit tests for the decimal and fraction numeric backends
+Tests exactness, precision handling and error semantics matching the float Operator.
+"""
+import math
+from decimal import Decimal
+from fractions import Fraction
+import pytest
+from Operators.NumericBackend import NUMERIC_BACKENDS, decimal_pi, get_backend
+from Operators.Operator import CalculatorError
+
+DECIMAL = NUMERIC_BACKENDS['decimal']
+FRACTION = NUMERIC_BACKENDS['fraction']
+
+
+def decimal_result(operation, *args, precision=28):
+    return DECIMAL.execute(operation, tuple(None if a is None else DECIMAL.convert(a)
+                                            for a in args), precision)
+
+
+class TestConversion:
+    """Test operand conversion."""
+
+    def test_float_uses_shortest_repr(self):
+        assert DECIMAL.convert(0.1) == Decimal('0.1')
+        assert FRACTION.convert(0.1) == Fraction(1, 10)
+
+    def test_strings(self):
+        assert DECIMAL.convert(' 1.50 ') == Decimal('1.50')
+        assert FRACTION.convert('2/6') == Fraction(1, 3)
+
+    @pytest.mark.parametrize('value', ['abc', 'NaN', 'Infinity', '1/0', True, None, [1]])
+    def test_invalid(self, value):
+        for backend in (DECIMAL, FRACTION):
+            with pytest.raises(CalculatorError, match='Invalid number'):
+                backend.convert(value)
+
+    @pytest.mark.parametrize('value, message', [
+        ('1e5000000', 'exponent beyond'),
+        ('1e-20000', 'exponent beyond'),
+        ('1' * 3000, 'at most 2000 digits'),
+        ('1' * 3000 + '/3', 'at most 2000 digits'),
+        (10 ** 5000, 'at most 2000 digits'),
+    ], ids=['exponent', 'negative-exponent', 'digits', 'ratio-digits', 'int-digits'])
+    def test_oversized_operands(self, value, message):
+        for backend in (DECIMAL, FRACTION):
+            with pytest.raises(CalculatorError, match=message):
+                backend.convert(value)
+
+    def test_large_operands_within_limits(self):
+        assert FRACTION.convert('1e10000') == Fraction(10 ** 10000)
+        assert FRACTION.convert('0e999999') == 0
+        assert DECIMAL.convert(10 ** 1500) == Decimal(10 ** 1500)
+
+    def test_unknown_backend(self):
+        with pytest.raises(CalculatorError, match='Unknown numeric backend'):
+            get_backend('binary')
+
+
+class TestDecimalBackend:
+    """Test decimal arithmetic."""
+
+    def test_basic_operations(self):
+        assert decimal_result('+', 0.1, 0.2) == Decimal('0.3')
+        assert decimal_result('-', '1.00', '0.01') == Decimal('0.99')
+        assert decimal_result('*', '1.1', '1.1') == Decimal('1.21')
+        assert decimal_result('/', 1, 3, precision=5) == Decimal('0.33333')
+
+    def test_modulo_sign_matches_float(self):
+        for a, b in [(-7, 3), (7, -3), (-7, -3), (7.5, 2)]:
+            assert decimal_result('mod', a, b) == Decimal(repr(a % b))
+
+    def test_large_power_keeps_precision(self):
+        result = decimal_result('power', 3, 100, precision=60)
+        assert result == Decimal(3 ** 100)
+        assert decimal_result('power', 10, 400) == Decimal('1E+400')
+
+    def test_trigonometry(self):
+        assert decimal_result('sin', None, 30) == Decimal('0.5')
+        assert decimal_result('cos', 2, 60) == Decimal('1.0')
+        assert decimal_result('tan', None, 45) == 1
+        assert decimal_result('cot', None, 90) == 0
+        value = decimal_result('sin', None, 1, precision=40)
+        assert str(value) == '0.01745240643728351281941897851631619247225'
+        assert math.isclose(float(decimal_result('tan', None, 100)), math.tan(math.radians(100)))
+
+    def test_logarithm_and_pi(self):
+        assert decimal_result('log', 1000, 10) == 3
+        assert decimal_result('log', 8, 2, precision=10) == Decimal('3.000000000')
+        assert str(decimal_pi()) == '3.141592653589793238462643383'
+
+    @pytest.mark.parametrize('operation,args,message', [
+        ('/', (1, 0), 'Division by zero'),
+        ('mod', (1, 0), 'Modulo by zero'),
+        ('log', (-1, 10), 'Logarithm requires positive number'),
+        ('log', (10, 1), 'not equal to 1'),
+        ('tan', (None, 90), 'is undefined'),
+        ('cot', (1, 180), 'is undefined'),
+        ('power', (-8, 0.5), 'not a real number'),
+        ('power', (0, -1), 'negative power'),
+        ('sin', (None, '1e40'), 'operand too large for the precision'),
+        ('mod', ('1e100', 3), 'operand too large for the precision'),
+    ])
+    def test_errors(self, operation, args, message):
+        with pytest.raises(CalculatorError, match=message):
+            decimal_result(operation, *args)
+
+
+class TestFractionBackend:
+    """Test exact rational arithmetic."""
+
+    def test_basic_operations(self):
+        third = FRACTION.convert('1/3')
+        assert FRACTION.execute('+', (third, third), 28) == Fraction(2, 3)
+        assert FRACTION.execute('/', (Fraction(1), Fraction(3)), 28) == third
+        assert FRACTION.execute('mod', (Fraction(-7, 2), Fraction(2)), 28) == Fraction(1, 2)
+
+    def test_unsupported_operation(self):
+        with pytest.raises(CalculatorError, match='not supported by the fraction backend'):
+            FRACTION.execute('sin', (None, Fraction(30)), 28)
+
+    def test_division_by_zero(self):
+        with pytest.raises(CalculatorError, match='Division by zero'):
+            FRACTION.execute('/', (Fraction(1), Fraction(0)), 28)
@@ -4,7 +4,9 @@ Tests all calculator operations including edge cases and error handling.
 """
 import pytest
 import math
-from Operators.Operator import Operator, CalculatorError
+import Operators.Operator as operator_module
+from decimal import Decimal, localcontext
+from Operators.Operator import Operator, CalculatorError, TRIGONOMETRIC_FUNCTIONS
 
 
 class TestBasicOperations:
@@ -88,6 +90,81 @@ class TestTrigonometricOperations:
             Operator.perform_trigonometric_function('invalid', 45)
 
 
+def libm_trig(operator, angle):
+    """The pre-table implementation: math.radians plus libm."""
+    return TRIGONOMETRIC_FUNCTIONS[operator](math.radians(angle))
+
+
+@pytest.fixture
+def trig_resolution():
+    """Let a test rebuild the trig table and restore the default afterwards."""
+    yield Operator.configure_trig_table
+    Operator.configure_trig_table(1)
+
+
+class TestTrigonometricTable:
+    """Test the precomputed trig table against the libm implementation."""
+
+    def test_exact_special_angles(self):
+        assert Operator.perform_trigonometric_function('sin', 30) == 0.5
+        assert Operator.perform_trigonometric_function('cos', 60) == 0.5
+        assert Operator.perform_trigonometric_function('tan', 45) == 1.0
+        assert Operator.perform_trigonometric_function('cot', 45) == 1.0
+        assert Operator.perform_trigonometric_function('cot', 90) == 0.0
+        assert Operator.perform_trigonometric_function('cos', 90) == 0.0
+        assert Operator.perform_trigonometric_function('sin', 180) == 0.0
+        assert Operator.perform_trigonometric_function('sin', 45) == math.sqrt(2) / 2
+        assert Operator.perform_trigonometric_function('tan', 60) == math.sqrt(3)
+        assert Operator.perform_trigonometric_operation('sin', 2, 30) == 1.0
+
+    @pytest.mark.parametrize('operator,angle', [
+        ('tan', 90), ('tan', 270), ('tan', -90), ('tan', 450.0), ('cot', 0), ('cot', 180), ('cot', 360)
+    ])
+    def test_undefined_angles(self, operator, angle):
+        with pytest.raises(CalculatorError, match="is undefined"):
+            Operator.perform_trigonometric_function(operator, angle)
+
+    @pytest.mark.parametrize('operator', ['sin', 'cos', 'tan', 'cot'])
+    def test_whole_degrees_match_libm(self, operator):
+        for angle in range(360):
+            if angle % 15 == 0:
+                continue
+            assert Operator.perform_trigonometric_function(operator, angle) == \
+                libm_trig(operator, angle)
+
+    @pytest.mark.parametrize('operator', ['sin', 'cos', 'tan', 'cot'])
+    def test_accuracy_against_libm(self, operator):
+        # Special angles and angles outside [0, 360) may differ from libm by rounding only
+        for tenth in range(-7200, 7200, 7):
+            angle = tenth / 10
+            try:
+                expected = libm_trig(operator, angle)
+            except ZeroDivisionError:
+                continue
+            if abs(expected) > 1e12:
+                continue
+            actual = Operator.perform_trigonometric_function(operator, angle)
+            assert math.isclose(actual, expected, rel_tol=1e-12, abs_tol=1e-15)
+
+    def test_fractional_resolution(self, trig_resolution):
+        trig_resolution(10)
+        assert Operator.perform_trigonometric_function('sin', 30.5) == libm_trig('sin', 30.5)
+        assert Operator.perform_trigonometric_function('sin', 0.1) == libm_trig('sin', 0.1)
+        assert Operator.perform_trigonometric_function('sin', 390) == 0.5
+
+    def test_special_angles_without_table(self, trig_resolution):
+        trig_resolution(0)
+        assert Operator.perform_trigonometric_function('sin', 30) == 0.5
+        assert Operator.perform_trigonometric_function('sin', 31) == libm_trig('sin', 31)
+        with pytest.raises(CalculatorError, match="is undefined"):
+            Operator.perform_trigonometric_function('tan', 90)
+
+    def test_non_finite_angle(self):
+        assert math.isnan(Operator.perform_trigonometric_function('sin', math.nan))
+        with pytest.raises(CalculatorError, match="Trigonometric calculation error"):
+            Operator.perform_trigonometric_function('sin', math.inf)
+
+
 class TestLogarithm:
     """Test logarithm operations."""
 
@@ -143,6 +220,63 @@ class TestPower:
         result = Operator.perform_power(8, 1/3)
         assert abs(result - 2) < 1e-10
 
+    def test_real_power_rejects_complex_results(self):
+        assert Operator.perform_real_power(9, 0.5) == 3.0
+        assert isinstance(Operator.perform_power(-8, 1/3), complex)
+        with pytest.raises(CalculatorError, match="Result is not a real number"):
+            Operator.perform_real_power(-8, 1/3)
+
+
+class TestPowerLogFastPaths:
+    """Test the fixed-base logarithm and exact integer power paths."""
+
+    def test_fixed_base_logs_no_less_accurate(self):
+        with localcontext() as context:
+            context.prec = 50
+            for number in (3.0, 7.5, 1e-300, 123456.789, 2.0 ** 0.5, 1e300, 5e-324):
+                for base in (2.0, 10.0, math.e):
+                    exact = Decimal(number).ln() / Decimal(base).ln()
+                    error = abs(Decimal(Operator.perform_logarithm(number, base)) - exact)
+                    assert error <= abs(Decimal(math.log(number, base)) - exact)
+
+    def test_exact_powers_of_fixed_bases(self):
+        assert Operator.perform_logarithm(1024, 2) == 10
+        assert Operator.perform_logarithm(1e15, 10) == 15
+        assert Operator.perform_logarithm(math.e, math.e) == 1
+
+    def test_other_bases_unchanged(self):
+        for number, base in ((81, 3), (100, 16), (0.5, 7.25)):
+            assert Operator.perform_logarithm(number, base) == math.log(number, base)
+
+    def test_large_integer_powers_exact(self):
+        for base in range(2, 40):
+            for exponent in range(0, 100):
+                if exponent * math.log2(base) < 1000:
+                    expected = float(base ** exponent)
+                    assert Operator.perform_power(float(base), float(exponent)) == expected
+
+    def test_mixed_int_and_float_operands(self):
+        assert Operator.perform_power(3, 40.0) == float(3 ** 40)
+        assert Operator.perform_power(3.0, 40) == float(3 ** 40)
+        result = Operator.perform_power(3, 40)
+        assert result == 3 ** 40 and type(result) is int
+
+    def test_non_integer_powers_unchanged(self):
+        for base, exponent in ((2.5, 40.0), (10.0, 20.5), (1e10, 1.7)):
+            assert Operator.perform_power(base, exponent) == base ** exponent
+
+    def test_complex_result_passes_through(self):
+        result = Operator.perform_power(-8, 1/3)
+        assert isinstance(result, complex)
+
+    def test_memo_bounded(self, monkeypatch):
+        monkeypatch.setattr(operator_module, 'POWER_MEMO', {})
+        monkeypatch.setattr(operator_module, 'POWER_MEMO_LIMIT', 3)
+        for base in range(2, 10):
+            Operator.perform_power(float(base), 60.0)
+        assert len(operator_module.POWER_MEMO) == 3
+        assert Operator.perform_power(9.0, 60.0) == float(9 ** 60)
+
 
 class TestModulo:
     """Test modulo operations."""
@@ -0,0 +1,77 @@
+"""
+Unit tests for the operator registry
+Tests built-in registrations, plugin operations and service dispatch.
+"""
+import pytest
+from Operators.OperatorRegistry import (
+    OPERATIONS, get_operation, register_operation, unregister_operation
+)
+from Operators.Operator import CalculatorError
+from app.calculator_service import CalculatorService
+
+
+@pytest.fixture
+def hypot_plugin():
+    """Register a plugin operation for one test."""
+    spec = register_operation(
+        'hypot',
+        lambda a, b: (a * a + b * b) ** 0.5,
+        (('num1', 0), ('num2', 0)),
+        lambda a, b: f"hypot({a}, {b})"
+    )
+    yield spec
+    unregister_operation('hypot')
+
+
+class TestBuiltinOperations:
+    """Test built-in registry entries."""
+
+    def test_builtins_registered(self):
+        for name in ['+', '-', '*', '/', 'sin', 'cos', 'tan', 'cot', 'log', 'power', 'mod', 'pi']:
+            assert name in OPERATIONS
+
+    def test_spec_metadata(self):
+        spec = get_operation('log')
+        assert spec.arity == 2
+        assert spec.param_names == ('number', 'base')
+        assert spec.parse({'number': '8'}) == (8.0, 10.0)
+
+    def test_optional_parameter(self):
+        spec = get_operation('sin')
+        assert spec.parse({'angle': 30}) == (None, 30.0)
+        assert spec.execute({'num1': 2, 'angle': 30})['operation'] == '2.0 × sin(30.0°)'
+
+    def test_complex_power_rejected(self):
+        with pytest.raises(CalculatorError, match="Result is not a real number"):
+            get_operation('power').execute({'base': -8, 'exponent': 0.5})
+        assert get_operation('power').execute({'base': -8, 'exponent': 3})['result'] == -512
+
+    def test_unknown_operation(self):
+        with pytest.raises(CalculatorError, match="Unknown operation: sqrt"):
+            get_operation('sqrt')
+
+
+class TestPluginOperations:
+    """Test registering operations at runtime."""
+
+    def test_plugin_dispatch_through_service(self, hypot_plugin):
+        result = CalculatorService.calculate('hypot', {'num1': 3, 'num2': 4})
+        assert result == {'success': True, 'result': 5.0, 'operation': 'hypot(3.0, 4.0)'}
+
+    def test_duplicate_registration(self, hypot_plugin):
+        with pytest.raises(ValueError, match="already registered"):
+            register_operation('hypot', abs, (('num1', 0),), str)
+
+    def test_validator(self):
+        def reject_negative(num1):
+            if num1 < 0:
+                raise CalculatorError("Negative input")
+
+        register_operation('root', lambda num1: num1 ** 0.5, (('num1', 0),),
+                           lambda num1: f"√{num1}", validator=reject_negative)
+        try:
+            assert CalculatorService.calculate('root', {'num1': 9})['result'] == 3
+            with pytest.raises(CalculatorError, match="Negative input"):
+                CalculatorService.calculate('root', {'num1': -9})
+        finally:
+            unregister_operation('root')
@@ -0,0 +1,83 @@
+"""
+Unit tests for BatchProcessPool
+Tests chunking, ordering and the inline fallback.
+"""
+import pytest
+from app.metrics import METRICS
+from app.process_pool import BatchProcessPool
+
+
+def _trig_table_size(_):
+    """Runs in a worker: size of its sine lookup table."""
+    from Operators.Operator import TRIGONOMETRIC_TABLES
+    return len(TRIGONOMETRIC_TABLES['sin'])
+
+
+@pytest.fixture(scope='module')
+def pool():
+    """Start a small pool once for the module."""
+    pool = BatchProcessPool(workers=2, min_batch_size=10)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+class TestChunking:
+    """Test automatic chunk sizing."""
+
+    def test_chunk_size_at_least_one_chunk_per_worker(self):
+        pool = BatchProcessPool(workers=4)
+        assert pool.chunk_size(100) <= 25
+
+    def test_chunk_size_follows_cost_estimate(self):
+        pool = BatchProcessPool(workers=2, target_chunk_seconds=0.01)
+        pool._seconds_per_item = 0.001
+        assert pool.chunk_size(100000) == 10
+
+
+class TestBatchProcessPool:
+    """Test batch evaluation in worker processes."""
+
+    def test_disabled_pool_runs_inline(self):
+        pool = BatchProcessPool(workers=0)
+        results = pool.calculate_batch([{'operation': '+', 'num1': 1, 'num2': 2}])
+        assert results[0]['result'] == 3
+        assert pool.stats()['running'] is False
+
+    def test_results_in_order(self, pool):
+        operations = [{'operation': '*', 'num1': i, 'num2': 2} for i in range(500)]
+        operations[7] = {'operation': '/', 'num1': 1, 'num2': 0}
+        operations[8] = {'expression': '2 ^ 10'}
+        results = pool.calculate_batch(operations)
+        assert len(results) == 500
+        assert results[7] == {'success': False, 'error': 'Division by zero'}
+        assert results[8]['result'] == 1024
+        assert [item['result'] for item in results[9:]] == [i * 2 for i in range(9, 500)]
+        assert pool.stats()['running'] is True
+
+    def test_small_batch_stays_inline(self, pool):
+        results = pool.calculate_batch([{'operation': 'pi'}])
+        assert results[0]['success'] is True
+
+    def test_worker_metrics_are_merged(self, pool):
+        METRICS.reset()
+        operations = [{'operation': '*', 'num1': i, 'num2': 2} for i in range(50)]
+        operations.append({'operation': '/', 'num1': 1, 'num2': 0})
+        pool.calculate_batch(operations)
+        snapshot = METRICS.snapshot()
+        assert snapshot[('calculator_operations_total', (('operation', '*'),))] == 50
+        assert snapshot[('calculator_operation_errors_total',
+                         (('operation', '/'), ('error', 'division_by_zero')))] == 1
+        histogram = snapshot[('calculator_operation_duration_seconds', (('operation', '*'),))]
+        assert sum(histogram[:-1]) == 50
+
+    def test_workers_apply_app_settings(self):
+        pool = BatchProcessPool(workers=1, min_batch_size=1,
+                                settings={'trig_table_resolution': 10, 'decimal_precision': 5})
+        try:
+            results = pool.calculate_batch([{'operation': '/', 'num1': 1, 'num2': 3,
+                                             'numeric': 'decimal'}])
+            assert results[0]['result'] == '0.33333'
+            assert list(pool.map_chunks(_trig_table_size, [None])) == [3600]
+        finally:
+            pool.shutdown()
@@ -0,0 +1,148 @@
+"""
+Unit tests for the request profiler
+Tests stack collection, phase classification, triggers and profile retention.
+"""
+import json
+import math
+import os
+import sys
+import pytest
+from app.profiler import RequestProfile, RequestProfiler, classify, DEFAULT_DIRECTORY
+from Operators.Operator import Operator
+
+
+def _inner():
+    return math.sqrt(2)
+
+
+def _outer():
+    return _inner() + _inner()
+
+
+class TestRequestProfile:
+    """Test collapsed stack collection."""
+
+    def test_collapsed_stacks(self):
+        profile = RequestProfile().start()
+        _outer()
+        profile.stop()
+        assert sys.getprofile() is None
+        lines = profile.collapsed()
+        stacks = {line.rsplit(' ', 1)[0] for line in lines}
+        outer = f'request;{__name__}:_outer'
+        assert outer in stacks
+        assert f'{outer};{__name__}:_inner;math:sqrt' in stacks
+        assert all(int(line.rsplit(' ', 1)[1]) > 0 for line in lines)
+
+    def test_self_times_add_up_to_elapsed(self):
+        profile = RequestProfile().start()
+        _outer()
+        profile.stop()
+        assert sum(profile.stacks.values()) == profile.elapsed
+        assert profile.phases()['total'] == pytest.approx(profile.elapsed / 1e6)
+
+    def test_stop_closes_open_frames_and_is_idempotent(self):
+        profile = RequestProfile()
+
+        def traced():
+            profile.start()
+            _inner()
+            profile.stop()
+
+        traced()
+        elapsed = profile.elapsed
+        profile.stop()
+        assert profile.elapsed == elapsed
+        assert not profile._open
+
+    def test_semicolons_escaped(self):
+        profile = RequestProfile('GET /a;b').start()
+        _inner()
+        profile.stop()
+        assert all(line.startswith('GET /a,b') for line in profile.collapsed())
+
+
+class TestPhases:
+    """Test phase classification of stacks."""
+
+    def test_classify(self):
+        assert classify('flask.app:Flask.dispatch_request;app.routes:calculate;'
+                        'werkzeug.wrappers.request:Request.get_json;orjson:loads') == 'json_decode'
+        assert classify('app.routes:calculate;app.calculator_service:CalculatorService.calculate;'
+                        'Operators.OperatorRegistry:<lambda>') == 'dispatch'
+        assert classify('app.calculator_service:CalculatorService.calculate;'
+                        'Operators.Operator:Operator.perform_power;builtins:float') == 'operator'
+        assert classify('app.routes:calculate;flask.json:jsonify') == 'response_encode'
+        assert classify('flask.app:Flask.dispatch_request') == 'other'
+        assert classify('') == 'other'
+
+    def test_codec_inside_dispatch_stays_dispatch(self):
+        # Coalescing keys are encoded inside CalculatorService; that is not the response
+        assert classify('app.calculator_service:CalculatorService.calculate;'
+                        'app.json_codec:JSONCodec.dumps') == 'dispatch'
+
+    def test_operator_phase_measured(self):
+        profile = RequestProfile().start()
+        Operator.perform_power(3.0, 70.0)
+        profile.stop()
+        phases = profile.phases()
+        assert phases['operator'] > 0
+        assert sum(ms for phase, ms in phases.items() if phase != 'total') == pytest.approx(phases['total'])
+
+
+class TestRequestProfiler:
+    """Test triggers, output files and retention."""
+
+    def test_disabled_by_default(self):
+        profiler = RequestProfiler()
+        assert not profiler.enabled
+        assert profiler.begin('anything') is None
+
+    def test_header_trigger(self):
+        profiler = RequestProfiler()
+        profiler.configure(token='secret')
+        assert profiler.enabled
+        assert profiler.begin(None) is None
+        assert profiler.begin('wrong') is None
+        assert profiler.begin('sécret') is None
+        profile = profiler.begin('secret')
+        profile.stop()
+        assert profile.elapsed > 0
+
+    def test_sampling(self):
+        profiler = RequestProfiler()
+        profiler.configure(sample_rate=1.0)
+        profile = profiler.begin(None)
+        assert profile is not None
+        profile.stop()
+        with pytest.raises(ValueError):
+            profiler.configure(sample_rate=1.5)
+
+    def test_finish_writes_files(self, tmp_path):
+        profiler = RequestProfiler()
+        profiler.configure(token='secret', directory=str(tmp_path))
+        profile = profiler.begin('secret')
+        _outer()
+        headers = profiler.finish(profile, 'POST /api/calculate', 200)
+        profile_id = headers['X-Profile-Id']
+        assert headers['Server-Timing'].startswith('json_decode;dur=')
+        assert 'total;dur=' in headers['Server-Timing']
+        folded = (tmp_path / f'{profile_id}.folded').read_text().splitlines()
+        assert all(line.startswith('POST /api/calculate') for line in folded)
+        summary = json.loads((tmp_path / f'{profile_id}.json').read_text())
+        assert summary['endpoint'] == 'POST /api/calculate' and summary['status'] == 200
+        assert set(summary['phases_ms']) >= {'json_decode', 'dispatch', 'operator',
+                                             'response_encode', 'other', 'total'}
+
+    def test_retention(self, tmp_path):
+        profiler = RequestProfiler()
+        profiler.configure(sample_rate=1.0, directory=str(tmp_path), max_files=2)
+        ids = [profiler.finish(profiler.begin(None), 'GET /', 200)['X-Profile-Id'] for _ in range(3)]
+        assert sorted(os.listdir(tmp_path)) == sorted(f'{i}{suffix}' for i in ids[1:]
+                                                      for suffix in ('.folded', '.json'))
+
+    def test_reconfigure_resets_directory(self, tmp_path):
+        profiler = RequestProfiler()
+        profiler.configure(token='secret', directory=str(tmp_path))
+        profiler.configure(token='secret')
+        assert profiler.directory == DEFAULT_DIRECTORY
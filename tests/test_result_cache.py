@@ -0,0 +1,98 @@
+"""
+Unit tests for ResultCache and CalculatorService result caching
+Tests LRU eviction, TTL expiry, statistics and negative caching.
+"""
+import math
+import pytest
+from app.result_cache import ResultCache, MISSING
+from app.calculator_service import CalculatorService
+from Operators.Operator import CalculatorError
+
+
+@pytest.fixture
+def service_cache():
+    """Enable the service cache for one test and disable it afterwards."""
+    CalculatorService.configure_cache(16)
+    yield CalculatorService._cache
+    CalculatorService.configure_cache(0)
+
+
+class TestResultCache:
+    """Test the LRU/TTL cache."""
+
+    def test_hit_and_miss(self):
+        cache = ResultCache(2)
+        assert cache.get('a') is MISSING
+        cache.set('a', 1)
+        assert cache.get('a') == 1
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_rate'] == 0.5
+
+    def test_lru_eviction(self):
+        cache = ResultCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert cache.get('b') is MISSING
+        assert cache.get('a') == 1
+        assert cache.stats()['evictions'] == 1
+
+    def test_ttl_expiry(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr('app.result_cache.time.monotonic', lambda: now[0])
+        cache = ResultCache(2, ttl=5)
+        cache.set('a', 1)
+        now[0] = 104.0
+        assert cache.get('a') == 1
+        now[0] = 106.0
+        assert cache.get('a') is MISSING
+        assert cache.stats()['expirations'] == 1
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            ResultCache(0)
+
+
+class TestServiceCaching:
+    """Test caching in CalculatorService.calculate."""
+
+    def test_disabled_by_default(self):
+        assert CalculatorService.cache_stats() == {'enabled': False}
+
+    def test_normalized_keys_hit(self, service_cache):
+        first = CalculatorService.calculate('+', {'num1': 5, 'num2': '3'})
+        second = CalculatorService.calculate('+', {'num1': 5.0, 'num2': 3, 'angle': 9})
+        assert first == second
+        assert service_cache.hits == 1
+
+    def test_signed_zeros_cached_separately(self, service_cache):
+        positive = CalculatorService.calculate('*', {'num1': 0.0, 'num2': 5})
+        negative = CalculatorService.calculate('*', {'num1': -0.0, 'num2': 5})
+        assert math.copysign(1, positive['result']) == 1
+        assert math.copysign(1, negative['result']) == -1
+        assert service_cache.hits == 0
+
+    def test_cached_result_is_read_only(self, service_cache):
+        with pytest.raises(TypeError):
+            CalculatorService.calculate('pi', {})['result'] = 0
+        assert CalculatorService.calculate('pi', {})['result'] == math.pi
+
+    def test_only_value_cached(self, service_cache):
+        first = CalculatorService.calculate('power', {'base': 2, 'exponent': 10})
+        assert service_cache.get(('power', 2.0, 10.0)) == (True, 1024.0)
+        assert CalculatorService.calculate('power', {'base': 2, 'exponent': 10}) == first
+
+    def test_errors_are_cached(self, service_cache):
+        for _ in range(2):
+            with pytest.raises(CalculatorError, match="Division by zero"):
+                CalculatorService.calculate('/', {'num1': 1, 'num2': 0})
+        assert service_cache.hits == 1
+        assert CalculatorService.cache_stats()['misses'] == 1
+
+    def test_uncacheable_input_bypasses_cache(self, service_cache):
+        with pytest.raises(CalculatorError):
+            CalculatorService.calculate('+', {'num1': 'abc', 'num2': 1})
+        assert len(service_cache) == 0
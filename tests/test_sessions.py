@@ -0,0 +1,170 @@
+"""
+Unit tests for calculation sessions
+Tests accumulator chaining, atomic multi-step updates, idle eviction, the log bound
+and sessions shared through the memory-mapped table.
+"""
+import pytest
+import app.sessions
+from app.sessions import SessionStore, apply_step, chain_parameters
+from Operators.Operator import CalculatorError
+from Operators.OperatorRegistry import OPERATIONS, register_operation, unregister_operation
+
+
+@pytest.fixture
+def store():
+    store = SessionStore()
+    store.configure(100, idle_timeout=60, max_log=3)
+    yield store
+    store.configure(0)
+
+
+class TestApplyStep:
+    """Test how steps map onto operation parameters."""
+
+    @pytest.mark.parametrize('operation,expected', [
+        ('+', ('num1', 'num2')), ('mod', ('num1', 'num2')), ('power', ('base', 'exponent')),
+        ('log', ('number', 'base')), ('sin', ('angle', None)), ('pi', (None, None)),
+    ])
+    def test_chain_parameters(self, operation, expected):
+        assert chain_parameters(OPERATIONS[operation]) == expected
+
+    def test_accumulator_is_first_operand(self):
+        assert apply_step(8.0, {'operation': '-', 'operand': 3}) == (5.0, ('-', 3.0, 5.0))
+        assert apply_step(8.0, {'operation': 'log', 'operand': 2})[0] == pytest.approx(3.0)
+        assert apply_step(30.0, {'operation': 'sin', 'num1': 2})[0] == pytest.approx(1.0)
+
+    def test_defaults_for_missing_operand(self):
+        assert apply_step(100.0, {'operation': 'log'})[0] == pytest.approx(2.0)
+
+    @pytest.mark.parametrize('step', [None, {'operation': 'pi', 'operand': 1}, {'operation': '+', 'operand': 'x'}])
+    def test_invalid_step(self, step):
+        with pytest.raises(CalculatorError):
+            apply_step(1.0, step)
+
+
+class TestSessionStore:
+    """Test the in-process session table."""
+
+    def test_create_and_apply(self, store):
+        session_id, state = store.create(2)
+        assert state[:2] == (2.0, 0)
+        value, steps, _, log = store.apply(session_id, [{'operation': '*', 'operand': 21}])
+        assert (value, steps, log) == (42.0, 1, (('*', 21.0, 42.0),))
+        assert store.get(session_id)[0] == 42.0
+
+    def test_failed_steps_are_atomic(self, store):
+        session_id, _ = store.create(1)
+        with pytest.raises(CalculatorError, match='Step 2: Division by zero'):
+            store.apply(session_id, [{'operation': '+', 'operand': 1},
+                                     {'operation': '+', 'operand': 1},
+                                     {'operation': '/', 'operand': 0}])
+        assert store.get(session_id)[:2] == (1.0, 0)
+
+    def test_non_real_results_are_not_stored(self, store):
+        session_id, _ = store.create(-8)
+        with pytest.raises(CalculatorError, match='not a real number'):
+            store.apply(session_id, [{'operation': 'power', 'operand': 0.5}])
+        register_operation('csqrt', lambda num1: complex(num1) ** 0.5, (('num1', 0),), lambda num1: 'csqrt')
+        try:
+            with pytest.raises(CalculatorError, match='not a real number'):
+                store.apply(session_id, [{'operation': 'csqrt'}])
+        finally:
+            unregister_operation('csqrt')
+        assert store.get(session_id)[:2] == (-8.0, 0)
+        assert store.apply(session_id, [{'operation': '+', 'operand': 1}])[0] == -7.0
+
+    def test_steps_run_outside_the_table_lock(self, store, monkeypatch):
+        session_id, _ = store.create(1)
+        calls = []
+
+        def concurrent_apply_step(value, step):
+            calls.append(value)
+            assert not store._table._lock.locked()
+            if len(calls) == 1:
+                # Another request advances the session while this one is calculating
+                store.apply(session_id, [{'operation': '+', 'operand': 10}])
+            return real_apply_step(value, step)
+
+        real_apply_step = app.sessions.apply_step
+        monkeypatch.setattr(app.sessions, 'apply_step', concurrent_apply_step)
+        value, steps, _, log = store.apply(session_id, [{'operation': '*', 'operand': 2}])
+        # The first calculation (from 1) is discarded and redone from the newer value 11
+        assert calls == [1.0, 1.0, 11.0]
+        assert (value, steps) == (22.0, 2)
+        assert [entry[0] for entry in log] == ['+', '*']
+
+    def test_log_is_bounded(self, store):
+        session_id, _ = store.create()
+        state = store.apply(session_id, [{'operation': '+', 'operand': i} for i in range(10)])
+        assert state[0] == 45 and state[1] == 10
+        assert [entry[1] for entry in state[3]] == [7.0, 8.0, 9.0]
+
+    def test_unknown_session(self, store):
+        assert store.get('missing') is None
+        assert store.apply('missing', [{'operation': 'pi'}]) is None
+        assert not store.delete('missing')
+        assert len(store._table) == 0
+
+    def test_idle_sessions_expire(self, store, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr('app.result_cache.time.monotonic', lambda: now[0])
+        store.configure(100, idle_timeout=60)
+        session_id, _ = store.create()
+        now[0] += 50
+        store.apply(session_id, [{'operation': '+', 'operand': 1}])
+        now[0] += 50
+        assert store.get(session_id)[0] == 1
+        now[0] += 61
+        assert store.apply(session_id, [{'operation': 'pi'}]) is None
+        assert store.stats()['expired'] == 1
+
+    def test_capacity_evicts_least_recently_used(self, store):
+        store.configure(2)
+        first, _ = store.create()
+        second, _ = store.create()
+        store.apply(first, [{'operation': 'pi'}])
+        store.create()
+        assert store.get(second) is None and store.get(first) is not None
+        assert store.stats()['evicted'] == 1
+
+    def test_stats_report_memory(self, store):
+        for _ in range(5):
+            store.create()
+        stats = store.stats()
+        assert stats['sessions'] == 5 and stats['created'] == 5 and stats['shared'] is False
+        assert 0 < stats['memory_bytes'] <= 5 * stats['max_bytes_per_session']
+
+    def test_disabled(self):
+        assert SessionStore().stats() == {'enabled': False}
+
+
+class TestSharedSessions:
+    """Test sessions shared by several workers through one file."""
+
+    def test_workers_see_the_same_session(self, tmp_path):
+        path = str(tmp_path / 'sessions')
+        workers = [SessionStore(), SessionStore()]
+        for worker in workers:
+            worker.configure(100, max_log=3, shared_path=path)
+        session_id, _ = workers[0].create(1)
+        for i in range(6):
+            workers[i % 2].apply(session_id, [{'operation': '*', 'operand': 2}])
+        value, steps, _, log = workers[1].get(session_id)
+        assert (value, steps, len(log)) == (64.0, 6, 3)
+        stats = workers[0].stats()
+        assert stats['shared'] is True and stats['sessions'] == 1
+        assert stats['memory_bytes'] == stats['max_sessions'] * stats['max_bytes_per_session']
+        assert workers[1].delete(session_id) and workers[0].get(session_id) is None
+
+    def test_falls_back_to_process_table(self, tmp_path):
+        store = SessionStore()
+        store.configure(10, shared_path=str(tmp_path / 'missing' / 'sessions'))
+        assert store.enabled and not store.shared
+        assert 'No such file' in store.stats()['fallback']
+
+    def test_full_log_fits_a_shared_record(self, tmp_path):
+        store = SessionStore()
+        store.configure(10, max_log=20, shared_path=str(tmp_path / 'sessions'))
+        session_id, _ = store.create(1e300)
+        state = store.apply(session_id, [{'operation': 'power', 'operand': 0.123456789}] * 25)
+        assert len(state[3]) == 20
@@ -0,0 +1,164 @@
+"""
+Unit tests for SharedResultCache
+Tests set-associative eviction, TTL expiry, cross-process sharing, torn-record
+detection and the per-process fallback in CalculatorService.
+"""
+import errno
+import multiprocessing
+import os
+import pytest
+from app import shared_cache
+from app.calculator_service import CalculatorService
+from app.result_cache import ResultCache, MISSING
+from app.shared_cache import SharedResultCache, HEADER_SIZE
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'results.cache')
+
+
+def _fill(path, keys):
+    """Child process: store each key through its own mapping of the file."""
+    cache = SharedResultCache(path, 64)
+    for key in keys:
+        cache.set(key, (True, {'result': key[1] * 2}))
+    cache.close()
+
+
+class TestSharedResultCache:
+    """Test the shared hash table."""
+
+    def test_hit_and_miss(self, path):
+        cache = SharedResultCache(path, 16)
+        assert cache.get(('+', 1.0, 2.0)) is MISSING
+        cache.set(('+', 1.0, 2.0), (True, {'result': 3.0, 'operation': '1.0 + 2.0 = 3.0'}))
+        assert cache.get(('+', 1.0, 2.0)) == (True, {'result': 3.0, 'operation': '1.0 + 2.0 = 3.0'})
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+        assert stats['hit_rate'] == 0.5
+
+    def test_overwrite_keeps_size(self, path):
+        cache = SharedResultCache(path, 16)
+        cache.set('a', 1)
+        cache.set('a', 2)
+        assert cache.get('a') == 2
+        assert len(cache) == 1 and cache.stats()['evictions'] == 0
+
+    def test_lru_eviction_within_set(self, path):
+        cache = SharedResultCache(path, 2, ways=2)
+        assert cache.sets == 1
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert cache.get('b') is MISSING
+        assert cache.get('a') == 1 and cache.get('c') == 3
+        assert cache.stats()['evictions'] == 1 and len(cache) == 2
+
+    def test_ttl_expiry(self, path, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(shared_cache.time, 'time', lambda: now[0])
+        cache = SharedResultCache(path, 2, ttl=5, ways=2)
+        cache.set('a', 1)
+        now[0] = 1004.0
+        assert cache.get('a') == 1
+        now[0] = 1006.0
+        assert cache.get('a') is MISSING
+        assert cache.stats()['expirations'] == 1
+        # Expired records are replaced before live ones
+        cache.set('b', 2)
+        cache.set('c', 3)
+        assert cache.get('b') == 2 and cache.get('c') == 3
+
+    def test_oversized_and_unmarshallable_values_skipped(self, path):
+        cache = SharedResultCache(path, 16, record_size=64)
+        cache.set('big', 'x' * 100)
+        cache.set('object', object())
+        assert cache.get('big') is MISSING and cache.get(object()) is MISSING
+        assert len(cache) == 0 and cache.stats()['oversize'] == 2
+
+    def test_torn_record_is_a_miss(self, path):
+        cache = SharedResultCache(path, 16)
+        cache.set('a', 'value')
+        # Corrupt the stored value behind the CRC's back
+        cache._map[cache._map.find(b'value', HEADER_SIZE)] = ord('V')
+        assert cache.get('a') is MISSING
+
+    def test_clear_is_shared(self, path):
+        first = SharedResultCache(path, 16)
+        second = SharedResultCache(path, 16)
+        first.set('a', 1)
+        assert second.get('a') == 1
+        second.clear()
+        assert first.get('a') is MISSING and len(first) == 0
+
+    def test_layout_change_reinitializes(self, path):
+        SharedResultCache(path, 16).set('a', 1)
+        resized = SharedResultCache(path, 64)
+        assert resized.get('a') is MISSING and len(resized) == 0
+
+    def test_file_space_is_allocated(self, path):
+        cache = SharedResultCache(path, 64)
+        assert os.stat(path).st_blocks * 512 >= os.stat(path).st_size == cache._size
+
+    def test_layout_change_never_shrinks_mapped_file(self, path):
+        large = SharedResultCache(path, 256)
+        size = os.stat(path).st_size
+        small = SharedResultCache(path, 16)
+        assert os.stat(path).st_size == size
+        small.set('a', 1)
+        # The larger mapping stays backed; before, its pages past the new size raised SIGBUS
+        large._map[size - 1:size] = b'\0'
+        assert small.get('a') == 1
+
+    def test_invalid_size(self, path):
+        with pytest.raises(ValueError):
+            SharedResultCache(path, 0)
+
+    def test_shared_across_processes(self, path):
+        cache = SharedResultCache(path, 64)
+        context = multiprocessing.get_context('spawn')
+        workers = [context.Process(target=_fill, args=(path, [('*', float(i)) for i in range(w, 20, 2)]))
+                   for w in range(2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+            assert worker.exitcode == 0
+        assert [cache.get(('*', float(i)))[1]['result'] for i in range(20)] == [i * 2.0 for i in range(20)]
+        assert len(cache) == 20
+
+
+class TestServiceSharedCache:
+    """Test CalculatorService with a shared cache."""
+
+    @pytest.fixture(autouse=True)
+    def disable_afterwards(self):
+        yield
+        CalculatorService.configure_cache(0)
+
+    def test_results_served_from_shared_cache(self, path):
+        CalculatorService.configure_cache(16, shared_path=path)
+        first = CalculatorService.calculate('power', {'base': 2, 'exponent': 10})
+        other_worker = SharedResultCache(path, 16)
+        assert other_worker.get(('power', 2.0, 10.0)) == (True, first['result'])
+        stats = CalculatorService.cache_stats()
+        assert stats['shared'] is True and stats['size'] == 1 and 'fallback' not in stats
+
+    def test_falls_back_to_process_cache(self, tmp_path):
+        CalculatorService.configure_cache(16, shared_path=str(tmp_path / 'missing' / 'results.cache'))
+        assert isinstance(CalculatorService._cache, ResultCache)
+        CalculatorService.calculate('+', {'num1': 1, 'num2': 2})
+        stats = CalculatorService.cache_stats()
+        assert stats['shared'] is False and stats['size'] == 1
+        assert 'No such file' in stats['fallback']
+
+    def test_falls_back_when_space_cannot_be_reserved(self, path, monkeypatch):
+        def full(fd, offset, length):
+            raise OSError(errno.ENOSPC, 'No space left on device')
+
+        monkeypatch.setattr(shared_cache.os, 'posix_fallocate', full, raising=False)
+        CalculatorService.configure_cache(16, shared_path=path)
+        assert isinstance(CalculatorService._cache, ResultCache)
+        assert 'No space left' in CalculatorService.cache_stats()['fallback']
@@ -0,0 +1,209 @@
+"""
+Unit tests for single-flight request coalescing
+Tests that concurrent identical calls share one computation and its outcome.
+"""
+import threading
+import time
+import pytest
+from app import api_handlers
+from app.api_handlers import handle_batch, handle_calculate, handle_expression
+from app.calculator_service import CalculatorService
+from app.metrics import METRICS
+from app.single_flight import SingleFlight, SINGLE_FLIGHT
+from Operators.Calculation import CalculationResult
+from Operators.Operator import CalculatorError
+
+
+def run_concurrently(count, target):
+    """Start one leader, then count - 1 followers while the leader is still running."""
+    outcomes = [None] * count
+
+    def worker(index):
+        try:
+            outcomes[index] = ('ok', target())
+        except Exception as e:
+            outcomes[index] = ('error', e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    threads[0].start()
+    return threads, outcomes
+
+
+class Blocker:
+    """Computation that blocks until released and counts its executions."""
+
+    def __init__(self, result=42, error=None):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+        self.result = result
+        self.error = error
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        assert self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def finish(threads, blocker):
+    """Start the followers once the leader is computing, then let it finish."""
+    assert blocker.started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # Give the followers time to reach the in-flight call
+    time.sleep(0.1)
+    blocker.release.set()
+    for thread in threads:
+        thread.join(5)
+
+
+class TestSingleFlight:
+    """Test the coalescer itself."""
+
+    def test_identical_calls_compute_once(self):
+        flight = SingleFlight()
+        blocker = Blocker()
+        threads, outcomes = run_concurrently(5, lambda: flight.run('calculate', 'k', blocker))
+        finish(threads, blocker)
+        assert blocker.calls == 1
+        assert [outcome[1][0] for outcome in outcomes] == [42] * 5
+        assert sorted(outcome[1][1] for outcome in outcomes) == [False] + [True] * 4
+        assert flight.stats() == {'enabled': True, 'in_flight': 0, 'coalesced': 4}
+
+    def test_errors_are_shared(self):
+        flight = SingleFlight()
+        blocker = Blocker(error=CalculatorError('Division by zero'))
+        threads, outcomes = run_concurrently(3, lambda: flight.run('calculate', 'k', blocker))
+        finish(threads, blocker)
+        assert blocker.calls == 1
+        assert all(kind == 'error' and isinstance(error, CalculatorError)
+                   and str(error) == 'Division by zero' for kind, error in outcomes)
+
+    def test_different_keys_and_kinds_are_independent(self):
+        flight = SingleFlight()
+        calls = []
+        flight.run('calculate', 'a', lambda: calls.append('a'))
+        flight.run('calculate', 'b', lambda: calls.append('b'))
+        flight.run('expression', 'a', lambda: calls.append('a'))
+        assert calls == ['a', 'b', 'a']
+
+    def test_completed_calls_are_not_cached(self):
+        flight = SingleFlight()
+        results = [flight.run('calculate', 'k', lambda i=i: i) for i in range(3)]
+        assert results == [(0, False), (1, False), (2, False)]
+        assert flight.stats()['in_flight'] == 0
+
+    def test_leader_error_clears_the_call(self):
+        flight = SingleFlight()
+        with pytest.raises(ValueError):
+            flight.run('calculate', 'k', lambda: int('x'))
+        assert flight.run('calculate', 'k', lambda: 1) == (1, False)
+
+    def test_disabled(self):
+        flight = SingleFlight(enabled=False)
+        blocker = Blocker()
+        threads, outcomes = run_concurrently(3, lambda: flight.run('calculate', 'k', blocker))
+        finish(threads, blocker)
+        assert blocker.calls == 3
+
+
+@pytest.fixture
+def coalescing():
+    """Enable the process-wide coalescer for a test."""
+    previous = SINGLE_FLIGHT.enabled
+    SINGLE_FLIGHT.configure(True)
+    yield SINGLE_FLIGHT
+    SINGLE_FLIGHT.configure(previous)
+
+
+class TestHandlerCoalescing:
+    """Test coalescing of API requests."""
+
+    def test_calculate_requests(self, coalescing, monkeypatch):
+        blocker = Blocker(result=CalculationResult(3.0, operation='1.0 + 2.0'))
+        monkeypatch.setattr(CalculatorService, '_run', staticmethod(lambda request: blocker()))
+        before = METRICS.collect().get(('calculator_coalesced_total', (('kind', 'calculate'),)), 0)
+
+        # 1 and 1.0 decode to the same parameters, so they coalesce
+        payloads = [{'operation': '+', 'num1': 1, 'num2': 2},
+                    {'operation': '+', 'num1': 1.0, 'num2': '2'}]
+        outcomes = [None] * 4
+        threads = [threading.Thread(target=lambda i=i: outcomes.__setitem__(
+            i, handle_calculate(payloads[i % 2]))) for i in range(4)]
+        threads[0].start()
+        finish(threads, blocker)
+
+        assert blocker.calls == 1
+        assert all(outcome == (blocker.result, 200) for outcome in outcomes)
+        # Results are read-only, so waiters share the leader's instead of copying it
+        assert all(outcome[0] is blocker.result for outcome in outcomes)
+        after = METRICS.collect()[('calculator_coalesced_total', (('kind', 'calculate'),))]
+        assert after - before == 3
+
+    def test_numeric_requests(self, coalescing, monkeypatch):
+        blocker = Blocker()
+        monkeypatch.setattr('Operators.NumericBackend.NumericBackend.execute',
+                            lambda self, operation, args, precision: blocker())
+        payloads = [{'operation': '+', 'num1': '1.0', 'num2': 2, 'numeric': 'decimal'},
+                    {'operation': '+', 'num1': 1.0, 'num2': '2', 'numeric': 'decimal'},
+                    {'operation': '+', 'num1': '1', 'num2': 2, 'numeric': 'decimal'}]
+        outcomes = [None] * 3
+        threads = [threading.Thread(target=lambda i=i: outcomes.__setitem__(
+            i, handle_calculate(payloads[i]))) for i in range(3)]
+        threads[0].start()
+        finish(threads, blocker)
+        # '1' formats differently from '1.0', so it is computed separately
+        assert blocker.calls == 2
+        assert all(outcome[0]['result'] == '42' for outcome in outcomes)
+
+    def test_expression_requests(self, coalescing, monkeypatch):
+        blocker = Blocker(result=7.0)
+        monkeypatch.setattr('app.calculator_service.ExpressionEvaluator.evaluate',
+                            lambda expression: blocker())
+        outcomes = [None] * 3
+        threads = [threading.Thread(target=lambda i=i: outcomes.__setitem__(
+            i, handle_expression({'expression': ' 3+4 ' if i else '3+4'}, 100))) for i in range(3)]
+        threads[0].start()
+        finish(threads, blocker)
+        assert blocker.calls == 1
+        assert [outcome[0]['result'] for outcome in outcomes] == [7.0] * 3
+
+    def test_batch_requests(self, coalescing, monkeypatch):
+        blocker = Blocker(result=[{'success': True, 'result': 3}])
+        monkeypatch.setattr(api_handlers.BATCH_POOL, 'calculate_batch', lambda operations: blocker())
+        body = {'operations': [{'operation': '+', 'num1': 1, 'num2': 2}]}
+        outcomes = [None] * 3
+        threads = [threading.Thread(target=lambda i=i: outcomes.__setitem__(
+            i, handle_batch(body, 10))) for i in range(3)]
+        threads[0].start()
+        finish(threads, blocker)
+        assert blocker.calls == 1
+        assert all(outcome[0]['results'] == blocker.result for outcome in outcomes)
+
+    def test_batch_key(self):
+        batch_key = api_handlers.batch_key
+        same = batch_key([{'operation': '+', 'num1': 1, 'num2': 2}])
+        assert batch_key([{'operation': '+', 'num1': 1, 'num2': 2}]) == same
+        assert batch_key([{'operation': '+', 'num1': 1.0, 'num2': 2}]) != same
+        assert batch_key([{'operation': '+', 'num1': True, 'num2': 2}]) != same
+        assert batch_key([{'operation': '*', 'num1': 0.0}]) != batch_key([{'operation': '*', 'num1': -0.0}])
+        assert batch_key([{'operation': '+', 'num1': [1]}]) is None
+        assert batch_key([{'operation': '+'}, 'x']) is None
+
+    def test_uncoalescable_batches_still_run(self, coalescing):
+        body = {'operations': [{'operation': '+', 'num1': 1, 'num2': 2}, [1], {'operation': '+', 'num1': [1]}]}
+        payload, status = handle_batch(body, 10)
+        assert status == 200 and payload['count'] == 3
+        assert payload['results'][0]['result'] == 3.0
+        assert [result['success'] for result in payload['results']] == [True, False, False]
+
+    def test_direct_calls_do_not_coalesce(self, coalescing, monkeypatch):
+        blocker = Blocker(result=CalculationResult(3.0, operation='1.0 + 2.0'))
+        monkeypatch.setattr(CalculatorService, '_run', staticmethod(lambda request: blocker()))
+        threads, outcomes = run_concurrently(
+            3, lambda: CalculatorService.calculate('+', {'num1': 1, 'num2': 2}))
+        finish(threads, blocker)
+        assert blocker.calls == 3
@@ -0,0 +1,72 @@
+"""
+Startup budget tests
+Each check runs in a fresh interpreter so modules loaded by other tests don't count.
+"""
+import os
+import subprocess
+import sys
+import pytest
+from benchmarks.import_profile import ROOT, measure
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason='resource module is POSIX only')
+
+
+# Generous ceilings: a cold start regressing past these means a heavy import crept
+# back onto the startup path, not just a slow machine
+OPERATOR_BUDGET_SECONDS = 0.5
+OPERATOR_BUDGET_RSS_KB = 8 * 1024
+CREATE_APP_BUDGET_SECONDS = 1.5
+CREATE_APP_BUDGET_RSS_KB = 64 * 1024
+
+# Modules that only load when the feature needing them is used
+LAZY_MODULES = ['sqlite3', 'multiprocessing', 'concurrent.futures', 'fractions', 'numpy']
+WEB_MODULES = ['flask', 'werkzeug', 'flask_cors']
+
+
+def loaded_modules(statement: str, candidates) -> list:
+    """Return which candidate modules are in sys.modules after running the statement."""
+    environment = {key: value for key, value in os.environ.items()
+                   if key not in ('HISTORY_DB', 'PROCESS_POOL_WORKERS', 'METRICS_DIR')}
+    probe = f"{statement}\nimport sys\nprint(','.join(m for m in {list(candidates)!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True,
+                            cwd=ROOT, env=environment, check=True).stdout.strip()
+    return output.split(',') if output else []
+
+
+class TestStartupBudget:
+    """Test cold-start time and memory stay within budget."""
+
+    def test_operator_import(self):
+        result = measure('from Operators.Operator import Operator')
+        assert result['seconds'] < OPERATOR_BUDGET_SECONDS
+        assert result['rss_delta_kb'] < OPERATOR_BUDGET_RSS_KB
+
+    def test_create_app(self):
+        result = measure('from app import create_app; create_app()')
+        assert result['seconds'] < CREATE_APP_BUDGET_SECONDS
+        assert result['rss_delta_kb'] < CREATE_APP_BUDGET_RSS_KB
+
+
+class TestLazyImports:
+    """Test heavy modules stay off the startup path until used."""
+
+    def test_headless_operator_skips_web_stack(self):
+        statement = 'from Operators.Operator import Operator'
+        assert loaded_modules(statement, WEB_MODULES + LAZY_MODULES) == []
+
+    def test_service_skips_web_stack(self):
+        statement = 'from app.calculator_service import CalculatorService'
+        assert loaded_modules(statement, WEB_MODULES + LAZY_MODULES) == []
+
+    def test_cli_skips_web_stack(self):
+        statement = 'import calculatorModel, app.cli'
+        assert loaded_modules(statement, WEB_MODULES + LAZY_MODULES) == []
+
+    def test_create_app_defers_optional_subsystems(self):
+        statement = 'from app import create_app; create_app()'
+        assert loaded_modules(statement, LAZY_MODULES) == []
+
+    def test_subsystems_load_on_first_use(self):
+        statement = ("from app.calculator_service import CalculatorService\n"
+                     "CalculatorService.calculate('+', {'num1': '1/3', 'num2': 1, 'numeric': 'fraction'})")
+        assert loaded_modules(statement, ['fractions']) == ['fractions']
@@ -0,0 +1,33 @@
+"""
+Unit tests for static asset fingerprinting
+Tests fingerprinted names and the manifest built from a static folder.
+"""
+import hashlib
+from app.static_assets import FINGERPRINT_LENGTH, build_manifest, fingerprint_name
+
+
+class TestFingerprint:
+    """Test content-hashed file names."""
+
+    def test_fingerprint_name(self):
+        assert fingerprint_name('js/calculator.js', 'abcdef0123456789') == 'js/calculator.abcdef012345.js'
+        assert fingerprint_name('LICENSE', 'abcdef0123456789') == 'LICENSE.abcdef012345'
+        assert fingerprint_name('a.b/c.min.css', '0' * 64) == f"a.b/c.min.{'0' * FINGERPRINT_LENGTH}.css"
+
+    def test_build_manifest(self, tmp_path):
+        (tmp_path / 'css').mkdir()
+        (tmp_path / 'css' / 'style.css').write_bytes(b'body {}')
+        (tmp_path / 'app.js').write_bytes(b'1;')
+        manifest = build_manifest(str(tmp_path))
+        digest = hashlib.sha256(b'body {}').hexdigest()[:FINGERPRINT_LENGTH]
+        assert manifest == {
+            'css/style.css': f'css/style.{digest}.css',
+            'app.js': fingerprint_name('app.js', hashlib.sha256(b'1;').hexdigest())
+        }
+
+    def test_changed_content_changes_name(self, tmp_path):
+        path = tmp_path / 'style.css'
+        path.write_bytes(b'a')
+        before = build_manifest(str(tmp_path))
+        path.write_bytes(b'b')
+        assert build_manifest(str(tmp_path)) != before
@@ -0,0 +1,115 @@
+"""
+Unit tests for VectorizedOperator class
+Tests columnar evaluation against the scalar Operator semantics.
+"""
+import math
+import pytest
+from Operators import VectorizedOperator as vectorized_module
+from Operators.VectorizedOperator import VectorizedOperator
+from Operators.Operator import CalculatorError
+
+
+OPERATORS = ['+', '-', '*', '/', 'sin', 'cos', 'tan', 'cot', 'log', 'power', 'mod']
+
+
+def scalar_reference(operators, operand1, operand2):
+    """Evaluate columns through the scalar path for comparison."""
+    return VectorizedOperator.evaluate_scalar(operators, operand1, operand2)
+
+
+@pytest.fixture(params=['numpy', 'fallback'])
+def engine(request, monkeypatch):
+    """Run each test with NumPy kernels and with the scalar fallback."""
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(vectorized_module, 'HAS_NUMPY', False)
+    return VectorizedOperator
+
+
+class TestVectorizedEvaluation:
+    """Test vectorized results match the scalar path."""
+
+    def test_homogeneous_column(self, engine):
+        result = engine.evaluate('+', [1, 2, 3], [4, 5, 6])
+        assert list(result.values) == [5, 7, 9]
+        assert result.error_count == 0
+
+    def test_mixed_column_matches_scalar(self, engine):
+        operand1 = [float(i + 1) for i in range(len(OPERATORS))]
+        operand2 = [float(i + 2) * 7 for i in range(len(OPERATORS))]
+        result = engine.evaluate(OPERATORS, operand1, operand2)
+        expected = scalar_reference(OPERATORS, operand1, operand2)
+        for value, reference in zip(result.values, expected.values):
+            assert math.isclose(value, reference, rel_tol=1e-12)
+
+    def test_fixed_base_logarithms_match_scalar(self, engine):
+        # Exact powers of the base give the exact integer on both paths
+        for base, powers in ((10.0, [10.0 ** k for k in range(-20, 23)]),
+                             (2.0, [2.0 ** k for k in range(-60, 61)])):
+            result = engine.evaluate('log', powers, [base] * len(powers))
+            expected = scalar_reference('log', powers, [base] * len(powers))
+            assert list(result.values) == list(expected.values)
+        assert engine.evaluate('log', [1000], [10]).values[0] == 3.0
+        # Elsewhere NumPy and libm may round differently, by at most one ulp
+        numbers = [0.001 * 1.37 ** i for i in range(200)]
+        for base in (2.0, 10.0, math.e, 3.0):
+            result = engine.evaluate('log', numbers, [base] * len(numbers))
+            expected = scalar_reference('log', numbers, [base] * len(numbers))
+            for value, reference in zip(result.values, expected.values):
+                assert abs(value - reference) <= math.ulp(reference)
+
+    def test_trig_uses_degrees(self, engine):
+        result = engine.evaluate('sin', [1, 2], [30, 90])
+        assert abs(result.values[0] - 0.5) < 1e-10
+        assert abs(result.values[1] - 2) < 1e-10
+
+
+class TestVectorizedErrors:
+    """Test per-element error masks."""
+
+    def test_division_and_modulo_by_zero(self, engine):
+        result = engine.evaluate(['/', '/', 'mod'], [10, 10, 10], [2, 0, 0])
+        assert result.values[0] == 5
+        assert list(result.mask) == [False, True, True]
+        assert result.errors[1] == 'Division by zero'
+        assert result.errors[2] == 'Modulo by zero'
+        assert math.isnan(result.values[1])
+
+    def test_logarithm_errors(self, engine):
+        result = engine.evaluate('log', [100, -1, 10, 10], [10, 10, 1, -2])
+        assert abs(result.values[0] - 2) < 1e-10
+        assert result.errors[1] == 'Logarithm requires positive number'
+        assert 'not equal to 1' in result.errors[2]
+        assert 'base must be positive' in result.errors[3]
+
+    def test_cot_singularity(self, engine):
+        result = engine.evaluate('cot', [1, 1], [0, 45])
+        assert result.errors[0].startswith('Trigonometric calculation error')
+        assert abs(result.values[1] - 1) < 1e-10
+
+    def test_special_angles_match_scalar(self, engine):
+        angles = [30, -330, 45, 90, 270, 180, 31.5]
+        for operator in ['sin', 'cos', 'tan', 'cot']:
+            result = engine.evaluate(operator, [1] * len(angles), angles)
+            expected = scalar_reference(operator, [1] * len(angles), angles)
+            assert result.errors == expected.errors
+            for value, reference in zip(result.values, expected.values):
+                assert value == reference or (math.isnan(value) and math.isnan(reference))
+        result = engine.evaluate('tan', [1, 1], [90, 45])
+        assert result.errors[0].endswith('is undefined')
+        assert result.values[1] == 1.0
+
+    def test_power_overflow(self, engine):
+        result = engine.evaluate('power', [2, 10], [8, 400])
+        assert result.values[0] == 256
+        assert result.errors[1].startswith('Power calculation error')
+
+    def test_unknown_operator(self, engine):
+        result = engine.evaluate(['+', 'sqrt'], [1, 4], [1, 0])
+        assert result.values[0] == 2
+        assert result.errors[1] == 'Unknown operation: sqrt'
+
+    def test_mismatched_columns(self, engine):
+        with pytest.raises(CalculatorError, match="same length"):
+            engine.evaluate('+', [1, 2], [1])